@@ -6,8 +6,13 @@ Calculates logistics KPIs from flow instances
 from typing import List
 from dataclasses import dataclass, asdict
 from collections import Counter
+import numpy as np
+import pandas as pd
 from ..core.flow_models import LogisticsFlow, FlowCode
 
+# Columns required by ColumnarFlowKPICalculator
+FLOW_COLUMNS = ["flow_code", "wh_handling", "offshore_flag", "is_pre_arrival", "transport_mode"]
+
 
 @dataclass
 class FlowKPIs:
@@ -152,3 +157,168 @@ class FlowKPICalculator:
 
         return valid, errors
 
+
+
+def flows_to_frame(flows: List[LogisticsFlow]) -> pd.DataFrame:
+    """Convert LogisticsFlow instances to the columnar layout (flow_id + FLOW_COLUMNS)"""
+    return pd.DataFrame(
+        {
+            "flow_id": [f.flow_id for f in flows],
+            "flow_code": np.array([int(f.flow_code) for f in flows], dtype=np.int64),
+            "wh_handling": np.array([f.wh_handling for f in flows], dtype=np.int64),
+            "offshore_flag": np.array([f.offshore_flag for f in flows], dtype=bool),
+            "is_pre_arrival": np.array([f.is_pre_arrival for f in flows], dtype=bool),
+            "transport_mode": [f.transport_mode for f in flows],
+        }
+    )
+
+
+class ColumnarFlowKPICalculator:
+    """
+    Calculate KPIs from columnar flow data (pandas DataFrame or Arrow table)
+
+    Expects the FLOW_COLUMNS columns (plus optional flow_id). All metrics and the
+    per-mode grouping are computed with vectorized operations in a single pass
+    over the arrays, without materializing LogisticsFlow objects.
+    """
+
+    @staticmethod
+    def _to_frame(flows) -> pd.DataFrame:
+        """Accept a DataFrame or anything with to_pandas() (pyarrow.Table)"""
+        if not isinstance(flows, pd.DataFrame):
+            flows = flows.to_pandas()
+        missing = [c for c in FLOW_COLUMNS if c not in flows.columns]
+        if missing:
+            raise ValueError(f"Missing flow columns: {missing}")
+        return flows
+
+    @staticmethod
+    def _arrays(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Extract (flow_code, wh_handling, offshore, pre_arrival) as NumPy arrays"""
+        codes = np.clip(df["flow_code"].to_numpy(dtype=np.int64), 0, 4)
+        wh = df["wh_handling"].to_numpy(dtype=np.int64)
+        offshore = df["offshore_flag"].to_numpy(dtype=bool)
+        pre = df["is_pre_arrival"].to_numpy(dtype=bool)
+        return codes, wh, offshore, pre
+
+    def calculate(self, flows) -> FlowKPIs:
+        """
+        Calculate comprehensive KPIs from columnar flows
+
+        Args:
+            flows: DataFrame/Arrow table with FLOW_COLUMNS
+
+        Returns:
+            FlowKPIs with all metrics calculated
+        """
+        modes, counts, code_hist = self._aggregate(self._to_frame(flows))
+        return self._build(
+            counts.sum(axis=0),
+            code_hist.sum(axis=0),
+            {mode: int(counts[i, 0]) for i, mode in enumerate(modes)},
+        )
+
+    def calculate_by_mode(self, flows) -> dict[str, FlowKPIs]:
+        """
+        Calculate KPIs grouped by transport mode
+
+        Args:
+            flows: DataFrame/Arrow table with FLOW_COLUMNS
+
+        Returns:
+            Dictionary mapping transport_mode → FlowKPIs
+        """
+        modes, counts, code_hist = self._aggregate(self._to_frame(flows))
+        return {
+            mode: self._build(counts[i], code_hist[i], {mode: int(counts[i, 0])})
+            for i, mode in enumerate(modes)
+        }
+
+    def _aggregate(self, df: pd.DataFrame) -> tuple[list[str], np.ndarray, np.ndarray]:
+        """
+        Per-mode counters from one bincount pass keyed by mode index
+
+        Returns:
+            (modes, counts[mode, (total, pre, direct, mosb, wh)], code_hist[mode, 0..4])
+        """
+        if len(df) == 0:
+            return [], np.zeros((0, 5), dtype=np.int64), np.zeros((0, 5), dtype=np.int64)
+
+        codes, wh, offshore, pre = self._arrays(df)
+        mode_idx, modes = pd.factorize(df["transport_mode"].astype(str), sort=True)
+        n_modes = len(modes)
+
+        counts = np.stack(
+            [
+                np.bincount(mode_idx, minlength=n_modes),
+                np.bincount(mode_idx[pre], minlength=n_modes),
+                np.bincount(mode_idx[codes == FlowCode.DIRECT], minlength=n_modes),
+                np.bincount(mode_idx[offshore], minlength=n_modes),
+                np.bincount(mode_idx, weights=wh, minlength=n_modes).astype(np.int64),
+            ],
+            axis=1,
+        )
+        # (mode, flow_code) histogram in one bincount over a combined key
+        code_hist = np.bincount(mode_idx * 5 + codes, minlength=n_modes * 5).reshape(n_modes, 5)
+        return list(modes), counts, code_hist
+
+    @staticmethod
+    def _build(counts: np.ndarray, code_hist: np.ndarray, mode_dist: dict[str, int]) -> FlowKPIs:
+        """FlowKPIs from a (total, pre, direct, mosb, wh) counter row"""
+        total, pre_arrival, direct, mosb_pass, total_wh = (int(c) for c in counts)
+        return FlowKPIs(
+            total_flows=total,
+            pre_arrival_count=pre_arrival,
+            direct_delivery_rate=(direct / total * 100) if total > 0 else 0.0,
+            mosb_pass_rate=(mosb_pass / total * 100) if total > 0 else 0.0,
+            avg_wh_hops=(total_wh / total) if total > 0 else 0.0,
+            flow_distribution={code: int(n) for code, n in enumerate(code_hist) if n},
+            mode_distribution=mode_dist
+        )
+
+    def consistency_mask(self, flows) -> np.ndarray:
+        """
+        Vectorized FlowCode consistency check
+
+        Args:
+            flows: DataFrame/Arrow table with FLOW_COLUMNS
+
+        Returns:
+            Boolean array, True where flow_code matches the business rule
+        """
+        df = self._to_frame(flows)
+        codes, wh, offshore, pre = self._arrays(df)
+        return codes == self.expected_flow_codes(wh, offshore, pre)
+
+    @staticmethod
+    def expected_flow_codes(
+        wh: np.ndarray, offshore: np.ndarray, pre: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized LogisticsFlow.calculate_flow_code"""
+        active = np.clip(1 + wh + offshore.astype(np.int64), 1, 4)
+        return np.where(pre, FlowCode.PRE_ARRIVAL, active)
+
+    def validate_consistency(self, flows) -> tuple[int, List[str]]:
+        """
+        Validate flow code consistency across all flows
+
+        Args:
+            flows: DataFrame/Arrow table with FLOW_COLUMNS (flow_id optional)
+
+        Returns:
+            Tuple of (valid_count, list of error messages)
+        """
+        df = self._to_frame(flows)
+        codes, wh, offshore, pre = self._arrays(df)
+        expected = self.expected_flow_codes(wh, offshore, pre)
+        mask = codes == expected
+
+        # Messages only for the (usually few) failing rows
+        bad = np.flatnonzero(~mask)
+        ids = df["flow_id"].to_numpy() if "flow_id" in df.columns else df.index.to_numpy()
+        errors = [
+            f"Flow {ids[i]}: FlowCode={codes[i]} but expected {expected[i]} "
+            f"(WH={wh[i]}, Offshore={offshore[i]}, PreArrival={pre[i]})"
+            for i in bad
+        ]
+        return int(mask.sum()), errors
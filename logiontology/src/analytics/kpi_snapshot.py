@@ -0,0 +1,354 @@
+"""
+HVDC Flow KPI Snapshot v1.0
+Server-side aggregated KPI counters with cached refresh and incremental updates
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional
+
+from rdflib import Graph
+
+from ..core.flow_models import FlowCode, LogisticsFlow
+from .kpi_calculator import FlowKPIs
+
+logger = logging.getLogger(__name__)
+
+# Per (flow code, transport mode) aggregates over flow nodes loaded by Neo4jStore.
+# Flow literals become node properties named after the hvdc-flow predicates.
+KPI_AGGREGATE_CYPHER = """
+MATCH (f)
+WHERE f.hasFlowCode IS NOT NULL
+RETURN f.hasFlowCode AS flow_code,
+       coalesce(f.hasTransportMode, 'unknown') AS transport_mode,
+       count(f) AS total,
+       sum(CASE WHEN f.isPreArrival THEN 1 ELSE 0 END) AS pre_arrival,
+       sum(CASE WHEN f.hasOffshoreFlag THEN 1 ELSE 0 END) AS mosb_pass,
+       sum(coalesce(f.hasWHHandling, 0)) AS wh_hops
+"""
+
+# Same aggregates over an RDF graph produced by FlowRDFMapper.
+KPI_AGGREGATE_SPARQL = """
+PREFIX hvdc-flow: <https://hvdc.example.org/flow#>
+
+SELECT ?flowCode ?mode
+       (COUNT(?flow) AS ?total)
+       (SUM(IF(?pre, 1, 0)) AS ?preArrival)
+       (SUM(IF(?offshore, 1, 0)) AS ?mosbPass)
+       (SUM(?wh) AS ?whHops)
+WHERE {
+  ?flow hvdc-flow:hasFlowCode ?flowCode .
+  OPTIONAL { ?flow hvdc-flow:hasTransportMode ?m }
+  OPTIONAL { ?flow hvdc-flow:hasWHHandling ?w }
+  OPTIONAL { ?flow hvdc-flow:hasOffshoreFlag ?o }
+  OPTIONAL { ?flow hvdc-flow:isPreArrival ?p }
+  BIND(COALESCE(STR(?m), "unknown") AS ?mode)
+  BIND(COALESCE(?w, 0) AS ?wh)
+  BIND(COALESCE(?o, false) AS ?offshore)
+  BIND(COALESCE(?p, false) AS ?pre)
+}
+GROUP BY ?flowCode ?mode
+"""
+
+
+@dataclass
+class KPIBucket:
+    """Running counters for one (flow code, transport mode) group"""
+    total: int = 0
+    pre_arrival: int = 0
+    mosb_pass: int = 0
+    wh_hops: int = 0
+
+
+class KPISnapshot:
+    """
+    KPI aggregates keyed by (flow code, transport mode)
+
+    Every FlowKPIs metric is derivable from these counters, so the snapshot can be
+    filled from a single group-by query and adjusted in place as flows arrive.
+    """
+
+    def __init__(self):
+        self.buckets: dict[tuple[int, str], KPIBucket] = {}
+
+    def add_aggregate(
+        self,
+        flow_code: int,
+        transport_mode: str,
+        total: int,
+        pre_arrival: int = 0,
+        mosb_pass: int = 0,
+        wh_hops: int = 0,
+    ) -> None:
+        """
+        Add (or subtract, with negative counts) pre-aggregated counters
+
+        Args:
+            flow_code: Flow code 0-4
+            transport_mode: Transport mode of the group
+            total: Number of flows in the group
+            pre_arrival: Pre-arrival flows in the group
+            mosb_pass: Flows with offshore_flag=True in the group
+            wh_hops: Sum of wh_handling over the group
+        """
+        key = (int(flow_code), str(transport_mode))
+        bucket = self.buckets.setdefault(key, KPIBucket())
+        bucket.total += int(total)
+        bucket.pre_arrival += int(pre_arrival)
+        bucket.mosb_pass += int(mosb_pass)
+        bucket.wh_hops += int(wh_hops)
+        if bucket.total <= 0:
+            del self.buckets[key]
+
+    def add_flow(self, flow: LogisticsFlow, sign: int = 1) -> None:
+        """Apply a single flow (sign=-1 removes it)"""
+        self.add_aggregate(
+            int(flow.flow_code),
+            flow.transport_mode,
+            total=sign,
+            pre_arrival=sign if flow.is_pre_arrival else 0,
+            mosb_pass=sign if flow.offshore_flag else 0,
+            wh_hops=sign * flow.wh_handling,
+        )
+
+    def add_flows(self, flows: Iterable[LogisticsFlow]) -> None:
+        """Apply multiple flows"""
+        for flow in flows:
+            self.add_flow(flow)
+
+    def remove_flow(self, flow: LogisticsFlow) -> None:
+        """Retract a previously applied flow"""
+        self.add_flow(flow, sign=-1)
+
+    def merge(self, other: "KPISnapshot", sign: int = 1) -> None:
+        """Add (sign=-1: subtract) all counters of another snapshot into this one"""
+        for (code, mode), bucket in other.buckets.items():
+            self.add_aggregate(
+                code,
+                mode,
+                sign * bucket.total,
+                sign * bucket.pre_arrival,
+                sign * bucket.mosb_pass,
+                sign * bucket.wh_hops,
+            )
+
+    def copy(self) -> "KPISnapshot":
+        """Return an independent copy"""
+        snapshot = KPISnapshot()
+        snapshot.merge(self)
+        return snapshot
+
+    @property
+    def total_flows(self) -> int:
+        return sum(bucket.total for bucket in self.buckets.values())
+
+    def to_kpis(self, transport_mode: Optional[str] = None) -> FlowKPIs:
+        """
+        Derive FlowKPIs from the counters
+
+        Args:
+            transport_mode: Restrict to a single mode (None = all flows)
+
+        Returns:
+            FlowKPIs equal to FlowKPICalculator.calculate on the same flows
+        """
+        total = pre_arrival = direct = mosb_pass = wh_hops = 0
+        flow_dist: dict[int, int] = {}
+        mode_dist: dict[str, int] = {}
+
+        for (code, mode), bucket in self.buckets.items():
+            if transport_mode is not None and mode != transport_mode:
+                continue
+            total += bucket.total
+            pre_arrival += bucket.pre_arrival
+            mosb_pass += bucket.mosb_pass
+            wh_hops += bucket.wh_hops
+            if code == FlowCode.DIRECT:
+                direct += bucket.total
+            flow_dist[code] = flow_dist.get(code, 0) + bucket.total
+            mode_dist[mode] = mode_dist.get(mode, 0) + bucket.total
+
+        return FlowKPIs(
+            total_flows=total,
+            pre_arrival_count=pre_arrival,
+            direct_delivery_rate=(direct / total * 100) if total > 0 else 0.0,
+            mosb_pass_rate=(mosb_pass / total * 100) if total > 0 else 0.0,
+            avg_wh_hops=(wh_hops / total) if total > 0 else 0.0,
+            flow_distribution=flow_dist,
+            mode_distribution=mode_dist,
+        )
+
+    def by_mode(self) -> dict[str, FlowKPIs]:
+        """KPIs grouped by transport mode"""
+        modes = sorted({mode for _, mode in self.buckets})
+        return {mode: self.to_kpis(mode) for mode in modes}
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "KPISnapshot":
+        """
+        Build a snapshot from aggregate rows
+
+        Args:
+            records: Rows with flow_code, transport_mode, total, pre_arrival,
+                mosb_pass and wh_hops keys (as returned by KPI_AGGREGATE_CYPHER)
+
+        Returns:
+            KPISnapshot
+        """
+        snapshot = cls()
+        for row in records:
+            snapshot.add_aggregate(
+                row["flow_code"],
+                row.get("transport_mode") or "unknown",
+                row.get("total") or 0,
+                row.get("pre_arrival") or 0,
+                row.get("mosb_pass") or 0,
+                row.get("wh_hops") or 0,
+            )
+        return snapshot
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> "KPISnapshot":
+        """Aggregate flow KPIs from an RDF graph with a single SPARQL group-by"""
+        results = graph.query(KPI_AGGREGATE_SPARQL)
+        return cls.from_records(
+            {
+                "flow_code": int(row.flowCode),
+                "transport_mode": str(row.mode),
+                "total": int(row.total),
+                "pre_arrival": int(row.preArrival or 0),
+                "mosb_pass": int(row.mosbPass or 0),
+                "wh_hops": int(row.whHops or 0),
+            }
+            for row in results
+        )
+
+    @classmethod
+    def from_neo4j(cls, store) -> "KPISnapshot":
+        """Aggregate flow KPIs inside Neo4j with a single Cypher group-by"""
+        return cls.from_records(store.execute_cypher(KPI_AGGREGATE_CYPHER))
+
+
+class KPIService:
+    """
+    Cached KPI snapshot with periodic refresh and incremental updates
+
+    The loader runs at most once per refresh interval. Between refreshes, newly
+    loaded flows are folded into the cached snapshot; the next refresh replaces it
+    with the authoritative aggregate from the store.
+    """
+
+    def __init__(
+        self,
+        loader: Optional[Callable[[], KPISnapshot]] = None,
+        refresh_interval: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize service
+
+        Args:
+            loader: Callable returning a fresh KPISnapshot (None = incremental only)
+            refresh_interval: Seconds before the cached snapshot is reloaded
+            clock: Monotonic time source
+        """
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshot = KPISnapshot()
+        self._loaded_at: Optional[float] = None
+        # last counters applied per source (e.g. TTL path), so a re-load replaces them
+        self._sources: dict[str, KPISnapshot] = {}
+
+    def _is_stale(self) -> bool:
+        if self.loader is None:
+            return False
+        if self._loaded_at is None:
+            return True
+        return self._clock() - self._loaded_at >= self.refresh_interval
+
+    def refresh(self) -> KPISnapshot:
+        """Reload the snapshot from the store, keeping the cached one on failure"""
+        with self._lock:
+            self._refresh_locked()
+            return self._snapshot
+
+    def _refresh_locked(self) -> None:
+        self._loaded_at = self._clock()
+        if self.loader is None:
+            return
+        try:
+            self._snapshot = self.loader()
+        except Exception as e:
+            logger.warning(f"KPI refresh failed, serving cached snapshot: {e}")
+
+    def get_snapshot(self) -> KPISnapshot:
+        """Return the cached snapshot, refreshing it if the interval has elapsed"""
+        with self._lock:
+            if self._is_stale():
+                self._refresh_locked()
+            return self._snapshot
+
+    def get_kpis(self, transport_mode: Optional[str] = None) -> FlowKPIs:
+        """Current KPIs (optionally for a single transport mode)"""
+        return self.get_snapshot().to_kpis(transport_mode)
+
+    def apply_flows(self, flows: List[LogisticsFlow]) -> None:
+        """Fold newly loaded flows into the cached snapshot"""
+        with self._lock:
+            self._snapshot.add_flows(flows)
+
+    def apply_snapshot(self, delta: KPISnapshot, source: Optional[str] = None) -> None:
+        """
+        Fold pre-aggregated counters (e.g. from a loaded TTL) into the cache
+
+        Args:
+            delta: Counters of the loaded flows
+            source: Identifier of the loaded file. Counters previously applied for
+                the same source are replaced, so re-loading a file (an idempotent
+                MERGE in Neo4j) does not count its flows twice.
+        """
+        with self._lock:
+            if source is not None:
+                previous = self._sources.get(source)
+                if previous is not None:
+                    self._snapshot.merge(previous, sign=-1)
+                self._sources[source] = delta.copy()
+            self._snapshot.merge(delta)
+
+    def invalidate(self) -> None:
+        """Force a reload on the next read"""
+        with self._lock:
+            self._loaded_at = None
+
+
+def _load_snapshot_from_neo4j() -> KPISnapshot:
+    """Aggregate KPIs server-side in Neo4j."""
+    from ..graph.neo4j_store import Neo4jStore
+
+    with Neo4jStore() as store:
+        return KPISnapshot.from_neo4j(store)
+
+
+_shared_service: Optional[KPIService] = None
+_shared_lock = threading.Lock()
+
+
+def shared_kpi_service() -> KPIService:
+    """
+    Process-wide KPIService backed by Neo4j (used by the KPI endpoint and Neo4jLoader)
+
+    Refresh interval: $KPI_REFRESH_SECONDS (default 300)
+    """
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = KPIService(
+                loader=_load_snapshot_from_neo4j,
+                refresh_interval=float(os.getenv("KPI_REFRESH_SECONDS", "300")),
+            )
+        return _shared_service
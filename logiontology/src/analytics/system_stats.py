@@ -0,0 +1,200 @@
+"""
+HVDC System Stats v1.0
+Single-pass entity/activity statistics for message graphs (ABU, Lightning)
+"""
+
+from __future__ import annotations
+import json
+import logging
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+from rdflib import Namespace
+from rdflib.namespace import RDF
+
+from ..rdfio.graph_cache import load_cached_graph
+from ..rdfio.snapshot import file_digest
+
+logger = logging.getLogger(__name__)
+
+# stats key → rdf:type local name
+ENTITY_CLASSES = {
+    "vessels": "Vessel",
+    "persons": "Person",
+    "locations": "Location",
+    "operations": "Operation",
+    "messages": "Message",
+    "images": "Image",
+}
+
+# stats key → precomputed stats JSON key (as read by compare_abu_lightning)
+COUNT_KEYS = {
+    "vessels": "vessel_count",
+    "persons": "person_count",
+    "locations": "location_count",
+    "operations": "operation_count",
+    "messages": "message_count",
+    "images": "image_count",
+}
+
+TOP_N = 10
+
+
+def collect_system_stats(graph, ns: Union[str, Namespace]) -> Dict:
+    """
+    Entity counts and activity rankings from one pass over the relevant triples
+
+    Each tracked predicate's triples are streamed once through the predicate
+    index and folded into counters, instead of value()/objects()/subjects()
+    lookups per entity: rdf:type counts, operationType distribution, vessels
+    per person (worksWithVessel), subjects per vessel (mentionsVessel) and
+    subjects per location (mentionsLocation), keyed by the entity's name literal.
+
+    Args:
+        graph: rdflib Graph or EncodedTripleStore
+        ns: System namespace (e.g. ABU or LIGHTNING)
+
+    Returns:
+        dict: total_triples, vessels … images, operation_types, top_persons,
+            top_vessels, top_locations
+    """
+    ns = Namespace(str(ns))
+    # dicts keep rdflib's subject order, so most_common() breaks ties the same way
+    members = {
+        key: dict.fromkeys(graph.subjects(RDF.type, ns[local]))
+        for key, local in ENTITY_CLASSES.items()
+    }
+    first_value = {}
+    for predicate in (ns.operationType, ns.personName, ns.vesselName, ns.locationName):
+        values = first_value[predicate] = {}
+        for s, _, o in graph.triples((None, predicate, None)):
+            values.setdefault(s, o)
+    works_with = Counter(s for s, _, _ in graph.triples((None, ns.worksWithVessel, None)))
+    vessel_mentions = Counter(o for _, _, o in graph.triples((None, ns.mentionsVessel, None)))
+    location_mentions = Counter(
+        o for _, _, o in graph.triples((None, ns.mentionsLocation, None))
+    )
+
+    stats = {"total_triples": len(graph)}
+    for key in ENTITY_CLASSES:
+        stats[key] = len(members[key])
+
+    operation_types = Counter()
+    op_types = first_value[ns.operationType]
+    for op in members["operations"]:
+        op_type = op_types.get(op)
+        if op_type:
+            operation_types[str(op_type)] += 1
+    stats["operation_types"] = dict(operation_types.most_common(TOP_N))
+
+    def ranking(entities, names, counts) -> Dict[str, int]:
+        activity = Counter()
+        for entity in entities:
+            name = names.get(entity)
+            if name:
+                activity[str(name)] = counts[entity]
+        return dict(activity.most_common(TOP_N))
+
+    stats["top_persons"] = ranking(members["persons"], first_value[ns.personName], works_with)
+    stats["top_vessels"] = ranking(members["vessels"], first_value[ns.vesselName], vessel_mentions)
+    stats["top_locations"] = ranking(
+        members["locations"], first_value[ns.locationName], location_mentions
+    )
+    return stats
+
+
+def stats_to_precomputed(stats: Dict, system_name: str, source: Optional[Path] = None,
+                         source_sha256: Optional[str] = None) -> Dict:
+    """Stats dict → precomputed stats JSON layout (*_count keys plus rankings)"""
+    data = {
+        "system": system_name,
+        "total_triples": stats["total_triples"],
+    }
+    for key, json_key in COUNT_KEYS.items():
+        data[json_key] = stats[key]
+    for key in ("operation_types", "top_persons", "top_vessels", "top_locations"):
+        data[key] = stats[key]
+    if source is not None:
+        data["source_ttl"] = str(source)
+    if source_sha256 is not None:
+        data["source_sha256"] = source_sha256
+    data["generated_at"] = datetime.now().isoformat()
+    return data
+
+
+def _stats_for_ttl(ttl_path: str, ns: str) -> Dict:
+    """Worker: load one TTL (snapshot-backed) and collect its stats"""
+    return collect_system_stats(load_cached_graph(ttl_path), ns)
+
+
+def compute_system_stats(
+    sources: Mapping[str, Tuple[Union[str, Path], Union[str, Namespace]]],
+    cache_dir: Union[str, Path],
+    parallel: bool = True,
+    force: bool = False,
+) -> Dict[str, Path]:
+    """
+    Collect stats for several systems and cache them as precomputed stats JSON
+
+    A system's <cache_dir>/<name>_stats.json is reused while its source_sha256
+    matches the TTL; stale or missing systems are recomputed, one process each.
+
+    Args:
+        sources: {system name: (ttl path, namespace)}
+        cache_dir: Directory for <name>_stats.json files
+        parallel: Run stale systems in separate processes
+        force: Ignore cached files
+
+    Returns:
+        dict: {system name: stats JSON path}
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    paths: Dict[str, Path] = {}
+    stale: Dict[str, Tuple[Path, str, str]] = {}
+    for name, (ttl_path, ns) in sources.items():
+        ttl_path = Path(ttl_path)
+        digest = file_digest(ttl_path)
+        out = cache_dir / f"{name.lower()}_stats.json"
+        paths[name] = out
+        if not force and out.exists():
+            try:
+                with open(out, "r", encoding="utf-8") as f:
+                    if json.load(f).get("source_sha256") == digest:
+                        logger.info(f"{name} stats up to date: {out}")
+                        continue
+            except (OSError, ValueError):
+                pass
+        stale[name] = (ttl_path, str(ns), digest)
+
+    if not stale:
+        return paths
+
+    if parallel and len(stale) > 1:
+        workers = min(len(stale), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                name: executor.submit(_stats_for_ttl, str(ttl_path), ns)
+                for name, (ttl_path, ns, _) in stale.items()
+            }
+            results = {name: future.result() for name, future in futures.items()}
+    else:
+        results = {
+            name: _stats_for_ttl(str(ttl_path), ns) for name, (ttl_path, ns, _) in stale.items()
+        }
+
+    for name, stats in results.items():
+        ttl_path, _, digest = stale[name]
+        data = stats_to_precomputed(stats, name, ttl_path, digest)
+        tmp = paths[name].with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, paths[name])
+        logger.info(f"{name} stats written: {paths[name]}")
+
+    return paths
@@ -5,13 +5,25 @@ from pydantic import BaseModel
 from typing import List, Optional
 import logging
 
-from src.analytics.kpi_calculator import FlowKPICalculator, FlowKPIs
-from src.core.flow_models import LogisticsFlow
+from src.analytics.kpi_calculator import FlowKPIs
+from src.analytics.kpi_snapshot import shared_kpi_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+FLOW_CODE_LABELS = {
+    0: "Pre-Arrival",
+    1: "Direct",
+    2: "WH Once",
+    3: "WH + MOSB",
+    4: "WH Double + MOSB",
+}
+
+
+# Shared KPI cache; Neo4jLoader folds the flows of each loaded file into it.
+kpi_service = shared_kpi_service()
+
 
 class KPIResponse(BaseModel):
     """KPI response model."""
@@ -31,12 +43,7 @@ async def get_kpis():
         KPI dashboard data
     """
     try:
-        # TODO: Load flows from Neo4j
-        # For now, return sample data
-        flows: List[LogisticsFlow] = []
-
-        calc = FlowKPICalculator()
-        kpis: FlowKPIs = calc.calculate(flows)
+        kpis: FlowKPIs = kpi_service.get_kpis()
 
         # Convert to response format
         return KPIResponse(
@@ -45,11 +52,8 @@ async def get_kpis():
             mosb_pass_rate=kpis.mosb_pass_rate,
             avg_wh_hops=kpis.avg_wh_hops,
             flow_distribution=[
-                {"code": 0, "count": kpis.pre_arrival_count},
-                {"code": 1, "count": kpis.direct_delivery_count},
-                {"code": 2, "count": kpis.wh_once_count},
-                {"code": 3, "count": kpis.wh_mosb_count},
-                {"code": 4, "count": kpis.wh_wh_mosb_count},
+                {"code": code, "count": kpis.flow_distribution.get(code, 0)}
+                for code in FLOW_CODE_LABELS
             ]
         )
 
@@ -61,15 +65,26 @@ async def get_kpis():
 @router.get("/flow-distribution")
 async def get_flow_distribution():
     """Get flow code distribution."""
-    # TODO: Query Neo4j for actual distribution
+    kpis = kpi_service.get_kpis()
     return {
         "distribution": [
-            {"flow_code": 0, "count": 0, "label": "Pre-Arrival"},
-            {"flow_code": 1, "count": 0, "label": "Direct"},
-            {"flow_code": 2, "count": 0, "label": "WH Once"},
-            {"flow_code": 3, "count": 0, "label": "WH + MOSB"},
-            {"flow_code": 4, "count": 0, "label": "WH Double + MOSB"},
+            {"flow_code": code, "count": kpis.flow_distribution.get(code, 0), "label": label}
+            for code, label in FLOW_CODE_LABELS.items()
         ]
     }
 
 
+@router.get("/by-mode")
+async def get_kpis_by_mode():
+    """Get KPI metrics grouped by transport mode."""
+    snapshot = kpi_service.get_snapshot()
+    return {mode: kpis.to_dict() for mode, kpis in snapshot.by_mode().items()}
+
+
+@router.post("/refresh")
+async def refresh_kpis():
+    """Reload the KPI snapshot from Neo4j immediately."""
+    snapshot = kpi_service.refresh()
+    return {"total_flows": snapshot.total_flows}
+
+
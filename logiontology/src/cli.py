@@ -94,5 +94,26 @@ def batch_ingest(
     typer.echo(f"✓ Processed {len(results)} files")
 
 
+@app.command()
+def materialize(
+    ttl_file: str = typer.Argument(..., help="Data TTL file"),
+    out: str = typer.Option("output/materialized.ttl", help="Output TTL file path"),
+    profile: str = typer.Option("owlrl", help="rdfs or owlrl"),
+):
+    """Materialize ontology inferences (subclass/subproperty/domain/range/...) into a TTL file."""
+    from rdflib import Graph
+    from src.reasoning.engine import Materializer
+
+    graph = Graph()
+    graph.parse(ttl_file, format="turtle")
+    materializer = Materializer(graph, profile=profile)
+    fired = materializer.run()
+    Path(out).parent.mkdir(parents=True, exist_ok=True)
+    graph.serialize(destination=out, format="turtle")
+    typer.echo(f"✓ Materialized {sum(fired.values())} triples in {materializer.seconds:.2f}s → {out}")
+    for rule, count in sorted(fired.items()):
+        typer.echo(f"  {rule}: {count}")
+
+
 if __name__ == "__main__":
     app()
@@ -3,10 +3,13 @@ HVDC Flow Code Models v1.0
 Flow Code (0-4) classification system with mode-specific attributes
 """
 
+from dataclasses import dataclass, field
 from enum import IntEnum
-from typing import Literal
+from typing import Iterator, List, Literal
+from annotated_types import Ge, Gt, Le, Lt
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 import numpy as np
+import pandas as pd
 
 
 class FlowCode(IntEnum):
@@ -192,3 +195,292 @@ def get_flow_description(flow_code: FlowCode) -> str:
     """Get human-readable description for a flow code"""
     return FLOW_CODE_DESCRIPTIONS.get(flow_code, f"Unknown FlowCode: {flow_code}")
 
+
+# ==================================================
+# Bulk path for internal pipelines
+# Pydantic models stay the API boundary; these validate and hold flows in bulk.
+# ==================================================
+
+MODE_MODELS: dict[str, type[LogisticsFlow]] = {
+    "container": ContainerFlow,
+    "bulk": BulkFlow,
+    "land": LandFlow,
+    "lct": LCTFlow,
+}
+
+# Index of each mode in FLOW_RECORD_DTYPE["transport_mode"]
+TRANSPORT_MODES: tuple[str, ...] = tuple(MODE_MODELS)
+
+# Packed flow record: 10 bytes per flow instead of a pydantic instance.
+# "row" is the row of BulkFlowValidation.frame, so frame["flow_id"][row] traces a record back.
+FLOW_RECORD_DTYPE = np.dtype(
+    [
+        ("row", np.int32),
+        ("flow_code", np.int8),
+        ("wh_handling", np.int16),
+        ("offshore_flag", np.bool_),
+        ("is_pre_arrival", np.bool_),
+        ("transport_mode", np.int8),
+    ]
+)
+
+
+# Columns shared by every mode (everything else is mode-specific)
+_BASE_COLUMNS = (
+    "flow_id",
+    "flow_code",
+    "wh_handling",
+    "offshore_flag",
+    "is_pre_arrival",
+    "transport_mode",
+    "flow_description",
+)
+
+
+class FlowRecord:
+    """Compact flow record for internal pipelines (no per-instance validation)"""
+    __slots__ = (
+        "flow_id",
+        "flow_code",
+        "wh_handling",
+        "offshore_flag",
+        "is_pre_arrival",
+        "transport_mode",
+        "extra",
+    )
+
+    def __init__(
+        self,
+        flow_id: str,
+        flow_code: int,
+        wh_handling: int,
+        offshore_flag: bool,
+        is_pre_arrival: bool,
+        transport_mode: str,
+        extra: dict | None = None,
+    ):
+        self.flow_id = flow_id
+        self.flow_code = flow_code
+        self.wh_handling = wh_handling
+        self.offshore_flag = offshore_flag
+        self.is_pre_arrival = is_pre_arrival
+        self.transport_mode = transport_mode
+        self.extra = extra
+
+    def __repr__(self) -> str:
+        return (
+            f"FlowRecord({self.flow_id!r}, code={self.flow_code}, wh={self.wh_handling}, "
+            f"offshore={self.offshore_flag}, mode={self.transport_mode!r})"
+        )
+
+    def to_model(self) -> LogisticsFlow:
+        """Build the pydantic model for this record (for API boundaries)"""
+        model = MODE_MODELS.get(self.transport_mode, LogisticsFlow)
+        return model(
+            flow_id=self.flow_id,
+            flow_code=self.flow_code,
+            wh_handling=self.wh_handling,
+            offshore_flag=self.offshore_flag,
+            is_pre_arrival=self.is_pre_arrival,
+            transport_mode=self.transport_mode,
+            **(self.extra or {}),
+        )
+
+    @classmethod
+    def from_model(cls, flow: LogisticsFlow) -> "FlowRecord":
+        """Build a record from a pydantic flow"""
+        extra = {
+            name: value
+            for name, value in flow.model_dump(exclude=set(_BASE_COLUMNS)).items()
+            if value is not None
+        }
+        return cls(
+            flow_id=flow.flow_id,
+            flow_code=int(flow.flow_code),
+            wh_handling=flow.wh_handling,
+            offshore_flag=flow.offshore_flag,
+            is_pre_arrival=flow.is_pre_arrival,
+            transport_mode=flow.transport_mode,
+            extra=extra or None,
+        )
+
+
+@dataclass
+class BulkFlowValidation:
+    """Result of validate_flows_bulk"""
+    frame: pd.DataFrame  # Normalized flows (flow_code clipped to 0-4)
+    valid: np.ndarray  # Boolean mask per row
+    errors: List[dict] = field(default_factory=list)  # {"row", "field", "error"}
+
+    @property
+    def valid_count(self) -> int:
+        return int(self.valid.sum())
+
+    def to_struct_array(self) -> np.ndarray:
+        """Valid rows packed as FLOW_RECORD_DTYPE"""
+        df = self.frame[self.valid]
+        out = np.empty(len(df), dtype=FLOW_RECORD_DTYPE)
+        out["row"] = df.index.to_numpy()
+        out["flow_code"] = df["flow_code"].to_numpy()
+        out["wh_handling"] = df["wh_handling"].to_numpy()
+        out["offshore_flag"] = df["offshore_flag"].to_numpy()
+        out["is_pre_arrival"] = df["is_pre_arrival"].to_numpy()
+        out["transport_mode"] = pd.Categorical(
+            df["transport_mode"], categories=TRANSPORT_MODES
+        ).codes
+        return out
+
+    def records(self) -> Iterator[FlowRecord]:
+        """Valid rows as FlowRecord instances"""
+        df = self.frame[self.valid]
+        extra_cols = [c for c in df.columns if c not in _BASE_COLUMNS]
+        for row in df.itertuples(index=False):
+            values = row._asdict()
+            extra = {c: values[c] for c in extra_cols if not pd.isna(values[c])}
+            yield FlowRecord(
+                flow_id=values["flow_id"],
+                flow_code=int(values["flow_code"]),
+                wh_handling=int(values["wh_handling"]),
+                offshore_flag=bool(values["offshore_flag"]),
+                is_pre_arrival=bool(values["is_pre_arrival"]),
+                transport_mode=values["transport_mode"],
+                extra=extra or None,
+            )
+
+
+def _field_checks(model: type[LogisticsFlow]) -> dict[str, tuple[bool, list]]:
+    """Mode-specific field → (is_int, annotated_types constraints) from Field metadata"""
+    checks = {}
+    for name, info in model.model_fields.items():
+        if name in _BASE_COLUMNS:
+            continue
+        is_int = int in getattr(info.annotation, "__args__", (info.annotation,))
+        checks[name] = (is_int, list(info.metadata))
+    return checks
+
+
+_MODE_FIELD_CHECKS = {mode: _field_checks(model) for mode, model in MODE_MODELS.items()}
+
+
+def _constraint_mask(values: pd.Series, constraint) -> pd.Series:
+    """Rows of values violating a Ge/Gt/Le/Lt constraint"""
+    if isinstance(constraint, Ge):
+        return values < constraint.ge
+    if isinstance(constraint, Gt):
+        return values <= constraint.gt
+    if isinstance(constraint, Le):
+        return values > constraint.le
+    if isinstance(constraint, Lt):
+        return values >= constraint.lt
+    return pd.Series(False, index=values.index)
+
+
+# String inputs accepted for bool fields (pydantic lax mode, case-insensitive)
+_BOOL_STRINGS = {
+    "0": False, "off": False, "f": False, "false": False, "n": False, "no": False,
+    "1": True, "on": True, "t": True, "true": True, "y": True, "yes": True,
+}
+
+
+def _coerce_bool(value):
+    """Pydantic bool coercion of one value (None when pydantic would reject it)"""
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, str):
+        return _BOOL_STRINGS.get(value.lower())
+    if isinstance(value, (int, float, np.integer, np.floating)) and value in (0, 1):
+        return bool(value)
+    return None
+
+
+def _bool_column(values: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Coerce a column with pydantic bool rules → (bool values, invalid mask)"""
+    if values.dtype == bool:
+        return values.to_numpy(), np.zeros(len(values), dtype=bool)
+    # Coerce each distinct value once
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    coerced = [_coerce_bool(v) for v in uniques]
+    known = np.array([c is not None for c in coerced] + [True], dtype=bool)
+    flags = np.array([bool(c) for c in coerced] + [False], dtype=bool)
+    return flags[codes], ~known[codes]
+
+
+def validate_flows_bulk(data) -> BulkFlowValidation:
+    """
+    Validate many flows at once with column-wise checks
+
+    Applies the same rules as the pydantic models: flow_code is clipped to 0-4,
+    wh_handling >= 0, offshore_flag/is_pre_arrival accept pydantic's bool inputs
+    ("false", "yes", 0, 1, ...), and mode-specific fields use the ranges declared on
+    ContainerFlow/BulkFlow/LandFlow/LCTFlow. Mode-specific fields set on a row of
+    another mode are rejected like extra="forbid".
+
+    Args:
+        data: DataFrame or dict of equal-length arrays
+
+    Returns:
+        BulkFlowValidation with normalized frame, valid mask and row-indexed errors
+    """
+    df = pd.DataFrame(data).reset_index(drop=True)
+    n = len(df)
+    invalid = np.zeros(n, dtype=bool)
+    errors: List[dict] = []
+
+    def reject(mask, field_name: str, message: str) -> None:
+        mask = np.asarray(mask, dtype=bool)
+        invalid[mask] = True
+        errors.extend(
+            {"row": int(i), "field": field_name, "error": message} for i in np.flatnonzero(mask)
+        )
+
+    required = ["flow_id", "flow_code", "wh_handling", "offshore_flag", "transport_mode"]
+    missing = [c for c in required if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing flow columns: {missing}")
+    if "is_pre_arrival" not in df.columns:
+        df["is_pre_arrival"] = False
+
+    for col in required + ["is_pre_arrival"]:
+        reject(df[col].isna(), col, "Field required")
+
+    codes = pd.to_numeric(df["flow_code"], errors="coerce")
+    reject(codes.isna() & df["flow_code"].notna(), "flow_code", "Invalid integer")
+    df["flow_code"] = codes.fillna(0).clip(0, 4).astype(np.int64)
+
+    wh = pd.to_numeric(df["wh_handling"], errors="coerce")
+    reject((wh.isna() | (wh % 1 != 0)) & df["wh_handling"].notna(), "wh_handling",
+           "Invalid integer")
+    reject(wh < 0, "wh_handling", "Input should be greater than or equal to 0")
+    df["wh_handling"] = wh.fillna(0).astype(np.int64)
+
+    for col in ("offshore_flag", "is_pre_arrival"):
+        flags, bad = _bool_column(df[col])
+        reject(bad, col, "Input should be a valid boolean")
+        df[col] = flags
+
+    modes = df["transport_mode"].astype(str)
+    reject(df["transport_mode"].notna() & ~modes.isin(TRANSPORT_MODES), "transport_mode",
+           f"Input should be one of {list(TRANSPORT_MODES)}")
+
+    specific_cols = [c for c in df.columns if c not in _BASE_COLUMNS]
+    for col in specific_cols:
+        values = pd.to_numeric(df[col], errors="coerce")
+        present = df[col].notna()
+        reject(present & values.isna(), col, "Invalid number")
+        numeric = values.notna().to_numpy()
+        allowed = np.zeros(n, dtype=bool)
+        for mode, checks in _MODE_FIELD_CHECKS.items():
+            if col not in checks:
+                continue
+            rows = (modes == mode).to_numpy() & numeric
+            allowed |= rows
+            is_int, constraints = checks[col]
+            if is_int:
+                reject(rows & (values % 1 != 0).to_numpy(), col, "Invalid integer")
+            for constraint in constraints:
+                reject(rows & _constraint_mask(values, constraint).to_numpy(), col,
+                       f"Constraint violated: {constraint!r}")
+        reject(numeric & ~allowed, col, "Extra inputs are not permitted")
+
+    errors.sort(key=lambda e: e["row"])
+    return BulkFlowValidation(frame=df, valid=~invalid, errors=errors)
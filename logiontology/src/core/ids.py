@@ -1,10 +1,72 @@
 from __future__ import annotations
+from functools import lru_cache
+from hashlib import sha1
 from uuid import uuid5, NAMESPACE_DNS, UUID
-from typing import Any
+from typing import Any, Dict, Iterable, List, Sequence
 
 # Stable project-level namespace derived once from a constant label.
 PROJECT_NAMESPACE: UUID = uuid5(NAMESPACE_DNS, "logiontology.namespace")
 
+# Namespace of the mapping / clustering IRIs (uuid5_from).
+NIL_NAMESPACE: UUID = UUID(int=0)
+
+
+class IdMinter:
+    """UUIDv5 minting under one namespace with a bounded LRU memo.
+
+    Key parts are joined with ``sep`` (None → ""), so ``mint("BL1", None)``
+    hashes ``"BL1::"``. Repeated keys (same vendor, BL, container across
+    rows) are hashed once while they stay in the memo.
+
+    Example:
+        MAPPING_IDS.mint("HVDC-ADOPT-001", "CASE-1")
+        MAPPING_IDS.mint_many([("BL1", "C1"), ("BL1", "C1"), ("BL2", "C7")])
+    """
+
+    def __init__(self, namespace: UUID, sep: str = "::", maxsize: int = 65536):
+        self.namespace = namespace
+        self.sep = sep
+        self.maxsize = maxsize
+        self._namespace_bytes = namespace.bytes
+        self.mint_name = lru_cache(maxsize=maxsize)(self._mint_name)
+
+    def _mint_name(self, name: str) -> str:
+        # str(uuid5(namespace, name)) without the intermediate UUID object
+        digest = sha1(self._namespace_bytes + name.encode("utf-8"), usedforsecurity=False).digest()
+        h = bytearray(digest[:16])
+        h[6] = (h[6] & 0x0F) | 0x50
+        h[8] = (h[8] & 0x3F) | 0x80
+        x = h.hex()
+        return f"{x[:8]}-{x[8:12]}-{x[12:16]}-{x[16:20]}-{x[20:]}"
+
+    def name(self, parts: Sequence[Any]) -> str:
+        """Hashed name of a key tuple."""
+        return self.sep.join(["" if p is None else str(p) for p in parts])
+
+    def mint(self, *parts: Any) -> str:
+        """Deterministic id of one key."""
+        return self.mint_name(self.name(parts))
+
+    def mint_many(self, keys: Iterable[Sequence[Any]]) -> List[str]:
+        """Deterministic ids of many keys, hashing each distinct key once."""
+        names = [self.name(key) for key in keys]
+        ids: Dict[str, str] = {}
+        for name in names:
+            if name not in ids:
+                ids[name] = self.mint_name(name)
+        return [ids[name] for name in names]
+
+    def cache_info(self):
+        return self.mint_name.cache_info()
+
+    def cache_clear(self) -> None:
+        self.mint_name.cache_clear()
+
+
+PROJECT_IDS = IdMinter(PROJECT_NAMESPACE, sep="|")
+MAPPING_IDS = IdMinter(NIL_NAMESPACE, sep="::")
+
+
 def deterministic_id(kind: str, *parts: Any, **attrs: Any) -> str:
     """Deterministic UUIDv5 from kind + parts + sorted key=value attrs.
 
@@ -15,4 +77,4 @@ def deterministic_id(kind: str, *parts: Any, **attrs: Any) -> str:
     for k in sorted(attrs.keys()):
         seq.append(f"{k}={attrs[k]}")
     key = "|".join(seq)
-    return str(uuid5(PROJECT_NAMESPACE, key))
+    return PROJECT_IDS.mint_name(key)
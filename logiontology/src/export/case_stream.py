@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+HVDC Case Record Streaming Exporter
+Case 단위 레코드를 JSON Lines / JSON 배열로 점진적으로 기록 (orjson 사용 가능 시 고속 인코딩)
+"""
+
+from __future__ import annotations
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from rdflib import Graph, Literal, Namespace, RDF
+
+from .view_engine import case_local_id
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+HVDC = Namespace("http://samsung.com/project-logistics#")
+
+# record key → (predicate, converter)
+CASE_FIELDS = [
+    ("hvdc_code", HVDC.hasHvdcCode, str),
+    ("flow_code", HVDC.hasFlowCode, str),
+    ("flow_code_original", HVDC.hasFlowCodeOriginal, int),
+    ("flow_override_reason", HVDC.hasFlowOverrideReason, str),
+    ("flow_description", HVDC.hasFlowDescription, str),
+    ("final_location", HVDC.hasFinalLocation, str),
+    ("vendor", HVDC.hasVendor, str),
+    ("gross_weight", HVDC.hasGrossWeight, float),
+    ("net_weight", HVDC.hasNetWeight, float),
+    ("cbm", HVDC.hasCBM, float),
+]
+
+
+def dumps(obj) -> bytes:
+    """Encode one JSON value as UTF-8 bytes (orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _convert(term, converter):
+    if term is None:
+        return None
+    value = term.toPython() if isinstance(term, Literal) else term
+    try:
+        return converter(value)
+    except (TypeError, ValueError):
+        return str(term)
+
+
+def _case_events(graph: Graph, case, predicate) -> List[Dict]:
+    """Events linked to a case, each complete (date/location/quantity), sorted by date"""
+    events = []
+    for event in graph.objects(case, predicate):
+        date = graph.value(event, HVDC.hasEventDate)
+        location = graph.value(event, HVDC.hasLocationAtEvent)
+        qty = graph.value(event, HVDC.hasQuantity)
+        if date is None or location is None or qty is None:
+            continue
+        events.append({
+            "date": str(date),
+            "location": str(location),
+            "quantity": _convert(qty, float),
+        })
+    events.sort(key=lambda e: (e["date"], e["location"]))
+    return events
+
+
+def case_subjects(graph: Graph) -> List:
+    """Case subjects in IRI order"""
+    return sorted(graph.subjects(RDF.type, HVDC.Case), key=str)
+
+
+def iter_case_records(graph: Graph, cases: Optional[List] = None) -> Iterator[Dict]:
+    """
+    Case당 하나의 평탄화 레코드 생성 (이벤트는 케이스별로 묶어 행 폭증 없음)
+
+    `inbound`/`outbound`는 가장 이른 이벤트(기존 평탄화 형식), 전체 이벤트는
+    `inbound_events`/`outbound_events` 리스트에 담습니다.
+
+    Args:
+        graph: Case/Event 그래프
+        cases: 순회할 Case 목록 (None = case_subjects(graph))
+
+    Yields:
+        dict: Case 레코드
+    """
+    for case in cases if cases is not None else case_subjects(graph):
+        record = {"case_id": case_local_id(case)}
+        for key, predicate, converter in CASE_FIELDS:
+            record[key] = _convert(graph.value(case, predicate), converter)
+
+        inbound = _case_events(graph, case, HVDC.hasInboundEvent)
+        outbound = _case_events(graph, case, HVDC.hasOutboundEvent)
+        record["inbound"] = inbound[0] if inbound else None
+        record["outbound"] = outbound[0] if outbound else None
+        record["inbound_events"] = inbound
+        record["outbound_events"] = outbound
+        yield record
+
+
+def write_jsonl(records: Iterable[Dict], output_path: Union[str, Path]) -> int:
+    """
+    레코드를 JSON Lines로 스트리밍 기록
+
+    Returns:
+        int: 기록된 레코드 수
+    """
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(path, "wb") as f:
+        for record in records:
+            f.write(dumps(record))
+            f.write(b"\n")
+            count += 1
+    return count
+
+
+def write_json(
+    records: Iterable[Dict], output_path: Union[str, Path], metadata: Optional[Dict] = None
+) -> int:
+    """
+    레코드를 {"metadata": ..., "cases": [...]} 문서로 스트리밍 기록
+
+    배열 원소를 한 줄에 하나씩 기록하므로 전체 문서를 메모리에 올리지 않습니다.
+
+    Returns:
+        int: 기록된 레코드 수
+    """
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(path, "wb") as f:
+        f.write(b'{"metadata": ')
+        f.write(dumps(metadata or {}))
+        f.write(b',\n "cases": [')
+        for record in records:
+            f.write(b",\n  " if count else b"\n  ")
+            f.write(dumps(record))
+            count += 1
+        f.write(b"\n ]\n}\n" if count else b"]\n}\n")
+    return count
+
+
+def export_cases(
+    graph: Graph,
+    output_path: Union[str, Path],
+    metadata: Optional[Dict] = None,
+    fmt: Optional[str] = None,
+) -> Dict:
+    """
+    Case 레코드를 스트리밍 내보내기
+
+    Args:
+        graph: Case/Event 그래프
+        output_path: 출력 경로
+        metadata: JSON 문서 메타데이터 (total_cases는 자동 추가)
+        fmt: "json" 또는 "jsonl" (None = 확장자로 판단)
+
+    Returns:
+        dict: {"total_cases": int, "output_file": str}
+    """
+    fmt = fmt or ("jsonl" if str(output_path).endswith(".jsonl") else "json")
+    if fmt not in ("json", "jsonl"):
+        raise ValueError(f"Unsupported format: {fmt}")
+
+    cases = case_subjects(graph)
+    records = iter_case_records(graph, cases)
+    if fmt == "jsonl":
+        count = write_jsonl(records, output_path)
+    else:
+        meta = {**(metadata or {}), "total_cases": len(cases)}
+        count = write_json(records, output_path, meta)
+
+    logger.info(f"Exported {count} cases ({fmt}) to {output_path}")
+    return {"total_cases": count, "output_file": str(output_path)}
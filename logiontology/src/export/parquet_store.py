@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+HVDC Case/Event Parquet Store
+Case/Event 그래프를 Parquet 테이블(cases, events, overrides)로 내보내고 rdflib 없이 다시 로드
+"""
+
+from __future__ import annotations
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import pandas as pd
+from rdflib import Graph
+
+from .view_engine import CaseEventTables, finalize_tables, scan_case_events
+
+logger = logging.getLogger(__name__)
+
+# table name → file name inside the store directory
+TABLE_FILES = {
+    "cases": "cases.parquet",
+    "events": "events.parquet",
+    "overrides": "overrides.parquet",
+}
+
+OVERRIDE_COLUMNS = ["case_id", "hvdc_code", "flow_code_original", "flow_code", "flow_override_reason"]
+
+
+def _require_pyarrow() -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required for Parquet export. Install with: pip install 'logiontology[columnar]'"
+        ) from e
+
+
+def is_parquet_store(path: Union[str, Path]) -> bool:
+    """True if path is a directory written by write_case_parquet"""
+    path = Path(path)
+    return path.is_dir() and (path / TABLE_FILES["cases"]).exists()
+
+
+def overrides_table(tables: CaseEventTables) -> pd.DataFrame:
+    """Cases whose FLOW code was overridden (original → final, with reason)"""
+    cases = tables.cases
+    return cases.loc[cases["flow_override_reason"].notna(), OVERRIDE_COLUMNS].reset_index(drop=True)
+
+
+def write_case_parquet(
+    source: Union[str, Path, Graph, CaseEventTables],
+    output_dir: Union[str, Path],
+    row_group_size: Optional[int] = None,
+) -> Dict[str, str]:
+    """
+    Case/Event 데이터를 Parquet 테이블로 저장
+
+    문자열 속성은 categorical로 저장되어 Parquet dictionary 인코딩이 적용됩니다.
+
+    Args:
+        source: TTL 경로, rdflib Graph, 또는 CaseEventTables
+        output_dir: 출력 디렉토리 (cases/events/overrides.parquet 생성)
+        row_group_size: Parquet row group 크기 (None = pyarrow 기본값)
+
+    Returns:
+        dict: {table_name: file_path}
+    """
+    _require_pyarrow()
+
+    if isinstance(source, CaseEventTables):
+        tables = source
+    else:
+        graph = source
+        if not isinstance(graph, Graph):
+            graph = Graph()
+            graph.parse(str(source), format="turtle")
+        tables = scan_case_events(graph)
+
+    output_dir_obj = Path(output_dir)
+    output_dir_obj.mkdir(parents=True, exist_ok=True)
+
+    frames = {
+        "cases": tables.cases,
+        "events": tables.events,
+        "overrides": overrides_table(tables),
+    }
+    paths = {}
+    for name, frame in frames.items():
+        path = output_dir_obj / TABLE_FILES[name]
+        frame.to_parquet(path, index=False, row_group_size=row_group_size)
+        paths[name] = str(path)
+        logger.info(f"    {name}: {len(frame)} rows -> {path}")
+    return paths
+
+
+def load_case_tables(store_dir: Union[str, Path]) -> CaseEventTables:
+    """
+    Parquet 저장소에서 Case/Event 테이블 로드 (TTL 재파싱 없음)
+
+    Args:
+        store_dir: write_case_parquet 출력 디렉토리
+
+    Returns:
+        CaseEventTables
+    """
+    _require_pyarrow()
+    store = Path(store_dir)
+    cases = pd.read_parquet(store / TABLE_FILES["cases"])
+    events = pd.read_parquet(store / TABLE_FILES["events"])
+    return finalize_tables(cases, events)
+
+
+def load_overrides(store_dir: Union[str, Path]) -> pd.DataFrame:
+    """FLOW override 테이블 로드"""
+    _require_pyarrow()
+    return pd.read_parquet(Path(store_dir) / TABLE_FILES["overrides"])
+
+
+def load_tables(source: Union[str, Path, Graph]) -> CaseEventTables:
+    """
+    Case/Event 테이블 로드 — Parquet 저장소면 직접 읽고, 아니면 TTL을 파싱
+
+    Args:
+        source: Parquet 저장소 디렉토리, TTL 파일 경로, 또는 rdflib Graph
+
+    Returns:
+        CaseEventTables
+    """
+    if isinstance(source, Graph):
+        return scan_case_events(source)
+    if is_parquet_store(source):
+        return load_case_tables(source)
+    graph = Graph()
+    graph.parse(str(source), format="turtle")
+    return scan_case_events(graph)
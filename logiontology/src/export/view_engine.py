@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+HVDC Precomputed View Engine
+TTL Case/Event 그래프를 한 번만 순회하여 정수 코드 테이블을 만들고 모든 뷰를 집계
+"""
+
+from __future__ import annotations
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Union
+
+import numpy as np
+import pandas as pd
+from rdflib import Graph, Literal, Namespace, RDF
+
+logger = logging.getLogger(__name__)
+
+HVDC = Namespace("http://samsung.com/project-logistics#")
+
+# Case-level predicate → column
+CASE_PREDICATES = {
+    HVDC.hasHvdcCode: "hvdc_code",
+    HVDC.hasFlowCode: "flow_code",
+    HVDC.hasFlowCodeOriginal: "flow_code_original",
+    HVDC.hasFlowOverrideReason: "flow_override_reason",
+    HVDC.hasFlowDescription: "flow_description",
+    HVDC.hasFinalLocation: "final_location",
+    HVDC.hasVendor: "vendor",
+    HVDC.hasGrossWeight: "gross_weight",
+    HVDC.hasNetWeight: "net_weight",
+    HVDC.hasCBM: "cbm",
+}
+
+# Event-level predicate → column
+EVENT_PREDICATES = {
+    HVDC.hasEventDate: "event_date",
+    HVDC.hasLocationAtEvent: "location",
+    HVDC.hasQuantity: "quantity",
+}
+
+EVENT_LINKS = {
+    HVDC.hasInboundEvent: "inbound",
+    HVDC.hasOutboundEvent: "outbound",
+}
+
+# Columns stored dictionary-encoded (pandas Categorical → Parquet dictionary)
+CATEGORY_COLUMNS = ["vendor", "flow_code", "final_location", "flow_override_reason", "location"]
+FLOAT_COLUMNS = ["gross_weight", "net_weight", "cbm", "quantity"]
+
+CASE_COLUMNS = ["case_id"] + list(CASE_PREDICATES.values())
+EVENT_COLUMNS = ["case_id", "direction"] + list(EVENT_PREDICATES.values())
+
+
+def case_local_id(case) -> str:
+    """Case IRI → local id (e.g. Case_00001)"""
+    text = str(case)
+    return text.split("#")[-1].split("/")[-1]
+
+
+@dataclass
+class CaseEventTables:
+    """Columnar Case/Event tables (string columns are integer-coded categoricals)"""
+    cases: pd.DataFrame
+    events: pd.DataFrame
+
+    @property
+    def case_codes(self) -> np.ndarray:
+        """Integer case code per event (index into cases.case_id categories)"""
+        return self.events["case_id"].cat.codes.to_numpy()
+
+
+def _empty_frame(columns) -> pd.DataFrame:
+    return pd.DataFrame({c: pd.Series(dtype=object) for c in columns})
+
+
+def finalize_tables(cases: pd.DataFrame, events: pd.DataFrame) -> CaseEventTables:
+    """
+    Apply the shared dtypes to raw case/event frames
+
+    case_id is a categorical over the sorted case ids in both tables, so the
+    integer codes line up; string attributes become categoricals, numerics floats,
+    and event_date a datetime64 column.
+    """
+    cases = cases.reindex(columns=CASE_COLUMNS)
+    events = events.reindex(columns=EVENT_COLUMNS)
+
+    case_ids = pd.CategoricalDtype(sorted(set(cases["case_id"].dropna())))
+    cases = cases.astype({"case_id": case_ids}).sort_values("case_id", kind="stable")
+    events = events[events["case_id"].isin(case_ids.categories)].astype({"case_id": case_ids})
+
+    for frame in (cases, events):
+        for col in CATEGORY_COLUMNS:
+            if col in frame:
+                frame[col] = frame[col].astype("category")
+        for col in FLOAT_COLUMNS:
+            if col in frame:
+                frame[col] = pd.to_numeric(frame[col], errors="coerce").astype("float64")
+
+    cases["flow_code_original"] = pd.to_numeric(
+        cases["flow_code_original"], errors="coerce"
+    ).astype("Int64")
+    for col in ("hvdc_code", "flow_description"):
+        cases[col] = cases[col].astype("string")
+    events["direction"] = events["direction"].astype(
+        pd.CategoricalDtype(list(EVENT_LINKS.values()))
+    )
+    events["event_date"] = pd.to_datetime(events["event_date"], errors="coerce")
+    events = events.sort_values(["case_id", "direction", "event_date"], kind="stable")
+
+    return CaseEventTables(cases=cases.reset_index(drop=True), events=events.reset_index(drop=True))
+
+
+def _value(term):
+    """Literal → Python value (dates kept as lexical strings for pandas)"""
+    if isinstance(term, Literal):
+        value = term.toPython()
+        return value if isinstance(value, (int, float, str)) else str(term)
+    return str(term)
+
+
+def scan_case_events(graph: Graph) -> CaseEventTables:
+    """
+    Build Case/Event tables with a single pass over the graph's triples
+
+    Args:
+        graph: Graph produced by convert_data_wh_to_ttl_with_events
+
+    Returns:
+        CaseEventTables
+    """
+    case_subjects = set()
+    case_attrs: Dict[str, Dict] = {col: {} for col in CASE_PREDICATES.values()}
+    event_attrs: Dict[str, Dict] = {col: {} for col in EVENT_PREDICATES.values()}
+    links = []  # (case, event, direction)
+
+    for s, p, o in graph:
+        if p == RDF.type:
+            if o == HVDC.Case:
+                case_subjects.add(s)
+        elif p in EVENT_LINKS:
+            links.append((s, o, EVENT_LINKS[p]))
+        elif p in CASE_PREDICATES:
+            case_attrs[CASE_PREDICATES[p]].setdefault(s, _value(o))
+        elif p in EVENT_PREDICATES:
+            event_attrs[EVENT_PREDICATES[p]].setdefault(s, _value(o))
+
+    case_list = sorted(case_subjects, key=str)
+    cases = pd.DataFrame(
+        {
+            "case_id": [case_local_id(c) for c in case_list],
+            **{col: [values.get(c) for c in case_list] for col, values in case_attrs.items()},
+        }
+    ) if case_list else _empty_frame(CASE_COLUMNS)
+
+    events = pd.DataFrame(
+        {
+            "case_id": [case_local_id(c) for c, _, _ in links],
+            "direction": [d for _, _, d in links],
+            **{col: [values.get(e) for _, e, _ in links] for col, values in event_attrs.items()},
+        }
+    ) if links else _empty_frame(EVENT_COLUMNS)
+
+    tables = finalize_tables(cases, events)
+    logger.info(f"Scanned {len(tables.cases)} cases, {len(tables.events)} events")
+    return tables
+
+
+# ============================================================================
+# Views (grouped aggregation over the integer-coded tables)
+# ============================================================================
+
+def _month(dates: pd.Series) -> pd.Series:
+    return dates.dt.strftime("%Y-%m")
+
+
+def monthly_warehouse_inbound(tables: CaseEventTables) -> pd.DataFrame:
+    """월별 창고 입고 집계 (month, warehouse)"""
+    ev = tables.events
+    ev = ev[(ev["direction"] == "inbound")].dropna(subset=["event_date", "location", "quantity"])
+    out = (
+        ev.assign(month=_month(ev["event_date"]), warehouse=ev["location"].astype(str))
+        .groupby(["month", "warehouse"], sort=True)
+        .agg(event_count=("quantity", "size"), total_quantity=("quantity", "sum"))
+        .reset_index()
+    )
+    return out
+
+
+def vendor_summary(tables: CaseEventTables) -> pd.DataFrame:
+    """Vendor별 월별 입고 (vendor, month)"""
+    ev = tables.events
+    ev = ev[ev["direction"] == "inbound"].dropna(subset=["event_date", "quantity"])
+    vendors = tables.cases["vendor"].astype(object).to_numpy()
+    ev = ev.assign(vendor=vendors[ev["case_id"].cat.codes.to_numpy()]).dropna(subset=["vendor"])
+    out = (
+        ev.assign(month=_month(ev["event_date"]))
+        .groupby(["vendor", "month"], sort=True)
+        .agg(event_count=("quantity", "size"), total_quantity=("quantity", "sum"))
+        .reset_index()
+    )
+    return out
+
+
+def flow_distribution(tables: CaseEventTables, override_counts: bool = False) -> pd.DataFrame:
+    """FLOW 코드별 케이스 분포 (override_counts=True: override 건수 컬럼 포함)"""
+    cases = tables.cases
+    flow = cases["flow_code"].astype(object).fillna("NO_FLOW").astype(str)
+    grouped = (
+        pd.DataFrame({"flow_code": flow, "override": cases["flow_override_reason"].notna()})
+        .groupby("flow_code", sort=True)
+    )
+    if override_counts:
+        out = grouped.agg(case_count=("override", "size"), override_count=("override", "sum"))
+    else:
+        out = grouped.agg(case_count=("override", "size"))
+    return out.reset_index()
+
+
+def dwell_time_by_warehouse(tables: CaseEventTables) -> pd.DataFrame:
+    """창고별 체류일수 (첫 입고 → 첫 출고)"""
+    ev = tables.events.dropna(subset=["event_date"])
+    first = (
+        ev.groupby(["case_id", "direction"], observed=True)["event_date"].min().unstack()
+    )
+    if "inbound" not in first or "outbound" not in first:
+        return pd.DataFrame(
+            columns=["warehouse", "case_count", "avg_dwell_days", "median_dwell_days",
+                     "max_dwell_days"]
+        )
+    inbound = ev[ev["direction"] == "inbound"].sort_values("event_date", kind="stable")
+    wh = inbound.drop_duplicates("case_id").set_index("case_id")["location"].astype(object)
+    dwell = (first["outbound"] - first["inbound"]).dt.days
+    df = pd.DataFrame({"warehouse": wh, "dwell_days": dwell}).dropna()
+    df = df[df["dwell_days"] >= 0]
+    out = (
+        df.groupby("warehouse", sort=True)["dwell_days"]
+        .agg(case_count="size", avg_dwell_days="mean", median_dwell_days="median",
+             max_dwell_days="max")
+        .reset_index()
+    )
+    out["case_count"] = out["case_count"].astype(int)
+    out["max_dwell_days"] = out["max_dwell_days"].astype(int)
+    return out
+
+
+# view name → (file stem, builder)
+VIEWS: Dict[str, tuple[str, Callable[..., pd.DataFrame]]] = {
+    "monthly_warehouse": ("monthly_warehouse_inbound", monthly_warehouse_inbound),
+    "vendor_summary": ("vendor_summary", vendor_summary),
+    "flow_distribution": ("cases_by_flow", flow_distribution),
+    "dwell_time": ("dwell_time_by_warehouse", dwell_time_by_warehouse),
+}
+
+
+def compute_views(
+    tables: CaseEventTables, override_counts: bool = False
+) -> Dict[str, pd.DataFrame]:
+    """Compute every registered view (override_counts: see flow_distribution)"""
+    options = {"flow_distribution": {"override_counts": override_counts}}
+    return {name: builder(tables, **options.get(name, {})) for name, (_, builder) in VIEWS.items()}
+
+
+def write_views(
+    views: Dict[str, pd.DataFrame], output_dir: Union[str, Path], parquet: bool = True
+) -> Dict[str, str]:
+    """
+    Write each view as JSON (and Parquet when pyarrow is installed)
+
+    Returns:
+        dict: {view_name: json_path}; Parquet files share the JSON file stem
+    """
+    output_dir_obj = Path(output_dir)
+    output_dir_obj.mkdir(parents=True, exist_ok=True)
+
+    if parquet:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            logger.warning("pyarrow not installed; skipping Parquet views")
+            parquet = False
+
+    paths = {}
+    for name, frame in views.items():
+        stem = VIEWS[name][0] if name in VIEWS else name
+        json_file = output_dir_obj / f"{stem}.json"
+        with open(json_file, "w", encoding="utf-8") as f:
+            json.dump(frame.to_dict(orient="records"), f, indent=2, ensure_ascii=False)
+        if parquet:
+            frame.to_parquet(output_dir_obj / f"{stem}.parquet", index=False)
+        paths[name] = str(json_file)
+        logger.info(f"    {name}: {len(frame)} records")
+    return paths
+
+
+def generate_views(
+    source: Union[str, Path, Graph, CaseEventTables],
+    output_dir: Union[str, Path],
+    parquet: bool = True,
+    override_counts: bool = False,
+) -> Dict[str, str]:
+    """
+    TTL 경로/Graph/테이블에서 모든 사전 집계 뷰 생성
+
+    Args:
+        source: TTL 파일 경로, rdflib Graph, 또는 CaseEventTables
+        output_dir: 출력 디렉토리
+        parquet: Parquet 파일도 함께 생성
+        override_counts: cases_by_flow에 override_count 포함 (scripts/core/ttl_to_json.py 형식)
+
+    Returns:
+        dict: 생성된 파일 목록 {view_name: json_path}
+    """
+    if isinstance(source, CaseEventTables):
+        tables = source
+    else:
+        graph = source
+        if not isinstance(graph, Graph):
+            graph = Graph()
+            graph.parse(str(source), format="turtle")
+        tables = scan_case_events(graph)
+    return write_views(compute_views(tables, override_counts), output_dir, parquet=parquet)
+
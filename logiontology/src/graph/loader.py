@@ -4,6 +4,7 @@ from pathlib import Path
 from rdflib import Graph
 import logging
 
+from src.analytics.kpi_snapshot import KPISnapshot, shared_kpi_service
 from src.graph.neo4j_store import Neo4jStore
 
 logger = logging.getLogger(__name__)
@@ -12,14 +13,17 @@ logger = logging.getLogger(__name__)
 class Neo4jLoader:
     """Load RDF data into Neo4j graph database."""
 
-    def __init__(self, neo4j_store: Neo4jStore = None):
+    def __init__(self, neo4j_store: Neo4jStore = None, kpi_service=None):
         """
         Initialize loader with Neo4j store.
 
         Args:
             neo4j_store: Neo4jStore instance (creates new if None)
+            kpi_service: KPIService updated with the flows of each loaded file
+                (None = the process-wide service shared with the KPI endpoint)
         """
         self.store = neo4j_store or Neo4jStore()
+        self.kpi_service = kpi_service if kpi_service is not None else shared_kpi_service()
 
     def load_ttl_file(self, ttl_path: Path):
         """
@@ -39,6 +43,12 @@ class Neo4jLoader:
         self.store.load_rdf_graph(g)
         logger.info(f"✓ Loaded {ttl_path} into Neo4j")
 
+        # Adjust cached KPIs with the new flows instead of re-aggregating everything;
+        # keyed by file so that loading the same file again replaces its counters
+        self.kpi_service.apply_snapshot(
+            KPISnapshot.from_graph(g), source=str(Path(ttl_path).resolve())
+        )
+
     def load_directory(self, directory: Path, pattern: str = "*.ttl"):
         """
         Load all TTL files from directory.
@@ -0,0 +1,314 @@
+"""
+HVDC Network Index v1.0
+Typed node index and CSR adjacency over a networkx-style graph, with Louvain community detection
+"""
+
+from __future__ import annotations
+import logging
+import random
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# node/edge attribute value for "attribute not set" (distinct from an explicit None)
+MISSING = object()
+
+
+class NetworkIndex:
+    """
+    Read-only array view of a graph (networkx.Graph API: nodes, adjacency())
+
+    - nodes / ids: node order of the source graph ↔ integer ids
+    - by_type: node "type" attribute → node ids (node order)
+    - CSR adjacency (indptr, indices, weights) that keeps each node's
+      adjacency order, plus the undirected edge list in graph.edges() order
+    - requested node/edge attributes as object arrays (MISSING when unset)
+
+    Build once per graph state; rebuild after mutating the graph.
+    """
+
+    def __init__(
+        self,
+        graph,
+        node_attrs: Sequence[str] = ("type",),
+        edge_attrs: Sequence[str] = (),
+        weight: str = "weight",
+    ):
+        """
+        Index a graph
+
+        Args:
+            graph: networkx.Graph (undirected)
+            node_attrs: Node attributes to keep as arrays ("type" is always kept)
+            edge_attrs: Edge attributes to keep as arrays (graph.edges() order)
+            weight: Edge weight attribute (default 1.0 when unset)
+        """
+        self.nodes: List[Hashable] = list(graph.nodes)
+        self.ids: Dict[Hashable, int] = {node: i for i, node in enumerate(self.nodes)}
+        n = len(self.nodes)
+        ids = self.ids
+
+        node_attrs = list(dict.fromkeys(["type", *node_attrs]))
+        columns = {name: [MISSING] * n for name in node_attrs}
+        for i, (_, data) in enumerate(graph.nodes(data=True)):
+            for name in node_attrs:
+                if name in data:
+                    columns[name][i] = data[name]
+        self.node_attrs = {name: _object_array(values) for name, values in columns.items()}
+
+        by_type: Dict[Any, List[int]] = defaultdict(list)
+        for i, node_type in enumerate(columns["type"]):
+            if node_type is not MISSING:
+                by_type[node_type].append(i)
+        self.by_type = {t: np.asarray(members, dtype=np.int64) for t, members in by_type.items()}
+
+        # CSR in adjacency order (both directions; self-loops once), one adjacency pass
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        indices: List[int] = []
+        weights: List[float] = []
+        entry_columns: Dict[str, List[Any]] = {name: [] for name in edge_attrs}
+        for i, (_, nbrs) in enumerate(graph.adjacency()):
+            indices.extend(map(ids.__getitem__, nbrs))
+            datas = nbrs.values()
+            weights.extend([data.get(weight, 1.0) for data in datas])
+            for name, column in entry_columns.items():
+                column.extend([data.get(name, MISSING) for data in datas])
+            indptr[i + 1] = len(indices)
+        self.indptr = indptr
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.weights = np.asarray(weights, dtype=np.float64)
+
+        # undirected edge list in graph.edges() order: networkx yields (u, v) from
+        # u's adjacency when v has not been visited yet, i.e. CSR entries with v >= u
+        rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))
+        forward = self.indices >= rows
+        self.edge_u = rows[forward]
+        self.edge_v = self.indices[forward]
+        self.edge_attrs = {
+            name: _object_array(column)[forward] for name, column in entry_columns.items()
+        }
+
+        # sorted u*n+v keys for vectorized has_edge
+        self._edge_keys = np.sort(rows * max(n, 1) + self.indices)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def number_of_edges(self) -> int:
+        return len(self.edge_u)
+
+    def ids_of_type(self, node_type) -> np.ndarray:
+        """Node ids with the given "type" attribute (graph node order)"""
+        return self.by_type.get(node_type, np.empty(0, dtype=np.int64))
+
+    def nodes_of_type(self, node_type) -> List[Hashable]:
+        """Nodes with the given "type" attribute (graph node order)"""
+        return [self.nodes[i] for i in self.ids_of_type(node_type).tolist()]
+
+    def type_mask(self, node_types: Iterable) -> np.ndarray:
+        """Boolean mask over node ids: node "type" in node_types"""
+        mask = np.zeros(len(self.nodes), dtype=bool)
+        for node_type in node_types:
+            mask[self.ids_of_type(node_type)] = True
+        return mask
+
+    def neighbor_ids(self, i: int) -> np.ndarray:
+        """Neighbor ids of node id i (adjacency order)"""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def has_edges(self, u_ids, v_ids) -> np.ndarray:
+        """Vectorized has_edge over id arrays"""
+        keys = np.asarray(u_ids, dtype=np.int64) * max(len(self.nodes), 1) + np.asarray(
+            v_ids, dtype=np.int64
+        )
+        if len(self._edge_keys) == 0:
+            return np.zeros(len(keys), dtype=bool)
+        pos = np.minimum(np.searchsorted(self._edge_keys, keys), len(self._edge_keys) - 1)
+        return self._edge_keys[pos] == keys
+
+    def has_edge(self, u: Hashable, v: Hashable) -> bool:
+        if u not in self.ids or v not in self.ids:
+            return False
+        return bool(self.has_edges([self.ids[u]], [self.ids[v]])[0])
+
+    def row_ids(self) -> np.ndarray:
+        """CSR row id of every entry in indices"""
+        return np.repeat(np.arange(len(self.nodes), dtype=np.int64), np.diff(self.indptr))
+
+    def weighted_degree(self) -> np.ndarray:
+        """Weighted degree per node id (self-loops count twice, as in networkx)"""
+        rows = self.row_ids()
+        degree = np.bincount(rows, weights=self.weights, minlength=len(self.nodes))
+        loops = rows == self.indices
+        degree += np.bincount(rows[loops], weights=self.weights[loops], minlength=len(self.nodes))
+        return degree
+
+    # ------------------------------------------------------------------
+    # Community detection
+    # ------------------------------------------------------------------
+
+    def louvain_communities(
+        self, resolution: float = 1.0, threshold: float = 1e-7, seed: Optional[int] = None
+    ) -> List[Set[Hashable]]:
+        """
+        Louvain communities over the CSR adjacency
+
+        Same algorithm and stopping rule as networkx louvain_communities
+        (local moving until no node moves, aggregate, stop when modularity
+        gains <= threshold), with community graphs aggregated in numpy.
+        Partitions are not bit-identical to networkx (different random
+        streams) but optimize the same objective.
+
+        Returns:
+            list of node sets
+        """
+        labels = louvain_labels(
+            self.indptr, self.indices, self.weights, self.weighted_degree(),
+            resolution=resolution, threshold=threshold, seed=seed,
+        )
+        communities: Dict[int, Set[Hashable]] = defaultdict(set)
+        for node, label in zip(self.nodes, labels.tolist()):
+            communities[label].add(node)
+        return list(communities.values())
+
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def modularity(indptr, indices, weights, degree, labels, resolution: float = 1.0) -> float:
+    """Modularity of a labelling over a symmetric CSR adjacency"""
+    m = degree.sum() / 2
+    if m == 0:
+        return 0.0
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    internal = labels[rows] == labels[indices]
+    # symmetric entries count each edge twice; self-loops (stored once) count double
+    loops = rows == indices
+    inside = weights[internal].sum() + weights[internal & loops].sum()
+    totals = np.bincount(labels, weights=degree)
+    return float(inside / (2 * m) - resolution * np.sum((totals / (2 * m)) ** 2))
+
+
+def _one_level(indptr, indices, weights, degree, m, resolution, rng) -> np.ndarray:
+    """Local moving phase: community label per node"""
+    n = len(degree)
+    node2com = list(range(n))
+    stot = degree.tolist()
+    deg = degree.tolist()
+    ptr = indptr.tolist()
+    nbrs = indices.tolist()
+    wts = weights.tolist()
+    # (neighbor, weight) pairs without self-loops, built once per level
+    adjacency = []
+    for u in range(n):
+        lo, hi = ptr[u], ptr[u + 1]
+        adjacency.append([(v, w) for v, w in zip(nbrs[lo:hi], wts[lo:hi]) if v != u])
+    order = list(range(n))
+    rng.shuffle(order)
+    scale = resolution / (2 * m * m)
+
+    moved = True
+    while moved:
+        moved = False
+        for u in order:
+            pairs = adjacency[u]
+            if not pairs:
+                continue
+            weights2com: Dict[int, float] = defaultdict(float)
+            for v, w in pairs:
+                weights2com[node2com[v]] += w
+            best_com = node2com[u]
+            d = deg[u]
+            stot[best_com] -= d
+            remove_cost = -weights2com[best_com] / m + scale * stot[best_com] * d
+            best_gain = 0.0
+            for c, wt in weights2com.items():
+                gain = remove_cost + wt / m - scale * stot[c] * d
+                if gain > best_gain:
+                    best_gain = gain
+                    best_com = c
+            stot[best_com] += d
+            if best_com != node2com[u]:
+                node2com[u] = best_com
+                moved = True
+
+    _, labels = np.unique(np.asarray(node2com, dtype=np.int64), return_inverse=True)
+    return labels.astype(np.int64)
+
+
+def _aggregate(indptr, indices, weights, labels, k):
+    """Community graph as symmetric CSR (internal weight kept as self-loops)"""
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    keys = labels[rows] * k + labels[indices]
+    # every internal edge lands on the diagonal twice (self-loops doubled to match),
+    # and a community self-loop carries the undirected internal weight once
+    entry_weights = np.where(rows == indices, weights * 2, weights)
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    summed = np.bincount(inverse, weights=entry_weights)
+    new_rows = unique_keys // k
+    new_cols = unique_keys % k
+    summed[new_rows == new_cols] /= 2
+    new_indptr = np.zeros(k + 1, dtype=np.int64)
+    np.add.at(new_indptr, new_rows + 1, 1)
+    return np.cumsum(new_indptr), new_cols.astype(np.int64), summed
+
+
+def louvain_labels(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    weights: np.ndarray,
+    degree: np.ndarray,
+    resolution: float = 1.0,
+    threshold: float = 1e-7,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Louvain community label per node of a symmetric CSR adjacency
+
+    Args:
+        indptr, indices, weights: CSR adjacency (both directions, self-loops once)
+        degree: Weighted degree per node (self-loops counted twice)
+        resolution: Modularity resolution
+        threshold: Minimum modularity gain per level
+        seed: Random seed for node order
+
+    Returns:
+        np.ndarray: Community label per node (0..k-1)
+    """
+    n = len(degree)
+    labels = np.arange(n, dtype=np.int64)
+    m = degree.sum() / 2
+    if n == 0 or m == 0:
+        return labels
+
+    # only shuffles the node visiting order, not used for security
+    rng = random.Random(seed)  # nosec B311
+    mod = modularity(indptr, indices, weights, degree, labels, resolution)
+    level = 0
+    while True:
+        level_labels = _one_level(indptr, indices, weights, degree, m, resolution, rng)
+        k = int(level_labels.max()) + 1
+        new_labels = level_labels[labels]
+        new_indptr, new_indices, new_weights = _aggregate(indptr, indices, weights, level_labels, k)
+        new_degree = np.bincount(level_labels, weights=degree, minlength=k)
+        new_mod = modularity(
+            new_indptr, new_indices, new_weights, new_degree, np.arange(k), resolution
+        )
+        level += 1
+        logger.debug(f"Louvain level {level}: {k} communities, modularity {new_mod:.4f}")
+        if new_mod - mod <= threshold or k == len(degree):
+            return new_labels
+        labels = new_labels
+        mod = new_mod
+        indptr, indices, weights, degree = new_indptr, new_indices, new_weights, new_degree
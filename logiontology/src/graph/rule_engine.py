@@ -0,0 +1,439 @@
+"""
+HVDC Rule Engine v1.0
+Forward-chaining inference over a networkx-style graph: rules as data, evaluated as joins
+over type-indexed edge lists, with semi-naive incremental evaluation for new edges
+"""
+
+from __future__ import annotations
+import logging
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Body atoms (terms are "?var" or node ids):
+#   ("edge", x, y)        undirected edge x–y (any rel)
+#   ("edge", x, y, rel)   undirected edge x–y with that "rel" attribute
+#   ("in", x, values)     x in values
+#   ("neq", x, y)         x != y
+#   ("lt", x, y)          x before y in graph node order (one binding per unordered pair)
+# Heads:
+#   ("edge", x, y)        add x–y with attrs unless x and y are already adjacent
+#   ("node", x)           count body matches per x; set attrs once the count reaches threshold
+Atom = Tuple[Any, ...]
+
+FILTERS = ("in", "neq", "lt")
+
+
+def is_var(term: Any) -> bool:
+    return isinstance(term, str) and term.startswith("?")
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    One inference rule
+
+    Attributes:
+        name: Unique rule name (stats key)
+        bodies: Alternative conjunctions of atoms (matches of all bodies feed the head)
+        head: ("edge", x, y) or ("node", x)
+        types: Variable → allowed node "type" values (unlisted variables match any node)
+        attrs: Attributes set by the head ("?var" values are substituted)
+        threshold: Node heads: minimum match count per node
+        count_attr: Node heads: attribute that receives the match count
+    """
+    name: str
+    bodies: Tuple[Tuple[Atom, ...], ...]
+    head: Atom
+    types: Mapping[str, Tuple[Any, ...]] = field(default_factory=dict)
+    attrs: Mapping[str, Any] = field(default_factory=dict)
+    threshold: int = 1
+    count_attr: Optional[str] = None
+
+
+@dataclass
+class RuleStats:
+    """Per-rule work of one evaluation"""
+    matches: int = 0
+    fired: int = 0
+    seconds: float = 0.0
+
+
+class RuleEngine:
+    """
+    Forward-chaining rule evaluation bound to one graph
+
+    run() evaluates all rules to a fixpoint; add_edges() adds edges and
+    propagates only their consequences (semi-naive: every body match uses at
+    least one new edge). Derived edges are added to the graph at the end of
+    each round and become the next round's new edges.
+
+    Bodies match node "type" and edge structure only, so node attributes set by
+    node heads never trigger other rules.
+    """
+
+    def __init__(self, graph, rules: Iterable[Rule]):
+        """
+        Args:
+            graph: networkx.Graph (undirected; modified in place)
+            rules: Rules in evaluation order
+
+        Raises:
+            ValueError: Duplicate rule names or bodies with unbound filter variables
+        """
+        self.graph = graph
+        self.rules: List[Rule] = list(rules)
+        names = [rule.name for rule in self.rules]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate rule names: {names}")
+        self.stats: Dict[str, RuleStats] = {name: RuleStats() for name in names}
+        self.rounds = 0
+
+        # join plans per (rule, body, delta position); built up front to reject bad rules early
+        self._plans: Dict[Tuple[str, int, Optional[int]], List[Tuple]] = {}
+        for rule in self.rules:
+            if rule.head[0] not in ("edge", "node"):
+                raise ValueError(f"Rule {rule.name}: unknown head {rule.head}")
+            for b, body in enumerate(rule.bodies):
+                self._plans[(rule.name, b, None)] = self._plan(rule, body, None)
+                for i, atom in enumerate(body):
+                    if atom[0] == "edge":
+                        self._plans[(rule.name, b, i)] = self._plan(rule, body, i)
+        self._reset()
+
+    # ------------------------------------------------------------------
+    # Type-indexed edge lists
+    # ------------------------------------------------------------------
+
+    def _reset(self) -> None:
+        self.node_type: Dict[Hashable, Any] = {}
+        self.order: Dict[Hashable, int] = {}
+        self.by_type: Dict[Any, Dict[Hashable, None]] = defaultdict(dict)
+        # node → neighbor type → neighbors (ordered)
+        self.adj: Dict[Hashable, Dict[Any, Dict[Hashable, None]]] = {}
+        for node, data in self.graph.nodes(data=True):
+            self._index_node(node, data.get("type"))
+        for u, nbrs in self.graph.adjacency():
+            typed = self.adj[u]
+            for v in nbrs:
+                typed.setdefault(self.node_type[v], {})[v] = None
+        self.counts: Dict[str, Counter] = {rule.name: Counter() for rule in self.rules}
+        self.marked: Dict[str, Set[Hashable]] = {rule.name: set() for rule in self.rules}
+
+    def _index_node(self, node: Hashable, node_type: Any) -> None:
+        self.node_type[node] = node_type
+        self.order[node] = len(self.order)
+        self.by_type[node_type][node] = None
+        self.adj[node] = {}
+
+    def _index_edge(self, u: Hashable, v: Hashable) -> None:
+        for node in (u, v):
+            if node not in self.node_type:
+                self._index_node(node, self.graph.nodes[node].get("type"))
+        self.adj[u].setdefault(self.node_type[v], {})[v] = None
+        self.adj[v].setdefault(self.node_type[u], {})[u] = None
+
+    def _adjacent(self, u: Hashable, v: Hashable) -> bool:
+        typed = self.adj.get(u)
+        return typed is not None and v in typed.get(self.node_type.get(v), ())
+
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+
+    def run(self) -> Dict[str, RuleStats]:
+        """
+        Evaluate all rules over the whole graph to a fixpoint
+
+        Returns:
+            dict: {rule name: RuleStats} for this evaluation
+        """
+        self._reset()
+        return self._evaluate(list(self.graph.edges()), initial=True)
+
+    def add_edges(
+        self,
+        edges: Iterable[Tuple],
+        nodes: Iterable[Tuple[Hashable, Dict[str, Any]]] = (),
+    ) -> Dict[str, RuleStats]:
+        """
+        Add edges and propagate their consequences (semi-naive)
+
+        An edge that is already present only has its attributes updated; an
+        asserted edge over an inferred one replaces the inferred attributes.
+
+        Args:
+            edges: (u, v) or (u, v, attrs) tuples
+            nodes: (node, attrs) for nodes that are new or need a "type"
+
+        Returns:
+            dict: {rule name: RuleStats} for this update
+        """
+        for node, attrs in nodes:
+            if node in self.node_type:
+                if attrs.get("type", self.node_type[node]) != self.node_type[node]:
+                    raise ValueError(f"Cannot change type of indexed node {node!r}")
+                self.graph.nodes[node].update(attrs)
+            else:
+                self.graph.add_node(node, **attrs)
+                self._index_node(node, attrs.get("type"))
+
+        delta = []
+        for edge in edges:
+            u, v = edge[0], edge[1]
+            attrs = edge[2] if len(edge) > 2 else {}
+            if self.graph.has_edge(u, v):
+                data = self.graph.edges[u, v]
+                if data.get("inferred") and not attrs.get("inferred"):
+                    data.clear()
+                data.update(attrs)
+                continue
+            self.graph.add_edge(u, v, **attrs)
+            self._index_edge(u, v)
+            delta.append((u, v))
+        return self._evaluate(delta, initial=False)
+
+    def _evaluate(self, delta: List[Tuple[Hashable, Hashable]], initial: bool) -> Dict[str, RuleStats]:
+        stats = {rule.name: RuleStats() for rule in self.rules}
+        rounds = 0
+        while delta:
+            rounds += 1
+            # the initial round joins all edges directly; only later rounds need delta lookups
+            delta_keys = set() if initial else set(delta) | {(v, u) for u, v in delta}
+            pending: Dict[Tuple[Hashable, Hashable], Dict[str, Any]] = {}
+            for rule in self.rules:
+                start = time.perf_counter()
+                rule_stats = stats[rule.name]
+                if rule.head[0] == "edge":
+                    self._fire_edges(rule, delta, delta_keys, initial, pending, rule_stats)
+                else:
+                    self._fire_nodes(rule, delta, delta_keys, initial, rule_stats)
+                rule_stats.seconds += time.perf_counter() - start
+
+            self.graph.add_edges_from((u, v, attrs) for (u, v), attrs in pending.items())
+            for u, v in pending:
+                self._index_edge(u, v)
+            delta = list(pending)
+            initial = False
+
+        self.rounds += rounds
+        for name, rule_stats in stats.items():
+            total = self.stats[name]
+            total.matches += rule_stats.matches
+            total.fired += rule_stats.fired
+            total.seconds += rule_stats.seconds
+            logger.debug(
+                f"Rule {name}: {rule_stats.matches} matches, {rule_stats.fired} fired, "
+                f"{rule_stats.seconds:.3f}s"
+            )
+        return stats
+
+    def _fire_edges(self, rule, delta, delta_keys, initial, pending, rule_stats) -> None:
+        x, y = rule.head[1], rule.head[2]
+        x_var, y_var = is_var(x), is_var(y)
+        for binding in self._matches(rule, delta, delta_keys, initial):
+            rule_stats.matches += 1
+            u = binding[x] if x_var else x
+            v = binding[y] if y_var else y
+            if self.graph.has_edge(u, v) or (u, v) in pending or (v, u) in pending:
+                continue
+            pending[(u, v)] = _substitute(rule.attrs, binding)
+            rule_stats.fired += 1
+
+    def _fire_nodes(self, rule, delta, delta_keys, initial, rule_stats) -> None:
+        x = rule.head[1]
+        x_var = is_var(x)
+        counts = self.counts[rule.name]
+        touched: Dict[Hashable, Dict[str, Any]] = {}
+        for binding in self._matches(rule, delta, delta_keys, initial):
+            rule_stats.matches += 1
+            node = binding[x] if x_var else x
+            counts[node] += 1
+            if node not in touched:
+                touched[node] = _substitute(rule.attrs, binding)
+
+        marked = self.marked[rule.name]
+        for node, attrs in touched.items():
+            if counts[node] < rule.threshold:
+                continue
+            data = self.graph.nodes[node]
+            data.update(attrs)
+            if rule.count_attr:
+                data[rule.count_attr] = counts[node]
+            if node not in marked:
+                marked.add(node)
+                rule_stats.fired += 1
+
+    def _matches(self, rule, delta, delta_keys, initial) -> Iterator[Dict[str, Any]]:
+        """
+        Body bindings that use at least one delta edge (each exactly once)
+
+        For delta position i, edge atoms before i only match old edges and
+        atoms after i match all edges (standard semi-naive decomposition).
+        On the initial evaluation every edge is new, so the bodies are joined
+        directly from the most selective atom instead.
+        """
+        node_type = self.node_type
+        for b, body in enumerate(rule.bodies):
+            if initial:
+                yield from self._join(self._plans[(rule.name, b, None)], 0, {}, delta_keys)
+                continue
+            for i, atom in enumerate(body):
+                if atom[0] != "edge":
+                    continue
+                plan = self._plans[(rule.name, b, i)]
+                x, y, rel = atom[1], atom[2], atom[3] if len(atom) > 3 else None
+                x_var, y_var = is_var(x), is_var(y)
+                x_types, y_types = rule.types.get(x), rule.types.get(y)
+                for u, v in delta:
+                    for a, c in ((u, v), (v, u)) if u != v else ((u, v),):
+                        if x_var:
+                            if x_types is not None and node_type.get(a) not in x_types:
+                                continue
+                        elif x != a:
+                            continue
+                        if y_var:
+                            if y_types is not None and node_type.get(c) not in y_types:
+                                continue
+                            if y == x and c != a:
+                                continue
+                        elif y != c:
+                            continue
+                        if rel is not None and self.graph.adj[a][c].get("rel") != rel:
+                            continue
+                        binding = {}
+                        if x_var:
+                            binding[x] = a
+                        if y_var:
+                            binding[y] = c
+                        yield from self._join(plan, 0, binding, delta_keys)
+
+    def _join(self, plan, k, binding, delta_keys) -> Iterator[Dict[str, Any]]:
+        if k == len(plan):
+            yield binding
+            return
+        op, x, y, x_var, y_var, types, arg, old = plan[k]
+        u = binding[x] if x_var and x in binding else x
+
+        if op == "expand":
+            # x bound, y new: typed neighbors of x
+            typed = self.adj.get(u)
+            if not typed:
+                return
+            groups = [typed[t] for t in types if t in typed] if types is not None else list(typed.values())
+            adj = self.graph.adj[u] if arg is not None else None
+            for group in groups:
+                for v in list(group):
+                    if old and (u, v) in delta_keys:
+                        continue
+                    if adj is not None and adj[v].get("rel") != arg:
+                        continue
+                    binding[y] = v
+                    yield from self._join(plan, k + 1, binding, delta_keys)
+            binding.pop(y, None)
+            return
+
+        if op == "check":
+            v = binding[y] if y_var else y
+            if (
+                self._adjacent(u, v)
+                and not (old and (u, v) in delta_keys)
+                and (arg is None or self.graph.adj[u][v].get("rel") == arg)
+            ):
+                yield from self._join(plan, k + 1, binding, delta_keys)
+            return
+
+        if op in ("seed", "enum"):
+            # seed: x from the type index (or all nodes); enum: x from an "in" list
+            if op == "seed":
+                nodes = (
+                    [n for t in types for n in self.by_type.get(t, ())] if types is not None
+                    else list(self.node_type)
+                )
+            else:
+                nodes = [
+                    n for n in arg
+                    if n in self.node_type and (types is None or self.node_type[n] in types)
+                ]
+            for node in nodes:
+                binding[x] = node
+                yield from self._join(plan, k + 1, binding, delta_keys)
+            binding.pop(x, None)
+            return
+
+        if op == "in":
+            ok = u in arg
+        else:
+            v = binding[y] if y_var else y
+            ok = u != v if op == "neq" else self.order.get(u, -1) < self.order.get(v, -1)
+        if ok:
+            yield from self._join(plan, k + 1, binding, delta_keys)
+
+    @staticmethod
+    def _plan(rule: Rule, body: Tuple[Atom, ...], start: Optional[int]) -> List[Tuple]:
+        """
+        Join order for a body: bound filters first, then edge checks, "in"
+        enumerations and edge expansions (ties: body order)
+
+        Returns:
+            [(op, x, y, x_var, y_var, types, arg, old)] steps excluding the delta
+            atom at start; op is check / expand / seed / enum / in / neq / lt
+        """
+        bound: Set[str] = set()
+        if start is not None:
+            bound.update(t for t in body[start][1:3] if is_var(t))
+        remaining = [j for j in range(len(body)) if j != start]
+        steps: List[Tuple] = []
+
+        def known(term) -> bool:
+            return not is_var(term) or term in bound
+
+        def cost(j: int) -> int:
+            atom = body[j]
+            if atom[0] in FILTERS:
+                terms = atom[1:2] if atom[0] == "in" else atom[1:3]
+                if all(known(t) for t in terms):
+                    return 0
+                return 2 if atom[0] == "in" else 9
+            if atom[0] != "edge":
+                raise ValueError(f"Rule {rule.name}: unknown atom {atom}")
+            return (4, 3, 1)[known(atom[1]) + known(atom[2])]
+
+        while remaining:
+            j = min(remaining, key=lambda j: (cost(j), j))
+            atom = body[j]
+            kind = atom[0]
+            if cost(j) == 9:
+                raise ValueError(f"Rule {rule.name}: unbound variables in {atom}")
+            x = atom[1]
+            if kind == "in":
+                op = "in" if known(x) else "enum"
+                steps.append((op, x, None, is_var(x), False, rule.types.get(x), atom[2], False))
+                if is_var(x):
+                    bound.add(x)
+            elif kind in FILTERS:
+                y = atom[2]
+                steps.append((kind, x, y, is_var(x), is_var(y), None, None, False))
+            else:
+                y = atom[2]
+                rel = atom[3] if len(atom) > 3 else None
+                old = start is not None and j < start
+                if not known(x) and known(y):
+                    x, y = y, x
+                if not known(x):
+                    steps.append(("seed", x, None, True, False, rule.types.get(x), None, False))
+                    bound.add(x)
+                if known(y):
+                    steps.append(("check", x, y, is_var(x), is_var(y), None, rel, old))
+                else:
+                    steps.append(("expand", x, y, is_var(x), True, rule.types.get(y), rel, old))
+                    bound.add(y)
+            remaining.remove(j)
+        return steps
+
+
+def _substitute(attrs: Mapping[str, Any], binding: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: binding[value] if is_var(value) else value for key, value in attrs.items()}
@@ -0,0 +1,477 @@
+"""
+HVDC Unified Network v1.0
+Inference rules, ontology validation and community detection for the v1.2 unified network,
+with a networkx backend, a CSR backend (NetworkIndex) for 100k+ node graphs and a
+rule-engine backend (HVDC_RULES as data, incremental via RuleEngine.add_edges)
+"""
+
+from __future__ import annotations
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from .network_index import MISSING, NetworkIndex
+from .rule_engine import Rule, RuleEngine, RuleStats
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("networkx", "csr", "rules")
+
+HUB = "MOSB"
+HVDC_PORTS = ["ZAYED_PORT", "KHALIFA_PORT", "JEBEL_ALI_PORT"]
+HVDC_SITES = ["MIR", "SHU", "DAS", "AGI"]
+HVDC_NODE_IDS = HVDC_PORTS + [HUB] + HVDC_SITES
+LOCATION_TYPES = ["hub", "port", "site"]
+
+# NetworkIndex attributes needed by validate_hvdc_ontology
+VALIDATION_NODE_ATTRS = ("ontology_class", "criticality")
+VALIDATION_EDGE_ATTRS = ("rel", "inferred")
+
+# add_inference_rules rules 1-4 as RuleEngine data
+HVDC_RULES = (
+    # 1. Vessel operates_from MOSB AND MOSB dispatches Site → Vessel indirectly_serves Site
+    Rule(
+        name="indirectly_serves",
+        bodies=((("edge", "?vessel", HUB), ("edge", HUB, "?site"), ("in", "?site", tuple(HVDC_SITES))),),
+        head=("edge", "?vessel", "?site"),
+        types={"?vessel": ("vessel",)},
+        attrs={"rel": "indirectly_serves", "weight": 0.3, "inferred": True},
+    ),
+    # 2. Vessel operates_from MOSB AND MOSB receives_from Port → Vessel flows_through Port
+    Rule(
+        name="flows_through",
+        bodies=((("edge", "?vessel", HUB), ("edge", HUB, "?port"), ("in", "?port", tuple(HVDC_PORTS))),),
+        head=("edge", "?vessel", "?port"),
+        types={"?vessel": ("vessel",)},
+        attrs={"rel": "flows_through", "weight": 0.4, "inferred": True},
+    ),
+    # 3. dependency depth = Operation–Person + Person–Vessel + Vessel–MOSB chains; >= 3 → HIGH
+    Rule(
+        name="critical_path",
+        bodies=(
+            (("edge", "?op", "?person"),),
+            (("edge", "?op", "?person"), ("edge", "?person", "?vessel")),
+            (("edge", "?op", "?person"), ("edge", "?person", "?vessel"), ("edge", "?vessel", HUB)),
+        ),
+        head=("node", "?op"),
+        types={"?op": ("operation",), "?person": ("person",), "?vessel": ("vessel",)},
+        attrs={"criticality": "HIGH", "inferred": True},
+        threshold=3,
+        count_attr="dependency_depth",
+    ),
+    # 4. Vessels at the same hub/port/site → co_located_with
+    Rule(
+        name="co_located_with",
+        bodies=((("edge", "?a", "?location"), ("edge", "?b", "?location"), ("lt", "?a", "?b")),),
+        head=("edge", "?a", "?b"),
+        types={"?a": ("vessel",), "?b": ("vessel",), "?location": tuple(LOCATION_TYPES)},
+        attrs={"rel": "co_located_with", "weight": 0.2, "inferred": True, "location": "?location"},
+    ),
+)
+
+
+def build_network_index(G) -> NetworkIndex:
+    """NetworkIndex with the attributes used by validation (and Louvain)"""
+    return NetworkIndex(G, node_attrs=VALIDATION_NODE_ATTRS, edge_attrs=VALIDATION_EDGE_ATTRS)
+
+
+def add_inference_rules(G, backend: str = "networkx"):
+    """
+    Apply ontological inference rules (p.md 5.1)
+
+    Rules:
+    1. Transitive Property: Vessel operates_from MOSB AND MOSB dispatches Site → Vessel indirectly_serves Site
+    2. Cargo Flow Path: Vessel operates_from MOSB AND MOSB receives_from Port → Vessel flows_through Port
+    3. Critical Path Detection: Operation.performed_by Person AND Person.operates Vessel AND Vessel.operates_from MOSB → Operation.criticality = HIGH
+    4. Co-Location Clustering: Vessels operating_from same location → co_located_with
+
+    Args:
+        G: networkx.Graph (modified in place)
+        backend: "networkx" (per-node lookups), "csr" (typed node index +
+            CSR adjacency; same edges, attributes and insertion order) or
+            "rules" (RuleEngine over HVDC_RULES; same edges and attributes, but
+            a vessel pair sharing several locations may record another
+            shared location, and edges are inserted in derivation order)
+
+    Returns:
+        G
+    """
+    if backend == "csr":
+        return _add_inference_rules_csr(G)
+    if backend == "rules":
+        RuleEngine(G, HVDC_RULES).run()
+        return G
+    if backend != "networkx":
+        raise ValueError(f"Unknown backend: {backend} (expected one of {BACKENDS})")
+
+    # Rule 1: Transitive Property (indirectly_serves)
+    for vessel in [n for n, d in G.nodes(data=True) if d.get("type") == "vessel"]:
+        if G.has_edge(vessel, "MOSB"):
+            for site in ["MIR", "SHU", "DAS", "AGI"]:
+                if G.has_edge("MOSB", site):
+                    # Check if edge already exists
+                    if not G.has_edge(vessel, site):
+                        G.add_edge(
+                            vessel,
+                            site,
+                            rel="indirectly_serves",
+                            weight=0.3,
+                            inferred=True,
+                        )
+
+    # Rule 2: Cargo Flow Path (flows_through)
+    for vessel in [n for n, d in G.nodes(data=True) if d.get("type") == "vessel"]:
+        if G.has_edge(vessel, "MOSB"):
+            for port in ["ZAYED_PORT", "KHALIFA_PORT", "JEBEL_ALI_PORT"]:
+                if G.has_edge(port, "MOSB") or G.has_edge("MOSB", port):
+                    # Check if edge already exists
+                    if not G.has_edge(vessel, port):
+                        G.add_edge(
+                            vessel,
+                            port,
+                            rel="flows_through",
+                            weight=0.4,
+                            inferred=True,
+                        )
+
+    # Rule 3: Critical Path Detection
+    for op in [n for n, d in G.nodes(data=True) if d.get("type") == "operation"]:
+        # Count dependency chain depth
+        depth = 0
+        for neighbor in G.neighbors(op):
+            if G.nodes[neighbor].get("type") == "person":
+                depth += 1
+                for vessel_neighbor in G.neighbors(neighbor):
+                    if G.nodes[vessel_neighbor].get("type") == "vessel":
+                        depth += 1
+                        if G.has_edge(vessel_neighbor, "MOSB"):
+                            depth += 1
+
+        # Mark as critical if depth >= 3
+        if depth >= 3:
+            G.nodes[op]["criticality"] = "HIGH"
+            G.nodes[op]["dependency_depth"] = depth
+            G.nodes[op]["inferred"] = True
+
+    # Rule 4: Co-Location Clustering
+    location_groups = defaultdict(list)
+    for vessel in [n for n, d in G.nodes(data=True) if d.get("type") == "vessel"]:
+        for neighbor in G.neighbors(vessel):
+            if G.nodes[neighbor].get("type") in ["hub", "port", "site"]:
+                location_groups[neighbor].append(vessel)
+
+    for location, vessels in location_groups.items():
+        if len(vessels) > 1:
+            for i, vessel_a in enumerate(vessels):
+                for vessel_b in vessels[i + 1 :]:
+                    # Check if edge already exists
+                    if not G.has_edge(vessel_a, vessel_b):
+                        G.add_edge(
+                            vessel_a,
+                            vessel_b,
+                            rel="co_located_with",
+                            weight=0.2,
+                            inferred=True,
+                            location=location,
+                        )
+
+    return G
+
+
+def _add_inference_rules_csr(G):
+    """add_inference_rules over a NetworkIndex: typed id arrays instead of node scans"""
+    index = NetworkIndex(G)
+    ids, nodes = index.ids, index.nodes
+    vessels = index.ids_of_type("vessel")
+    mosb = ids.get(HUB)
+
+    # Rules 1-2: vessels on MOSB → MOSB-connected sites / ports (vessel-major order)
+    added: Dict[str, List] = {"indirectly_serves": [], "flows_through": []}
+    appended = defaultdict(list)  # vessel id → location ids appended to its adjacency
+    if mosb is not None and len(vessels):
+        on_mosb = vessels[index.has_edges(vessels, np.full(len(vessels), mosb))]
+        for rel, targets in (("indirectly_serves", HVDC_SITES), ("flows_through", HVDC_PORTS)):
+            target_ids = np.asarray(
+                [ids[t] for t in targets if t in ids and index.has_edge(HUB, t)], dtype=np.int64
+            )
+            if not len(on_mosb) or not len(target_ids):
+                continue
+            grid_v = np.repeat(on_mosb, len(target_ids))
+            grid_t = np.tile(target_ids, len(on_mosb))
+            keep = ~index.has_edges(grid_v, grid_t)
+            for v, t in zip(grid_v[keep].tolist(), grid_t[keep].tolist()):
+                added[rel].append((v, t))
+                appended[v].append(t)
+
+    # Rule 3: dependency depth = Σ persons (1 + Σ their vessels (1 + [vessel–MOSB]))
+    rows, cols = index.row_ids(), index.indices
+    is_vessel = index.type_mask(["vessel"])
+    is_person = index.type_mask(["person"])
+    if mosb is not None:
+        on_hub = index.has_edges(np.arange(len(nodes)), np.full(len(nodes), mosb))
+    else:
+        on_hub = np.zeros(len(nodes), dtype=bool)
+    vessel_term = np.where(is_vessel[cols], 1 + on_hub[cols], 0)
+    person_inner = np.bincount(rows, weights=vessel_term, minlength=len(nodes))
+    person_term = np.where(is_person[cols], 1 + person_inner[cols], 0)
+    depth = np.bincount(rows, weights=person_term, minlength=len(nodes)).astype(np.int64)
+    ops = index.ids_of_type("operation")
+    critical = ops[depth[ops] >= 3]
+
+    # Rule 4: location groups in networkx neighbor order (rule 1-2 edges appended last)
+    is_location = index.type_mask(LOCATION_TYPES)
+    entry = is_vessel[rows] & is_location[cols]
+    group_vessel = [rows[entry]]
+    group_location = [cols[entry]]
+    group_phase = [np.zeros(int(entry.sum()), dtype=np.int64)]
+    group_seq = [np.flatnonzero(entry)]
+    for v, targets in appended.items():
+        group_vessel.append(np.full(len(targets), v, dtype=np.int64))
+        group_location.append(np.asarray(targets, dtype=np.int64))
+        group_phase.append(np.ones(len(targets), dtype=np.int64))
+        group_seq.append(np.arange(len(targets), dtype=np.int64))
+    g_vessel = np.concatenate(group_vessel)
+    g_location = np.concatenate(group_location)
+    order = np.lexsort((np.concatenate(group_seq), np.concatenate(group_phase), g_vessel))
+    g_vessel, g_location = g_vessel[order], g_location[order]
+    by_location = np.argsort(g_location, kind="stable")
+    locations, first, counts = np.unique(
+        g_location[by_location], return_index=True, return_counts=True
+    )
+    first_seen = by_location[first]  # stable sort: first member = first appearance
+
+    n = max(len(nodes), 1)
+    pair_u, pair_v, pair_loc = [], [], []
+    for g in np.argsort(first_seen, kind="stable").tolist():
+        if counts[g] < 2:
+            continue
+        members = g_vessel[by_location[first[g]:first[g] + counts[g]]]
+        i, j = np.triu_indices(len(members), 1)
+        pair_u.append(members[i])
+        pair_v.append(members[j])
+        pair_loc.append(np.full(len(i), locations[g], dtype=np.int64))
+    co_located = []
+    if pair_u:
+        a, b, loc = np.concatenate(pair_u), np.concatenate(pair_v), np.concatenate(pair_loc)
+        candidates = ~index.has_edges(a, b)
+        a, b, loc = a[candidates], b[candidates], loc[candidates]
+        # first pair wins (networkx re-checks has_edge after each add)
+        _, keep = np.unique(np.minimum(a, b) * n + np.maximum(a, b), return_index=True)
+        keep.sort()
+        co_located = list(zip(a[keep].tolist(), b[keep].tolist(), loc[keep].tolist()))
+
+    G.add_edges_from(
+        (nodes[v], nodes[t], {"rel": "indirectly_serves", "weight": 0.3, "inferred": True})
+        for v, t in added["indirectly_serves"]
+    )
+    G.add_edges_from(
+        (nodes[v], nodes[t], {"rel": "flows_through", "weight": 0.4, "inferred": True})
+        for v, t in added["flows_through"]
+    )
+    for op, op_depth in zip(critical.tolist(), depth[critical].tolist()):
+        attrs = G.nodes[nodes[op]]
+        attrs["criticality"] = "HIGH"
+        attrs["dependency_depth"] = op_depth
+        attrs["inferred"] = True
+    G.add_edges_from(
+        (
+            nodes[u],
+            nodes[v],
+            {"rel": "co_located_with", "weight": 0.2, "inferred": True, "location": nodes[loc]},
+        )
+        for u, v, loc in co_located
+    )
+    return G
+
+
+def validate_hvdc_ontology(G, index: Optional[NetworkIndex] = None) -> dict:
+    """
+    Validate HVDC v3.0 ontology compliance
+
+    Args:
+        G: networkx.Graph
+        index: build_network_index(G) for the CSR backend (None = networkx scans)
+
+    Returns:
+        dict: Validation results
+    """
+    if index is not None:
+        results = _validate_csr(index)
+        _print_validation(results)
+        return results
+
+    results = {}
+
+    # 1. HVDC 노드 존재 확인
+    hvdc_nodes_present = []
+    for node in [
+        "ZAYED_PORT",
+        "KHALIFA_PORT",
+        "JEBEL_ALI_PORT",
+        "MOSB",
+        "MIR",
+        "SHU",
+        "DAS",
+        "AGI",
+    ]:
+        if node in G.nodes:
+            hvdc_nodes_present.append(node)
+
+    results["hvdc_nodes_count"] = len(hvdc_nodes_present)
+    results["hvdc_nodes_list"] = hvdc_nodes_present
+
+    # 2. Cargo flow 검증 (Port → MOSB → Sites)
+    mosb_incoming = [u for u, v in G.edges() if v == "MOSB"]
+    mosb_outgoing = [v for u, v in G.edges() if u == "MOSB"]
+
+    results["mosb_incoming"] = len(mosb_incoming)
+    results["mosb_outgoing"] = len(mosb_outgoing)
+
+    # 3. 관계 타입 (목표: 12종+)
+    edge_types = set([d.get("rel") for u, v, d in G.edges(data=True)])
+    results["edge_types_count"] = len(edge_types)
+    results["edge_types_list"] = sorted(edge_types)
+
+    # 4. 온톨로지 클래스 커버리지
+    ontology_classes = set(
+        [
+            d.get("ontology_class")
+            for n, d in G.nodes(data=True)
+            if "ontology_class" in d
+        ]
+    )
+    results["ontology_classes"] = sorted(ontology_classes)
+
+    # 5. same_as 링크
+    same_as_edges = [
+        (u, v) for u, v, d in G.edges(data=True) if d.get("rel") == "same_as"
+    ]
+    results["same_as_links"] = len(same_as_edges)
+
+    # 6. 평균 차수
+    if G.number_of_nodes() > 0:
+        results["avg_degree"] = sum(dict(G.degree()).values()) / G.number_of_nodes()
+    else:
+        results["avg_degree"] = 0
+
+    # 7. 노드/엣지 통계
+    results["total_nodes"] = G.number_of_nodes()
+    results["total_edges"] = G.number_of_edges()
+
+    # 8. 추론된 관계 (inferred edges)
+    inferred_edges = [
+        (u, v, d.get("rel"))
+        for u, v, d in G.edges(data=True)
+        if d.get("inferred") == True
+    ]
+    results["inferred_edges_count"] = len(inferred_edges)
+    results["inferred_relation_types"] = sorted(
+        set([rel for u, v, rel in inferred_edges])
+    )
+
+    # 9. Critical path operations (criticality = HIGH)
+    critical_ops = [n for n, d in G.nodes(data=True) if d.get("criticality") == "HIGH"]
+    results["critical_operations"] = len(critical_ops)
+
+    _print_validation(results)
+    return results
+
+
+def _validate_csr(index: NetworkIndex) -> dict:
+    """validate_hvdc_ontology over NetworkIndex arrays (one pass to build, then vectorized)"""
+    results = {}
+    ids = index.ids
+
+    hvdc_nodes_present = [node for node in HVDC_NODE_IDS if node in ids]
+    results["hvdc_nodes_count"] = len(hvdc_nodes_present)
+    results["hvdc_nodes_list"] = hvdc_nodes_present
+
+    mosb = ids.get(HUB, -1)
+    results["mosb_incoming"] = int(np.count_nonzero(index.edge_v == mosb))
+    results["mosb_outgoing"] = int(np.count_nonzero(index.edge_u == mosb))
+
+    rel = index.edge_attrs["rel"]
+    rel_values = [None if value is MISSING else value for value in rel]
+    edge_types = set(rel_values)
+    results["edge_types_count"] = len(edge_types)
+    results["edge_types_list"] = sorted(edge_types)
+
+    ontology_class = index.node_attrs["ontology_class"]
+    results["ontology_classes"] = sorted(
+        {value for value in ontology_class.tolist() if value is not MISSING}
+    )
+
+    results["same_as_links"] = int(np.count_nonzero(rel == "same_as"))
+
+    # self-loops count twice in degree, once in the CSR
+    loops = int(np.count_nonzero(index.row_ids() == index.indices))
+    if len(index) > 0:
+        results["avg_degree"] = (len(index.indices) + loops) / len(index)
+    else:
+        results["avg_degree"] = 0
+
+    results["total_nodes"] = len(index)
+    results["total_edges"] = index.number_of_edges
+
+    inferred = np.asarray([value == True for value in index.edge_attrs["inferred"]], dtype=bool)  # noqa: E712
+    results["inferred_edges_count"] = int(inferred.sum())
+    results["inferred_relation_types"] = sorted(
+        {value for value, flag in zip(rel_values, inferred.tolist()) if flag}
+    )
+
+    results["critical_operations"] = int(
+        np.count_nonzero(index.node_attrs["criticality"] == "HIGH")
+    )
+    return results
+
+
+def _print_validation(results: dict) -> None:
+    print("\n" + "=" * 60)
+    print("[HVDC v3.0 ONTOLOGY VALIDATION]")
+    print("=" * 60)
+    print(f"[OK] HVDC Nodes: {results['hvdc_nodes_count']}/8")
+    print(f"     {results['hvdc_nodes_list']}")
+    print(
+        f"[OK] MOSB Hub: {results['mosb_incoming']} incoming, {results['mosb_outgoing']} outgoing"
+    )
+    print(f"[OK] Edge types: {results['edge_types_count']} (target: >=12)")
+    print(f"     {results['edge_types_list']}")
+    print(f"[OK] Ontology classes: {results['ontology_classes']}")
+    print(f"[OK] Same_as links: {results['same_as_links']}")
+    print(f"[OK] Avg degree: {results['avg_degree']:.2f} (target: >=3.2)")
+    print(f"[OK] Total: {results['total_nodes']} nodes, {results['total_edges']} edges")
+    print(f"[OK] Inferred edges: {results['inferred_edges_count']}")
+    print(f"     Types: {results['inferred_relation_types']}")
+    print(f"[OK] Critical operations: {results['critical_operations']}")
+    print("=" * 60)
+
+
+def print_rule_stats(stats: Dict[str, RuleStats]) -> None:
+    """Per-rule matches / fired / time of a RuleEngine evaluation"""
+    print("[RULES] rule                  matches    fired     time")
+    for name, rule_stats in stats.items():
+        print(
+            f"        {name:<20} {rule_stats.matches:>8} {rule_stats.fired:>8} "
+            f"{rule_stats.seconds:>7.3f}s"
+        )
+
+
+def detect_communities(G, index: Optional[NetworkIndex] = None, seed: int = 42) -> List[Set]:
+    """
+    Louvain communities
+
+    Args:
+        G: networkx.Graph
+        index: NetworkIndex of G for the CSR backend (None = networkx louvain_communities)
+        seed: Random seed
+
+    Returns:
+        list of node sets
+    """
+    if index is not None:
+        return index.louvain_communities(seed=seed)
+    from networkx.algorithms.community import louvain_communities
+
+    return louvain_communities(G, seed=seed)
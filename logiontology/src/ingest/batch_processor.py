@@ -1,7 +1,7 @@
 """Batch processing for multiple Excel files."""
 
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 import logging
 
 from src.ingest.excel_to_rdf import ExcelToRDFConverter
@@ -13,10 +13,17 @@ logger = logging.getLogger(__name__)
 class BatchProcessor:
     """Process multiple Excel files to RDF with validation."""
 
-    def __init__(self, validate: bool = True):
-        """Initialize batch processor."""
+    def __init__(self, validate: bool = True, workers: Optional[int] = None):
+        """
+        Initialize batch processor.
+
+        Args:
+            validate: Validate each converted graph against SHACL shapes
+            workers: Worker processes for SHACL focus-node partitions (None/1 = serial)
+        """
         self.converter = ExcelToRDFConverter()
-        self.validator = OntologyValidator() if validate else None
+        # shapes are compiled once and reused for every file
+        self.validator = OntologyValidator(workers=workers) if validate else None
         self.validate_flag = validate
 
     def process_directory(
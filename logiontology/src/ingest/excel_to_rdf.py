@@ -1,36 +1,110 @@
 """Excel to RDF converter for HVDC data."""
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from rdflib import Graph, Literal, Namespace, URIRef, RDF, XSD
-from typing import Optional
+from typing import Callable, Dict, Optional, Sequence, Tuple
 import logging
 
 from src.core.flow_models import FlowCode
 from src.integration.site_normalizer import SiteNormalizer
+from src.ontology.schema_index import SchemaIndex, load_schema_index
 
 logger = logging.getLogger(__name__)
 
 HVDC = Namespace("https://hvdc-project.com/ontology#")
+HVDC_ONTOLOGY_FILE = Path(__file__).parent.parent.parent / "configs" / "ontology" / "hvdc_ontology.ttl"
+
+# datatype properties written by the converter → datatype if the ontology has no XSD range
+LITERAL_DEFAULTS = {
+    HVDC.hasHVDCCode: XSD.string,
+    HVDC.weight: XSD.decimal,
+    HVDC.warehouseName: XSD.string,
+    HVDC.siteName: XSD.string,
+    HVDC.portName: XSD.string,
+}
+
+# source column aliases (first truthy value wins, same as the row path's `or` chains)
+COLUMN_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "hvdc_code": ("HVDC_CODE", "hvdc_code"),
+    "weight": ("WEIGHT", "weight"),
+    "warehouse": ("WAREHOUSE", "warehouse"),
+    "site": ("SITE", "site", "DESTINATION"),
+    "port": ("PORT", "port"),
+    "flow_code": ("FLOW_CODE", "flow_code"),
+    "wh_handling": ("WH_HANDLING", "wh_handling"),
+    "offshore": ("OFFSHORE", "offshore_flag"),
+    "pre_arrival": ("PRE_ARRIVAL", "is_pre_arrival"),
+}
+
+# entity column → (normalizer kind, link property, class, name property)
+ENTITIES = {
+    "warehouse": ("warehouse", HVDC.storedAt, HVDC.Warehouse, HVDC.warehouseName),
+    "site": ("site", HVDC.destinedTo, HVDC.Site, HVDC.siteName),
+    "port": ("port", HVDC.fromPort, HVDC.Port, HVDC.portName),
+}
+
+
+def _truthy(values: np.ndarray) -> np.ndarray:
+    """bool(value) per element, evaluated once per distinct value (NaN is truthy, None is not)"""
+    missing = pd.isna(values)
+    truth = np.empty(len(values), dtype=bool)
+    truth[missing] = np.not_equal(values[missing], None)
+    present = ~missing
+    if present.any():
+        codes, uniques = pd.factorize(values[present])
+        truth[present] = np.array([bool(u) for u in uniques], dtype=bool)[codes]
+    return truth
+
+
+def _map_unique(values: np.ndarray, func: Callable) -> np.ndarray:
+    """func(value) per element, evaluated once per distinct value"""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    return np.array([func(u) for u in uniques], dtype=object)[codes]
+
+
+def _entity_iri(kind: str, code: str) -> URIRef:
+    """Instance IRI of a normalized code (site codes are only lower-cased)"""
+    if kind == "site":
+        return HVDC[code.lower()]
+    return HVDC[code.lower().replace('_', '-')]
 
 
 class ExcelToRDFConverter:
     """Convert Excel logistics data to RDF format."""
 
-    def __init__(self):
-        """Initialize converter with graph and normalizer."""
+    def __init__(self, schema: Optional[SchemaIndex] = None):
+        """
+        Initialize converter with graph and normalizer.
+
+        Args:
+            schema: Ontology schema index for literal datatypes (None = in-process
+                cached index of hvdc_ontology.ttl)
+        """
         self.graph = Graph()
         self.graph.bind("hvdc", HVDC)
         self.normalizer = SiteNormalizer()
+        if schema is None:
+            schema = load_schema_index(HVDC_ONTOLOGY_FILE, disk=False)
+        self.schema = schema
+        self._datatypes = {
+            prop: self.schema.datatype_of(prop, default) for prop, default in LITERAL_DEFAULTS.items()
+        }
         self._cargo_counter = 0
 
-    def convert(self, excel_path: Path, output_path: Path) -> Graph:
+    def _literal(self, prop: URIRef, value) -> Literal:
+        """Literal typed by the property's rdfs:range (schema index lookup)"""
+        return Literal(value, datatype=self._datatypes[prop])
+
+    def convert(self, excel_path: Path, output_path: Path, vectorized: bool = True) -> Graph:
         """
         Convert Excel file to RDF TTL format.
 
         Args:
             excel_path: Path to input Excel file
             output_path: Path to output TTL file
+            vectorized: Columnar conversion (False = row by row)
 
         Returns:
             RDF Graph
@@ -41,9 +115,12 @@ class ExcelToRDFConverter:
         df = pd.read_excel(excel_path)
         logger.info(f"Loaded {len(df)} rows from Excel")
 
-        # Convert each row
-        for idx, row in df.iterrows():
-            self._convert_row(row, idx)
+        if vectorized:
+            self.convert_frame(df)
+        else:
+            # Convert each row
+            for idx, row in df.iterrows():
+                self._convert_row(row, idx)
 
         # Serialize to TTL
         self.graph.serialize(destination=output_path, format="turtle")
@@ -51,6 +128,107 @@ class ExcelToRDFConverter:
 
         return self.graph
 
+    def convert_frame(self, df: pd.DataFrame) -> Graph:
+        """
+        Convert a DataFrame column by column (same triples as _convert_row per row).
+
+        Column aliases are resolved once, entity columns are normalized once per
+        distinct value, warehouse/site/port instance triples are emitted once per
+        distinct entity and flow codes are computed on arrays.
+
+        Args:
+            df: Source rows
+
+        Returns:
+            RDF Graph
+        """
+        n = len(df)
+        if n == 0:
+            return self.graph
+        # iterrows() upcasts rows to the frame's common dtype; match its values
+        common = df.iloc[:0].to_numpy().dtype
+        columns = {
+            name: (df[name] if common == object else df[name].astype(common)).to_numpy(dtype=object)
+            for name in set(df.columns)
+        }
+        fields = {key: self._first_truthy(columns, aliases, n) for key, aliases in COLUMN_ALIASES.items()}
+
+        # Cargo IRIs and codes
+        hvdc_code, has_code = fields["hvdc_code"]
+        hvdc_code = hvdc_code.copy()
+        hvdc_code[~has_code] = [f"AUTO-{idx:04d}" for idx in df.index[~has_code]]
+        code_prop, code_dt = HVDC.hasHVDCCode, self._datatypes[HVDC.hasHVDCCode]
+        cargo_prefix = str(HVDC) + "cargo-"
+        cargo = np.array([URIRef(f"{cargo_prefix}{code}") for code in hvdc_code], dtype=object)
+
+        rdf_type, cargo_cls = RDF.type, HVDC.Cargo
+        triples = [(c, rdf_type, cargo_cls) for c in cargo]
+        triples += [(c, code_prop, Literal(code, datatype=code_dt)) for c, code in zip(cargo, hvdc_code)]
+
+        weight, has_weight = fields["weight"]
+        has_weight &= pd.notna(weight)
+        weight_literals = _map_unique(weight[has_weight], lambda w: self._literal(HVDC.weight, float(w)))
+        triples += zip(cargo[has_weight], [HVDC.weight] * len(weight_literals), weight_literals)
+
+        # Warehouse / site / port links, instances once per distinct entity
+        for field, (kind, link, cls, name_prop) in ENTITIES.items():
+            values, present = fields[field]
+            present &= pd.notna(values)
+            codes = np.empty(n, dtype=object)
+            if present.any():
+                raw, uniques = pd.factorize(values[present], use_na_sentinel=False)
+                normalized = self.normalizer.normalize_series([str(u) for u in uniques], kind, to="code")
+                codes[present] = normalized.to_numpy(dtype=object)[raw]
+            linked = present & np.not_equal(codes, None)
+            entities = {code: _entity_iri(kind, code) for code in pd.unique(codes[linked])}
+            triples += zip(cargo[linked], [link] * int(linked.sum()), [entities[code] for code in codes[linked]])
+            for code, iri in entities.items():
+                triples.append((iri, RDF.type, cls))
+                triples.append((iri, name_prop, self._literal(name_prop, code)))
+
+        flow = self._flow_codes(fields, n)
+        flow_iris = {code: HVDC[f"flow-code-{code}"] for code in pd.unique(flow)}
+        flow_prop = HVDC.hasFlowCode
+        triples += [(c, flow_prop, flow_iris[code]) for c, code in zip(cargo, flow)]
+
+        graph = self.graph
+        graph.addN((s, p, o, graph) for s, p, o in triples)
+        return self.graph
+
+    @staticmethod
+    def _first_truthy(
+        columns: Dict[str, np.ndarray], aliases: Sequence[str], n: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(value of the first alias column with a truthy value, found mask) per row"""
+        values = np.full(n, None, dtype=object)
+        found = np.zeros(n, dtype=bool)
+        for alias in aliases:
+            if alias not in columns:
+                continue
+            take = _truthy(columns[alias]) & ~found
+            values[take] = columns[alias][take]
+            found |= take
+        return values, found
+
+    @staticmethod
+    def _flow_codes(fields: Dict[str, Tuple[np.ndarray, np.ndarray]], n: int) -> np.ndarray:
+        """Vectorized _calculate_flow_code (explicit code, else pre-arrival 0, else 1 + WH + offshore clipped)"""
+        explicit, has_explicit = fields["flow_code"]
+        has_explicit = has_explicit & pd.notna(explicit)
+        pre_arrival = fields["pre_arrival"][1] & ~has_explicit
+        inferred = ~has_explicit & ~pre_arrival
+
+        wh_values, wh_found = fields["wh_handling"]
+        wh = np.zeros(n, dtype=np.int64)
+        counted = inferred & wh_found
+        wh[counted] = _map_unique(wh_values[counted], int).astype(np.int64)
+        offshore = fields["offshore"][1].astype(np.int64)
+
+        codes = np.clip(1 + wh + offshore, 1, 4)
+        codes[pre_arrival] = 0
+        codes[has_explicit] = _map_unique(explicit[has_explicit], int).astype(np.int64)
+        return codes
+
     def _convert_row(self, row: pd.Series, idx: int):
         """Convert single Excel row to RDF triples."""
         # Generate cargo IRI
@@ -61,48 +239,48 @@ class ExcelToRDFConverter:
         self.graph.add((cargo_iri, RDF.type, HVDC.Cargo))
 
         # Add HVDC code
-        self.graph.add((cargo_iri, HVDC.hasHVDCCode, Literal(hvdc_code, datatype=XSD.string)))
+        self.graph.add((cargo_iri, HVDC.hasHVDCCode, self._literal(HVDC.hasHVDCCode, hvdc_code)))
 
         # Add weight if available
         weight = row.get('WEIGHT') or row.get('weight')
         if weight and pd.notna(weight):
-            self.graph.add((cargo_iri, HVDC.weight, Literal(float(weight), datatype=XSD.decimal)))
+            self.graph.add((cargo_iri, HVDC.weight, self._literal(HVDC.weight, float(weight))))
 
         # Add warehouse relationship
         warehouse = row.get('WAREHOUSE') or row.get('warehouse')
         if warehouse and pd.notna(warehouse):
-            wh_code = self.normalizer.normalize_code(str(warehouse))
+            wh_code = self.normalizer.normalize_code(str(warehouse), "warehouse")
             if wh_code:
                 wh_iri = HVDC[wh_code.lower().replace('_', '-')]
                 self.graph.add((cargo_iri, HVDC.storedAt, wh_iri))
 
                 # Ensure warehouse exists as instance
                 self.graph.add((wh_iri, RDF.type, HVDC.Warehouse))
-                self.graph.add((wh_iri, HVDC.warehouseName, Literal(wh_code, datatype=XSD.string)))
+                self.graph.add((wh_iri, HVDC.warehouseName, self._literal(HVDC.warehouseName, wh_code)))
 
         # Add site relationship
         site = row.get('SITE') or row.get('site') or row.get('DESTINATION')
         if site and pd.notna(site):
-            site_code = self.normalizer.normalize_code(str(site))
+            site_code = self.normalizer.normalize_code(str(site), "site")
             if site_code:
                 site_iri = HVDC[site_code.lower()]
                 self.graph.add((cargo_iri, HVDC.destinedTo, site_iri))
 
                 # Ensure site exists as instance
                 self.graph.add((site_iri, RDF.type, HVDC.Site))
-                self.graph.add((site_iri, HVDC.siteName, Literal(site_code, datatype=XSD.string)))
+                self.graph.add((site_iri, HVDC.siteName, self._literal(HVDC.siteName, site_code)))
 
         # Add port if available
         port = row.get('PORT') or row.get('port')
         if port and pd.notna(port):
-            port_code = self.normalizer.normalize_code(str(port))
+            port_code = self.normalizer.normalize_code(str(port), "port")
             if port_code:
                 port_iri = HVDC[port_code.lower().replace('_', '-')]
                 self.graph.add((cargo_iri, HVDC.fromPort, port_iri))
 
                 # Ensure port exists
                 self.graph.add((port_iri, RDF.type, HVDC.Port))
-                self.graph.add((port_iri, HVDC.portName, Literal(port_code, datatype=XSD.string)))
+                self.graph.add((port_iri, HVDC.portName, self._literal(HVDC.portName, port_code)))
 
         # Calculate and add flow code
         flow_code = self._calculate_flow_code(row)
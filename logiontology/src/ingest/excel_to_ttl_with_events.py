@@ -70,174 +70,148 @@ def _get_location_name(row: pd.Series, cols: List[str], target_date: datetime) -
     return None
 
 
-def inject_events_to_case(g: Graph, case_uri, row: pd.Series,
-                          wh_cols: List[str], site_cols: List[str]) -> Dict:
+def _first_event(row: pd.Series, cols: List[str]) -> Optional[Tuple[datetime, str]]:
+    """컬럼 리스트에서 최소 날짜와 해당 위치명"""
+    min_date = _pick_min_date_from_cols(row, cols)
+    if min_date:
+        name = _get_location_name(row, cols, min_date)
+        if name:
+            return min_date, name
+    return None
+
+
+def derive_case_events(row: pd.Series, wh_cols: List[str],
+                       site_cols: List[str]) -> Tuple[List[Tuple[str, datetime, str, float]], bool]:
     """
-    FLOW_CODE 기반 이벤트 주입
+    FLOW_CODE 기반 Inbound/Outbound 이벤트 도출 (그래프 비의존)
 
     Args:
-        g: RDF Graph
-        case_uri: Case URI
         row: DataFrame 행
         wh_cols: 창고 컬럼 리스트
         site_cols: 사이트 컬럼 리스트
 
     Returns:
-        dict: {"inbound_count": int, "outbound_count": int, "skipped": bool}
+        tuple: ([(direction, date, location, quantity), ...], skipped)
     """
     flow = str(row.get("FLOW_CODE", "")).strip()
-    stats = {"inbound_count": 0, "outbound_count": 0, "skipped": False}
 
-    # FLOW_CODE 없으면 건너뜀
-    if not flow or flow not in ["0", "1", "2", "3", "4", "5"]:
-        stats["skipped"] = True
-        return stats
+    # FLOW_CODE 없으면 건너뜀, Flow 0: Pre Arrival → 이벤트 없음
+    if not flow or flow not in ["0", "1", "2", "3", "4", "5"] or flow == "0":
+        return [], True
 
-    # Flow 0: Pre Arrival → 이벤트 없음
-    if flow == "0":
-        stats["skipped"] = True
-        return stats
+    # FLOW 5: Mixed/Incomplete (혼합 케이스)
+    # TODO: 비즈니스 룰 확인 필요
+    if flow == "5":
+        return [], True
 
     # 수량 (Pkg 없으면 1.00)
     quantity = row.get("Pkg", 1.0)
     if pd.isna(quantity):
         quantity = 1.0
+    quantity = float(quantity)
+
+    events = []
 
     # FLOW 1: 직송 (Site 입고만)
     if flow == "1":
-        site_min_date = _pick_min_date_from_cols(row, site_cols)
-        if site_min_date:
-            site_name = _get_location_name(row, site_cols, site_min_date)
-            if site_name:
-                inbound_event = BNode()
-                g.add((case_uri, HVDC.hasInboundEvent, inbound_event))
-                g.add((inbound_event, RDF.type, HVDC.StockEvent))
-                g.add((inbound_event, HVDC.hasEventDate,
-                       Literal(site_min_date.date(), datatype=XSD.date)))
-                g.add((inbound_event, HVDC.hasLocationAtEvent,
-                       Literal(site_name, datatype=XSD.string)))
-                g.add((inbound_event, HVDC.hasQuantity,
-                       Literal(float(quantity), datatype=XSD.decimal)))
-                stats["inbound_count"] = 1
-
-    # FLOW 2: 창고 경유
-    elif flow == "2":
-        # Inbound: 창고 최소 날짜
-        wh_min_date = _pick_min_date_from_cols(row, wh_cols)
-        if wh_min_date:
-            wh_name = _get_location_name(row, wh_cols, wh_min_date)
-            if wh_name:
-                inbound_event = BNode()
-                g.add((case_uri, HVDC.hasInboundEvent, inbound_event))
-                g.add((inbound_event, RDF.type, HVDC.StockEvent))
-                g.add((inbound_event, HVDC.hasEventDate,
-                       Literal(wh_min_date.date(), datatype=XSD.date)))
-                g.add((inbound_event, HVDC.hasLocationAtEvent,
-                       Literal(wh_name, datatype=XSD.string)))
-                g.add((inbound_event, HVDC.hasQuantity,
-                       Literal(float(quantity), datatype=XSD.decimal)))
-                stats["inbound_count"] = 1
-
-        # Outbound: 사이트 최소 날짜
-        site_min_date = _pick_min_date_from_cols(row, site_cols)
-        if site_min_date:
-            site_name = _get_location_name(row, site_cols, site_min_date)
-            if site_name:
-                outbound_event = BNode()
-                g.add((case_uri, HVDC.hasOutboundEvent, outbound_event))
-                g.add((outbound_event, RDF.type, HVDC.StockEvent))
-                g.add((outbound_event, HVDC.hasEventDate,
-                       Literal(site_min_date.date(), datatype=XSD.date)))
-                g.add((outbound_event, HVDC.hasLocationAtEvent,
-                       Literal(site_name, datatype=XSD.string)))
-                g.add((outbound_event, HVDC.hasQuantity,
-                       Literal(float(quantity), datatype=XSD.decimal)))
-                stats["outbound_count"] = 1
-
-    # FLOW 3: Port → MOSB → Site (MOSB 경유)
-    elif flow == "3":
-        # MOSB 컬럼 찾기
+        inbound = _first_event(row, site_cols)
+        outbound = None
+
+    # FLOW 2: 창고 경유 / FLOW 4: Port → WH → MOSB → Site (창고 입고 → 사이트 출고)
+    elif flow in ("2", "4"):
+        inbound = _first_event(row, wh_cols)
+        outbound = _first_event(row, site_cols)
+
+    # FLOW 3: Port → MOSB → Site (MOSB 입고 → 사이트 출고)
+    else:
         mosb_cols = [col for col in wh_cols + site_cols if 'MOSB' in col.upper()]
+        inbound = _first_event(row, mosb_cols) if mosb_cols else None
+        outbound = _first_event(row, site_cols)
 
-        # Inbound: MOSB 날짜
-        if mosb_cols:
-            mosb_date = _pick_min_date_from_cols(row, mosb_cols)
-            if mosb_date:
-                mosb_name = _get_location_name(row, mosb_cols, mosb_date)
-                if mosb_name:
-                    inbound_event = BNode()
-                    g.add((case_uri, HVDC.hasInboundEvent, inbound_event))
-                    g.add((inbound_event, RDF.type, HVDC.StockEvent))
-                    g.add((inbound_event, HVDC.hasEventDate,
-                           Literal(mosb_date.date(), datatype=XSD.date)))
-                    g.add((inbound_event, HVDC.hasLocationAtEvent,
-                           Literal(mosb_name, datatype=XSD.string)))
-                    g.add((inbound_event, HVDC.hasQuantity,
-                           Literal(float(quantity), datatype=XSD.decimal)))
-                    stats["inbound_count"] = 1
-
-        # Outbound: Site 최종 날짜
-        site_min_date = _pick_min_date_from_cols(row, site_cols)
-        if site_min_date:
-            site_name = _get_location_name(row, site_cols, site_min_date)
-            if site_name:
-                outbound_event = BNode()
-                g.add((case_uri, HVDC.hasOutboundEvent, outbound_event))
-                g.add((outbound_event, RDF.type, HVDC.StockEvent))
-                g.add((outbound_event, HVDC.hasEventDate,
-                       Literal(site_min_date.date(), datatype=XSD.date)))
-                g.add((outbound_event, HVDC.hasLocationAtEvent,
-                       Literal(site_name, datatype=XSD.string)))
-                g.add((outbound_event, HVDC.hasQuantity,
-                       Literal(float(quantity), datatype=XSD.decimal)))
-                stats["outbound_count"] = 1
-
-    # FLOW 4: Port → WH → MOSB → Site (창고+MOSB 경유)
-    elif flow == "4":
-        # Inbound: 창고 최소 날짜
-        wh_min_date = _pick_min_date_from_cols(row, wh_cols)
-        if wh_min_date:
-            wh_name = _get_location_name(row, wh_cols, wh_min_date)
-            if wh_name:
-                inbound_event = BNode()
-                g.add((case_uri, HVDC.hasInboundEvent, inbound_event))
-                g.add((inbound_event, RDF.type, HVDC.StockEvent))
-                g.add((inbound_event, HVDC.hasEventDate,
-                       Literal(wh_min_date.date(), datatype=XSD.date)))
-                g.add((inbound_event, HVDC.hasLocationAtEvent,
-                       Literal(wh_name, datatype=XSD.string)))
-                g.add((inbound_event, HVDC.hasQuantity,
-                       Literal(float(quantity), datatype=XSD.decimal)))
-                stats["inbound_count"] = 1
-
-        # Outbound: Site 최종 날짜
-        site_min_date = _pick_min_date_from_cols(row, site_cols)
-        if site_min_date:
-            site_name = _get_location_name(row, site_cols, site_min_date)
-            if site_name:
-                outbound_event = BNode()
-                g.add((case_uri, HVDC.hasOutboundEvent, outbound_event))
-                g.add((outbound_event, RDF.type, HVDC.StockEvent))
-                g.add((outbound_event, HVDC.hasEventDate,
-                       Literal(site_min_date.date(), datatype=XSD.date)))
-                g.add((outbound_event, HVDC.hasLocationAtEvent,
-                       Literal(site_name, datatype=XSD.string)))
-                g.add((outbound_event, HVDC.hasQuantity,
-                       Literal(float(quantity), datatype=XSD.decimal)))
-                stats["outbound_count"] = 1
+    if inbound:
+        events.append(("inbound", inbound[0], inbound[1], quantity))
+    if outbound:
+        events.append(("outbound", outbound[0], outbound[1], quantity))
+    return events, False
 
-    # FLOW 5: Mixed/Incomplete (혼합 케이스)
-    elif flow == "5":
-        # 혼합 케이스: 제한적 이벤트 생성
-        # TODO: 비즈니스 룰 확인 필요
-        stats["skipped"] = True
+
+def inject_events_to_case(g: Graph, case_uri, row: pd.Series,
+                          wh_cols: List[str], site_cols: List[str]) -> Dict:
+    """
+    FLOW_CODE 기반 이벤트 주입
+
+    Args:
+        g: RDF Graph
+        case_uri: Case URI
+        row: DataFrame 행
+        wh_cols: 창고 컬럼 리스트
+        site_cols: 사이트 컬럼 리스트
+
+    Returns:
+        dict: {"inbound_count": int, "outbound_count": int, "skipped": bool}
+    """
+    events, skipped = derive_case_events(row, wh_cols, site_cols)
+    return _add_event_triples(g, case_uri, events, skipped)
+
+
+def _add_event_triples(g: Graph, case_uri, events: List[Tuple[str, datetime, str, float]],
+                       skipped: bool) -> Dict:
+    """도출된 이벤트를 StockEvent BNode로 그래프에 추가"""
+    stats = {"inbound_count": 0, "outbound_count": 0, "skipped": skipped}
+
+    for direction, event_date, location, quantity in events:
+        link = HVDC.hasInboundEvent if direction == "inbound" else HVDC.hasOutboundEvent
+        event = BNode()
+        g.add((case_uri, link, event))
+        g.add((event, RDF.type, HVDC.StockEvent))
+        g.add((event, HVDC.hasEventDate,
+               Literal(event_date.date(), datatype=XSD.date)))
+        g.add((event, HVDC.hasLocationAtEvent,
+               Literal(location, datatype=XSD.string)))
+        g.add((event, HVDC.hasQuantity,
+               Literal(quantity, datatype=XSD.decimal)))
+        stats[f"{direction}_count"] = 1
 
     return stats
 
 
+def _float_or_none(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _case_table_row(case_id: str, row: pd.Series) -> Dict:
+    """Case 테이블 행 (TTL Case 속성과 동일한 변환 규칙)"""
+    def text(col):
+        value = row.get(col)
+        return str(value) if pd.notna(value) else None
+
+    def number(col):
+        value = row.get(col)
+        return _float_or_none(value) if pd.notna(value) else None
+
+    flow_orig = row.get("FLOW_CODE_ORIG")
+    return {
+        "case_id": case_id,
+        "hvdc_code": text("HVDC CODE"),
+        "flow_code": text("FLOW_CODE"),
+        "flow_code_original": int(flow_orig) if pd.notna(flow_orig) else None,
+        "flow_override_reason": text("FLOW_OVERRIDE_REASON"),
+        "flow_description": text("FLOW_DESCRIPTION"),
+        "final_location": text("Final_Location"),
+        "vendor": text("VENDOR"),
+        "gross_weight": number("G.W(KG)"),
+        "net_weight": number("N.W(kgs)"),
+        "cbm": number("CBM"),
+    }
+
+
 def convert_data_wh_to_ttl_with_events(excel_path: str, output_path: str,
                                         schema_path: Optional[str] = None,
-                                        flow_version: str = "3.5") -> Dict:
+                                        flow_version: str = "3.5",
+                                        parquet_dir: Optional[str] = None) -> Dict:
     """
     DATA WH.xlsx를 이벤트 기반 TTL로 변환
 
@@ -246,6 +220,8 @@ def convert_data_wh_to_ttl_with_events(excel_path: str, output_path: str,
         output_path: 출력 TTL 파일 경로
         schema_path: 온톨로지 스키마 TTL 경로 (선택)
         flow_version: Flow Code 버전 ("3.4" 또는 "3.5", 기본값: "3.5")
+        parquet_dir: Case/Event Parquet 저장소 디렉토리 (선택). 같은 실행에서
+            TTL과 동일한 Case_NNNNN 키로 cases/events/overrides.parquet 생성
 
     Returns:
         dict: 변환 통계
@@ -329,12 +305,31 @@ def convert_data_wh_to_ttl_with_events(excel_path: str, output_path: str,
         "skipped_no_date": 0
     }
 
+    # Parquet 출력용 테이블 행
+    case_rows: List[Dict] = []
+    event_rows: List[Dict] = []
+
     # 6) 각 행을 Case로 변환 + 이벤트 주입
     print("\nStarting RDF conversion...")
     for idx, row in df.iterrows():
-        case_uri = HVDC[f"Case_{idx+1:05d}"]
+        case_id = f"Case_{idx+1:05d}"
+        case_uri = HVDC[case_id]
         g.add((case_uri, RDF.type, HVDC.Case))
 
+        events, skipped = derive_case_events(row, wh_cols, site_cols)
+        if parquet_dir:
+            case_rows.append(_case_table_row(case_id, row))
+            event_rows.extend(
+                {
+                    "case_id": case_id,
+                    "direction": direction,
+                    "event_date": event_date.date().isoformat(),
+                    "location": location,
+                    "quantity": quantity,
+                }
+                for direction, event_date, location, quantity in events
+            )
+
         # 기본 속성
         if pd.notna(row.get("FLOW_CODE")):
             g.add((case_uri, HVDC.hasFlowCode,
@@ -388,7 +383,7 @@ def convert_data_wh_to_ttl_with_events(excel_path: str, output_path: str,
                 pass
 
         # 이벤트 주입
-        event_stats = inject_events_to_case(g, case_uri, row, wh_cols, site_cols)
+        event_stats = _add_event_triples(g, case_uri, events, skipped)
 
         stats["cases_created"] += 1
         stats["inbound_events"] += event_stats["inbound_count"]
@@ -407,6 +402,15 @@ def convert_data_wh_to_ttl_with_events(excel_path: str, output_path: str,
     g.serialize(destination=output_path, format="turtle")
     print(f"\nSUCCESS: TTL saved: {output_path}")
 
+    # 8) Parquet 저장 (선택, TTL 왕복 없이 분석용 테이블 제공)
+    if parquet_dir:
+        from ..export.parquet_store import write_case_parquet
+        from ..export.view_engine import finalize_tables
+
+        tables = finalize_tables(pd.DataFrame(case_rows), pd.DataFrame(event_rows))
+        stats["parquet"] = write_case_parquet(tables, parquet_dir)
+        print(f"SUCCESS: Parquet saved: {parquet_dir}")
+
     return stats
 
 
@@ -416,7 +420,7 @@ if __name__ == "__main__":
     import io
 
     if len(sys.argv) < 3:
-        print("Usage: python excel_to_ttl_with_events.py <excel_path> <output_path> [schema_path]")
+        print("Usage: python excel_to_ttl_with_events.py <excel_path> <output_path> [schema_path] [parquet_dir]")
         sys.exit(1)
 
     # Windows console encoding fix
@@ -425,8 +429,10 @@ if __name__ == "__main__":
     excel_path = sys.argv[1]
     output_path = sys.argv[2]
     schema_path = sys.argv[3] if len(sys.argv) > 3 else None
+    parquet_dir = sys.argv[4] if len(sys.argv) > 4 else None
 
-    stats = convert_data_wh_to_ttl_with_events(excel_path, output_path, schema_path)
+    stats = convert_data_wh_to_ttl_with_events(excel_path, output_path, schema_path,
+                                               parquet_dir=parquet_dir)
 
     print("\nConversion Statistics:")
     print(f"   - Total rows: {stats.get('total_rows', 0)}")
@@ -0,0 +1,201 @@
+"""
+HVDC Invoice RDF Builder v1.0
+Column-wise invoice sheet → RDF conversion (typed normalization, bulk triple emission)
+"""
+
+from __future__ import annotations
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+from rdflib import Graph, Literal, Namespace, RDF, URIRef, XSD
+
+# type_conversion: date 값에 순서대로 시도하는 형식
+DATE_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%Y-%m-%d %H:%M:%S"]
+
+SHIPMENT_PREFIX = "HVDC-ADOPT-"
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _normalize_dates(values: pd.Series, out: List[Optional[str]]) -> None:
+    """Present values (positional index) → 'YYYY-MM-DD' into out; strings parsed column-wise per format"""
+    if values.empty:
+        return
+
+    dates = values[values.map(lambda v: isinstance(v, datetime)).astype(bool)]
+    for pos, value in zip(dates.index, dates.tolist()):
+        out[pos] = value.strftime("%Y-%m-%d")
+
+    strings = values[values.map(lambda v: isinstance(v, str)).astype(bool)]
+    if strings.empty:
+        return
+    # 숫자만 있는 경우 (예: "0", "150")는 날짜가 아님
+    remaining = strings[~strings.str.isdigit().astype(bool)]
+    for fmt in DATE_FORMATS:
+        if remaining.empty:
+            break
+        parsed = pd.to_datetime(remaining, format=fmt, errors="coerce")
+        ok = parsed.notna().to_numpy()
+        if ok.any():
+            formatted = parsed[ok].dt.strftime("%Y-%m-%d")
+            for pos, value in zip(formatted.index, formatted.tolist()):
+                out[pos] = value
+        remaining = remaining[~ok]
+
+
+def normalize_column(values: pd.Series, target_type: Optional[str] = None) -> List[Any]:
+    """
+    Normalize one mapped column (column-wise equivalent of per-cell normalize_value)
+
+    Missing and "" cells become None, strings are stripped, then the
+    business_rules.type_conversion type is applied: "decimal" → float (None if
+    unparseable), "date" → 'YYYY-MM-DD' (None if unparseable).
+
+    Args:
+        values: Column as read from the sheet
+        target_type: "decimal", "date" or None
+
+    Returns:
+        list: One value per row, None where no value is emitted
+    """
+    values = values.reset_index(drop=True)
+    obj = values.astype(object)
+    is_str = obj.map(lambda v: isinstance(v, str)).astype(bool)
+    present = (obj.notna() & ~(is_str & obj.eq(""))).tolist()
+    if is_str.any():
+        obj[is_str] = obj[is_str].str.strip()
+
+    if target_type == "date":
+        if is_datetime64_any_dtype(values.dtype):
+            formatted = values.dt.strftime("%Y-%m-%d").astype(object).tolist()
+            return [v if keep else None for v, keep in zip(formatted, present)]
+        out: List[Any] = [None] * len(values)
+        _normalize_dates(obj[present], out)
+        return out
+
+    if target_type == "decimal":
+        if is_numeric_dtype(values.dtype):
+            floats = values.astype(float).tolist()
+            return [v if keep else None for v, keep in zip(floats, present)]
+        items = obj.tolist()
+        converted = {v: _to_float(v) for v in pd.unique(obj[present])}
+        return [converted[v] if keep else None for v, keep in zip(items, present)]
+
+    return [v if keep else None for v, keep in zip(obj.tolist(), present)]
+
+
+def compile_invoice_properties(
+    rules: Dict[str, Any], ns_dict: Dict[str, Namespace]
+) -> List[Tuple[str, URIRef, str, Optional[str]]]:
+    """
+    entity_mapping.invoice.properties → [(field, property URI, datatype, type_conversion)]
+
+    Resolved once per sheet instead of once per row.
+    """
+    type_conversion = rules.get("business_rules", {}).get("type_conversion", {})
+    properties = rules.get("entity_mapping", {}).get("invoice", {}).get("properties", [])
+    return [
+        (
+            prop["field"],
+            ns_dict["hvdc"][prop["property"].split(":")[1]],
+            prop.get("datatype", "xsd:string"),
+            type_conversion.get(prop["field"]),
+        )
+        for prop in properties
+    ]
+
+
+def _literal(value: Any, datatype: str) -> Optional[Literal]:
+    if datatype == "xsd:date":
+        # 날짜 형식이 올바른지 확인 (YYYY-MM-DD)
+        if isinstance(value, str) and len(value) == 10 and value.count("-") == 2:
+            return Literal(value, datatype=XSD.date)
+        return None
+    if datatype == "xsd:decimal":
+        return Literal(value, datatype=XSD.decimal)
+    return Literal(str(value))
+
+
+def safe_shipment_code(shipment_ref: str) -> str:
+    """HVDC-ADOPT- 접두사 제거 후 URI에 쓸 수 없는 문자를 '_'로 변환"""
+    return re.sub(r"[^\w\-]", "_", shipment_ref.replace(SHIPMENT_PREFIX, ""))
+
+
+def invoice_rows_to_graph(
+    df: pd.DataFrame,
+    rules: Dict[str, Any],
+    ns_dict: Dict[str, Namespace],
+    graph: Optional[Graph] = None,
+) -> Graph:
+    """
+    Filtered invoice rows → RDF graph
+
+    Rows need a non-empty string shipment_reference. Each mapped property column
+    is normalized once, literals are built once per distinct value, and triples
+    are added in bulk.
+
+    Args:
+        df: Sheet with mapped field columns (after business filters)
+        rules: Mapping rules (entity_mapping, business_rules)
+        ns_dict: Prefix → Namespace (needs hvdc, hvdci)
+        graph: Graph to add to (None = new graph with ns_dict bound)
+
+    Returns:
+        Graph
+    """
+    if graph is None:
+        graph = Graph()
+        for prefix, ns in ns_dict.items():
+            graph.bind(prefix, ns)
+
+    if "shipment_reference" not in df.columns:
+        return graph
+    refs = df["shipment_reference"].astype(object)
+    valid = refs.map(lambda v: isinstance(v, str) and v != "").astype(bool)
+    if not valid.any():
+        return graph
+    rows = df[valid.to_numpy()]
+    refs = refs[valid]
+
+    hvdc, hvdci = ns_dict["hvdc"], ns_dict["hvdci"]
+    stamp = datetime.now().strftime("%Y%m%d")
+    invoices, shipments = {}, {}
+    for ref in pd.unique(refs):
+        code = safe_shipment_code(ref)
+        invoices[ref] = URIRef(f"{hvdci}Invoice/{code}_{stamp}")
+        shipments[ref] = URIRef(f"{hvdci}Shipment/{code}")
+    subjects = [invoices[ref] for ref in refs]
+
+    # 같은 shipment_reference 행들은 같은 Invoice로 합쳐지므로 중복 제거 후 일괄 추가
+    triples = {}
+    invoice_class = hvdc["Invoice"]
+    related = hvdc["relatedShipment"]
+    for ref, invoice in invoices.items():
+        triples[(invoice, RDF.type, invoice_class)] = None
+        triples[(invoice, related, shipments[ref])] = None
+
+    for field, property_uri, datatype, target_type in compile_invoice_properties(rules, ns_dict):
+        if field not in rows.columns:
+            continue
+        # 1 == 1.0 == True 이므로 타입까지 키에 포함
+        literals: Dict[Tuple[type, Any], Optional[Literal]] = {}
+        for subject, value in zip(subjects, normalize_column(rows[field], target_type)):
+            if value is None:
+                continue
+            key = (type(value), value)
+            if key not in literals:
+                literals[key] = _literal(value, datatype)
+            literal = literals[key]
+            if literal is not None:
+                triples[(subject, property_uri, literal)] = None
+
+    graph.addN((s, p, o, graph) for s, p, o in triples)
+    return graph
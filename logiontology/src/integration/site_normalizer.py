@@ -1,97 +1,236 @@
 """
-HVDC Site/WH Code Normalizer v1.0
-Normalizes site and warehouse codes to standard HVDC nomenclature
+HVDC Site/WH Code Normalizer v1.1
+Normalizes site, warehouse and port codes to standard HVDC nomenclature
+(aliases from configs/site_aliases.yaml, hashed key lookup, memoized,
+optional fuzzy fallback, bulk normalize_series)
 """
 
-from typing import Dict, Optional
-
-# HVDC Site Codes (from ontology/HVDC.MD v3.0)
-SITE_CODES: Dict[str, str] = {
-    "AGI": "Al Ghallan Island",
-    "AL GHALLAN": "Al Ghallan Island",
-    "AL_GHALLAN": "Al Ghallan Island",
-    "ALGHALLAN": "Al Ghallan Island",
-
-    "DAS": "Das Island",
-    "DAS ISLAND": "Das Island",
-    "DAS_ISLAND": "Das Island",
-    "DASISLAND": "Das Island",
-
-    "MIR": "Mirfa Site",
-    "MIRFA": "Mirfa Site",
-    "MIRFA SITE": "Mirfa Site",
-    "MIRFA_SITE": "Mirfa Site",
-
-    "SHU": "Shuweihat Site",
-    "SHUWEIHAT": "Shuweihat Site",
-    "SHUWEIHAT SITE": "Shuweihat Site",
-    "SHUWEIHAT_SITE": "Shuweihat Site",
-}
-
-# Reverse mapping: full name → code
-SITE_CODE_REVERSE: Dict[str, str] = {
-    "Al Ghallan Island": "AGI",
-    "Das Island": "DAS",
-    "Mirfa Site": "MIR",
-    "Shuweihat Site": "SHU",
-}
-
-# Warehouse Codes
-WH_CODES: Dict[str, str] = {
-    "DSV": "DSV Indoor Warehouse",
-    "DSV INDOOR": "DSV Indoor Warehouse",
-    "DSV_INDOOR": "DSV Indoor Warehouse",
-    "DSVINDOOR": "DSV Indoor Warehouse",
-
-    "MOSB": "Mussafah Offshore Supply Base",
-    "MUSSAFAH": "Mussafah Offshore Supply Base",
-    "MUSSAFAH OFFSHORE": "Mussafah Offshore Supply Base",
-    "MUSSAFAH_OFFSHORE": "Mussafah Offshore Supply Base",
-}
-
-# Reverse mapping: full name → code
-WH_CODE_REVERSE: Dict[str, str] = {
-    "DSV Indoor Warehouse": "DSV",
-    "Mussafah Offshore Supply Base": "MOSB",
-}
-
-# Port Codes (from ontology/HVDC.MD v3.0)
-PORT_CODES: Dict[str, str] = {
-    "ZAYED": "Zayed Port",
-    "ZAYED PORT": "Zayed Port",
-    "ZAYED_PORT": "Zayed Port",
-    "PORT ZAYED": "Zayed Port",
-    "AEZYD": "Zayed Port",
-
-    "KHALIFA": "Khalifa Port",
-    "KHALIFA PORT": "Khalifa Port",
-    "KHALIFA_PORT": "Khalifa Port",
-    "PORT KHALIFA": "Khalifa Port",
-    "AEKHL": "Khalifa Port",
-
-    "JEBEL ALI": "Jebel Ali Port",
-    "JEBEL_ALI": "Jebel Ali Port",
-    "JEBEL ALI PORT": "Jebel Ali Port",
-    "JEBEL_ALI_PORT": "Jebel Ali Port",
-    "PORT JEBEL ALI": "Jebel Ali Port",
-    "AEJEA": "Jebel Ali Port",
-}
-
-# Reverse mapping: full name → code
-PORT_CODE_REVERSE: Dict[str, str] = {
-    "Zayed Port": "ZAYED_PORT",
-    "Khalifa Port": "KHALIFA_PORT",
-    "Jebel Ali Port": "JEBEL_ALI_PORT",
-}
+from __future__ import annotations
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import yaml
+
+DEFAULT_ALIAS_FILE = Path(__file__).parent.parent.parent / "configs" / "site_aliases.yaml"
+
+# alias file section → kind
+KINDS = {"sites": "site", "warehouses": "warehouse", "ports": "port"}
+
+_SEPARATORS = re.compile(r"[\s_\-]+")
+
+
+def alias_key(value: str) -> str:
+    """Lookup key: upper case, trimmed, runs of space / '_' / '-' → single '_'"""
+    return _SEPARATORS.sub("_", value.upper().strip()).strip("_")
+
+
+def load_aliases(path: Union[str, Path] = DEFAULT_ALIAS_FILE) -> Dict[str, List[dict]]:
+    """
+    Read an alias file
+
+    Returns:
+        dict: {kind: [{"code", "name", "aliases"}]} for kind in site / warehouse / port
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    return {kind: list(data.get(section) or []) for section, kind in KINDS.items()}
+
+
+def _tables(entries: List[dict]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """(alias key → full name, full name → code) of one kind"""
+    names: Dict[str, str] = {}
+    codes: Dict[str, str] = {}
+    for entry in entries:
+        code, name = str(entry["code"]), str(entry["name"])
+        codes[name] = code
+        for alias in [code, *entry.get("aliases", [])]:
+            names[alias_key(str(alias))] = name
+    return names, codes
+
+
+_DEFAULT = load_aliases()
+
+# HVDC Site / Warehouse / Port codes: alias key → full name, full name → code
+SITE_CODES, SITE_CODE_REVERSE = _tables(_DEFAULT["site"])
+WH_CODES, WH_CODE_REVERSE = _tables(_DEFAULT["warehouse"])
+PORT_CODES, PORT_CODE_REVERSE = _tables(_DEFAULT["port"])
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    """
+    Candidate index over alias keys for misspelled values
+
+    Aliases are indexed by character trigrams of their separator-free form;
+    a query is scored only against aliases sharing a trigram, by the better of
+    edit-distance similarity (separator-free) and token Jaccard similarity.
+    """
+
+    def __init__(self, names: Dict[str, str]):
+        self.keys = list(names)
+        self.names = [names[k] for k in self.keys]
+        self.squashed = [k.replace("_", "") for k in self.keys]
+        self.tokens = [set(k.split("_")) for k in self.keys]
+        self.grams: Dict[str, Set[int]] = defaultdict(set)
+        for i, squashed in enumerate(self.squashed):
+            for gram in self._grams(squashed):
+                self.grams[gram].add(i)
+
+    @staticmethod
+    def _grams(text: str) -> Set[str]:
+        if len(text) < 3:
+            return {text}
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def match(self, key: str, threshold: float) -> Optional[str]:
+        """Full name of the best alias scoring >= threshold (None if none or ambiguous)"""
+        squashed = key.replace("_", "")
+        tokens = set(key.split("_"))
+        candidates: Set[int] = set()
+        for gram in self._grams(squashed):
+            candidates |= self.grams.get(gram, set())
+
+        best: Dict[str, float] = {}
+        for i in candidates:
+            other = self.squashed[i]
+            edit = 1 - edit_distance(squashed, other) / max(len(squashed), len(other))
+            jaccard = len(tokens & self.tokens[i]) / len(tokens | self.tokens[i])
+            score = max(edit, jaccard)
+            if score >= threshold and score > best.get(self.names[i], 0.0):
+                best[self.names[i]] = score
+        if not best:
+            return None
+        ranked = sorted(best.items(), key=lambda kv: -kv[1])
+        if len(ranked) > 1 and ranked[1][1] == ranked[0][1]:
+            return None
+        return ranked[0][0]
 
 
 class SiteNormalizer:
     """Normalize site, warehouse, and port codes"""
 
-    def __init__(self):
-        self.site_codes = SITE_CODES
-        self.wh_codes = WH_CODES
-        self.port_codes = PORT_CODES
+    def __init__(
+        self,
+        alias_file: Optional[Union[str, Path]] = None,
+        fuzzy: bool = False,
+        threshold: float = 0.8,
+        memo_size: int = 100_000,
+    ):
+        """
+        Args:
+            alias_file: Alias YAML (None = configs/site_aliases.yaml)
+            fuzzy: Match unrecognized spellings by edit distance / tokens
+            threshold: Minimum fuzzy similarity (0-1)
+            memo_size: Memoized values per kind (cache is reset when full)
+        """
+        if alias_file is None:
+            tables = {"site": (SITE_CODES, SITE_CODE_REVERSE), "warehouse": (WH_CODES, WH_CODE_REVERSE),
+                      "port": (PORT_CODES, PORT_CODE_REVERSE)}
+        else:
+            tables = {kind: _tables(entries) for kind, entries in load_aliases(alias_file).items()}
+        self.site_codes, self.site_code_reverse = tables["site"]
+        self.wh_codes, self.wh_code_reverse = tables["warehouse"]
+        self.port_codes, self.port_code_reverse = tables["port"]
+        self._names = {kind: names for kind, (names, _) in tables.items()}
+        self._codes = {kind: codes for kind, (_, codes) in tables.items()}
+
+        self.fuzzy = fuzzy
+        self.threshold = threshold
+        self.memo_size = memo_size
+        self._memo: Dict[str, Dict[object, Optional[str]]] = {kind: {} for kind in KINDS.values()}
+        self._fuzzy_index: Dict[str, FuzzyIndex] = {}
+
+    def normalize(self, code: str, kind: str) -> Optional[str]:
+        """
+        Normalize a site / warehouse / port spelling to its full name
+
+        Args:
+            code: Raw value
+            kind: "site", "warehouse" or "port"
+
+        Returns:
+            Full name or None if not recognized
+        """
+        memo = self._memo[kind]
+        try:
+            return memo[code]
+        except KeyError:
+            pass
+        except TypeError:  # unhashable
+            return None
+        name = self._lookup(code, kind)
+        if len(memo) >= self.memo_size:
+            memo.clear()
+        memo[code] = name
+        return name
+
+    def _lookup(self, code, kind: str) -> Optional[str]:
+        if not code or not isinstance(code, str):
+            return None
+        key = alias_key(code)
+        name = self._names[kind].get(key)
+        if name is None and self.fuzzy and key:
+            index = self._fuzzy_index.get(kind)
+            if index is None:
+                index = self._fuzzy_index[kind] = FuzzyIndex(self._names[kind])
+            name = index.match(key, self.threshold)
+        return name
+
+    def normalize_series(self, values: Union[pd.Series, Iterable], kind: str, to: str = "name") -> pd.Series:
+        """
+        Normalize a column, looking up each distinct value once
+
+        Args:
+            values: Raw values (Series or iterable)
+            kind: "site", "warehouse" or "port"
+            to: "name" (full name) or "code"
+
+        Returns:
+            pd.Series: Normalized values (None where not recognized), same index
+        """
+        series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        mapped = [self.normalize(value, kind) for value in uniques]
+        if to == "code":
+            reverse = self._codes[kind]
+            mapped = [None if name is None else reverse.get(name) for name in mapped]
+        elif to != "name":
+            raise ValueError(f"Unknown target: {to} (expected 'name' or 'code')")
+        table = np.array(mapped + [None], dtype=object)  # last slot: NA sentinel (-1)
+        return pd.Series(table[codes], index=series.index, dtype=object, name=series.name)
+
+    def normalize_code(self, code: str, kind: Optional[str] = None) -> Optional[str]:
+        """
+        Normalize a spelling to its canonical code (e.g. "dsv indoor" → "DSV")
+
+        Args:
+            code: Raw value
+            kind: "site", "warehouse", "port" or None (first kind that matches)
+
+        Returns:
+            Canonical code or None if not recognized
+        """
+        for k in [kind] if kind else list(KINDS.values()):
+            name = self.normalize(code, k)
+            if name is not None:
+                return self._codes[k].get(name)
+        return None
 
     def normalize_site(self, code: str) -> Optional[str]:
         """
@@ -103,11 +242,7 @@ class SiteNormalizer:
         Returns:
             Full site name or None if not found
         """
-        if not code:
-            return None
-
-        normalized_key = code.upper().strip().replace("-", "_")
-        return self.site_codes.get(normalized_key)
+        return self.normalize(code, "site")
 
     def normalize_wh(self, code: str) -> Optional[str]:
         """
@@ -119,11 +254,7 @@ class SiteNormalizer:
         Returns:
             Full warehouse name or None if not found
         """
-        if not code:
-            return None
-
-        normalized_key = code.upper().strip().replace("-", "_")
-        return self.wh_codes.get(normalized_key)
+        return self.normalize(code, "warehouse")
 
     def normalize_port(self, code: str) -> Optional[str]:
         """
@@ -135,11 +266,7 @@ class SiteNormalizer:
         Returns:
             Full port name or None if not found
         """
-        if not code:
-            return None
-
-        normalized_key = code.upper().strip().replace("-", "_")
-        return self.port_codes.get(normalized_key)
+        return self.normalize(code, "port")
 
     def get_site_code(self, full_name: str) -> Optional[str]:
         """
@@ -154,7 +281,7 @@ class SiteNormalizer:
         if not full_name:
             return None
 
-        return SITE_CODE_REVERSE.get(full_name)
+        return self.site_code_reverse.get(full_name)
 
     def get_wh_code(self, full_name: str) -> Optional[str]:
         """
@@ -169,7 +296,7 @@ class SiteNormalizer:
         if not full_name:
             return None
 
-        return WH_CODE_REVERSE.get(full_name)
+        return self.wh_code_reverse.get(full_name)
 
     def get_port_code(self, full_name: str) -> Optional[str]:
         """
@@ -184,7 +311,7 @@ class SiteNormalizer:
         if not full_name:
             return None
 
-        return PORT_CODE_REVERSE.get(full_name)
+        return self.port_code_reverse.get(full_name)
 
     def is_offshore_site(self, code: str) -> bool:
         """
@@ -214,13 +341,12 @@ class SiteNormalizer:
 
     def get_all_sites(self) -> Dict[str, str]:
         """Get all site codes and names"""
-        return {code: name for code, name in SITE_CODE_REVERSE.items()}
+        return dict(self.site_code_reverse)
 
     def get_all_warehouses(self) -> Dict[str, str]:
         """Get all warehouse codes and names"""
-        return {code: name for code, name in WH_CODE_REVERSE.items()}
+        return dict(self.wh_code_reverse)
 
     def get_all_ports(self) -> Dict[str, str]:
         """Get all port codes and names"""
-        return {code: name for code, name in PORT_CODE_REVERSE.items()}
-
+        return dict(self.port_code_reverse)
@@ -2,7 +2,6 @@
 # Identity Clusterer v2.6 — executes identity_rules from YAML to produce clusters + linksets.
 from __future__ import annotations
 import re
-import uuid
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
@@ -10,6 +9,8 @@ import pandas as pd
 from rdflib import Graph, Namespace, URIRef, Literal, RDF
 from datetime import timedelta
 
+from ..core.ids import MAPPING_IDS
+
 HVDC = Namespace("https://hvdc.example.org/ns#")
 OPS = Namespace("https://hvdc.example.org/ops#")
 HVDCI = Namespace("https://hvdc.example.org/id/")
@@ -17,9 +18,7 @@ OWL = Namespace("http://www.w3.org/2002/07/owl#")
 
 
 def uuid5_from(*parts: str) -> str:
-    base = "00000000-0000-0000-0000-000000000000"
-    name = "::".join("" if p is None else str(p) for p in parts)
-    return str(uuid.uuid5(uuid.UUID(base), name))
+    return MAPPING_IDS.mint(*parts)
 
 
 @dataclass
@@ -50,13 +49,9 @@ class IdentityClusterer:
         present = [k for k in keys if k in df.columns]
         if not present:
             return pd.DataFrame(columns=["ClusterID", "ClusterType", "RowIndex"])
-        # Build cluster id as uuid5 of concatenated key values
-        ids = []
-        for i, row in df[present].iterrows():
-            parts = [str(row.get(k, "") or "") for k in present]
-            cid = uuid5_from(*parts)
-            ids.append((i, cid))
-        out = pd.DataFrame(ids, columns=["RowIndex", "ClusterID"])
+        # Build cluster id as uuid5 of concatenated key values (one hash per distinct key)
+        keys = [[str(v or "") for v in row] for row in df[present].to_numpy()]
+        out = pd.DataFrame({"RowIndex": df.index, "ClusterID": MAPPING_IDS.mint_many(keys)})
         out["ClusterType"] = as_type
         return out
 
@@ -72,12 +67,13 @@ class IdentityClusterer:
         tmp["bucket"] = (
             tmp["ETA"].dt.floor("D") - pd.to_timedelta(tmp["ETA"].dt.dayofyear % w, unit="D")
         ).astype("datetime64[ns]")
-        ids = []
-        for i, r in tmp.iterrows():
-            parts = [str(r.get("RotationNo") or ""), str(r.get("bucket") or "")]
-            cid = uuid5_from(*parts)
-            ids.append((i, cid))
-        out = pd.DataFrame(ids, columns=["RowIndex", "ClusterID"])
+        # Same keys as the former iterrows() loop: a row whose RotationNo is missing
+        # holds only datetimes, so iterrows() typed it datetime64 and rendered "NaT"
+        keys = [
+            ("NaT" if pd.isna(rotation) else str(rotation or ""), str(bucket or ""))
+            for rotation, _, bucket in tmp.to_numpy()
+        ]
+        out = pd.DataFrame({"RowIndex": tmp.index, "ClusterID": MAPPING_IDS.mint_many(keys)})
         out["ClusterType"] = rule.cluster_as
         return out
 
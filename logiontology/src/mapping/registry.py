@@ -8,7 +8,6 @@ P.MD v2.6 시스템 통합
 
 from __future__ import annotations
 import re
-import uuid
 from pathlib import Path
 from typing import Dict, Any
 import pandas as pd
@@ -17,6 +16,8 @@ import pytz
 import yaml
 import logging
 
+from ..core.ids import MAPPING_IDS
+
 logger = logging.getLogger(__name__)
 
 # HVDC Namespaces
@@ -29,10 +30,8 @@ DXB_TZ = pytz.timezone("Asia/Dubai")
 
 
 def uuid5_from(*parts: str) -> str:
-    """Generate deterministic UUID5 from parts"""
-    base = "00000000-0000-0000-0000-000000000000"
-    name = "::".join("" if p is None else str(p) for p in parts)
-    return str(uuid.uuid5(uuid.UUID(base), name))
+    """Generate deterministic UUID5 from parts (memoized, see core.ids.MAPPING_IDS)"""
+    return MAPPING_IDS.mint(*parts)
 
 
 def load_dsv_codes() -> set:
@@ -1,8 +1,10 @@
 """Ontology loader for HVDC ontology."""
 
 from pathlib import Path
-from typing import List, Dict, Any
-from rdflib import Graph, Namespace, RDF, OWL, RDFS
+from typing import List, Dict, Any, Optional
+from rdflib import Graph, Namespace
+
+from .schema_index import SchemaIndex, load_schema_index, parse_ontology
 
 HVDC = Namespace("https://hvdc-project.com/ontology#")
 
@@ -10,103 +12,92 @@ HVDC = Namespace("https://hvdc-project.com/ontology#")
 class OntologyLoader:
     """Load and parse OWL/TTL ontology files."""
 
-    def __init__(self, ontology_path: Path):
-        """Initialize with ontology file path."""
+    def __init__(self, ontology_path: Path, cache_dir: Optional[Path] = None, cache: bool = True):
+        """
+        Initialize with ontology file path.
+
+        Args:
+            ontology_path: Ontology file
+            cache_dir: Schema index directory (None = default schema cache)
+            cache: Persist the schema index keyed by the ontology hash
+        """
         self.ontology_path = ontology_path
+        self.cache_dir = cache_dir
+        self.cache = cache
         self.graph = Graph()
         self.graph.bind("hvdc", HVDC)
+        self._schema: Optional[SchemaIndex] = None
+        self._views: Dict[str, Any] = {}
 
     def load(self) -> Graph:
-        """Load ontology file into RDFLib Graph."""
+        """Load ontology file into RDFLib Graph and its schema index."""
         if not self.ontology_path.exists():
             raise FileNotFoundError(f"Ontology file not found: {self.ontology_path}")
 
-        format_map = {
-            ".ttl": "turtle",
-            ".owl": "xml",
-            ".rdf": "xml",
-            ".n3": "n3",
-        }
-
-        file_format = format_map.get(self.ontology_path.suffix.lower(), "turtle")
-        self.graph.parse(self.ontology_path, format=file_format)
+        fresh = len(self.graph) == 0
+        parse_ontology([self.ontology_path], self.graph)
+        if fresh:
+            self._schema = load_schema_index(
+                self.ontology_path, cache_dir=self.cache_dir, disk=self.cache, graph=self.graph
+            )
+        else:
+            # graph held other triples before: index everything it now contains
+            self._schema = SchemaIndex.from_graph(self.graph)
+        self._views = {}
         return self.graph
 
+    @property
+    def schema(self) -> SchemaIndex:
+        """Schema index of the loaded graph (built on first use if load() was not called)."""
+        if self._schema is None:
+            self._schema = SchemaIndex.from_graph(self.graph)
+            self._views = {}
+        return self._schema
+
+    def _view(self, name: str):
+        """String-keyed copy of a schema table (built once per load)."""
+        if name not in self._views:
+            table = getattr(self.schema, name)
+            if isinstance(table, dict):
+                self._views[name] = {str(k): [str(v) for v in vs] for k, vs in table.items()}
+            else:
+                self._views[name] = [str(v) for v in table]
+        return self._views[name]
+
     def extract_classes(self) -> List[str]:
         """Extract all OWL classes from ontology."""
-        classes = []
-        for s in self.graph.subjects(predicate=RDF.type, object=OWL.Class):
-            classes.append(str(s))
-        return classes
+        return list(self._view("classes"))
 
     def extract_object_properties(self) -> List[str]:
         """Extract all object properties."""
-        props = []
-        for s in self.graph.subjects(predicate=RDF.type, object=OWL.ObjectProperty):
-            props.append(str(s))
-        return props
+        return list(self._view("object_properties"))
 
     def extract_datatype_properties(self) -> List[str]:
         """Extract all datatype properties."""
-        props = []
-        for s in self.graph.subjects(predicate=RDF.type, object=OWL.DatatypeProperty):
-            props.append(str(s))
-        return props
+        return list(self._view("datatype_properties"))
 
     def get_class_hierarchy(self) -> Dict[str, List[str]]:
         """Get class hierarchy (subclass relationships)."""
-        hierarchy = {}
-        for s, o in self.graph.subject_objects(predicate=RDFS.subClassOf):
-            parent = str(o)
-            child = str(s)
-            if parent not in hierarchy:
-                hierarchy[parent] = []
-            hierarchy[parent].append(child)
-        return hierarchy
+        return {parent: list(children) for parent, children in self._view("subclasses").items()}
 
     def get_property_domains(self, property_uri: str) -> List[str]:
         """Get domains for a property."""
-        from rdflib import URIRef
-
-        domains = []
-        prop = URIRef(property_uri)
-        for o in self.graph.objects(subject=prop, predicate=RDFS.domain):
-            domains.append(str(o))
-        return domains
+        return list(self._view("domains").get(str(property_uri), ()))
 
     def get_property_ranges(self, property_uri: str) -> List[str]:
         """Get ranges for a property."""
-        from rdflib import URIRef
-
-        ranges = []
-        prop = URIRef(property_uri)
-        for o in self.graph.objects(subject=prop, predicate=RDFS.range):
-            ranges.append(str(o))
-        return ranges
+        return list(self._view("ranges").get(str(property_uri), ()))
 
     def get_ontology_info(self) -> Dict[str, Any]:
         """Get ontology metadata."""
+        schema = self.schema
         info = {
-            "classes": len(self.extract_classes()),
-            "object_properties": len(self.extract_object_properties()),
-            "datatype_properties": len(self.extract_datatype_properties()),
+            "classes": len(schema.classes),
+            "object_properties": len(schema.object_properties),
+            "datatype_properties": len(schema.datatype_properties),
             "triples": len(self.graph),
         }
-
-        # Get version info if available
-        for s, o in self.graph.subject_objects(predicate=OWL.versionInfo):
-            info["version"] = str(o)
-            break
-
-        # Get ontology label
-        for s in self.graph.subjects(predicate=RDF.type, object=OWL.Ontology):
-            for o in self.graph.objects(subject=s, predicate=RDFS.label):
-                info["label"] = str(o)
-                break
-            for o in self.graph.objects(subject=s, predicate=RDFS.comment):
-                info["description"] = str(o)
-                break
-
+        info.update({k: v for k, v in schema.info.items() if k != "triples"})
         return info
 
 
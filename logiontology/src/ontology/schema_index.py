@@ -0,0 +1,317 @@
+"""
+HVDC Ontology Schema Index v1.0
+TBox tables (classes, properties, hierarchies, domains / ranges, OWL property
+characteristics) extracted once per ontology, with transitive closures, cached
+in process and on disk keyed by the ontology files' content hash
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple, Union
+
+from rdflib import Graph, OWL, RDF, RDFS, URIRef
+from rdflib.namespace import XSD
+from rdflib.term import Identifier
+from rdflib.util import from_n3
+
+from ..rdfio.snapshot import file_digest
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_INDEX_VERSION = 1
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "logiontology" / "schema"
+
+FORMATS = {".ttl": "turtle", ".owl": "xml", ".rdf": "xml", ".n3": "n3"}
+
+Term = Any
+Pair = Tuple[Term, Term]
+
+
+def closure(edges: Dict[Term, Iterable[Term]]) -> Dict[Term, FrozenSet[Term]]:
+    """Reflexive-transitive closure of a parent map (every key reaches itself)"""
+    closed = {}
+    for start in list(edges):
+        seen = {start}
+        stack = [start]
+        while stack:
+            for parent in edges.get(stack.pop(), ()):
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+        closed[start] = frozenset(seen)
+    return closed
+
+
+def _sorted(terms: Iterable[Term]) -> List[Term]:
+    return sorted(set(terms), key=str)
+
+
+def _multimap(pairs: Iterable[Pair]) -> Dict[Term, List[Term]]:
+    values: Dict[Term, set] = defaultdict(set)
+    for s, o in pairs:
+        values[s].add(o)
+    return {s: _sorted(os_) for s, os_ in sorted(values.items(), key=lambda kv: str(kv[0]))}
+
+
+@dataclass
+class SchemaIndex:
+    """
+    Precomputed ontology schema
+
+    The asserted tables are what gets persisted; hierarchy closures and
+    reverse maps are derived on construction, so every lookup is a dict access.
+    """
+    classes: List[Term]
+    object_properties: List[Term]
+    datatype_properties: List[Term]
+    subclass_of: Dict[Term, List[Term]]
+    subproperty_of: Dict[Term, List[Term]]
+    domains: Dict[Term, List[Term]]
+    ranges: Dict[Term, List[Term]]
+    equivalent_classes: List[Pair] = field(default_factory=list)
+    equivalent_properties: List[Pair] = field(default_factory=list)
+    inverse_of: List[Pair] = field(default_factory=list)
+    symmetric: List[Term] = field(default_factory=list)
+    transitive: List[Term] = field(default_factory=list)
+    info: Dict[str, Any] = field(default_factory=dict)
+    source_sha256: Optional[str] = None
+
+    def __post_init__(self):
+        children: Dict[Term, List[Term]] = defaultdict(list)
+        for child, parents in self.subclass_of.items():
+            for parent in parents:
+                children[parent].append(child)
+        self.subclasses: Dict[Term, List[Term]] = {p: _sorted(cs) for p, cs in children.items()}
+        # proper ancestors / descendants (transitive subclass closure)
+        self.superclasses = {c: ds - {c} for c, ds in closure(self.subclass_of).items()}
+        self.descendants = {c: ds - {c} for c, ds in closure(self.subclasses).items()}
+        self.superproperties = {p: qs - {p} for p, qs in closure(self.subproperty_of).items()}
+
+    @classmethod
+    def from_graph(cls, graph: Graph, source_sha256: Optional[str] = None) -> "SchemaIndex":
+        """Extract the schema tables from an ontology graph (one lookup per predicate)"""
+        info: Dict[str, Any] = {"triples": len(graph)}
+        for version in graph.objects(None, OWL.versionInfo):
+            info["version"] = str(version)
+            break
+        for ontology in graph.subjects(RDF.type, OWL.Ontology):
+            for label in graph.objects(ontology, RDFS.label):
+                info["label"] = str(label)
+                break
+            for comment in graph.objects(ontology, RDFS.comment):
+                info["description"] = str(comment)
+                break
+
+        return cls(
+            classes=_sorted(graph.subjects(RDF.type, OWL.Class)),
+            object_properties=_sorted(graph.subjects(RDF.type, OWL.ObjectProperty)),
+            datatype_properties=_sorted(graph.subjects(RDF.type, OWL.DatatypeProperty)),
+            subclass_of=_multimap(graph.subject_objects(RDFS.subClassOf)),
+            subproperty_of=_multimap(graph.subject_objects(RDFS.subPropertyOf)),
+            domains=_multimap(graph.subject_objects(RDFS.domain)),
+            ranges=_multimap(graph.subject_objects(RDFS.range)),
+            equivalent_classes=sorted(graph.subject_objects(OWL.equivalentClass), key=str),
+            equivalent_properties=sorted(graph.subject_objects(OWL.equivalentProperty), key=str),
+            inverse_of=sorted(graph.subject_objects(OWL.inverseOf), key=str),
+            symmetric=_sorted(graph.subjects(RDF.type, OWL.SymmetricProperty)),
+            transitive=_sorted(graph.subjects(RDF.type, OWL.TransitiveProperty)),
+            info=info,
+            source_sha256=source_sha256,
+        )
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _term(value) -> Term:
+        return value if isinstance(value, Identifier) else URIRef(value)
+
+    def ancestors(self, cls_) -> FrozenSet[Term]:
+        """All (transitive) superclasses of a class"""
+        return self.superclasses.get(self._term(cls_), frozenset())
+
+    def is_subclass(self, cls_, parent) -> bool:
+        """cls_ ⊑ parent (reflexive)"""
+        cls_, parent = self._term(cls_), self._term(parent)
+        return cls_ == parent or parent in self.superclasses.get(cls_, ())
+
+    def domains_of(self, prop) -> List[Term]:
+        return self.domains.get(self._term(prop), [])
+
+    def ranges_of(self, prop) -> List[Term]:
+        return self.ranges.get(self._term(prop), [])
+
+    def datatype_of(self, prop, default=None):
+        """First XSD datatype in the range of prop (literal datatype for converters)"""
+        for rng in self.ranges_of(prop):
+            if str(rng).startswith(str(XSD)):
+                return rng
+        return default
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        def terms(values):
+            return [v.n3() for v in values]
+
+        def table(mapping):
+            return {k.n3(): terms(vs) for k, vs in mapping.items()}
+
+        def pairs(values):
+            return [[a.n3(), b.n3()] for a, b in values]
+
+        return {
+            "version": SCHEMA_INDEX_VERSION,
+            "source_sha256": self.source_sha256,
+            "classes": terms(self.classes),
+            "object_properties": terms(self.object_properties),
+            "datatype_properties": terms(self.datatype_properties),
+            "subclass_of": table(self.subclass_of),
+            "subproperty_of": table(self.subproperty_of),
+            "domains": table(self.domains),
+            "ranges": table(self.ranges),
+            "equivalent_classes": pairs(self.equivalent_classes),
+            "equivalent_properties": pairs(self.equivalent_properties),
+            "inverse_of": pairs(self.inverse_of),
+            "symmetric": terms(self.symmetric),
+            "transitive": terms(self.transitive),
+            "info": self.info,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SchemaIndex":
+        def terms(values):
+            return [from_n3(v) for v in values]
+
+        def table(mapping):
+            return {from_n3(k): terms(vs) for k, vs in mapping.items()}
+
+        def pairs(values):
+            return [(from_n3(a), from_n3(b)) for a, b in values]
+
+        return cls(
+            classes=terms(data["classes"]),
+            object_properties=terms(data["object_properties"]),
+            datatype_properties=terms(data["datatype_properties"]),
+            subclass_of=table(data["subclass_of"]),
+            subproperty_of=table(data["subproperty_of"]),
+            domains=table(data["domains"]),
+            ranges=table(data["ranges"]),
+            equivalent_classes=pairs(data["equivalent_classes"]),
+            equivalent_properties=pairs(data["equivalent_properties"]),
+            inverse_of=pairs(data["inverse_of"]),
+            symmetric=terms(data["symmetric"]),
+            transitive=terms(data["transitive"]),
+            info=data["info"],
+            source_sha256=data["source_sha256"],
+        )
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the index as JSON (atomic rename)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=path.name + ".", dir=path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional["SchemaIndex"]:
+        """Read a saved index (None if missing, unreadable or another version)"""
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != SCHEMA_INDEX_VERSION:
+            return None
+        return cls.from_dict(data)
+
+
+# ============================================================================
+# Hash-keyed cache
+# ============================================================================
+
+_MEMORY: Dict[str, SchemaIndex] = {}
+_LOCK = threading.Lock()
+
+
+def ontology_digest(paths: Sequence[Union[str, Path]]) -> str:
+    """Combined content hash of ontology files (order-sensitive)"""
+    digest = hashlib.sha256(f"schema-index-v{SCHEMA_INDEX_VERSION}".encode())
+    for path in paths:
+        digest.update(Path(path).suffix.lower().encode())
+        digest.update(file_digest(path).encode())
+    return digest.hexdigest()
+
+
+def parse_ontology(paths: Sequence[Union[str, Path]], graph: Optional[Graph] = None) -> Graph:
+    """Parse ontology files (format by suffix) into one graph"""
+    graph = graph if graph is not None else Graph()
+    for path in paths:
+        graph.parse(str(path), format=FORMATS.get(Path(path).suffix.lower(), "turtle"))
+    return graph
+
+
+def load_schema_index(
+    paths: Union[str, Path, Sequence[Union[str, Path]]],
+    cache_dir: Optional[Union[str, Path]] = None,
+    disk: bool = True,
+    graph: Optional[Graph] = None,
+) -> SchemaIndex:
+    """
+    Schema index of ontology files, built at most once per content hash
+
+    Lookups go: in-process cache → <cache_dir>/<sha256>.json → build from the
+    parsed ontology (which then writes the JSON).
+
+    Args:
+        paths: Ontology file or files
+        cache_dir: Index directory (None = $LOGIONTOLOGY_SCHEMA_CACHE or
+            ~/.cache/logiontology/schema)
+        disk: Read/write the on-disk index
+        graph: Already parsed graph of exactly these files (skips re-parsing on a miss)
+
+    Returns:
+        SchemaIndex
+    """
+    paths = [paths] if isinstance(paths, (str, Path)) else list(paths)
+    key = ontology_digest(paths)
+    with _LOCK:
+        index = _MEMORY.get(key)
+    if index is not None:
+        return index
+
+    cache_path = Path(
+        cache_dir or os.getenv("LOGIONTOLOGY_SCHEMA_CACHE") or DEFAULT_CACHE_DIR
+    ) / f"{key}.json"
+    index = SchemaIndex.load(cache_path) if disk else None
+    if index is None:
+        index = SchemaIndex.from_graph(graph if graph is not None else parse_ontology(paths), key)
+        if disk:
+            try:
+                index.save(cache_path)
+            except OSError as e:
+                logger.warning(f"Schema index not cached ({cache_path}): {e}")
+        logger.info(f"Schema index built: {len(index.classes)} classes, {key[:12]}")
+    else:
+        logger.info(f"Schema index loaded: {cache_path}")
+
+    with _LOCK:
+        _MEMORY[key] = index
+    return index
@@ -5,22 +5,35 @@ from typing import Tuple, Optional
 from rdflib import Graph
 import logging
 
+from src.validation.shacl_service import CompiledShapes, ShaclValidationService, load_shapes
+
 logger = logging.getLogger(__name__)
 
 
 class OntologyValidator:
     """Validate RDF data against SHACL shapes."""
 
-    def __init__(self, shapes_path: Path | str = None):
-        """Initialize with SHACL shapes file path."""
+    def __init__(self, shapes_path: Path | str = None, workers: Optional[int] = None):
+        """
+        Initialize with SHACL shapes file path.
+
+        Shapes are parsed and compiled once per file content and shared by
+        all validators (see src.validation.shacl_service.load_shapes).
+        """
         if shapes_path is None:
             shapes_path = Path(__file__).parent.parent.parent / "configs" / "shapes" / "FlowCode.shape.ttl"
 
         self.shapes_path = Path(shapes_path)
         self.shapes_graph = Graph()
+        self.shapes: Optional[CompiledShapes] = None
+        self.workers = workers
 
         if self.shapes_path.exists():
-            self.shapes_graph.parse(self.shapes_path, format="turtle")
+            try:
+                self.shapes = load_shapes(self.shapes_path)
+                self.shapes_graph = self.shapes.graph
+            except ImportError:
+                self.shapes_graph.parse(self.shapes_path, format="turtle")
         else:
             logger.warning(f"SHACL shapes file not found: {self.shapes_path}")
 
@@ -28,6 +41,10 @@ class OntologyValidator:
         """
         Validate data graph against SHACL shapes.
 
+        RDFS entailments are materialized into a copy of data_graph; use
+        ShaclValidationService directly to validate a growing graph
+        incrementally.
+
         Args:
             data_graph: RDF graph containing data to validate
             ontology_graph: Optional ontology graph for inference
@@ -36,19 +53,18 @@ class OntologyValidator:
             Tuple of (conforms: bool, report_text: str)
         """
         try:
-            from pyshacl import validate
-
-            conforms, results_graph, results_text = validate(
-                data_graph=data_graph,
-                shacl_graph=self.shapes_graph,
-                ont_graph=ontology_graph,
-                inference='rdfs',
-                abort_on_first=False,
-                allow_infos=True,
-                allow_warnings=True,
-            )
-
-            return conforms, results_text
+            if self.shapes is None:
+                if not self.shapes_path.exists():
+                    return True, "Validation Report\nConforms: True\n"
+                self.shapes = load_shapes(self.shapes_path)
+
+            graph = Graph()
+            graph += data_graph
+            report = ShaclValidationService(
+                graph, self.shapes, ontology_graph, workers=self.workers
+            ).validate()
+
+            return report.conforms, report.text
 
         except ImportError:
             logger.error("pyshacl not installed. Install with: pip install pyshacl")
@@ -7,9 +7,10 @@ from ..rdfio.writer import write_ttl
 
 def run_pipeline_excel_to_ttl(xlsx_path: str, ttl_out: str) -> None:
     df = load_excel(xlsx_path)
-    records = df.to_dict(orient="records")
-    ok, errs = validate_transport_events(records)
+    # Column-wise validation; only failing rows go through per-record Pydantic
+    ok, errs = validate_transport_events(df)
     if not ok:
         raise ValueError(f"Validation failed: {len(errs)} errors")
+    records = df.to_dict(orient="records")
     enriched = list(reason(records))
     write_ttl(enriched, ttl_out)
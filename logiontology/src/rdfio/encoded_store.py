@@ -0,0 +1,262 @@
+"""
+HVDC Encoded Triple Store v1.0
+Read-only, memory-mapped triple store over dictionary-encoded int32 SPO/POS/OSP indexes
+"""
+
+from __future__ import annotations
+import logging
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from rdflib import Graph
+from rdflib.namespace import RDF
+
+from .snapshot import (
+    decode_terms,
+    encode_graph,
+    file_digest,
+    load_arrays,
+    read_meta,
+    save_snapshot,
+    snapshot_path_for,
+)
+
+logger = logging.getLogger(__name__)
+
+# index name → column order over (s, p, o)
+INDEX_ORDERS = {
+    "idx_spo": (0, 1, 2),
+    "idx_pos": (1, 2, 0),
+    "idx_osp": (2, 0, 1),
+}
+
+
+def build_indexes(spo: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Sorted SPO/POS/OSP indexes
+
+    Each index is a contiguous (3, n) int32 array whose rows are the permuted
+    (s, p, o) columns, sorted lexicographically in that order.
+    """
+    spo = np.asarray(spo, dtype=np.int32).reshape(-1, 3)
+    indexes = {}
+    for name, order in INDEX_ORDERS.items():
+        cols = spo[:, list(order)]
+        perm = np.lexsort((cols[:, 2], cols[:, 1], cols[:, 0]))
+        indexes[name] = np.ascontiguousarray(cols[perm].T)
+    return indexes
+
+
+class EncodedTripleStore:
+    """
+    Read-only triple store with an rdflib.Graph-like pattern API
+
+    Triples live in memory-mapped int32 index arrays; only the term dictionary is
+    held as Python objects. Supports triples(), subjects(), objects(), predicates(),
+    predicate_objects(), subject_objects(), subject_predicates(), value(), len(),
+    iteration and membership — enough for the read-only analysis scripts.
+    """
+
+    def __init__(self, terms: List, indexes: Dict[str, np.ndarray],
+                 namespaces: Optional[Dict[str, str]] = None):
+        """
+        Initialize store
+
+        Args:
+            terms: Term dictionary (id → rdflib term)
+            indexes: Arrays from build_indexes (may be memory-mapped)
+            namespaces: Prefix bindings
+        """
+        self._terms = terms
+        self._ids: Optional[Dict] = None
+        self._indexes = indexes
+        self._namespaces = namespaces or {}
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> "EncodedTripleStore":
+        """Encode an in-memory rdflib Graph"""
+        terms, spo = encode_graph(graph)
+        namespaces = {prefix: str(ns) for prefix, ns in graph.namespaces()}
+        return cls(terms, build_indexes(spo), namespaces)
+
+    @classmethod
+    def open(cls, snapshot_path: Union[str, Path]) -> "EncodedTripleStore":
+        """
+        Open a snapshot directory (see rdfio.snapshot) with memory-mapped indexes
+
+        Indexes missing from older snapshots are built in memory.
+        """
+        meta = read_meta(snapshot_path)
+        if meta is None:
+            raise ValueError(f"Not a valid graph snapshot: {snapshot_path}")
+        arrays = load_arrays(snapshot_path, mmap=True)
+        if all(name in arrays for name in INDEX_ORDERS):
+            indexes = {name: arrays[name] for name in INDEX_ORDERS}
+        else:
+            indexes = build_indexes(arrays["spo"])
+        return cls(decode_terms(arrays, meta["languages"]), indexes, meta["namespaces"])
+
+    @classmethod
+    def from_ttl(cls, ttl_path: Union[str, Path],
+                 snapshot_dir: Optional[Union[str, Path]] = None) -> "EncodedTripleStore":
+        """
+        Open a TTL file through its indexed snapshot, parsing only when it is stale
+
+        Args:
+            ttl_path: TTL file path
+            snapshot_dir: Directory for hash-named snapshots (None = next to the TTL)
+
+        Returns:
+            EncodedTripleStore
+        """
+        digest = file_digest(ttl_path)
+        snap = snapshot_path_for(ttl_path, snapshot_dir, digest)
+        meta = read_meta(snap)
+        if meta is None or meta.get("source_sha256") != digest \
+                or not set(INDEX_ORDERS) <= set(meta.get("extra_arrays", [])):
+            graph = Graph()
+            graph.parse(str(ttl_path), format="turtle")
+            _, spo = encode_graph(graph)
+            try:
+                save_snapshot(graph, snap, source_sha256=digest, extra_arrays=build_indexes(spo))
+            except OSError as e:
+                logger.warning(f"Could not write snapshot for {ttl_path}: {e}")
+                return cls.from_graph(graph)
+        return cls.open(snap)
+
+    # ------------------------------------------------------------------
+    # Pattern matching
+    # ------------------------------------------------------------------
+
+    def _id(self, term) -> Optional[int]:
+        if self._ids is None:
+            self._ids = {t: i for i, t in enumerate(self._terms)}
+        return self._ids.get(term)
+
+    def _match_ids(self, s, p, o) -> Optional[np.ndarray]:
+        """(n, 3) int array of matching (s, p, o) ids, None if a bound term is unknown"""
+        bound = []
+        for term in (s, p, o):
+            if term is None:
+                bound.append(None)
+            else:
+                tid = self._id(term)
+                if tid is None:
+                    return None
+                bound.append(tid)
+
+        # pick the index whose leading columns are all bound
+        if bound[0] is not None:
+            name = "idx_osp" if bound[1] is None and bound[2] is not None else "idx_spo"
+        elif bound[1] is not None:
+            name = "idx_pos"
+        elif bound[2] is not None:
+            name = "idx_osp"
+        else:
+            name = "idx_spo"
+        order = INDEX_ORDERS[name]
+        index = self._indexes[name]
+
+        lo, hi = 0, index.shape[1]
+        for col, pos in enumerate(order):
+            key = bound[pos]
+            if key is None:
+                break
+            column = index[col]
+            lo, hi = (lo + int(np.searchsorted(column[lo:hi], key, side="left")),
+                      lo + int(np.searchsorted(column[lo:hi], key, side="right")))
+            if lo >= hi:
+                break
+
+        rows = np.asarray(index[:, lo:hi])
+        result = np.empty((rows.shape[1], 3), dtype=np.int64)
+        for col, pos in enumerate(order):
+            result[:, pos] = rows[col]
+        return result
+
+    def triples(self, triple: Tuple) -> Iterator[Tuple]:
+        """Triples matching an (s, p, o) pattern (None = wildcard)"""
+        ids = self._match_ids(*triple)
+        if ids is None:
+            return
+        terms = self._terms
+        for s, p, o in ids.tolist():
+            yield terms[s], terms[p], terms[o]
+
+    def __iter__(self):
+        return self.triples((None, None, None))
+
+    def __len__(self) -> int:
+        return int(self._indexes["idx_spo"].shape[1])
+
+    def __contains__(self, triple) -> bool:
+        ids = self._match_ids(*triple)
+        return ids is not None and len(ids) > 0
+
+    def _column(self, pattern: Tuple, pos: int, unique: bool) -> Iterator:
+        ids = self._match_ids(*pattern)
+        if ids is None:
+            return
+        column = ids[:, pos]
+        if unique:
+            column = np.unique(column)
+        terms = self._terms
+        for tid in column.tolist():
+            yield terms[tid]
+
+    def _pairs(self, pattern: Tuple, first: int, second: int, unique: bool) -> Iterator[Tuple]:
+        ids = self._match_ids(*pattern)
+        if ids is None:
+            return
+        pairs = ids[:, [first, second]]
+        if unique:
+            pairs = np.unique(pairs, axis=0)
+        terms = self._terms
+        for a, b in pairs.tolist():
+            yield terms[a], terms[b]
+
+    def subjects(self, predicate=None, object=None, unique: bool = False) -> Iterator:
+        return self._column((None, predicate, object), 0, unique)
+
+    def predicates(self, subject=None, object=None, unique: bool = False) -> Iterator:
+        return self._column((subject, None, object), 1, unique)
+
+    def objects(self, subject=None, predicate=None, unique: bool = False) -> Iterator:
+        return self._column((subject, predicate, None), 2, unique)
+
+    def predicate_objects(self, subject=None, unique: bool = False) -> Iterator[Tuple]:
+        return self._pairs((subject, None, None), 1, 2, unique)
+
+    def subject_objects(self, predicate=None, unique: bool = False) -> Iterator[Tuple]:
+        return self._pairs((None, predicate, None), 0, 2, unique)
+
+    def subject_predicates(self, object=None, unique: bool = False) -> Iterator[Tuple]:
+        return self._pairs((None, None, object), 0, 1, unique)
+
+    def value(self, subject=None, predicate=RDF.value, object=None, default=None, any: bool = True):
+        """Single value of a pattern with exactly one wildcard (Graph.value semantics)"""
+        pattern = (subject, predicate, object)
+        if sum(term is None for term in pattern) != 1:
+            return default
+        values = list(self._column(pattern, pattern.index(None), unique=False))
+        if not values:
+            return default
+        if not any and len(values) > 1:
+            raise ValueError(f"More than one value for {pattern}")
+        return values[0]
+
+    def namespaces(self) -> Iterator[Tuple[str, str]]:
+        return iter(self._namespaces.items())
+
+    def to_graph(self) -> Graph:
+        """Materialize as an rdflib Graph (for SPARQL or writes)"""
+        graph = Graph()
+        for prefix, namespace in self._namespaces.items():
+            graph.bind(prefix, namespace, override=True)
+        graph.addN((s, p, o, graph) for s, p, o in self)
+        return graph
@@ -0,0 +1,145 @@
+"""
+HVDC Graph Cache v1.0
+Shared TTL graph loader: in-process LRU plus on-disk snapshots keyed by file content hash
+"""
+
+from __future__ import annotations
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from rdflib import Graph
+
+from .snapshot import file_digest, load_snapshot, read_meta, save_snapshot, snapshot_path_for
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "logiontology" / "graphs"
+
+
+@dataclass
+class CacheStats:
+    """Where each load() was served from"""
+    memory_hits: int = 0
+    disk_hits: int = 0
+    parses: int = 0
+
+
+class GraphCache:
+    """
+    Parse each TTL file at most once per content hash
+
+    Lookups go: in-process LRU (same file content) → on-disk snapshot in
+    cache_dir → rdflib parse (which then writes the snapshot). Cached graphs are
+    shared between callers; pass mutable=True to get a private copy to modify.
+    """
+
+    def __init__(self, maxsize: int = 8, cache_dir: Optional[Union[str, Path]] = None,
+                 disk: bool = True):
+        """
+        Initialize cache
+
+        Args:
+            maxsize: Number of graphs kept in memory
+            cache_dir: Snapshot directory (None = $LOGIONTOLOGY_GRAPH_CACHE or
+                ~/.cache/logiontology/graphs)
+            disk: Read/write on-disk snapshots
+        """
+        self.maxsize = maxsize
+        self.cache_dir = Path(
+            cache_dir or os.getenv("LOGIONTOLOGY_GRAPH_CACHE") or DEFAULT_CACHE_DIR
+        )
+        self.disk = disk
+        self.stats = CacheStats()
+        self._graphs: "OrderedDict[str, Graph]" = OrderedDict()
+        self._digests: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.RLock()
+
+    def _digest(self, path: Path) -> str:
+        """Content hash, recomputed only when size/mtime change"""
+        stat = path.stat()
+        key = str(path)
+        cached = self._digests.get(key)
+        if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+        digest = file_digest(path)
+        self._digests[key] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    def _load_uncached(self, path: Path, digest: str, format: str) -> Graph:
+        if self.disk:
+            snap = snapshot_path_for(path, self.cache_dir, digest)
+            meta = read_meta(snap)
+            if meta is not None and meta.get("source_sha256") == digest:
+                self.stats.disk_hits += 1
+                logger.debug(f"Graph cache: snapshot {snap}")
+                return load_snapshot(snap)
+
+        graph = Graph()
+        graph.parse(str(path), format=format)
+        self.stats.parses += 1
+        if self.disk:
+            try:
+                save_snapshot(graph, snap, source_sha256=digest)
+            except OSError as e:
+                logger.warning(f"Could not write graph snapshot for {path}: {e}")
+        return graph
+
+    def load(self, path: Union[str, Path], mutable: bool = False, format: str = "turtle") -> Graph:
+        """
+        Load a TTL file through the cache
+
+        Args:
+            path: TTL file path
+            mutable: Return a private copy the caller may modify
+            format: rdflib parser format
+
+        Returns:
+            Graph
+        """
+        path = Path(path).resolve()
+        with self._lock:
+            digest = self._digest(path)
+            graph = self._graphs.get(digest)
+            if graph is not None:
+                self.stats.memory_hits += 1
+                self._graphs.move_to_end(digest)
+            else:
+                graph = self._load_uncached(path, digest, format)
+                self._graphs[digest] = graph
+                while len(self._graphs) > self.maxsize:
+                    self._graphs.popitem(last=False)
+
+        if not mutable:
+            return graph
+        copy = Graph()
+        for prefix, namespace in graph.namespaces():
+            copy.bind(prefix, namespace, override=True)
+        copy.addN((s, p, o, copy) for s, p, o in graph)
+        return copy
+
+    def clear(self) -> None:
+        """Drop in-process graphs (on-disk snapshots are kept)"""
+        with self._lock:
+            self._graphs.clear()
+            self._digests.clear()
+
+
+_default_cache: Optional[GraphCache] = None
+
+
+def get_graph_cache() -> GraphCache:
+    """Process-wide shared cache"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = GraphCache()
+    return _default_cache
+
+
+def load_cached_graph(path: Union[str, Path], mutable: bool = False, format: str = "turtle") -> Graph:
+    """Load a TTL file through the process-wide GraphCache"""
+    return get_graph_cache().load(path, mutable=mutable, format=format)
@@ -0,0 +1,316 @@
+"""
+HVDC Graph Snapshot v1.0
+Binary rdflib Graph snapshots (term dictionary + int32 triple array) for fast TTL reload
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from rdflib import BNode, Graph, Literal, URIRef
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".snapshot"
+
+# term kinds stored in term_kind.npy
+URI, BNODE, LITERAL = 0, 1, 2
+
+_FILES = ("term_kind.npy", "term_offsets.npy", "term_blob.bin", "term_datatype.npy",
+          "term_lang.npy", "spo.npy")
+
+
+def file_digest(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def encode_graph(graph: Graph) -> Tuple[List, np.ndarray]:
+    """
+    Dictionary-encode a graph
+
+    Literal datatypes are themselves encoded as URI terms so they share the dictionary.
+
+    Returns:
+        tuple: (terms, spo) where spo is an (n, 3) int32 array sorted by (s, p, o)
+    """
+    ids: Dict = {}
+    terms: List = []
+
+    def term_id(term) -> int:
+        tid = ids.get(term)
+        if tid is None:
+            tid = ids[term] = len(terms)
+            terms.append(term)
+            if isinstance(term, Literal) and term.datatype is not None:
+                term_id(URIRef(term.datatype))
+        return tid
+
+    spo = np.fromiter(
+        (tid for triple in graph for tid in (term_id(triple[0]), term_id(triple[1]), term_id(triple[2]))),
+        dtype=np.int32,
+    ).reshape(-1, 3)
+    order = np.lexsort((spo[:, 2], spo[:, 1], spo[:, 0]))
+    return terms, spo[order]
+
+
+def _term_columns(terms: List) -> Dict[str, np.ndarray]:
+    ids = {term: i for i, term in enumerate(terms) if isinstance(term, URIRef)}
+    langs: Dict[str, int] = {}
+    kind = np.empty(len(terms), dtype=np.uint8)
+    datatype = np.full(len(terms), -1, dtype=np.int32)
+    lang = np.full(len(terms), -1, dtype=np.int16)
+    encoded = []
+    for i, term in enumerate(terms):
+        if isinstance(term, Literal):
+            kind[i] = LITERAL
+            if term.datatype is not None:
+                datatype[i] = ids[URIRef(term.datatype)]
+            if term.language:
+                lang[i] = langs.setdefault(term.language, len(langs))
+        else:
+            kind[i] = BNODE if isinstance(term, BNode) else URI
+        encoded.append(str(term).encode("utf-8"))
+
+    offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return {
+        "term_kind": kind,
+        "term_offsets": offsets,
+        "term_blob": b"".join(encoded),
+        "term_datatype": datatype,
+        "term_lang": lang,
+        "languages": list(langs),
+    }
+
+
+def save_snapshot(
+    graph: Graph,
+    path: Union[str, Path],
+    source_sha256: Optional[str] = None,
+    extra_arrays: Optional[Dict[str, np.ndarray]] = None,
+) -> Path:
+    """
+    Save a graph as a binary snapshot directory
+
+    The directory is written next to its final location and renamed into place, so
+    readers never observe a half-written snapshot.
+
+    Args:
+        graph: rdflib Graph
+        path: Snapshot directory
+        source_sha256: Content hash of the source TTL (recorded for cache checks)
+        extra_arrays: Additional named int arrays stored alongside (e.g. indexes)
+
+    Returns:
+        Path: Snapshot directory
+    """
+    path = Path(path)
+    terms, spo = encode_graph(graph)
+    columns = _term_columns(terms)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=path.name + ".", dir=path.parent))
+    try:
+        for name in ("term_kind", "term_offsets", "term_datatype", "term_lang"):
+            np.save(tmp / f"{name}.npy", columns[name])
+        (tmp / "term_blob.bin").write_bytes(columns["term_blob"])
+        np.save(tmp / "spo.npy", spo)
+        for name, array in (extra_arrays or {}).items():
+            np.save(tmp / f"{name}.npy", array)
+
+        meta = {
+            "version": SNAPSHOT_VERSION,
+            "source_sha256": source_sha256,
+            "n_terms": len(terms),
+            "n_triples": int(len(spo)),
+            "languages": columns["languages"],
+            "namespaces": {prefix: str(ns) for prefix, ns in graph.namespaces()},
+            "extra_arrays": sorted(extra_arrays or {}),
+        }
+        (tmp / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+        if path.exists():
+            shutil.rmtree(path)
+        os.replace(tmp, path)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    logger.info(f"Snapshot saved: {path} ({len(spo)} triples, {len(terms)} terms)")
+    return path
+
+
+def read_meta(path: Union[str, Path]) -> Optional[Dict]:
+    """Snapshot metadata, or None if path is not a complete snapshot"""
+    path = Path(path)
+    try:
+        meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != SNAPSHOT_VERSION or not all((path / f).exists() for f in _FILES):
+        return None
+    return meta
+
+
+def load_arrays(path: Union[str, Path], mmap: bool = True) -> Dict[str, np.ndarray]:
+    """Load the raw snapshot arrays (memory-mapped by default)"""
+    path = Path(path)
+    mode = "r" if mmap else None
+    meta = read_meta(path)
+    names = ["term_kind", "term_offsets", "term_datatype", "term_lang", "spo"]
+    names += (meta or {}).get("extra_arrays", [])
+    arrays = {name: np.load(path / f"{name}.npy", mmap_mode=mode) for name in names}
+    if mmap:
+        arrays["term_blob"] = np.memmap(path / "term_blob.bin", dtype=np.uint8, mode="r") \
+            if (path / "term_blob.bin").stat().st_size else np.zeros(0, dtype=np.uint8)
+    else:
+        arrays["term_blob"] = np.frombuffer((path / "term_blob.bin").read_bytes(), dtype=np.uint8)
+    return arrays
+
+
+def decode_term(arrays: Dict[str, np.ndarray], languages: List[str], tid: int, cache: Dict):
+    """Reconstruct the rdflib term with id tid"""
+    term = cache.get(tid)
+    if term is not None:
+        return term
+    offsets = arrays["term_offsets"]
+    text = bytes(arrays["term_blob"][offsets[tid]:offsets[tid + 1]]).decode("utf-8")
+    kind = arrays["term_kind"][tid]
+    if kind == URI:
+        term = URIRef(text)
+    elif kind == BNODE:
+        term = BNode(text)
+    else:
+        dt = int(arrays["term_datatype"][tid])
+        lang = int(arrays["term_lang"][tid])
+        term = Literal(
+            text,
+            lang=languages[lang] if lang >= 0 else None,
+            datatype=decode_term(arrays, languages, dt, cache) if dt >= 0 else None,
+        )
+    cache[tid] = term
+    return term
+
+
+def decode_terms(arrays: Dict[str, np.ndarray], languages: List[str]) -> List:
+    """Reconstruct the full term dictionary"""
+    blob = bytes(arrays["term_blob"])
+    offsets = np.asarray(arrays["term_offsets"]).tolist()
+    kinds = np.asarray(arrays["term_kind"]).tolist()
+    datatypes = np.asarray(arrays["term_datatype"]).tolist()
+    langs = np.asarray(arrays["term_lang"]).tolist()
+
+    texts = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(kinds))]
+    terms: List = [None] * len(kinds)
+    # URIs first so literal datatypes can reference them
+    for i, kind in enumerate(kinds):
+        if kind == URI:
+            terms[i] = URIRef(texts[i])
+        elif kind == BNODE:
+            terms[i] = BNode(texts[i])
+    for i, kind in enumerate(kinds):
+        if kind == LITERAL:
+            dt, lang = datatypes[i], langs[i]
+            terms[i] = Literal(
+                texts[i],
+                lang=languages[lang] if lang >= 0 else None,
+                datatype=terms[dt] if dt >= 0 else None,
+            )
+    return terms
+
+
+def load_snapshot(path: Union[str, Path], graph: Optional[Graph] = None) -> Graph:
+    """
+    Load a snapshot into an rdflib Graph
+
+    Args:
+        path: Snapshot directory written by save_snapshot
+        graph: Graph to fill (None = new Graph)
+
+    Returns:
+        Graph
+    """
+    path = Path(path)
+    meta = read_meta(path)
+    if meta is None:
+        raise ValueError(f"Not a valid graph snapshot: {path}")
+
+    arrays = load_arrays(path, mmap=True)
+    terms = decode_terms(arrays, meta["languages"])
+
+    graph = graph if graph is not None else Graph()
+    for prefix, namespace in meta["namespaces"].items():
+        graph.bind(prefix, namespace, override=True)
+    graph.addN((terms[s], terms[p], terms[o], graph) for s, p, o in np.asarray(arrays["spo"]).tolist())
+    return graph
+
+
+def snapshot_path_for(ttl_path: Union[str, Path], snapshot_dir: Optional[Union[str, Path]] = None,
+                      digest: Optional[str] = None) -> Path:
+    """
+    Snapshot location for a TTL file
+
+    Next to the TTL (<name>.ttl.snapshot) by default; inside snapshot_dir the
+    directory name is the content hash so identical files share one snapshot.
+    """
+    ttl_path = Path(ttl_path)
+    if snapshot_dir is None:
+        return ttl_path.with_name(ttl_path.name + SNAPSHOT_SUFFIX)
+    digest = digest or file_digest(ttl_path)
+    return Path(snapshot_dir) / f"{digest}{SNAPSHOT_SUFFIX}"
+
+
+def load_graph(
+    ttl_path: Union[str, Path],
+    snapshot: bool = True,
+    snapshot_dir: Optional[Union[str, Path]] = None,
+    format: str = "turtle",
+) -> Graph:
+    """
+    Load a TTL file, reusing a binary snapshot when its content hash matches
+
+    A missing or stale snapshot is (re)written after parsing; write failures
+    (e.g. read-only data directories) are logged and ignored.
+
+    Args:
+        ttl_path: TTL file path
+        snapshot: Use/create snapshots (False = plain rdflib parse)
+        snapshot_dir: Directory for hash-named snapshots (None = next to the TTL)
+        format: rdflib parser format
+
+    Returns:
+        Graph
+    """
+    ttl_path = Path(ttl_path)
+    if not snapshot:
+        graph = Graph()
+        graph.parse(str(ttl_path), format=format)
+        return graph
+
+    digest = file_digest(ttl_path)
+    snap = snapshot_path_for(ttl_path, snapshot_dir, digest)
+    meta = read_meta(snap)
+    if meta is not None and meta.get("source_sha256") == digest:
+        logger.debug(f"Loading snapshot {snap}")
+        return load_snapshot(snap)
+
+    graph = Graph()
+    graph.parse(str(ttl_path), format=format)
+    try:
+        save_snapshot(graph, snap, source_sha256=digest)
+    except OSError as e:
+        logger.warning(f"Could not write snapshot for {ttl_path}: {e}")
+    return graph
@@ -1,7 +1,267 @@
+"""
+HVDC Reasoning Engine v1.0
+Forward-chaining RDFS / OWL-RL materialization of ontology rules over data graphs
+(indexed triples, semi-naive worklist evaluation, incremental additions)
+"""
+
 from __future__ import annotations
-from typing import Iterable, Any
+import logging
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from rdflib import Graph, Literal, RDF, URIRef
+
+from ..ontology.schema_index import SchemaIndex, closure, load_schema_index
+
+logger = logging.getLogger(__name__)
+
+ONTOLOGY_DIR = Path(__file__).parent.parent.parent / "configs" / "ontology"
+DEFAULT_ONTOLOGY_FILES = (ONTOLOGY_DIR / "hvdc_ontology.ttl", ONTOLOGY_DIR / "flow_code.ttl")
+
+# rdfs: subproperty / domain / range / subclass; owlrl adds equivalence,
+# inverse, symmetric and transitive properties
+PROFILES = ("rdfs", "owlrl")
+
+Triple = Tuple[Any, Any, Any]
+
 
 def reason(records: Iterable[dict[str, Any]]) -> Iterable[dict[str, Any]]:
     # Placeholder: hook to ontology_reasoning_engine
     for r in records:
         yield r
+
+
+def load_ontology(paths: Sequence[Union[str, Path]] = DEFAULT_ONTOLOGY_FILES) -> Graph:
+    """Parse ontology TTL files into one graph (TBox for Materializer)"""
+    ontology = Graph()
+    for path in paths:
+        ontology.parse(str(path), format="turtle")
+    return ontology
+
+
+class Schema:
+    """
+    Compiled TBox: closed subclass / subproperty hierarchies plus
+    domain, range, inverse, symmetric and transitive property tables
+
+    Only named (IRI) classes are used as rdf:type targets, so anonymous
+    class expressions such as owl:unionOf domains are not materialized.
+    """
+
+    def __init__(self, ontology: Union[Graph, SchemaIndex], profile: str = "owlrl"):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile: {profile} (expected one of {PROFILES})")
+        owl_rl = profile == "owlrl"
+        index = ontology if isinstance(ontology, SchemaIndex) else SchemaIndex.from_graph(ontology)
+
+        parents: Dict[Any, Set[Any]] = defaultdict(set)
+        for c, ds in index.subclass_of.items():
+            parents[c].update(ds)
+        super_props: Dict[Any, Set[Any]] = defaultdict(set)
+        for p, qs in index.subproperty_of.items():
+            super_props[p].update(qs)
+        if owl_rl:
+            for c, d in index.equivalent_classes:
+                parents[c].add(d)
+                parents[d].add(c)
+            for p, q in index.equivalent_properties:
+                super_props[p].add(q)
+                super_props[q].add(p)
+
+        # proper ancestors only (the triple itself is never re-derived)
+        self.superclasses = {
+            c: frozenset(d for d in ds if d != c and isinstance(d, URIRef))
+            for c, ds in closure(parents).items()
+        }
+        self.superproperties = {
+            p: frozenset(q for q in qs if q != p) for p, qs in closure(super_props).items()
+        }
+        self.domains = _named_values(index.domains)
+        self.ranges = _named_values(index.ranges)
+
+        self.inverses: Dict[Any, Set[Any]] = defaultdict(set)
+        self.symmetric: Set[Any] = set()
+        self.transitive: Set[Any] = set()
+        if owl_rl:
+            for p, q in index.inverse_of:
+                self.inverses[p].add(q)
+                self.inverses[q].add(p)
+            self.symmetric = set(index.symmetric)
+            self.transitive = set(index.transitive)
+
+    def derived_predicates(self) -> Set[Any]:
+        """Predicates that rule heads can produce (indexed for duplicate checks)"""
+        predicates = {RDF.type} | self.symmetric | self.transitive
+        for values in self.superproperties.values():
+            predicates |= values
+        for values in self.inverses.values():
+            predicates |= values
+        return predicates
+
+
+def _named_values(table: Dict[Any, List[Any]]) -> Dict[Any, frozenset]:
+    named = {p: frozenset(c for c in cs if isinstance(c, URIRef)) for p, cs in table.items()}
+    return {p: cs for p, cs in named.items() if cs}
+
+
+class Materializer:
+    """
+    Materialize ontology entailments into a data graph
+
+    Rules (OWL 2 RL names): prp-spo1, prp-dom, prp-rng, cax-sco, and for the
+    owlrl profile also prp-inv1/2, prp-symp and prp-trp (equivalent classes /
+    properties are folded into the hierarchies). Schema hierarchies are closed
+    once at construction; instance triples are processed through a worklist,
+    so every triple is joined exactly once against the triples present when
+    it is processed (semi-naive). Derived triples are added to the data graph.
+
+    run() materializes the whole graph; add_triples() adds new triples and
+    derives only their consequences.
+    """
+
+    def __init__(
+        self,
+        graph: Graph,
+        ontology: Optional[Union[Graph, SchemaIndex]] = None,
+        profile: str = "owlrl",
+    ):
+        """
+        Args:
+            graph: Data graph (modified in place)
+            ontology: TBox graph or schema index (None = in-process cached index
+                of DEFAULT_ONTOLOGY_FILES, see load_schema_index)
+            profile: "rdfs" or "owlrl"
+        """
+        self.graph = graph
+        if ontology is None:
+            ontology = load_schema_index(DEFAULT_ONTOLOGY_FILES, disk=False)
+        self.schema = Schema(ontology, profile)
+        self._indexed = self.schema.derived_predicates()
+        self.stats: Dict[str, int] = defaultdict(int)
+        self.seconds = 0.0
+        self._reset()
+
+    def _reset(self) -> None:
+        # predicate → subject → objects, for predicates that rules can derive
+        self._out: Dict[Any, Dict[Any, Set[Any]]] = {p: defaultdict(set) for p in self._indexed}
+        # transitive predicate → object → subjects (second join direction)
+        self._in: Dict[Any, Dict[Any, Set[Any]]] = {p: defaultdict(set) for p in self.schema.transitive}
+
+    def _index(self, s, p, o) -> bool:
+        """Record a triple; False if it was already known"""
+        out = self._out.get(p)
+        if out is None:
+            return True
+        objects = out[s]
+        if o in objects:
+            return False
+        objects.add(o)
+        inv = self._in.get(p)
+        if inv is not None:
+            inv[o].add(s)
+        return True
+
+    def run(self) -> Dict[str, int]:
+        """
+        Materialize all entailments of the current graph
+
+        Returns:
+            dict: {rule name: triples derived}
+        """
+        self._reset()
+        delta = []
+        for s, p, o in self.graph:
+            self._index(s, p, o)
+            delta.append((s, p, o))
+        return self._evaluate(delta)
+
+    def add_triples(self, triples: Iterable[Triple]) -> Dict[str, int]:
+        """
+        Add triples to the graph and materialize their consequences
+
+        Returns:
+            dict: {rule name: triples derived} for this update
+        """
+        delta = []
+        for s, p, o in triples:
+            if p in self._out:
+                if not self._index(s, p, o):
+                    continue
+            elif (s, p, o) in self.graph:
+                continue
+            delta.append((s, p, o))
+        self.graph.addN((s, p, o, self.graph) for s, p, o in delta)
+        return self._evaluate(delta)
+
+    def _evaluate(self, delta: List[Triple]) -> Dict[str, int]:
+        start = time.perf_counter()
+        schema = self.schema
+        type_index = self._out[RDF.type]
+        fired: Dict[str, int] = defaultdict(int)
+        derived: List[Triple] = []
+        work = list(reversed(delta))
+
+        def emit(rule: str, s, p, o) -> None:
+            if isinstance(s, Literal) or not self._index(s, p, o):
+                return
+            fired[rule] += 1
+            derived.append((s, p, o))
+            work.append((s, p, o))
+
+        while work:
+            s, p, o = work.pop()
+            if p == RDF.type:
+                for d in schema.superclasses.get(o, ()):
+                    if d not in type_index[s]:
+                        emit("cax-sco", s, RDF.type, d)
+                continue
+
+            for q in schema.superproperties.get(p, ()):
+                emit("prp-spo1", s, q, o)
+            for c in schema.domains.get(p, ()):
+                emit("prp-dom", s, RDF.type, c)
+            if not isinstance(o, Literal):
+                for c in schema.ranges.get(p, ()):
+                    emit("prp-rng", o, RDF.type, c)
+                for q in schema.inverses.get(p, ()):
+                    emit("prp-inv", o, q, s)
+                if p in schema.symmetric:
+                    emit("prp-symp", o, p, s)
+            if p in schema.transitive:
+                # (s p o) joined with (o p z) and (w p s) already known
+                out, inv = self._out[p], self._in[p]
+                for z in list(out.get(o, ())):
+                    emit("prp-trp", s, p, z)
+                for w in list(inv.get(s, ())):
+                    emit("prp-trp", w, p, o)
+
+        self.graph.addN((s, p, o, self.graph) for s, p, o in derived)
+        elapsed = time.perf_counter() - start
+        self.seconds += elapsed
+        for rule, count in fired.items():
+            self.stats[rule] += count
+        logger.info(f"Materialized {len(derived)} triples from {len(delta)} in {elapsed:.3f}s")
+        return dict(fired)
+
+
+def materialize(
+    graph: Graph,
+    ontology: Optional[Union[Graph, SchemaIndex]] = None,
+    profile: str = "owlrl",
+) -> Materializer:
+    """
+    Materialize ontology entailments into graph (in place)
+
+    Args:
+        graph: Data graph
+        ontology: TBox graph or schema index (None = hvdc_ontology.ttl + flow_code.ttl)
+        profile: "rdfs" or "owlrl"
+
+    Returns:
+        Materializer: Bound to graph; use add_triples() for later additions
+    """
+    materializer = Materializer(graph, ontology, profile)
+    materializer.run()
+    return materializer
@@ -7,10 +7,16 @@ Enforces confidence thresholds and field completeness for HVDC requirements.
 """
 
 from __future__ import annotations
-from typing import Dict, List, Tuple, Any, Iterable
+from typing import Dict, List, Literal, Tuple, Any, Iterable, get_args, get_origin
 import logging
+import math
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
 from ..core.models import TransportEvent, StockSnapshot, DeadStock
 
 
@@ -80,6 +86,10 @@ class SchemaValidator:
             "hs_code": r"^\d{6,10}$",  # 6-10 digits
             "do_number": r"^DO\d{6,10}$",  # DO + 6-10 digits
         }
+        # Compiled form of hvdc_patterns, keyed by pattern string so edits stay in sync
+        self._compiled_patterns: Dict[str, re.Pattern[str]] = {
+            pattern: re.compile(pattern) for pattern in self.hvdc_patterns.values()
+        }
 
     def _setup_logger(self, log_level: str) -> logging.Logger:
         """Setup logger for validation"""
@@ -104,6 +114,17 @@ class SchemaValidator:
         Returns:
             Tuple[bool, List[str]]: (is_valid, list_of_errors)
         """
+        is_valid, errors = self._validate_document(document)
+        doc_type = document.get("type")
+        if is_valid:
+            self.logger.info(f"Document validation passed: {doc_type}")
+        elif doc_type in self.required_fields:
+            self.logger.warning(f"Document validation failed: {doc_type}, errors: {len(errors)}")
+
+        return is_valid, errors
+
+    def _validate_document(self, document: Dict[str, Any]) -> Tuple[bool, List[str]]:
+        """Validate a single document without per-document logging"""
         errors = []
 
         # Check document type
@@ -140,13 +161,7 @@ class SchemaValidator:
         blocks_errors = self._validate_blocks(document)
         errors.extend(blocks_errors)
 
-        is_valid = len(errors) == 0
-        if is_valid:
-            self.logger.info(f"Document validation passed: {doc_type}")
-        else:
-            self.logger.warning(f"Document validation failed: {doc_type}, errors: {len(errors)}")
-
-        return is_valid, errors
+        return len(errors) == 0, errors
 
     def _validate_confidence(self, document: Dict[str, Any], doc_type: str) -> List[str]:
         """Validate confidence thresholds"""
@@ -172,7 +187,10 @@ class SchemaValidator:
         for field, pattern in self.hvdc_patterns.items():
             if field in document:
                 value = str(document[field])
-                if not re.match(pattern, value):
+                compiled = self._compiled_patterns.get(pattern)
+                if compiled is None:
+                    compiled = self._compiled_patterns[pattern] = re.compile(pattern)
+                if not compiled.match(value):
                     errors.append(f"Field '{field}' value '{value}' does not match HVDC pattern")
 
         return errors
@@ -231,16 +249,43 @@ class SchemaValidator:
 
         return errors
 
-    def validate_batch(self, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def validate_batch(
+        self,
+        documents: List[Dict[str, Any]],
+        workers: int | None = None,
+        chunk_size: int | None = None,
+    ) -> Dict[str, Any]:
         """
         Validate a batch of documents
 
         Args:
             documents: List of documents to validate
+            workers: Worker processes (None/1 = serial, 0 = os.cpu_count())
+            chunk_size: Documents per worker task (default: ~4 tasks per worker)
 
         Returns:
             Dict with validation summary
         """
+        if workers == 0:
+            workers = os.cpu_count() or 1
+        if not workers or workers <= 1 or len(documents) < 2:
+            results = self._validate_chunk(documents)
+        else:
+            chunk_size = chunk_size or max(1, math.ceil(len(documents) / (workers * 4)))
+            chunks = [
+                documents[i : i + chunk_size] for i in range(0, len(documents), chunk_size)
+            ]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = self._merge_batch_results(executor.map(self._validate_chunk, chunks))
+
+        self.logger.info(
+            f"Batch validation: {results['valid']}/{results['total']} valid, "
+            f"{results['invalid']} invalid"
+        )
+        return results
+
+    def _validate_chunk(self, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Validate documents serially and summarize (runs inside pool workers)"""
         results = {
             "total": len(documents),
             "valid": 0,
@@ -251,7 +296,7 @@ class SchemaValidator:
         }
 
         for doc in documents:
-            is_valid, errors = self.validate(doc)
+            is_valid, errors = self._validate_document(doc)
 
             if is_valid:
                 results["valid"] += 1
@@ -273,36 +318,208 @@ class SchemaValidator:
 
         return results
 
+    @staticmethod
+    def _merge_batch_results(parts: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Sum per-chunk summaries into one batch summary"""
+        merged = {
+            "total": 0,
+            "valid": 0,
+            "invalid": 0,
+            "errors_by_type": {},
+            "confidence_failures": 0,
+            "pattern_failures": 0,
+        }
+        for part in parts:
+            for key in ("total", "valid", "invalid", "confidence_failures", "pattern_failures"):
+                merged[key] += part[key]
+            by_type = merged["errors_by_type"]
+            for doc_type, count in part["errors_by_type"].items():
+                by_type[doc_type] = by_type.get(doc_type, 0) + count
+        return merged
+
 
 # Pydantic model validation functions
-def validate_transport_events(records: Iterable[dict[str, Any]]) -> Tuple[bool, list[str]]:
-    """Validate TransportEvent records using Pydantic models"""
+# Quantity columns that may be required to be >= 0 (the models themselves allow negatives)
+NON_NEGATIVE_FIELDS: Dict[type[BaseModel], Tuple[str, ...]] = {
+    StockSnapshot: ("on_hand", "allocated", "available"),
+    DeadStock: ("quantity", "days_stagnant"),
+}
+
+# ISO-8601 shapes accepted by both pandas and Pydantic; anything else goes to Pydantic
+_ISO_DATETIME = (
+    r"^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?"
+    r"(?:Z|[+-]\d{2}:?\d{2})?$"
+)
+
+
+def _negative_errors(
+    model: type[BaseModel], rows: Iterable[Tuple[int, dict[str, Any]]]
+) -> list[str]:
+    """Non-negative quantity errors for already type-valid records"""
+    errors: list[str] = []
+    for i, rec in rows:
+        for field in NON_NEGATIVE_FIELDS.get(model, ()):
+            value = rec.get(field)
+            if value is not None and value < 0:
+                errors.append(f"row={i}: field '{field}' must be non-negative, got {value}")
+    return errors
+
+
+def _validate_records(
+    model: type[BaseModel], records: Iterable[dict[str, Any]], non_negative: bool = False
+) -> list[str]:
+    """Validate records one by one with the Pydantic model"""
     errors: list[str] = []
+    valid_rows: list[Tuple[int, dict[str, Any]]] = []
     for i, rec in enumerate(records):
         try:
-            TransportEvent.model_validate(rec)
+            model.model_validate(rec)
+            valid_rows.append((i, rec))
         except Exception as e:
             errors.append(f"row={i}: {e}")
-    return (len(errors) == 0, errors)
+    if non_negative:
+        errors.extend(_negative_errors(model, valid_rows))
+        errors.sort(key=lambda e: int(e[4 : e.index(":")]))
+    return errors
 
 
-def validate_stock_snapshots(records: Iterable[dict[str, Any]]) -> Tuple[bool, list[str]]:
-    """Validate StockSnapshot records using Pydantic models"""
-    errors: list[str] = []
-    for i, rec in enumerate(records):
-        try:
-            StockSnapshot.model_validate(rec)
-        except Exception as e:
-            errors.append(f"row={i}: {e}")
-    return (len(errors) == 0, errors)
+def _is_instance_mask(col: pd.Series, types: tuple) -> np.ndarray:
+    """Element-wise isinstance over an object column"""
+    values = col.to_numpy(dtype=object)
+    return np.fromiter((isinstance(v, types) for v in values), dtype=bool, count=len(values))
+
+
+def _iso_datetime_mask(text: pd.Series) -> np.ndarray:
+    """ISO-8601 check on the distinct strings only, mapped back to rows"""
+    codes, uniques = pd.factorize(text)
+    uniques = pd.Series(uniques, dtype=object)
+    shaped = uniques.str.match(_ISO_DATETIME, na=False)
+    parsed = pd.to_datetime(uniques.where(shaped), format="ISO8601", utc=True, errors="coerce")
+    ok = (shaped & parsed.notna()).to_numpy()
+    return np.where(codes >= 0, ok[codes], False)
+
 
+def _column_ok(col: pd.Series, annotation: Any) -> np.ndarray:
+    """
+    Rows whose value certainly passes Pydantic validation for the annotation
+
+    False means "unknown", not "invalid": those rows are re-checked by Pydantic.
+    """
+    n = len(col)
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    optional = type(None) in args
+    if optional:
+        inner = [a for a in args if a is not type(None)]
+        annotation = inner[0] if len(inner) == 1 else annotation
+        origin, args = get_origin(annotation), get_args(annotation)
+    # Only object columns can hold a literal None
+    if optional and col.dtype == object:
+        none_ok = _is_instance_mask(col, (type(None),))
+    else:
+        none_ok = np.zeros(n, dtype=bool)
+
+    if origin is Literal:
+        return col.isin(list(args)).to_numpy() | none_ok
+    if annotation is str:
+        if isinstance(col.dtype, pd.StringDtype):
+            return col.notna().to_numpy()
+        return _is_instance_mask(col, (str,)) | none_ok
+    if annotation is int:
+        if pd.api.types.is_integer_dtype(col.dtype) and not col.hasnans:
+            return np.ones(n, dtype=bool)
+        if pd.api.types.is_float_dtype(col.dtype):
+            return (col.notna() & (col % 1 == 0)).to_numpy() | none_ok
+        return _is_instance_mask(col, (int, np.integer)) | none_ok
+    if annotation is datetime:
+        if pd.api.types.is_datetime64_any_dtype(col.dtype):
+            return col.notna().to_numpy()
+        if isinstance(col.dtype, pd.StringDtype):
+            return _iso_datetime_mask(col)
+        if pd.api.types.infer_dtype(col, skipna=True) in ("string", "mixed"):
+            is_str = _is_instance_mask(col, (str,))
+            return _iso_datetime_mask(col.where(is_str)) & is_str | none_ok
+        return _is_instance_mask(col, (datetime,)) & col.notna().to_numpy() | none_ok
+    if origin is dict or annotation is dict:
+        return _is_instance_mask(col, (dict,))
+    return np.zeros(n, dtype=bool)
+
+
+def _validate_frame(
+    model: type[BaseModel], df: pd.DataFrame, non_negative: bool = False
+) -> list[str]:
+    """
+    Column-wise validation with per-record Pydantic fallback
+
+    Each column is checked in one vectorized pass (dtype, enum membership, ISO
+    datetime coercion). Rows that do not pass every check are validated by the
+    Pydantic model so that error messages match the record-wise functions.
+    """
+    n = len(df)
+    ok = np.ones(n, dtype=bool)
+    fields = model.model_fields
+
+    if set(df.columns) - set(fields):
+        ok[:] = False  # extra="forbid": every row carries the extra keys
+    for name, info in fields.items():
+        if name not in df.columns:
+            if info.is_required():
+                ok[:] = False
+            continue
+        if ok.any():
+            ok &= _column_ok(df[name], info.annotation)
 
-def validate_dead_stock(records: Iterable[dict[str, Any]]) -> Tuple[bool, list[str]]:
-    """Validate DeadStock records using Pydantic models"""
     errors: list[str] = []
-    for i, rec in enumerate(records):
-        try:
-            DeadStock.model_validate(rec)
-        except Exception as e:
-            errors.append(f"row={i}: {e}")
+    bad = np.flatnonzero(~ok)
+    if len(bad):
+        records = df.iloc[bad].to_dict(orient="records")
+        for i, rec in zip(bad, records):
+            try:
+                model.model_validate(rec)
+            except Exception as e:
+                errors.append(f"row={i}: {e}")
+            else:
+                ok[i] = True
+
+    if non_negative:
+        for field in NON_NEGATIVE_FIELDS.get(model, ()):
+            if field not in df.columns:
+                continue
+            values = pd.to_numeric(df[field], errors="coerce").to_numpy()
+            for i in np.flatnonzero(ok & (values < 0)):
+                errors.append(f"row={i}: field '{field}' must be non-negative, got {values[i]:g}")
+        errors.sort(key=lambda e: int(e[4 : e.index(":")]))
+    return errors
+
+
+def _validate(
+    model: type[BaseModel],
+    records: Iterable[dict[str, Any]] | pd.DataFrame,
+    non_negative: bool = False,
+) -> Tuple[bool, list[str]]:
+    if isinstance(records, pd.DataFrame):
+        errors = _validate_frame(model, records, non_negative)
+    else:
+        errors = _validate_records(model, records, non_negative)
     return (len(errors) == 0, errors)
+
+
+def validate_transport_events(
+    records: Iterable[dict[str, Any]] | pd.DataFrame,
+) -> Tuple[bool, list[str]]:
+    """Validate TransportEvent records (or a DataFrame, column-wise) using Pydantic models"""
+    return _validate(TransportEvent, records)
+
+
+def validate_stock_snapshots(
+    records: Iterable[dict[str, Any]] | pd.DataFrame, non_negative: bool = False
+) -> Tuple[bool, list[str]]:
+    """Validate StockSnapshot records (or a DataFrame, column-wise) using Pydantic models"""
+    return _validate(StockSnapshot, records, non_negative)
+
+
+def validate_dead_stock(
+    records: Iterable[dict[str, Any]] | pd.DataFrame, non_negative: bool = False
+) -> Tuple[bool, list[str]]:
+    """Validate DeadStock records (or a DataFrame, column-wise) using Pydantic models"""
+    return _validate(DeadStock, records, non_negative)
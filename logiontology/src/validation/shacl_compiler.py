@@ -0,0 +1,557 @@
+"""
+HVDC SHACL Frame Compiler v1.0
+Compile SHACL property constraints into vectorized checks over a DataFrame of
+flow properties (one row per focus node), with pyshacl fallback for
+constraints that have no column-wise form
+"""
+
+from __future__ import annotations
+import logging
+import math
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from rdflib import BNode, Graph, Literal, RDF, URIRef
+from rdflib.collection import Collection
+from rdflib.namespace import SH, XSD
+
+from ..mapping.flow_rdf_mapper import HVDC_FLOW, HVDCI
+from .shacl_service import CompiledShapes, ShaclValidationService, load_shapes
+
+try:
+    from pyshacl.rdfutil import stringify_node  # type: ignore
+except ImportError:  # pragma: no cover - optional
+    stringify_node = None
+
+logger = logging.getLogger(__name__)
+
+# SHACL path → DataFrame column (FlowRDFMapper property names)
+FLOW_COLUMNS = {
+    HVDC_FLOW.hasFlowCode: "flow_code",
+    HVDC_FLOW.hasWHHandling: "wh_handling",
+    HVDC_FLOW.hasOffshoreFlag: "offshore_flag",
+    HVDC_FLOW.isPreArrival: "is_pre_arrival",
+    HVDC_FLOW.hasTransportMode: "transport_mode",
+    HVDC_FLOW.hasFlowDescription: "flow_description",
+    HVDC_FLOW.gateApptWinMin: "gate_appt_win_min",
+    HVDC_FLOW.CYInOutLagHr: "cy_in_out_lag_hr",
+    HVDC_FLOW.unloadRateTph: "unload_rate_tph",
+    HVDC_FLOW.spillageRiskPct: "spillage_risk_pct",
+    HVDC_FLOW.convoyPeriodMin: "convoy_period_min",
+    HVDC_FLOW.DOTPermitLeadDays: "dot_permit_lead_days",
+    HVDC_FLOW.rampCycleMin: "ramp_cycle_min",
+    HVDC_FLOW.stowageUtilPct: "stowage_util_pct",
+    HVDC_FLOW.LOLOslots: "lolo_slots",
+    HVDC_FLOW.voyageTimeHours: "voyage_time_hours",
+}
+
+# transport_mode → rdf:type (rows of other modes are plain LogisticsFlow)
+FLOW_MODE_CLASSES = {
+    "container": HVDC_FLOW.ContainerFlow,
+    "bulk": HVDC_FLOW.BulkFlow,
+    "land": HVDC_FLOW.LandFlow,
+    "lct": HVDC_FLOW.LCTFlow,
+}
+FLOW_FOCUS_PREFIX = str(HVDCI["Flow/"])
+
+DATATYPES = (XSD.integer, XSD.decimal, XSD.boolean, XSD.string)
+
+COMPONENTS = {
+    SH.minCount: SH.MinCountConstraintComponent,
+    SH.maxCount: SH.MaxCountConstraintComponent,
+    SH.datatype: SH.DatatypeConstraintComponent,
+    SH.minInclusive: SH.MinInclusiveConstraintComponent,
+    SH.maxInclusive: SH.MaxInclusiveConstraintComponent,
+    SH.minExclusive: SH.MinExclusiveConstraintComponent,
+    SH.maxExclusive: SH.MaxExclusiveConstraintComponent,
+    SH["in"]: SH.InConstraintComponent,
+}
+# parameters that only describe a shape (no constraint of their own)
+_DESCRIPTIVE = {SH.message, SH.severity, SH.name, SH.description, SH.order, SH.group, SH.deactivated}
+_NODE_PARAMS = _DESCRIPTIVE | {SH.targetClass, SH.property, SH.sparql}
+_PROPERTY_PARAMS = _DESCRIPTIVE | {SH.path} | set(COMPONENTS)
+
+_COUNTS = (SH.minCount, SH.maxCount)
+
+VIOLATION_COLUMNS = ["focus_node", "shape", "source_shape", "path", "component", "severity", "value", "message"]
+
+
+class TypedColumn:
+    """Column values split by RDF literal kind (absent columns are all-missing)"""
+
+    def __init__(self, values: pd.Series):
+        self.values = values
+        self.present = values.notna().to_numpy()
+        n = len(values)
+        if pd.api.types.is_bool_dtype(values.dtype):
+            self.boolean = self.present.copy()
+            self.strings = np.zeros(n, dtype=bool)
+            self.numeric = np.full(n, np.nan)
+        elif pd.api.types.is_numeric_dtype(values.dtype):
+            self.boolean = np.zeros(n, dtype=bool)
+            self.strings = np.zeros(n, dtype=bool)
+            self.numeric = values.to_numpy(dtype=float, na_value=np.nan)
+        elif pd.api.types.is_string_dtype(values.dtype) and not pd.api.types.is_object_dtype(values.dtype):
+            self.boolean = np.zeros(n, dtype=bool)
+            self.strings = self.present.copy()
+            self.numeric = np.full(n, np.nan)
+        else:
+            kinds = values.map(type)
+            self.boolean = kinds.isin([bool, np.bool_]).to_numpy()
+            self.strings = (kinds == str).to_numpy()
+            numbers = values.where(~(self.boolean | self.strings))
+            self.numeric = pd.to_numeric(numbers, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        self.finite = np.isfinite(self.numeric)
+        self.integer = self.finite & (np.mod(self.numeric, 1, where=self.finite, out=np.ones(n)) == 0)
+
+    def valid(self, datatype) -> np.ndarray:
+        """Present values in the lexical space of datatype"""
+        if datatype == XSD.integer:
+            return self.integer
+        if datatype == XSD.decimal:
+            return self.finite
+        if datatype == XSD.boolean:
+            return self.boolean
+        return self.strings
+
+    def flag(self, value: bool) -> np.ndarray:
+        """Boolean-typed values equal to value"""
+        if not self.boolean.any():
+            return np.zeros(len(self.values), dtype=bool)
+        return self.boolean & self.values.eq(value).fillna(False).to_numpy(dtype=bool)
+
+    def effective_boolean(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(defined, value) of the SPARQL effective boolean value of each cell"""
+        truth = self.flag(True)
+        with np.errstate(invalid="ignore"):
+            truth |= self.finite & (self.numeric != 0)
+        defined = self.boolean | self.finite
+        if self.strings.any():
+            truth |= self.strings & (self.values.where(self.strings, "").str.len() > 0).to_numpy(dtype=bool)
+            defined |= self.strings
+        return defined, truth
+
+
+def _flow_code_sparql(column: Callable[[Any], TypedColumn]) -> Dict[str, np.ndarray]:
+    """
+    FlowCodeConsistencyShape / PreArrivalShape SPARQL constraints, column-wise
+
+    Mirrors the SELECT queries in FlowCode.shape.ttl: a row matches only when
+    every variable of the pattern is bound to a comparable literal.
+    """
+    code = column(HVDC_FLOW.hasFlowCode)
+    wh = column(HVDC_FLOW.hasWHHandling)
+    offshore = column(HVDC_FLOW.hasOffshoreFlag)
+    pre = column(HVDC_FLOW.isPreArrival)
+    offshore_defined, offshore_true = offshore.effective_boolean()
+    expected = np.minimum(1 + wh.numeric + offshore_true, 4)
+    return {
+        "FlowCode inconsistent with WH hops and offshore flag. Expected: FlowCode = "
+        "min(1 + WH_hops + offshore, 4) for non-PreArrival flows": (
+            code.finite & wh.finite & offshore_defined & pre.flag(False) & (code.numeric != expected)
+        ),
+        "PreArrival flows must have FlowCode=0": pre.flag(True) & code.finite & (code.numeric != 0),
+        "FlowCode=0 must have isPreArrival=true": code.integer & (code.numeric == 0) & pre.flag(False),
+    }
+
+
+# node shape → vectorized equivalent of its sh:sparql constraints, keyed by sh:message
+NATIVE_SPARQL: Dict[Any, Callable[[Callable[[Any], TypedColumn]], Dict[str, np.ndarray]]] = {
+    HVDC_FLOW.FlowCodeConsistencyShape: _flow_code_sparql,
+    HVDC_FLOW.PreArrivalShape: _flow_code_sparql,
+}
+
+
+@dataclass(frozen=True)
+class FrameCheck:
+    """One compiled constraint of a top-level shape"""
+    shape: Any
+    source_shape: Any
+    path: Any
+    parameter: Any  # sh:minCount, sh:datatype, ... or sh:sparql
+    argument: Any
+    message: Optional[str]
+    severity: Any
+
+
+def _literal(value, datatype=None) -> Literal:
+    """
+    DataFrame cell → literal as FlowRDFMapper writes it (declared datatype when
+    valid; integral floats are integers, as NaN upcasts int columns to float)
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return Literal(bool(value))
+    if isinstance(value, (int, np.integer)) and not isinstance(value, bool):
+        value = int(value)
+        return Literal(Decimal(value), datatype=XSD.decimal) if datatype == XSD.decimal else Literal(value)
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        if math.isfinite(value):
+            if datatype == XSD.decimal:
+                return Literal(Decimal(repr(value)), datatype=XSD.decimal)
+            if value.is_integer():
+                return Literal(int(value))
+        return Literal(value)
+    return Literal(value)
+
+
+@dataclass
+class FrameReport:
+    """Violations of a frame validation, convertible to a pyshacl report"""
+    conforms: bool
+    violations: pd.DataFrame
+    seconds: float
+    shape_seconds: Dict[Any, float]
+    shapes: CompiledShapes
+    focus_prefix: str
+    datatypes: Dict[Any, Any]
+
+    def focus_iri(self, focus) -> URIRef:
+        return focus if isinstance(focus, URIRef) else URIRef(f"{self.focus_prefix}{focus}")
+
+    def graph(self) -> Graph:
+        """sh:ValidationReport graph (pyshacl results_graph layout)"""
+        g = Graph()
+        for prefix, ns in self.shapes.graph.namespace_manager.namespaces():
+            g.bind(prefix, ns)
+        report = BNode()
+        g.add((report, RDF.type, SH.ValidationReport))
+        g.add((report, SH.conforms, Literal(self.conforms)))
+        for row in self.violations.itertuples(index=False):
+            result = BNode()
+            focus = self.focus_iri(row.focus_node)
+            g.add((report, SH.result, result))
+            g.add((result, RDF.type, SH.ValidationResult))
+            g.add((result, SH.focusNode, focus))
+            g.add((result, SH.resultSeverity, row.severity))
+            g.add((result, SH.sourceShape, row.source_shape))
+            g.add((result, SH.sourceConstraintComponent, row.component))
+            if row.path is not None:
+                g.add((result, SH.resultPath, row.path))
+            if row.component == SH.SPARQLConstraintComponent:
+                g.add((result, SH.value, focus))
+            elif row.value is not None:
+                g.add((result, SH.value, _literal(row.value, self.datatypes.get(row.path))))
+            if row.message is not None:
+                g.add((result, SH.resultMessage, Literal(row.message)))
+        return g
+
+    @property
+    def text(self) -> str:
+        """Report text in pyshacl's results_text layout"""
+        text = f"Validation Report\nConforms: {self.conforms}\n"
+        if len(self.violations):
+            text += f"Results ({len(self.violations)}):\n"
+            text += "".join(sorted(self._result_texts()))
+        return text
+
+    def as_pyshacl(self) -> Tuple[bool, Graph, str]:
+        """(conforms, results_graph, results_text) like pyshacl.validate"""
+        return self.conforms, self.graph(), self.text
+
+    def _result_texts(self):
+        sg = self.shapes.graph
+        show = (lambda node: stringify_node(sg, node)) if stringify_node else str
+        for row in self.violations.itertuples(index=False):
+            focus = self.focus_iri(row.focus_node)
+            component = str(row.component)
+            text = (
+                f"Constraint Violation in {component.rsplit('#', 1)[-1]} ({component}):\n"
+                f"\tSeverity: {show(row.severity)}\n"
+                f"\tSource Shape: {show(row.source_shape)}\n"
+                f"\tFocus Node: {show(focus)}\n"
+            )
+            if row.component == SH.SPARQLConstraintComponent:
+                text += f"\tValue Node: {show(focus)}\n"
+            elif row.value is not None:
+                text += f"\tValue Node: {show(_literal(row.value, self.datatypes.get(row.path)))}\n"
+            if row.path is not None:
+                text += f"\tResult Path: {show(row.path)}\n"
+            if row.message is not None:
+                text += f"\tMessage: {row.message}\n"
+            yield text
+
+
+class FrameShapeValidator:
+    """
+    Validate flow DataFrames against SHACL shapes without building RDF
+
+    Each row is one focus node; columns hold single property values (NaN =
+    absent), typed as the literal FlowRDFMapper would write. Node shapes
+    targeting flow classes whose constraints are all compilable
+    (sh:minCount/maxCount, sh:datatype for integer/decimal/boolean/string,
+    sh:min/maxInclusive/Exclusive, sh:in on predicate paths mapped to
+    columns, and sh:sparql with a NATIVE_SPARQL equivalent) run as numpy
+    masks. Other shapes are validated by pyshacl (ShaclValidationService)
+    over the RDF of just the rows they target.
+    """
+
+    def __init__(
+        self,
+        shapes: Optional[CompiledShapes] = None,
+        columns: Mapping[Any, str] = FLOW_COLUMNS,
+        focus_column: str = "flow_id",
+        focus_prefix: str = FLOW_FOCUS_PREFIX,
+        type_column: str = "transport_mode",
+        type_classes: Mapping[str, Any] = FLOW_MODE_CLASSES,
+        base_class: Any = HVDC_FLOW.LogisticsFlow,
+        allow_warnings: bool = True,
+        allow_infos: bool = True,
+    ):
+        """
+        Args:
+            shapes: Compiled shapes (None = load_shapes() default FlowCode shapes)
+            columns: Property path → DataFrame column
+            focus_column: Column holding the focus node id
+            focus_prefix: IRI prefix of focus node ids (report / fallback graph)
+            type_column: Column selecting the row's rdf:type via type_classes
+            type_classes: type_column value → class (other rows: base_class)
+            base_class: Class of every row
+            allow_warnings: sh:Warning results do not break conformance
+            allow_infos: sh:Info results do not break conformance
+        """
+        self.shapes = shapes if shapes is not None else load_shapes()
+        self.columns = dict(columns)
+        self.focus_column = focus_column
+        self.focus_prefix = focus_prefix
+        self.type_column = type_column
+        self.type_classes = dict(type_classes)
+        self.base_class = base_class
+        self.allow_warnings = allow_warnings
+        self.allow_infos = allow_infos
+
+        sg = self.shapes.graph
+        self.datatypes = {
+            path: datatype
+            for prop in sg.subjects(SH.path, None)
+            for path in [sg.value(prop, SH.path)]
+            for datatype in [sg.value(prop, SH.datatype)]
+            if datatype is not None
+        }
+        self.checks: Dict[Any, List[FrameCheck]] = {}
+        self.fallback: List[Any] = []
+        for shape in self.shapes.shapes:
+            checks = self._compile(shape.node)
+            if checks is None:
+                self.fallback.append(shape.node)
+            else:
+                self.checks[shape.node] = checks
+        logger.info(
+            f"Compiled {len(self.checks)} shapes to frame checks, {len(self.fallback)} via pyshacl"
+        )
+
+    def _compile(self, shape) -> Optional[List[FrameCheck]]:
+        """Checks of one top-level shape (None = needs pyshacl)"""
+        sg = self.shapes.graph
+        nodes, _, subjects_of, objects_of = self.shapes.targets[shape]
+        if nodes or subjects_of or objects_of or (shape, SH.path, None) in sg:
+            return None
+        if any(p.startswith(str(SH)) and p not in _NODE_PARAMS for p in sg.predicates(shape)):
+            return None
+        severity = sg.value(shape, SH.severity) or SH.Violation
+        checks: List[FrameCheck] = []
+
+        constraints = list(sg.objects(shape, SH.sparql))
+        if constraints:
+            native = NATIVE_SPARQL.get(shape)
+            if native is None:
+                return None
+            for constraint in constraints:
+                message = sg.value(constraint, SH.message)
+                if message is None:
+                    return None
+                checks.append(FrameCheck(shape, shape, None, SH.sparql, native, str(message), severity))
+
+        for prop in sg.objects(shape, SH.property):
+            if sg.value(prop, SH.deactivated) == Literal(True):
+                continue
+            path = sg.value(prop, SH.path)
+            if path not in self.columns:
+                return None
+            params = set(sg.predicates(prop))
+            if any(p.startswith(str(SH)) and p not in _PROPERTY_PARAMS for p in params):
+                return None
+            message = sg.value(prop, SH.message)
+            message = None if message is None else str(message)
+            prop_severity = sg.value(prop, SH.severity) or SH.Violation
+            for parameter in COMPONENTS:
+                for argument in sg.objects(prop, parameter):
+                    if parameter == SH.datatype and argument not in DATATYPES:
+                        return None
+                    if parameter == SH["in"]:
+                        argument = [v.toPython() for v in Collection(sg, argument)]
+                    elif isinstance(argument, Literal):
+                        argument = argument.toPython()
+                    checks.append(FrameCheck(shape, prop, path, parameter, argument, message, prop_severity))
+        return checks
+
+    def _target_rows(self, frame: pd.DataFrame, shape) -> np.ndarray:
+        _, classes, _, _ = self.shapes.targets[shape]
+        if self.base_class in classes:
+            return np.ones(len(frame), dtype=bool)
+        if self.type_column not in frame.columns:
+            return np.zeros(len(frame), dtype=bool)
+        modes = [mode for mode, cls in self.type_classes.items() if cls in classes]
+        return frame[self.type_column].isin(modes).to_numpy()
+
+    def validate(self, frame: pd.DataFrame) -> FrameReport:
+        """
+        Validate all rows of frame
+
+        Returns:
+            FrameReport: Violations (one row per sh:ValidationResult) and conformance
+        """
+        start = time.perf_counter()
+        frame = frame.reset_index(drop=True)
+        focus_ids = frame[self.focus_column].to_numpy()
+        typed: Dict[Any, TypedColumn] = {}
+        targets: Dict[frozenset, np.ndarray] = {}
+
+        def column(path) -> TypedColumn:
+            if path not in typed:
+                name = self.columns[path]
+                values = frame[name] if name in frame.columns else pd.Series(np.nan, index=frame.index)
+                typed[path] = TypedColumn(values)
+            return typed[path]
+
+        parts: List[pd.DataFrame] = []
+        shape_seconds: Dict[Any, float] = {}
+        for shape, checks in self.checks.items():
+            shape_start = time.perf_counter()
+            classes = self.shapes.targets[shape][1]
+            if classes not in targets:
+                targets[classes] = self._target_rows(frame, shape)
+            rows = targets[classes]
+            native_masks: Dict[Any, Dict[str, np.ndarray]] = {}
+            for check in checks:
+                if check.parameter == SH.sparql:
+                    if check.argument not in native_masks:
+                        native_masks[check.argument] = check.argument(column)
+                    mask = rows & native_masks[check.argument][check.message]
+                    values = None
+                else:
+                    mask = self._evaluate(check, column(check.path), rows)
+                    values = column(check.path).values
+                idx = np.flatnonzero(mask)
+                if len(idx):
+                    parts.append(pd.DataFrame({
+                        "focus_node": focus_ids[idx],
+                        "shape": check.shape,
+                        "source_shape": check.source_shape,
+                        "path": check.path,
+                        "component": COMPONENTS.get(check.parameter, SH.SPARQLConstraintComponent),
+                        "severity": check.severity,
+                        "value": None if values is None or check.parameter in _COUNTS
+                        else values.iloc[idx].to_numpy(dtype=object),
+                        "message": check.message,
+                    }, dtype=object))
+            shape_seconds[shape] = time.perf_counter() - shape_start
+
+        if self.fallback:
+            parts.extend(self._validate_fallback(frame, shape_seconds))
+
+        violations = (
+            pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=VIOLATION_COLUMNS, dtype=object)
+        )
+        failing = {SH.Violation}
+        if not self.allow_warnings:
+            failing.add(SH.Warning)
+        if not self.allow_infos:
+            failing.add(SH.Info)
+        conforms = not violations["severity"].isin(failing).any()
+        seconds = time.perf_counter() - start
+        logger.info(f"Frame SHACL validation: {len(frame)} rows, {len(violations)} results in {seconds:.3f}s")
+        return FrameReport(
+            conforms=bool(conforms),
+            violations=violations,
+            seconds=seconds,
+            shape_seconds=shape_seconds,
+            shapes=self.shapes,
+            focus_prefix=self.focus_prefix,
+            datatypes=self.datatypes,
+        )
+
+    @staticmethod
+    def _evaluate(check: FrameCheck, col: TypedColumn, rows: np.ndarray) -> np.ndarray:
+        """Violation mask of one property constraint"""
+        parameter, argument = check.parameter, check.argument
+        present = rows & col.present
+        if parameter == SH.minCount:
+            return rows & (col.present.astype(int) < argument)
+        if parameter == SH.maxCount:
+            return rows & (col.present.astype(int) > argument)
+        if not present.any():
+            return present
+        if parameter == SH.datatype:
+            return present & ~col.valid(argument)
+        if parameter == SH["in"]:
+            # term equality: booleans only match booleans (True == 1 in pandas)
+            flags = [v for v in argument if isinstance(v, bool)]
+            others = [v for v in argument if not isinstance(v, bool)]
+            ok = np.where(col.boolean, col.values.isin(flags).to_numpy(), col.values.isin(others).to_numpy())
+            return present & ~ok
+        bound = float(argument)
+        with np.errstate(invalid="ignore"):
+            if parameter == SH.minInclusive:
+                ok = col.numeric >= bound
+            elif parameter == SH.maxInclusive:
+                ok = col.numeric <= bound
+            elif parameter == SH.minExclusive:
+                ok = col.numeric > bound
+            else:
+                ok = col.numeric < bound
+        return present & ~ok
+
+    def to_graph(self, frame: pd.DataFrame) -> Graph:
+        """RDF of frame rows (rdf:type per type_column plus base_class, one triple per present cell)"""
+        g = Graph()
+        focus = [URIRef(f"{self.focus_prefix}{i}") for i in frame[self.focus_column]]
+        modes = frame[self.type_column] if self.type_column in frame.columns else [None] * len(frame)
+        for node, mode in zip(focus, modes):
+            g.add((node, RDF.type, self.base_class))
+            cls = self.type_classes.get(mode)
+            if cls is not None:
+                g.add((node, RDF.type, cls))
+        for path, name in self.columns.items():
+            if name not in frame.columns:
+                continue
+            datatype = self.datatypes.get(path)
+            values = frame[name].to_numpy(dtype=object)
+            for i in np.flatnonzero(frame[name].notna().to_numpy()):
+                g.add((focus[i], path, _literal(values[i], datatype)))
+        return g
+
+    def _validate_fallback(self, frame: pd.DataFrame, shape_seconds: Dict[Any, float]) -> List[pd.DataFrame]:
+        """pyshacl over the RDF of rows targeted by non-compilable shapes"""
+        rows = np.zeros(len(frame), dtype=bool)
+        for shape in self.fallback:
+            rows |= self._target_rows(frame, shape)
+        subset = frame[rows]
+        ids = {URIRef(f"{self.focus_prefix}{i}"): i for i in subset[self.focus_column]}
+        service = ShaclValidationService(
+            self.to_graph(subset), self.shapes, use_shapes=self.fallback,
+            allow_warnings=self.allow_warnings, allow_infos=self.allow_infos,
+        )
+        results = service.validate().results
+        for shape in self.fallback:
+            shape_seconds[shape] = service.stats[shape].seconds
+        if not results:
+            return []
+        return [pd.DataFrame({
+            "focus_node": [ids.get(r.focus_node, r.focus_node) for r in results],
+            "shape": [r.shape for r in results],
+            "source_shape": [r.source_shape for r in results],
+            "path": [r.path for r in results],
+            "component": [r.component for r in results],
+            "severity": [r.severity for r in results],
+            "value": [
+                r.value.toPython() if isinstance(r.value, Literal)
+                and r.component != SH.SPARQLConstraintComponent else None
+                for r in results
+            ],
+            "message": [r.message for r in results],
+        }, dtype=object)]
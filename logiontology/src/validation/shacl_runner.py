@@ -1,15 +1,35 @@
 from __future__ import annotations
 # Optional SHACL validation via pyshacl if installed.
-from typing import Tuple
+from pathlib import Path
+from typing import Optional, Tuple
 try:
     from pyshacl import validate as shacl_validate  # type: ignore
 except Exception:  # pragma: no cover - optional
     shacl_validate = None
 
-def run_shacl(data_graph_ttl: str, shapes_ttl: str) -> Tuple[bool, str]:
+from rdflib import Graph
+
+from .shacl_service import ShaclValidationService, load_shapes
+
+
+def _is_file(source: str) -> bool:
+    try:
+        return "\n" not in source and Path(source).is_file()
+    except OSError:
+        return False
+
+
+def run_shacl(data_graph_ttl: str, shapes_ttl: str, workers: Optional[int] = None) -> Tuple[bool, str]:
     if shacl_validate is None:
         return (True, "pyshacl not installed; skipped.")
-    conforms, results_graph, results_text = shacl_validate(
-        data_graph_ttl, shacl_graph=shapes_ttl, inference="rdfs", abort_on_error=False
-    )
-    return (bool(conforms), str(results_text))
+    # shapes are parsed and compiled once per content (load_shapes cache)
+    shapes = load_shapes(shapes_ttl) if _is_file(shapes_ttl) else load_shapes(data=shapes_ttl)
+    data = Graph()
+    if _is_file(data_graph_ttl):
+        data.parse(data_graph_ttl, format="turtle")
+    else:
+        data.parse(data=data_graph_ttl, format="turtle")
+    report = ShaclValidationService(
+        data, shapes, workers=workers, allow_warnings=False, allow_infos=False
+    ).validate()
+    return (bool(report.conforms), report.text)
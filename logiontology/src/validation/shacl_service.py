@@ -0,0 +1,443 @@
+"""
+HVDC SHACL Validation Service v1.0
+SHACL validation with shapes parsed and compiled once, incremental RDFS
+entailment and delta validation of the focus nodes touched by new triples
+(per-shape timing, focus-node partitions across worker processes)
+"""
+
+from __future__ import annotations
+import hashlib
+import logging
+import math
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from rdflib import Graph, Literal, RDF, RDFS, URIRef
+from rdflib.collection import Collection
+from rdflib.namespace import SH
+from rdflib.plugins.sparql import prepareQuery
+
+from ..rdfio.snapshot import file_digest
+from ..reasoning.engine import Materializer
+
+try:
+    from pyshacl.pytypes import SHACLExecutor  # type: ignore
+    from pyshacl.shapes_graph import ShapesGraph  # type: ignore
+except ImportError:  # pragma: no cover - optional
+    SHACLExecutor = ShapesGraph = None
+
+logger = logging.getLogger(__name__)
+
+SHAPES_DIR = Path(__file__).parent.parent.parent / "configs" / "shapes"
+DEFAULT_SHAPES_FILE = SHAPES_DIR / "FlowCode.shape.ttl"
+
+# data-graph schema triples that feed RDFS inference (pyshacl inference='rdfs')
+TBOX_PREDICATES = (RDFS.subClassOf, RDFS.subPropertyOf, RDFS.domain, RDFS.range)
+
+# shape-expecting parameters applied to the value nodes of a shape
+_VALUE_SHAPE_PARAMS = (SH.property, SH.node, SH.qualifiedValueShape, SH["not"])
+_LIST_SHAPE_PARAMS = (SH["and"], SH["or"], SH.xone)
+
+Triple = Tuple[Any, Any, Any]
+
+# (shapes file paths + content digests) or Turtle text digest → CompiledShapes
+_SHAPES_CACHE: Dict[Tuple[str, ...], "CompiledShapes"] = {}
+
+
+@dataclass(frozen=True)
+class ShaclResult:
+    """One sh:ValidationResult of a top-level shape for one focus node"""
+    shape: Any
+    focus_node: Any
+    severity: Any
+    message: Optional[str]
+    path: Any
+    value: Any
+    source_shape: Any
+    component: Any
+    text: str
+
+
+@dataclass
+class ShapeStats:
+    """Per-shape validation work (cumulative)"""
+    focus_nodes: int = 0
+    results: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class ShaclReport:
+    """Validation state of the whole data graph after a validation call"""
+    conforms: bool
+    results: List[ShaclResult]
+    validated: int
+    seconds: float
+
+    @property
+    def text(self) -> str:
+        """Report text in pyshacl's results_text layout"""
+        text = f"Validation Report\nConforms: {self.conforms}\n"
+        if self.results:
+            text += f"Results ({len(self.results)}):\n"
+            text += "".join(sorted(r.text for r in self.results))
+        return text
+
+
+def _path_length(shapes: Graph, path) -> Optional[int]:
+    """Hops of a SHACL property path (None = unbounded)"""
+    if isinstance(path, URIRef):
+        return 1
+    if shapes.value(path, RDF.first) is not None:
+        lengths = [_path_length(shapes, step) for step in Collection(shapes, path)]
+        return None if None in lengths else sum(lengths)
+    inverse = shapes.value(path, SH.inversePath)
+    if inverse is not None:
+        return _path_length(shapes, inverse)
+    alternative = shapes.value(path, SH.alternativePath)
+    if alternative is not None:
+        lengths = [_path_length(shapes, step) for step in Collection(shapes, alternative)]
+        return None if None in lengths else max(lengths, default=0)
+    optional = shapes.value(path, SH.zeroOrOnePath)
+    if optional is not None:
+        return _path_length(shapes, optional)
+    return None  # sh:zeroOrMorePath / sh:oneOrMorePath
+
+
+def _shape_reach(shapes: Graph, shape, stack: frozenset = frozenset()) -> Optional[int]:
+    """
+    Farthest hop from a focus node whose own triples the shape reads
+
+    Constraints on the value nodes of a path of length L read triples up to
+    L - 1 hops out; sh:class and nested shapes also read the value nodes'
+    own triples (L hops). SPARQL constraints are assumed to read only the
+    triples of $this. Recursive shapes and unbounded paths return None.
+    """
+    if shape in stack:
+        return None
+    stack = stack | {shape}
+    path = shapes.value(shape, SH.path)
+    length = 0 if path is None else _path_length(shapes, path)
+    if length is None:
+        return None
+    reach = length if (shape, SH["class"], None) in shapes else max(length - 1, 0)
+
+    nested = [n for param in _VALUE_SHAPE_PARAMS for n in shapes.objects(shape, param)]
+    for param in _LIST_SHAPE_PARAMS:
+        for members in shapes.objects(shape, param):
+            nested.extend(Collection(shapes, members))
+    for node in nested:
+        nested_reach = _shape_reach(shapes, node, stack)
+        if nested_reach is None:
+            return None
+        # sh:property of a node shape shares its focus node (length 0)
+        reach = max(reach, length + nested_reach)
+    return reach
+
+
+class _PreparedQueryGraph(Graph):
+    """View of a data graph (same store) that parses each SPARQL text once"""
+
+    def __init__(self, graph: Graph, prepared: Dict[str, Any]):
+        super().__init__(store=graph.store, identifier=graph.identifier, namespace_manager=graph.namespace_manager)
+        self._prepared = prepared
+
+    def query(self, query_object, *args, **kwargs):
+        # pyshacl binds $this through initBindings, so the text is the same
+        # for every focus node of a SPARQL constraint
+        if isinstance(query_object, str):
+            prepared = self._prepared.get(query_object)
+            if prepared is None:
+                prepared = prepareQuery(query_object, initNs=dict(self.namespaces()))
+                self._prepared[query_object] = prepared
+            query_object = prepared
+        return super().query(query_object, *args, **kwargs)
+
+
+class CompiledShapes:
+    """
+    Parsed shapes graph with harvested pyshacl shapes, compiled targets,
+    the hop reach of every targeted shape and parsed SPARQL constraint
+    queries (built once, shared by validators)
+    """
+
+    def __init__(self, graph: Graph):
+        if ShapesGraph is None:
+            raise ImportError("pyshacl not installed. Install with: pip install pyshacl")
+        self.graph = graph
+        self.shapes_graph = ShapesGraph(graph)
+        self.shapes = []
+        self.targets: Dict[Any, Tuple[frozenset, frozenset, frozenset, frozenset]] = {}
+        self.reach: Dict[Any, Optional[int]] = {}
+        self.prepared: Dict[str, Any] = {}
+        for shape in self.shapes_graph.shapes:
+            nodes, classes, implicit, objects_of, subjects_of = shape.target()
+            targets = (
+                frozenset(nodes),
+                frozenset(classes) | frozenset(implicit),
+                frozenset(subjects_of),
+                frozenset(objects_of),
+            )
+            if shape.deactivated or not any(targets):
+                continue
+            self.shapes.append(shape)
+            self.targets[shape.node] = targets
+            self.reach[shape.node] = _shape_reach(graph, shape.node)
+        logger.info(f"Compiled {len(self.shapes)} targeted SHACL shapes ({len(graph)} triples)")
+
+
+def load_shapes(
+    paths: Union[str, Path, Sequence[Union[str, Path]]] = DEFAULT_SHAPES_FILE,
+    data: Optional[str] = None,
+) -> CompiledShapes:
+    """
+    Parse and compile SHACL shapes, cached by file content
+
+    Args:
+        paths: Shapes TTL file(s)
+        data: Turtle text instead of files
+
+    Returns:
+        CompiledShapes: Shared instance (reused while the content is unchanged)
+    """
+    if data is not None:
+        key: Tuple[str, ...] = ("data", hashlib.sha256(data.encode("utf-8")).hexdigest())
+    else:
+        if isinstance(paths, (str, Path)):
+            paths = [paths]
+        key = tuple(f"{Path(p).resolve()}:{file_digest(p)}" for p in paths)
+    compiled = _SHAPES_CACHE.get(key)
+    if compiled is None:
+        graph = Graph()
+        if data is not None:
+            graph.parse(data=data, format="turtle")
+        else:
+            for path in paths:
+                graph.parse(str(path), format="turtle")
+        compiled = _SHAPES_CACHE[key] = CompiledShapes(graph)
+    return compiled
+
+
+def _term(node):
+    # pyshacl reports data-graph terms as (source graph, term)
+    return node[1] if isinstance(node, tuple) else node
+
+
+def _validate_focus(compiled: CompiledShapes, graph: Graph, shape_node, focus: List[Any]):
+    """Validate focus nodes against one shape → ([ShaclResult], seconds)"""
+    start = time.perf_counter()
+    shape = compiled.shapes_graph.lookup_shape_from_node(shape_node)
+    view = _PreparedQueryGraph(graph, compiled.prepared)
+    _, reports = shape.validate(SHACLExecutor(), view, focus=focus)
+    results = []
+    for text, _, triples in reports:
+        fields: Dict[Any, Any] = {}
+        for _, p, o in triples:
+            fields.setdefault(p, _term(o))
+        message = fields.get(SH.resultMessage)
+        results.append(ShaclResult(
+            shape=shape_node,
+            focus_node=fields.get(SH.focusNode),
+            severity=fields.get(SH.resultSeverity),
+            message=None if message is None else str(message),
+            path=fields.get(SH.resultPath),
+            value=fields.get(SH.value),
+            source_shape=fields.get(SH.sourceShape),
+            component=fields.get(SH.sourceConstraintComponent),
+            text=text,
+        ))
+    return results, time.perf_counter() - start
+
+
+# (compiled shapes, data graph) inherited by forked pool workers
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _init_worker(compiled: CompiledShapes, graph: Graph) -> None:
+    _WORKER_STATE["state"] = (compiled, graph)
+
+
+def _validate_partition(shape_node, focus: List[Any]):
+    compiled, graph = _WORKER_STATE["state"]
+    return _validate_focus(compiled, graph, shape_node, focus)
+
+
+class ShaclValidationService:
+    """
+    SHACL validation bound to one data graph
+
+    RDFS entailments of the ontology (plus the data graph's own schema
+    triples) are materialized into the data graph once, replacing pyshacl's
+    per-call inference='rdfs' expansion; shapes come from load_shapes().
+    validate() checks every target of every shape; add_triples() adds
+    triples, materializes their consequences and revalidates only the focus
+    nodes within each shape's hop reach of the changed subjects (delta
+    validation). Results are kept per (shape, focus node), so every call
+    returns the state of the whole graph.
+
+    The schema is fixed at construction: schema triples added later are not
+    used for inference.
+    """
+
+    def __init__(
+        self,
+        graph: Graph,
+        shapes: Optional[CompiledShapes] = None,
+        ontology: Optional[Graph] = None,
+        workers: Optional[int] = None,
+        allow_warnings: bool = True,
+        allow_infos: bool = True,
+        use_shapes: Optional[Iterable[Any]] = None,
+    ):
+        """
+        Args:
+            graph: Data graph (entailments are added in place)
+            shapes: Compiled shapes (None = load_shapes() default FlowCode shapes)
+            ontology: TBox graph for RDFS inference (None = data graph schema only)
+            workers: Worker processes for focus-node partitions (None/1 = serial, 0 = os.cpu_count())
+            allow_warnings: sh:Warning results do not break conformance
+            allow_infos: sh:Info results do not break conformance
+            use_shapes: Validate only these shape nodes (None = all targeted shapes)
+        """
+        self.graph = graph
+        self.shapes = shapes if shapes is not None else load_shapes()
+        self.workers = (os.cpu_count() or 1) if workers == 0 else (workers or 1)
+        self.allow_warnings = allow_warnings
+        self.allow_infos = allow_infos
+        selected = None if use_shapes is None else set(use_shapes)
+        self._shapes = [s for s in self.shapes.shapes if selected is None or s.node in selected]
+
+        tbox = Graph()
+        for predicate in TBOX_PREDICATES:
+            tbox.addN((s, predicate, o, tbox) for s, o in graph.subject_objects(predicate))
+        if ontology is not None:
+            for predicate in TBOX_PREDICATES:
+                tbox.addN((s, predicate, o, tbox) for s, o in ontology.subject_objects(predicate))
+        self.materializer = Materializer(graph, tbox, profile="rdfs")
+
+        self.stats: Dict[Any, ShapeStats] = defaultdict(ShapeStats)
+        self._results: Dict[Any, Dict[Any, List[ShaclResult]]] = defaultdict(dict)
+        self._validated = False
+
+    def validate(self) -> ShaclReport:
+        """Materialize entailments and validate every focus node of every shape"""
+        start = time.perf_counter()
+        self.materializer.run()
+        self._results.clear()
+        focus = {shape.node: list(shape.focus_nodes(self.graph)) for shape in self._shapes}
+        validated = self._run(focus)
+        self._validated = True
+        return self.report(validated, time.perf_counter() - start)
+
+    def add_triples(self, triples: Iterable[Triple]) -> ShaclReport:
+        """
+        Add triples and revalidate only the focus nodes they can affect
+
+        Returns:
+            ShaclReport: Conformance of the whole graph after the update
+        """
+        triples = list(triples)
+        if not self._validated:
+            self.graph.addN((s, p, o, self.graph) for s, p, o in triples)
+            return self.validate()
+
+        start = time.perf_counter()
+        self.materializer.add_triples(triples)
+        # RDFS rules only derive triples about the subject or object of a new
+        # triple, so those two terms cover the derived triples as well
+        subjects = {s for s, _, _ in triples}
+        objects = {o for _, p, o in triples if p != RDF.type and not isinstance(o, Literal)}
+        focus = {}
+        for shape in self._shapes:
+            reach = self.shapes.reach[shape.node]
+            if reach is None:
+                focus[shape.node] = list(shape.focus_nodes(self.graph))
+                continue
+            candidates = self._neighbourhood(subjects, reach) | objects
+            focus[shape.node] = [f for f in candidates if self._is_target(shape.node, f)]
+        validated = self._run(focus)
+        return self.report(validated, time.perf_counter() - start)
+
+    def report(self, validated: int = 0, seconds: float = 0.0) -> ShaclReport:
+        """Current results of the whole graph"""
+        results = [r for by_focus in self._results.values() for rs in by_focus.values() for r in rs]
+        failing = {SH.Violation}
+        if not self.allow_warnings:
+            failing.add(SH.Warning)
+        if not self.allow_infos:
+            failing.add(SH.Info)
+        conforms = not any(r.severity in failing or r.severity is None for r in results)
+        return ShaclReport(conforms=conforms, results=results, validated=validated, seconds=seconds)
+
+    def _neighbourhood(self, seeds: Set[Any], hops: int) -> Set[Any]:
+        """Nodes within hops of seeds over non-type edges, either direction"""
+        seen = set(seeds)
+        frontier = seeds
+        graph = self.graph
+        for _ in range(hops):
+            reached = set()
+            for node in frontier:
+                for p, o in graph.predicate_objects(node):
+                    if p != RDF.type and not isinstance(o, Literal):
+                        reached.add(o)
+                for s, p in graph.subject_predicates(node):
+                    if p != RDF.type:
+                        reached.add(s)
+            frontier = reached - seen
+            seen |= frontier
+        return seen
+
+    def _is_target(self, shape_node, node) -> bool:
+        nodes, classes, subjects_of, objects_of = self.shapes.targets[shape_node]
+        graph = self.graph
+        if node in nodes:
+            return True
+        # rdf:type is materialized, so subclass instances carry the target class
+        if classes and any(c in classes for c in graph.objects(node, RDF.type)):
+            return True
+        if any((node, p, None) in graph for p in subjects_of):
+            return True
+        return any((None, p, node) in graph for p in objects_of)
+
+    def _run(self, focus: Dict[Any, List[Any]]) -> int:
+        """Validate focus nodes per shape and replace their stored results"""
+        total = sum(len(nodes) for nodes in focus.values())
+        if self.workers > 1 and total > 1 and "fork" in multiprocessing.get_all_start_methods():
+            chunk_size = max(1, math.ceil(total / (self.workers * 4)))
+            tasks = [
+                (shape_node, nodes[i : i + chunk_size])
+                for shape_node, nodes in focus.items()
+                for i in range(0, len(nodes), chunk_size)
+            ]
+            # forked workers share the graph and compiled shapes copy-on-write
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker,
+                initargs=(self.shapes, self.graph),
+            ) as executor:
+                outputs = list(executor.map(_validate_partition, *zip(*tasks))) if tasks else []
+        else:
+            tasks = [(shape_node, nodes) for shape_node, nodes in focus.items() if nodes]
+            outputs = [_validate_focus(self.shapes, self.graph, s, nodes) for s, nodes in tasks]
+
+        for shape_node, nodes in focus.items():
+            stored = self._results[shape_node]
+            for node in nodes:
+                stored.pop(node, None)
+            self.stats[shape_node].focus_nodes += len(nodes)
+        for (shape_node, _), (results, seconds) in zip(tasks, outputs):
+            stats = self.stats[shape_node]
+            stats.seconds += seconds
+            stats.results += len(results)
+            stored = self._results[shape_node]
+            for result in results:
+                stored.setdefault(result.focus_node, []).append(result)
+        logger.info(f"SHACL validated {total} focus nodes over {len(focus)} shapes")
+        return total
@@ -0,0 +1,449 @@
+"""
+HVDC SPARQL Rule Runner v1.0
+Run an event validation rule set (queries/event_validation.sparql) in one go:
+rules with a native equivalent are answered from a single indexed pass over
+Case/event triples, the remaining SPARQL rules run concurrently in a thread pool
+"""
+
+from __future__ import annotations
+import json
+import logging
+import os
+import re
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+from rdflib import Graph, Literal, Namespace, RDF
+from rdflib.plugins.sparql import prepareQuery
+
+logger = logging.getLogger(__name__)
+
+HVDC = Namespace("http://samsung.com/project-logistics#")
+
+QUERIES_DIR = Path(__file__).parent.parent.parent.parent / "queries"
+DEFAULT_RULES_FILE = QUERIES_DIR / "event_validation.sparql"
+
+# rule header in the rule file:  # ====\n# 4. Human-gate: ...\n# ====
+_SECTION = re.compile(r"^# =+\n# (\d+)\. (.+)\n# =+\n", re.MULTILINE)
+_PREFIX = re.compile(r"^PREFIX\s+(\w*):\s*<([^>]*)>", re.MULTILINE | re.IGNORECASE)
+_COMMENT = re.compile(r"(^|\s)#[^\n]*")
+
+Row = Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class SparqlRule:
+    """One SELECT query of a rule file"""
+    rule_id: str
+    title: str
+    query: str  # body without PREFIX declarations
+    prefixes: Dict[str, str] = field(default_factory=dict, compare=False, hash=False)
+
+    @property
+    def kind(self) -> str:
+        """"check" rows are violations (Human-gate lists); "report" rows are statistics"""
+        return "check" if "human-gate" in self.title.lower() else "report"
+
+    @property
+    def text(self) -> str:
+        """Full query text with PREFIX declarations"""
+        header = "".join(f"PREFIX {p}: <{ns}>\n" for p, ns in self.prefixes.items())
+        return header + self.query
+
+
+def normalize_query(query: str) -> str:
+    """Query text without comments and with collapsed whitespace (native rule matching)"""
+    return " ".join(_COMMENT.sub(r"\1", query).split())
+
+
+def load_rules(path: Union[str, Path] = DEFAULT_RULES_FILE) -> List[SparqlRule]:
+    """
+    Split a rule file into numbered SELECT rules
+
+    Args:
+        path: .sparql file of "# N. title" sections sharing the PREFIX header
+
+    Returns:
+        list: SparqlRule per section, in file order
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    sections = list(_SECTION.finditer(text))
+    head = text[:sections[0].start()] if sections else text
+    prefixes = {p: ns for p, ns in _PREFIX.findall(head)}
+    rules = []
+    for i, match in enumerate(sections):
+        end = sections[i + 1].start() if i + 1 < len(sections) else len(text)
+        body = text[match.end():end].strip()
+        rules.append(SparqlRule(f"Q{match.group(1)}", match.group(2).strip(), body + "\n", prefixes))
+    logger.info(f"Loaded {len(rules)} SPARQL rules from {path}")
+    return rules
+
+
+# ============================================================================
+# One-pass Case/event index and native rules
+# ============================================================================
+
+class CaseEventIndex:
+    """
+    Case/event adjacency built from one lookup per predicate
+
+    Mirrors what the event rules join on: hvdc:Case members, their flow /
+    HVDC codes, inbound / outbound event links and which events carry a date.
+    """
+
+    def __init__(self, graph: Graph):
+        start = time.perf_counter()
+        self.cases = sorted(graph.subjects(RDF.type, HVDC.Case), key=str)
+        self.flow_codes = self._multi(graph, HVDC.hasFlowCode)
+        self.hvdc_codes = self._multi(graph, HVDC.hasHvdcCode)
+        self.inbound = self._multi(graph, HVDC.hasInboundEvent)
+        self.outbound = self._multi(graph, HVDC.hasOutboundEvent)
+        self.dated = set(graph.subjects(HVDC.hasEventDate, None))
+        self.seconds = time.perf_counter() - start
+
+    @staticmethod
+    def _multi(graph: Graph, predicate) -> Dict[Any, List[Any]]:
+        values: Dict[Any, List[Any]] = defaultdict(list)
+        for s, o in graph.subject_objects(predicate):
+            values[s].append(o)
+        for objects in values.values():
+            objects.sort(key=str)
+        return values
+
+    def coverage(self) -> Dict[str, int]:
+        """Cases with inbound / outbound / both / neither event links"""
+        inbound = sum(1 for c in self.cases if c in self.inbound)
+        outbound = sum(1 for c in self.cases if c in self.outbound)
+        both = sum(1 for c in self.cases if c in self.inbound and c in self.outbound)
+        return {
+            "total_cases": len(self.cases),
+            "with_inbound": inbound,
+            "with_outbound": outbound,
+            "with_both": both,
+            "with_neither": len(self.cases) - inbound - outbound + both,
+        }
+
+
+def _in_simple(term, values) -> bool:
+    """
+    term IN (simple literals) as rdflib evaluates it
+
+    rdflib's IN compares RDF terms, so "3"^^xsd:string does not match "3"
+    (unlike "=", which treats the two as equal).
+    """
+    return (
+        isinstance(term, Literal) and term.language is None
+        and term.datatype is None and str(term) in values
+    )
+
+
+def _sort_key(term):
+    return (term is not None, str(term) if term is not None else "")
+
+
+def _flow_distribution(index: CaseEventIndex) -> Tuple[List[str], List[Row]]:
+    counts: Dict[Any, int] = defaultdict(int)
+    for case in index.cases:
+        for code in index.flow_codes.get(case) or [None]:
+            counts[code] += 1
+    rows = [(code, Literal(n)) for code, n in counts.items()]
+    return ["flowCode", "caseCount"], sorted(rows, key=lambda r: _sort_key(r[0]))
+
+
+def _flow23_without_inbound(index: CaseEventIndex) -> Tuple[List[str], List[Row]]:
+    rows = [
+        (case, code, hvdc)
+        for case in index.cases if case not in index.inbound
+        for code in index.flow_codes.get(case, ()) if _in_simple(code, ("2", "3"))
+        for hvdc in index.hvdc_codes.get(case) or [None]
+    ]
+    return ["case", "flowCode", "hvdcCode"], sorted(rows, key=lambda r: (str(r[1]), str(r[0])))
+
+
+def _events_without_date(index: CaseEventIndex) -> Tuple[List[str], List[Row]]:
+    rows = [
+        (case, event, Literal(direction))
+        for case in index.cases
+        for direction, links in (("inbound", index.inbound), ("outbound", index.outbound))
+        for event in links.get(case, ()) if event not in index.dated
+    ]
+    return ["case", "event", "eventType"], sorted(rows, key=lambda r: (str(r[0]), str(r[2])))
+
+
+def _flow_event_patterns(index: CaseEventIndex) -> Tuple[List[str], List[Row]]:
+    stats: Dict[Any, List[int]] = defaultdict(lambda: [0, 0, 0])
+    for case in index.cases:
+        for code in set(index.flow_codes.get(case, ())):
+            counts = stats[code]
+            counts[0] += 1
+            counts[1] += case in index.inbound
+            counts[2] += case in index.outbound
+    rows = [(code, *(Literal(n) for n in counts)) for code, counts in stats.items()]
+    return ["flowCode", "totalCases", "withInbound", "withOutbound"], sorted(rows, key=lambda r: str(r[0]))
+
+
+# normalized query body → native equivalent over CaseEventIndex (hvdc: prefix must be HVDC)
+NATIVE_RULES: Dict[str, Callable[[CaseEventIndex], Tuple[List[str], List[Row]]]] = {
+    normalize_query(query): native for query, native in [
+        ("""
+        SELECT ?flowCode (COUNT(?case) AS ?caseCount)
+        WHERE {
+            ?case a hvdc:Case .
+            OPTIONAL { ?case hvdc:hasFlowCode ?flowCode }
+        }
+        GROUP BY ?flowCode
+        ORDER BY ?flowCode
+        """, _flow_distribution),
+        ("""
+        SELECT ?case ?flowCode ?hvdcCode
+        WHERE {
+            ?case a hvdc:Case ;
+                  hvdc:hasFlowCode ?flowCode .
+            OPTIONAL { ?case hvdc:hasHvdcCode ?hvdcCode }
+            FILTER(?flowCode IN ("2", "3"))
+            FILTER NOT EXISTS {
+                ?case hvdc:hasInboundEvent ?inEvent .
+            }
+        }
+        ORDER BY ?flowCode ?case
+        """, _flow23_without_inbound),
+        ("""
+        SELECT ?case ?event ?eventType
+        WHERE {
+            ?case a hvdc:Case .
+            {
+                ?case hvdc:hasInboundEvent ?event .
+                BIND("inbound" AS ?eventType)
+                FILTER NOT EXISTS {
+                    ?event hvdc:hasEventDate ?date .
+                }
+            }
+            UNION
+            {
+                ?case hvdc:hasOutboundEvent ?event .
+                BIND("outbound" AS ?eventType)
+                FILTER NOT EXISTS {
+                    ?event hvdc:hasEventDate ?date .
+                }
+            }
+        }
+        ORDER BY ?case ?eventType
+        """, _events_without_date),
+        ("""
+        SELECT ?flowCode
+               (COUNT(DISTINCT ?case) AS ?totalCases)
+               (COUNT(DISTINCT ?caseWithInbound) AS ?withInbound)
+               (COUNT(DISTINCT ?caseWithOutbound) AS ?withOutbound)
+        WHERE {
+            ?case a hvdc:Case ;
+                  hvdc:hasFlowCode ?flowCode .
+            OPTIONAL {
+                ?case hvdc:hasInboundEvent ?inEvent .
+                BIND(?case AS ?caseWithInbound)
+            }
+            OPTIONAL {
+                ?case hvdc:hasOutboundEvent ?outEvent .
+                BIND(?case AS ?caseWithOutbound)
+            }
+        }
+        GROUP BY ?flowCode
+        ORDER BY ?flowCode
+        """, _flow_event_patterns),
+    ]
+}
+
+
+def native_rule(rule: SparqlRule) -> Optional[Callable[[CaseEventIndex], Tuple[List[str], List[Row]]]]:
+    """Native equivalent of rule, or None (run as SPARQL)"""
+    if rule.prefixes.get("hvdc") != str(HVDC):
+        return None
+    return NATIVE_RULES.get(normalize_query(rule.query))
+
+
+# ============================================================================
+# Runner and report
+# ============================================================================
+
+def _value(term):
+    """Bound term → JSON value (Literal → Python value where JSON-native)"""
+    if term is None:
+        return None
+    if isinstance(term, Literal):
+        value = term.toPython()
+        return value if isinstance(value, (bool, int, float, str)) else str(term)
+    return str(term)
+
+
+@dataclass
+class RuleResult:
+    """Rows of one rule (SELECT variables as columns) and how they were computed"""
+    rule: SparqlRule
+    engine: str  # "native" or "sparql"
+    rows: pd.DataFrame
+    seconds: float
+
+    @property
+    def count(self) -> int:
+        return len(self.rows)
+
+
+def _frame(columns: Sequence[str], rows: Sequence[Row]) -> pd.DataFrame:
+    return pd.DataFrame([[_value(t) for t in row] for row in rows], columns=list(columns), dtype=object)
+
+
+@dataclass
+class RuleReport:
+    """Combined result of a rule set run"""
+    results: Dict[str, RuleResult]
+    index: CaseEventIndex
+    seconds: float
+    total_triples: int
+
+    @property
+    def timings(self) -> Dict[str, Dict[str, Any]]:
+        """{rule_id: {engine, count, seconds}} plus the shared index pass"""
+        timings: Dict[str, Dict[str, Any]] = {
+            "index": {"engine": "native", "count": len(self.index.cases), "seconds": round(self.index.seconds, 6)}
+        }
+        for rule_id, result in self.results.items():
+            timings[rule_id] = {
+                "engine": result.engine, "count": result.count, "seconds": round(result.seconds, 6),
+            }
+        return timings
+
+    @property
+    def violations(self) -> pd.DataFrame:
+        """Rows of all "check" rules, one per violation (binding columns as strings)"""
+        frames = [
+            result.rows.assign(rule=rule_id, title=result.rule.title)
+            for rule_id, result in self.results.items() if result.rule.kind == "check"
+        ]
+        frames = [frame for frame in frames if len(frame)]
+        if not frames:
+            return pd.DataFrame(columns=["rule", "title"])
+        violations = pd.concat(frames, ignore_index=True)
+        columns = ["rule", "title"] + [c for c in violations.columns if c not in ("rule", "title")]
+        return violations[columns].astype("string")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON report: per-rule counts / timings, violation rows and report rows"""
+        return {
+            "total_triples": self.total_triples,
+            "seconds": round(self.seconds, 6),
+            "timings": self.timings,
+            "rules": {
+                rule_id: {
+                    "title": result.rule.title,
+                    "kind": result.rule.kind,
+                    "engine": result.engine,
+                    "count": result.count,
+                    "seconds": round(result.seconds, 6),
+                    "rows": result.rows.to_dict(orient="records"),
+                }
+                for rule_id, result in self.results.items()
+            },
+        }
+
+    def write(self, output_dir: Union[str, Path], stem: str = "event_validation_report",
+              parquet: bool = True) -> Dict[str, str]:
+        """
+        Write the JSON report and a Parquet violation table (when pyarrow is installed)
+
+        Returns:
+            dict: {"json": path, "parquet": path}
+        """
+        output_dir_obj = Path(output_dir)
+        output_dir_obj.mkdir(parents=True, exist_ok=True)
+        json_file = output_dir_obj / f"{stem}.json"
+        with open(json_file, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False, default=str)
+        paths = {"json": str(json_file)}
+
+        if parquet:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                logger.warning("pyarrow not installed; skipping Parquet violation report")
+                return paths
+            parquet_file = output_dir_obj / f"{stem}_violations.parquet"
+            self.violations.to_parquet(parquet_file, index=False)
+            paths["parquet"] = str(parquet_file)
+        return paths
+
+
+def _run_sparql(graph: Graph, rule: SparqlRule, prepared) -> RuleResult:
+    start = time.perf_counter()
+    result = graph.query(prepared)
+    rows = [tuple(row) for row in result]
+    columns = [str(v) for v in result.vars]
+    return RuleResult(rule, "sparql", _frame(columns, rows), time.perf_counter() - start)
+
+
+def _run_native(index: CaseEventIndex, rules: List[Tuple[SparqlRule, Callable]]) -> List[RuleResult]:
+    results = []
+    for rule, native in rules:
+        start = time.perf_counter()
+        columns, rows = native(index)
+        results.append(RuleResult(rule, "native", _frame(columns, rows), time.perf_counter() - start))
+    return results
+
+
+def run_rules(
+    graph: Graph,
+    rules: Optional[Sequence[SparqlRule]] = None,
+    workers: Optional[int] = 4,
+    native: bool = True,
+) -> RuleReport:
+    """
+    Run a rule set over graph
+
+    Args:
+        graph: Event graph (convert_data_wh_to_ttl_with_events output)
+        rules: Rules to run (None = load_rules() default rule file)
+        workers: Threads for SPARQL rules (None/1 = serial, 0 = os.cpu_count())
+        native: Answer rules with a native equivalent from the Case/event index
+
+    Returns:
+        RuleReport: Results keyed by rule_id, in rule order
+    """
+    start = time.perf_counter()
+    rules = list(rules) if rules is not None else load_rules()
+    native_rules = [(r, native_rule(r)) for r in rules] if native else [(r, None) for r in rules]
+    compiled = [(r, fn) for r, fn in native_rules if fn is not None]
+    # parse up front: the SPARQL parser is not shared safely across threads
+    prepared = [(r, prepareQuery(r.text)) for r, fn in native_rules if fn is None]
+
+    index = CaseEventIndex(graph)
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    found: Dict[str, RuleResult] = {}
+    if workers and workers > 1 and prepared:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_sparql, graph, rule, query) for rule, query in prepared]
+            for result in _run_native(index, compiled):
+                found[result.rule.rule_id] = result
+            for future in futures:
+                result = future.result()
+                found[result.rule.rule_id] = result
+    else:
+        for result in _run_native(index, compiled):
+            found[result.rule.rule_id] = result
+        for rule, query in prepared:
+            found[rule.rule_id] = _run_sparql(graph, rule, query)
+
+    report = RuleReport(
+        results={r.rule_id: found[r.rule_id] for r in rules},
+        index=index,
+        seconds=time.perf_counter() - start,
+        total_triples=len(graph),
+    )
+    logger.info(
+        f"Ran {len(rules)} rules ({len(compiled)} native, {len(prepared)} SPARQL) in {report.seconds:.3f}s"
+    )
+    return report
+
@@ -6,6 +6,7 @@ Pytest configuration and shared fixtures for logiontology tests
 import pytest
 import pandas as pd
 import json
+import os
 from pathlib import Path
 from datetime import datetime, date
 from typing import Dict, Any
@@ -14,6 +15,23 @@ from src.mapping.registry import MappingRegistry
 from src.validation.schema_validator import SchemaValidator
 
 
+@pytest.fixture(scope="session", autouse=True)
+def cache_dirs(tmp_path_factory):
+    """Keep on-disk schema indexes and graph snapshots out of ~/.cache during tests"""
+    dirs = {
+        "LOGIONTOLOGY_SCHEMA_CACHE": tmp_path_factory.mktemp("schema_cache"),
+        "LOGIONTOLOGY_GRAPH_CACHE": tmp_path_factory.mktemp("graph_cache"),
+    }
+    previous = {name: os.environ.get(name) for name in dirs}
+    os.environ.update({name: str(path) for name, path in dirs.items()})
+    yield dirs
+    for name, value in previous.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+
+
 @pytest.fixture
 def sample_dataframe():
     """Sample DataFrame for testing HVDC data processing"""
@@ -260,11 +278,24 @@ def pattern_test_cases():
 
 
 # Pytest configuration
+def pytest_addoption(parser):
+    """Command line options"""
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="run tests marked benchmark (also enabled by LOGIONTOLOGY_BENCHMARKS=1)",
+    )
+
+
 def pytest_configure(config):
     """Configure pytest with custom markers"""
     config.addinivalue_line("markers", "unit: mark test as unit test")
     config.addinivalue_line("markers", "integration: mark test as integration test")
     config.addinivalue_line("markers", "slow: mark test as slow running")
+    config.addinivalue_line(
+        "markers", "benchmark: opt-in timing comparison at full size (--run-benchmarks)"
+    )
 
 
 def pytest_collection_modifyitems(config, items):
@@ -279,3 +310,11 @@ def pytest_collection_modifyitems(config, items):
         # Add slow marker for tests that might take longer
         if "performance" in item.name or "benchmark" in item.name:
             item.add_marker(pytest.mark.slow)
+
+    # Benchmarks only run on request
+    if config.getoption("--run-benchmarks") or os.getenv("LOGIONTOLOGY_BENCHMARKS") == "1":
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmark: use --run-benchmarks to run")
+    for item in items:
+        if item.get_closest_marker("benchmark"):
+            item.add_marker(skip_benchmark)
@@ -0,0 +1,86 @@
+"""
+Unit tests for the streaming case record exporter
+"""
+
+import json
+from datetime import date
+
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, RDF, XSD
+
+from src.export.case_stream import export_cases, iter_case_records
+
+HVDC = Namespace("http://samsung.com/project-logistics#")
+
+
+def _add_event(g, case, predicate, day, location, qty):
+    event = BNode()
+    g.add((case, predicate, event))
+    g.add((event, HVDC.hasEventDate, Literal(day, datatype=XSD.date)))
+    g.add((event, HVDC.hasLocationAtEvent, Literal(location)))
+    g.add((event, HVDC.hasQuantity, Literal(float(qty), datatype=XSD.decimal)))
+
+
+@pytest.fixture
+def multi_event_graph():
+    g = Graph()
+    case = HVDC["Case_00001"]
+    g.add((case, RDF.type, HVDC.Case))
+    g.add((case, HVDC.hasFlowCode, Literal("3")))
+    g.add((case, HVDC.hasFlowCodeOriginal, Literal(2)))
+    g.add((case, HVDC.hasVendor, Literal("HITACHI")))
+    g.add((case, HVDC.hasCBM, Literal(1.5)))
+    # 2 inbound x 2 outbound events: the old OPTIONAL join produced 4 rows
+    _add_event(g, case, HVDC.hasInboundEvent, date(2024, 3, 1), "MOSB", 2)
+    _add_event(g, case, HVDC.hasInboundEvent, date(2024, 2, 1), "DSV Indoor", 2)
+    _add_event(g, case, HVDC.hasOutboundEvent, date(2024, 2, 20), "MOSB", 2)
+    _add_event(g, case, HVDC.hasOutboundEvent, date(2024, 3, 10), "AGI", 2)
+
+    other = HVDC["Case_00002"]
+    g.add((other, RDF.type, HVDC.Case))
+    return g
+
+
+class TestCaseStream:
+    def test_one_record_per_case(self, multi_event_graph):
+        records = list(iter_case_records(multi_event_graph))
+
+        assert [r["case_id"] for r in records] == ["Case_00001", "Case_00002"]
+        first = records[0]
+        assert first["flow_code"] == "3"
+        assert first["flow_code_original"] == 2
+        assert first["cbm"] == 1.5
+        assert first["gross_weight"] is None
+        assert [e["location"] for e in first["inbound_events"]] == ["DSV Indoor", "MOSB"]
+        assert first["inbound"] == {"date": "2024-02-01", "location": "DSV Indoor", "quantity": 2.0}
+        assert len(first["outbound_events"]) == 2
+        assert records[1]["inbound"] is None
+        assert records[1]["inbound_events"] == []
+
+    def test_export_json_document(self, multi_event_graph, tmp_path):
+        output = tmp_path / "flat.json"
+        stats = export_cases(multi_event_graph, output, metadata={"source_ttl": "x.ttl"})
+
+        with open(output, encoding="utf-8") as f:
+            doc = json.load(f)
+        assert stats["total_cases"] == 2
+        assert doc["metadata"] == {"source_ttl": "x.ttl", "total_cases": 2}
+        assert doc["cases"] == list(iter_case_records(multi_event_graph))
+
+    def test_export_jsonl(self, multi_event_graph, tmp_path):
+        output = tmp_path / "flat.jsonl"
+        export_cases(multi_event_graph, output)
+
+        lines = output.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["case_id"] for line in lines] == ["Case_00001", "Case_00002"]
+
+    def test_export_empty_graph(self, tmp_path):
+        output = tmp_path / "empty.json"
+        export_cases(Graph(), output)
+
+        with open(output, encoding="utf-8") as f:
+            assert json.load(f)["cases"] == []
+
+    def test_unknown_format(self, multi_event_graph, tmp_path):
+        with pytest.raises(ValueError):
+            export_cases(multi_event_graph, tmp_path / "flat.csv", fmt="csv")
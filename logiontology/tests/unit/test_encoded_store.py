@@ -0,0 +1,108 @@
+"""
+Unit tests for the memory-mapped encoded triple store
+"""
+
+import itertools
+import time
+import tracemalloc
+
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, RDF, XSD
+
+from src.rdfio.encoded_store import EncodedTripleStore
+from src.rdfio.snapshot import read_meta, snapshot_path_for
+
+EX = Namespace("http://example.org/abu/")
+
+
+@pytest.fixture
+def sample_graph():
+    g = Graph()
+    g.bind("abu", EX)
+    for i in range(20):
+        shipment = EX[f"shipment{i}"]
+        g.add((shipment, RDF.type, EX.Shipment if i % 3 else EX.Container))
+        g.add((shipment, EX.responsiblePerson, Literal(f"person{i % 4}")))
+        g.add((shipment, EX.shipName, Literal(f"vessel{i % 5}")))
+        g.add((shipment, EX.timestamp, Literal(f"2024-01-{i + 1:02d}", datatype=XSD.date)))
+        g.add((shipment, EX.relatedEvent, BNode(f"evt{i}")))
+    return g
+
+
+class TestEncodedTripleStore:
+    def test_all_patterns_match_rdflib(self, sample_graph):
+        store = EncodedTripleStore.from_graph(sample_graph)
+        s, p, o = EX.shipment4, EX.responsiblePerson, Literal("person0")
+
+        assert len(store) == len(sample_graph)
+        for mask in itertools.product([False, True], repeat=3):
+            pattern = tuple(term if use else None for term, use in zip((s, p, o), mask))
+            assert set(store.triples(pattern)) == set(sample_graph.triples(pattern)), pattern
+
+    def test_unknown_term(self, sample_graph):
+        store = EncodedTripleStore.from_graph(sample_graph)
+
+        assert list(store.triples((EX.missing, None, None))) == []
+        assert (EX.missing, RDF.type, EX.Shipment) not in store
+        assert (EX.shipment1, RDF.type, EX.Shipment) in store
+
+    def test_graph_helpers(self, sample_graph):
+        store = EncodedTripleStore.from_graph(sample_graph)
+        g = sample_graph
+
+        assert set(store.subjects(RDF.type, EX.Shipment)) == set(g.subjects(RDF.type, EX.Shipment))
+        assert sorted(store.objects(None, EX.shipName, unique=True)) == \
+            sorted(set(g.objects(None, EX.shipName)))
+        assert set(store.predicate_objects(EX.shipment2)) == set(g.predicate_objects(EX.shipment2))
+        assert set(store.subject_objects(EX.shipName)) == set(g.subject_objects(EX.shipName))
+        assert set(store.predicates(EX.shipment2, None)) == set(g.predicates(EX.shipment2, None))
+        assert store.value(EX.shipment7, EX.shipName) == g.value(EX.shipment7, EX.shipName)
+        assert store.value(EX.missing, EX.shipName, default="n/a") == "n/a"
+        with pytest.raises(ValueError):
+            store.value(None, EX.shipName, Literal("vessel1"), any=False)
+
+    def test_from_ttl_uses_indexed_snapshot(self, sample_graph, tmp_path):
+        ttl = tmp_path / "abu.ttl"
+        sample_graph.serialize(ttl, format="turtle")
+
+        first = EncodedTripleStore.from_ttl(ttl)
+        meta = read_meta(snapshot_path_for(ttl))
+        reopened = EncodedTripleStore.from_ttl(ttl)
+
+        assert {"idx_spo", "idx_pos", "idx_osp"} <= set(meta["extra_arrays"])
+        assert set(reopened) == set(first)
+        assert len(reopened.to_graph()) == len(sample_graph)
+
+    @pytest.mark.benchmark
+    def test_performance_encoded_store_memory(self, tmp_path):
+        """Benchmark: Python heap of rdflib Memory store vs encoded store (60k triples)"""
+        g = Graph()
+        for i in range(15000):
+            node = EX[f"message{i}"]
+            g.add((node, RDF.type, EX.Message))
+            g.add((node, EX.mentionsVessel, EX[f"vessel{i % 40}"]))
+            g.add((node, EX.mentionsLocation, EX[f"location{i % 25}"]))
+            g.add((node, EX.timestamp, Literal(f"2024-01-{i % 28 + 1:02d}", datatype=XSD.date)))
+        ttl = tmp_path / "messages.ttl"
+        g.serialize(ttl, format="turtle")
+        del g
+        EncodedTripleStore.from_ttl(ttl)
+
+        tracemalloc.start()
+        graph = Graph()
+        graph.parse(ttl, format="turtle")
+        graph_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        store = EncodedTripleStore.from_ttl(ttl)
+        open_time = time.perf_counter() - start
+        store_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        assert len(store) == len(graph)
+        assert store_bytes * 3 < graph_bytes, (
+            f"rdflib {graph_bytes / 1e6:.1f} MB vs encoded store {store_bytes / 1e6:.1f} MB "
+            f"(open {open_time:.2f}s)"
+        )
@@ -0,0 +1,73 @@
+"""
+Unit tests for the shared graph cache
+"""
+
+import pytest
+from rdflib import Graph, Literal, Namespace, RDF
+
+from src.rdfio.graph_cache import GraphCache
+
+EX = Namespace("http://example.org/abu/")
+
+
+@pytest.fixture
+def ttl_file(tmp_path):
+    g = Graph()
+    g.bind("abu", EX)
+    for i in range(10):
+        g.add((EX[f"person{i}"], RDF.type, EX.Person))
+        g.add((EX[f"person{i}"], EX.personName, Literal(f"Person {i}")))
+    path = tmp_path / "abu.ttl"
+    g.serialize(path, format="turtle")
+    return path
+
+
+class TestGraphCache:
+    def test_parses_once_per_process(self, ttl_file, tmp_path):
+        cache = GraphCache(cache_dir=tmp_path / "cache")
+
+        first = cache.load(ttl_file)
+        second = cache.load(str(ttl_file))
+
+        assert second is first
+        assert cache.stats.parses == 1
+        assert cache.stats.memory_hits == 1
+
+    def test_disk_snapshot_across_processes(self, ttl_file, tmp_path):
+        GraphCache(cache_dir=tmp_path / "cache").load(ttl_file)
+
+        fresh = GraphCache(cache_dir=tmp_path / "cache")
+        graph = fresh.load(ttl_file)
+
+        assert len(graph) == 20
+        assert fresh.stats.parses == 0
+        assert fresh.stats.disk_hits == 1
+
+    def test_content_change_invalidates(self, ttl_file, tmp_path):
+        cache = GraphCache(cache_dir=tmp_path / "cache")
+        cache.load(ttl_file)
+        with open(ttl_file, "a", encoding="utf-8") as f:
+            f.write('\n<http://example.org/abu/person99> a <http://example.org/abu/Person> .\n')
+
+        graph = cache.load(ttl_file)
+
+        assert (EX.person99, RDF.type, EX.Person) in graph
+        assert cache.stats.parses == 2
+
+    def test_mutable_copy_is_private(self, ttl_file, tmp_path):
+        cache = GraphCache(cache_dir=tmp_path / "cache")
+        copy = cache.load(ttl_file, mutable=True)
+        copy.add((EX.extra, RDF.type, EX.Person))
+
+        assert (EX.extra, RDF.type, EX.Person) not in cache.load(ttl_file)
+
+    def test_lru_eviction(self, ttl_file, tmp_path):
+        other = tmp_path / "other.ttl"
+        other.write_text("<http://example.org/a> <http://example.org/b> \"c\" .\n", encoding="utf-8")
+        cache = GraphCache(maxsize=1, disk=False)
+
+        cache.load(ttl_file)
+        cache.load(other)
+        cache.load(ttl_file)
+
+        assert cache.stats.parses == 3
@@ -0,0 +1,196 @@
+"""
+Unit tests for the shared deterministic ID minting service (core.ids)
+"""
+
+import random
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.ids import MAPPING_IDS, NIL_NAMESPACE, PROJECT_NAMESPACE, IdMinter, deterministic_id
+from src.mapping import clusterer, registry
+from src.mapping.clusterer import IdentityClusterer, uuid5_from
+
+IDENTITY_RULES = {
+    "identity_rules": [
+        {"name": "by_hvdc_case", "when": ["HVDC_Code", "Case No."], "cluster_as": "Shipment"},
+        {"name": "by_bl_container", "when": ["BL No.", "Container"], "cluster_as": "Consignment"},
+        {"name": "by_rotation_eta", "when": ["RotationNo", "ETA"], "cluster_as": "VesselCall", "window_days": 7},
+    ]
+}
+
+
+def legacy_uuid5_from(*parts):
+    """Previous per-call implementation (base UUID rebuilt and name hashed every call)"""
+    base = "00000000-0000-0000-0000-000000000000"
+    name = "::".join("" if p is None else str(p) for p in parts)
+    return str(uuid.uuid5(uuid.UUID(base), name))
+
+
+def legacy_simple_keys(df, keys):
+    present = [k for k in keys if k in df.columns]
+    return [legacy_uuid5_from(*[str(row.get(k, "") or "") for k in present]) for _, row in df[present].iterrows()]
+
+
+def shipment_frame(n, seed=0):
+    """Rows repeating a small set of vendors / BLs / containers / rotations"""
+    rng = random.Random(seed)
+    bls = [f"BL{i:04d}" for i in range(max(n // 50, 1))]
+    return pd.DataFrame({
+        "HVDC_Code": [rng.choice([f"HVDC-ADOPT-{i:03d}" for i in range(40)] + [None]) for _ in range(n)],
+        "Case No.": [rng.choice([f"CASE-{i:04d}" for i in range(200)] + [np.nan]) for _ in range(n)],
+        "Vendor": [rng.choice(["HE", "SIM", "SAS"]) for _ in range(n)],
+        "BL No.": [rng.choice(bls) for _ in range(n)],
+        "Container": [rng.choice([f"MSCU{i:07d}" for i in range(100)] + [""]) for _ in range(n)],
+        "RotationNo": [rng.choice([101, 102, 103, None]) for _ in range(n)],
+        "ETA": [rng.choice(["2025-09-01", "2025-09-09", "2025-09-20", "bad"]) for _ in range(n)],
+        "ETA_iso": [f"2025-09-{rng.randrange(1, 29):02d}T00:00:00+04:00" for _ in range(n)],
+    })
+
+
+class TestIdMinter:
+    def test_matches_uuid5(self):
+        minter = IdMinter(NIL_NAMESPACE)
+
+        assert minter.mint("BL1", None, 3) == legacy_uuid5_from("BL1", None, 3)
+        assert minter.mint() == str(uuid.uuid5(NIL_NAMESPACE, ""))
+        assert uuid.UUID(minter.mint("x")).version == 5
+        rng = random.Random(0)
+        for _ in range(2000):
+            name = "".join(rng.choice("aZ09:|é한 ") for _ in range(rng.randrange(30)))
+            assert minter.mint_name(name) == str(uuid.uuid5(NIL_NAMESPACE, name))
+
+    def test_module_functions_unchanged(self):
+        key = "transport_event|SHIP-1|occurred_at=2024-01-01T00:00Z"
+        assert deterministic_id("transport_event", "SHIP-1", occurred_at="2024-01-01T00:00Z") == str(
+            uuid.uuid5(PROJECT_NAMESPACE, key)
+        )
+        for parts in [("HVDC-1", "CASE-1"), ("BL1",), (None, np.nan, 2.5), ()]:
+            assert registry.uuid5_from(*parts) == legacy_uuid5_from(*parts)
+            assert clusterer.uuid5_from(*parts) == legacy_uuid5_from(*parts)
+
+    def test_bounded_lru(self):
+        minter = IdMinter(NIL_NAMESPACE, maxsize=2)
+        for key in ["a", "b", "a", "c", "b"]:
+            minter.mint(key)
+
+        info = minter.cache_info()
+        assert (info.hits, info.misses, info.currsize, info.maxsize) == (1, 4, 2, 2)
+        minter.cache_clear()
+        assert minter.cache_info().currsize == 0
+
+    def test_mint_many(self):
+        minter = IdMinter(NIL_NAMESPACE)
+        keys = [("BL1", "C1"), ("BL2", None), ("BL1", "C1"), ["BL2", None], ("BL1", "C1")]
+
+        ids = minter.mint_many(keys)
+
+        assert ids == [legacy_uuid5_from(*k) for k in keys]
+        assert minter.cache_info().misses == 2
+        assert minter.mint_many([]) == []
+
+
+class TestPipelines:
+    def test_cluster_ids_match_row_loop(self):
+        df = shipment_frame(300, seed=1)
+        rules = IdentityClusterer(IDENTITY_RULES)
+
+        shipments = rules._cluster_by_simple_keys(df, ["HVDC_Code", "Case No."], "Shipment")
+
+        assert shipments["RowIndex"].tolist() == df.index.tolist()
+        assert shipments["ClusterID"].tolist() == legacy_simple_keys(df, ["HVDC_Code", "Case No."])
+
+    def test_rotation_ids_match_row_loop(self):
+        df = shipment_frame(200, seed=2)
+        rules = IdentityClusterer(IDENTITY_RULES)
+
+        rotation = rules._cluster_by_rotation_eta(df, rules.rules[2])
+
+        tmp = df[["RotationNo", "ETA"]].copy()
+        tmp["ETA"] = pd.to_datetime(tmp["ETA"], errors="coerce")
+        tmp["bucket"] = (
+            tmp["ETA"].dt.floor("D") - pd.to_timedelta(tmp["ETA"].dt.dayofyear % 7, unit="D")
+        ).astype("datetime64[ns]")
+        expected = [
+            legacy_uuid5_from(str(r.get("RotationNo") or ""), str(r.get("bucket") or ""))
+            for _, r in tmp.iterrows()
+        ]
+        assert rotation["ClusterID"].tolist() == expected
+
+    def test_numeric_keys(self):
+        # iterrows() upcasts all-numeric rows to float; cluster keys keep that rendering
+        df = pd.DataFrame({"BL No.": [1, 2, 0], "Container": [1.5, np.nan, 2.0]})
+
+        out = IdentityClusterer(IDENTITY_RULES)._cluster_by_simple_keys(df, ["BL No.", "Container"], "C")
+
+        assert out["ClusterID"].tolist() == legacy_simple_keys(df, ["BL No.", "Container"])
+
+    def test_linkset_uses_shared_ids(self):
+        df = shipment_frame(50, seed=3)
+
+        _, graph = IdentityClusterer(IDENTITY_RULES).run(df)
+
+        row = df.dropna(subset=["HVDC_Code", "Case No."]).iloc[0]
+        subject = f"https://hvdc.example.org/id/Shipment/{uuid5_from(row['HVDC_Code'], row['Case No.'])}"
+        assert any(str(s) == subject for s in graph.subjects())
+
+    def test_mapping_output_unchanged(self, tmp_path):
+        df = shipment_frame(50, seed=5)
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(registry, "uuid5_from", legacy_uuid5_from)
+            registry.MappingRegistry().dataframe_to_rdf(df, tmp_path / "legacy.ttl")
+        registry.MappingRegistry().dataframe_to_rdf(df, tmp_path / "memo.ttl")
+
+        assert (tmp_path / "legacy.ttl").read_text(encoding="utf-8") == (
+            tmp_path / "memo.ttl"
+        ).read_text(encoding="utf-8")
+
+
+@pytest.mark.benchmark
+def test_performance_id_minting_pipelines(tmp_path):
+    """Benchmark: memoized / batch minting vs per-call uuid5 (keys, clustering, mapping)"""
+    df = shipment_frame(50_000, seed=4)
+    keys = list(zip(df["HVDC_Code"], df["Case No."])) + list(zip(df["Vendor"], df["BL No."]))
+
+    start = time.perf_counter()
+    reference = [legacy_uuid5_from(*k) for k in keys]
+    legacy = time.perf_counter() - start
+
+    MAPPING_IDS.cache_clear()
+    start = time.perf_counter()
+    ids = MAPPING_IDS.mint_many(keys)
+    batch = time.perf_counter() - start
+    assert ids == reference
+
+    rules = IdentityClusterer(IDENTITY_RULES)
+    start = time.perf_counter()
+    for rule in rules.rules[:2]:
+        legacy_simple_keys(df, rule.when)
+    legacy_clusters = time.perf_counter() - start
+
+    MAPPING_IDS.cache_clear()
+    start = time.perf_counter()
+    for rule in rules.rules[:2]:
+        rules._cluster_by_simple_keys(df, rule.when, rule.cluster_as)
+    clusters = time.perf_counter() - start
+
+    mapping_df = df.head(5_000)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(registry, "uuid5_from", legacy_uuid5_from)
+        start = time.perf_counter()
+        registry.MappingRegistry().dataframe_to_rdf(mapping_df, tmp_path / "legacy.ttl")
+        legacy_mapping = time.perf_counter() - start
+    MAPPING_IDS.cache_clear()
+    start = time.perf_counter()
+    registry.MappingRegistry().dataframe_to_rdf(mapping_df, tmp_path / "memo.ttl")
+    mapping = time.perf_counter() - start
+
+    assert (tmp_path / "legacy.ttl").read_text(encoding="utf-8") == (tmp_path / "memo.ttl").read_text(encoding="utf-8")
+    assert batch * 3 < legacy, f"mint_many {batch * 1000:.1f}ms vs per-call {legacy * 1000:.1f}ms"
+    assert clusters * 5 < legacy_clusters, (
+        f"clusters {clusters * 1000:.1f}ms vs iterrows+uuid5 {legacy_clusters * 1000:.1f}ms"
+    )
+    assert mapping <= legacy_mapping * 1.5, f"mapping {mapping:.2f}s vs {legacy_mapping:.2f}s"
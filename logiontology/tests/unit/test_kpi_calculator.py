@@ -2,6 +2,10 @@
 Unit tests for HVDC Flow KPI Calculator
 """
 
+import time
+
+import numpy as np
+import pandas as pd
 import pytest
 from src.core.flow_models import (
     ContainerFlow,
@@ -10,7 +14,12 @@ from src.core.flow_models import (
     LCTFlow,
     FlowCode
 )
-from src.analytics.kpi_calculator import FlowKPICalculator, FlowKPIs
+from src.analytics.kpi_calculator import (
+    ColumnarFlowKPICalculator,
+    FlowKPICalculator,
+    FlowKPIs,
+    flows_to_frame
+)
 
 
 class TestKPICalculation:
@@ -282,3 +291,84 @@ class TestKPISummary:
         assert kpi_dict["mosb_pass_rate"] == 40.0
         assert isinstance(kpi_dict["flow_distribution"], dict)
 
+
+
+class TestColumnarKPICalculator:
+    """Test vectorized KPI calculation over columnar flows"""
+
+    @pytest.fixture
+    def flows(self):
+        return [
+            ContainerFlow(flow_id="CT001", flow_code=FlowCode.DIRECT, wh_handling=0, offshore_flag=False),
+            ContainerFlow(flow_id="CT002", flow_code=FlowCode.WH_ONCE, wh_handling=0, offshore_flag=False),
+            ContainerFlow(
+                flow_id="PRE001",
+                flow_code=FlowCode.PRE_ARRIVAL,
+                wh_handling=0,
+                offshore_flag=False,
+                is_pre_arrival=True
+            ),
+            LCTFlow(flow_id="LCT001", flow_code=FlowCode.WH_MOSB, wh_handling=1, offshore_flag=True),
+            LCTFlow(flow_id="LCT002", flow_code=FlowCode.WH_DOUBLE_MOSB, wh_handling=2, offshore_flag=True),
+            BulkFlow(flow_id="BLK001", flow_code=FlowCode.WH_ONCE, wh_handling=1, offshore_flag=False),
+        ]
+
+    def test_matches_object_calculator(self, flows):
+        """Columnar results equal FlowKPICalculator results"""
+        df = flows_to_frame(flows)
+        columnar = ColumnarFlowKPICalculator()
+        calc = FlowKPICalculator()
+
+        assert columnar.calculate(df) == calc.calculate(flows)
+        assert columnar.calculate_by_mode(df) == calc.calculate_by_mode(flows)
+
+    def test_validate_consistency_mask(self, flows):
+        """Vectorized consistency check reports the same errors"""
+        df = flows_to_frame(flows)
+        columnar = ColumnarFlowKPICalculator()
+
+        mask = columnar.consistency_mask(df)
+        assert mask.tolist() == [f.validate_consistency() for f in flows]
+        assert columnar.validate_consistency(df) == FlowKPICalculator().validate_consistency(flows)
+
+    def test_empty_frame(self):
+        """Empty input yields zero KPIs"""
+        kpis = ColumnarFlowKPICalculator().calculate(flows_to_frame([]))
+
+        assert kpis.total_flows == 0
+        assert kpis.flow_distribution == {}
+
+    def test_missing_columns(self):
+        """Missing required columns raise ValueError"""
+        with pytest.raises(ValueError):
+            ColumnarFlowKPICalculator().calculate(pd.DataFrame({"flow_code": [1]}))
+
+    @pytest.mark.benchmark
+    def test_performance_1m_flows(self):
+        """Benchmark: 1M flows computed in a single vectorized pass"""
+        rng = np.random.default_rng(42)
+        n = 1_000_000
+        wh = rng.integers(0, 3, n)
+        offshore = rng.random(n) < 0.3
+        pre = rng.random(n) < 0.05
+        df = pd.DataFrame(
+            {
+                "flow_code": ColumnarFlowKPICalculator.expected_flow_codes(wh, offshore, pre),
+                "wh_handling": wh,
+                "offshore_flag": offshore,
+                "is_pre_arrival": pre,
+                "transport_mode": rng.choice(["container", "bulk", "land", "lct"], n),
+            }
+        )
+        columnar = ColumnarFlowKPICalculator()
+
+        start = time.perf_counter()
+        kpis = columnar.calculate(df)
+        by_mode = columnar.calculate_by_mode(df)
+        valid, errors = columnar.validate_consistency(df)
+        elapsed = time.perf_counter() - start
+
+        assert kpis.total_flows == n
+        assert sum(k.total_flows for k in by_mode.values()) == n
+        assert valid == n and errors == []
+        assert elapsed < 5.0
@@ -0,0 +1,156 @@
+"""
+Unit tests for HVDC Flow KPI Snapshot (aggregated/incremental KPIs)
+"""
+
+import pytest
+from src.core.flow_models import ContainerFlow, LCTFlow, BulkFlow, FlowCode
+from src.analytics.kpi_calculator import FlowKPICalculator
+from src.analytics.kpi_snapshot import KPISnapshot, KPIService
+from src.mapping.flow_rdf_mapper import FlowRDFMapper
+
+
+@pytest.fixture
+def mixed_flows():
+    return [
+        ContainerFlow(flow_id="CT001", flow_code=FlowCode.DIRECT, wh_handling=0, offshore_flag=False),
+        ContainerFlow(flow_id="CT002", flow_code=FlowCode.WH_ONCE, wh_handling=1, offshore_flag=False),
+        ContainerFlow(
+            flow_id="PRE001",
+            flow_code=FlowCode.PRE_ARRIVAL,
+            wh_handling=0,
+            offshore_flag=False,
+            is_pre_arrival=True,
+        ),
+        LCTFlow(flow_id="LCT001", flow_code=FlowCode.WH_MOSB, wh_handling=1, offshore_flag=True),
+        LCTFlow(flow_id="LCT002", flow_code=FlowCode.WH_DOUBLE_MOSB, wh_handling=2, offshore_flag=True),
+        BulkFlow(flow_id="BLK001", flow_code=FlowCode.WH_ONCE, wh_handling=1, offshore_flag=False),
+    ]
+
+
+class TestKPISnapshot:
+    """Snapshot counters must reproduce FlowKPICalculator results"""
+
+    def test_incremental_matches_calculator(self, mixed_flows):
+        snapshot = KPISnapshot()
+        snapshot.add_flows(mixed_flows)
+
+        expected = FlowKPICalculator().calculate(mixed_flows)
+        assert snapshot.to_kpis() == expected
+
+    def test_by_mode_matches_calculator(self, mixed_flows):
+        snapshot = KPISnapshot()
+        snapshot.add_flows(mixed_flows)
+
+        assert snapshot.by_mode() == FlowKPICalculator().calculate_by_mode(mixed_flows)
+
+    def test_remove_flow(self, mixed_flows):
+        snapshot = KPISnapshot()
+        snapshot.add_flows(mixed_flows)
+        snapshot.remove_flow(mixed_flows[-1])
+
+        assert snapshot.to_kpis() == FlowKPICalculator().calculate(mixed_flows[:-1])
+        assert "bulk" not in snapshot.to_kpis().mode_distribution
+
+    def test_from_graph_sparql_aggregate(self, mixed_flows):
+        graph = FlowRDFMapper.from_flows(mixed_flows).get_graph()
+        snapshot = KPISnapshot.from_graph(graph)
+
+        assert snapshot.to_kpis() == FlowKPICalculator().calculate(mixed_flows)
+
+    def test_from_records(self):
+        snapshot = KPISnapshot.from_records(
+            [
+                {"flow_code": 1, "transport_mode": "container", "total": 3, "wh_hops": 0},
+                {"flow_code": 3, "transport_mode": "lct", "total": 1, "mosb_pass": 1, "wh_hops": 1},
+            ]
+        )
+        kpis = snapshot.to_kpis()
+
+        assert kpis.total_flows == 4
+        assert kpis.direct_delivery_rate == 75.0
+        assert kpis.mosb_pass_rate == 25.0
+        assert kpis.avg_wh_hops == 0.25
+
+
+class TestKPIService:
+    """Cached refresh and incremental update behaviour"""
+
+    def test_refresh_interval(self, mixed_flows):
+        now = [0.0]
+        calls = []
+
+        def loader():
+            calls.append(now[0])
+            snapshot = KPISnapshot()
+            snapshot.add_flows(mixed_flows)
+            return snapshot
+
+        service = KPIService(loader=loader, refresh_interval=60, clock=lambda: now[0])
+        assert service.get_kpis().total_flows == 6
+        now[0] = 30.0
+        service.get_kpis()
+        assert len(calls) == 1
+
+        now[0] = 61.0
+        service.get_kpis()
+        assert len(calls) == 2
+
+    def test_apply_flows_between_refreshes(self, mixed_flows):
+        service = KPIService(loader=KPISnapshot, refresh_interval=3600)
+        assert service.get_kpis().total_flows == 0
+
+        service.apply_flows(mixed_flows[:2])
+        kpis = service.get_kpis()
+        assert kpis.total_flows == 2
+        assert kpis.direct_delivery_rate == 50.0
+
+    def test_loader_failure_keeps_cached_snapshot(self, mixed_flows):
+        def failing_loader():
+            raise ConnectionError("neo4j unavailable")
+
+        service = KPIService(loader=failing_loader, refresh_interval=0)
+        service.apply_flows(mixed_flows)
+
+        assert service.get_kpis().total_flows == len(mixed_flows)
+
+    def test_apply_snapshot_replaces_same_source(self, mixed_flows):
+        service = KPIService()
+        first = KPISnapshot()
+        first.add_flows(mixed_flows)
+        service.apply_snapshot(first, source="a.ttl")
+        service.apply_snapshot(first, source="a.ttl")
+        assert service.get_kpis().total_flows == len(mixed_flows)
+
+        smaller = KPISnapshot()
+        smaller.add_flows(mixed_flows[:2])
+        service.apply_snapshot(smaller, source="a.ttl")
+        service.apply_snapshot(smaller, source="b.ttl")
+        assert service.get_kpis().total_flows == 4
+
+    def test_loader_reload_is_idempotent(self, mixed_flows, tmp_path):
+        from src.graph.loader import Neo4jLoader
+
+        class FakeStore:
+            def __init__(self):
+                self.loaded = 0
+
+            def load_rdf_graph(self, graph):
+                self.loaded += 1
+
+        ttl = FlowRDFMapper.from_flows(mixed_flows).serialize(tmp_path / "flows.ttl")
+        service = KPIService()
+        loader = Neo4jLoader(neo4j_store=FakeStore(), kpi_service=service)
+
+        loader.load_ttl_file(ttl)
+        loader.load_ttl_file(tmp_path / "." / "flows.ttl")
+
+        assert loader.store.loaded == 2
+        assert service.get_snapshot().to_kpis() == FlowKPICalculator().calculate(mixed_flows)
+
+    def test_shared_service(self):
+        from src.analytics.kpi_snapshot import shared_kpi_service
+        from src.api.endpoints.kpi import kpi_service
+        from src.graph.loader import Neo4jLoader
+
+        assert shared_kpi_service() is kpi_service
+        assert Neo4jLoader(neo4j_store=object()).kpi_service is kpi_service
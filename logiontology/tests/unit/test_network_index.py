@@ -0,0 +1,153 @@
+"""
+Unit tests for the CSR network index and the csr unified-network backend
+"""
+
+import contextlib
+import copy
+import io
+import random
+import time
+
+import pytest
+
+nx = pytest.importorskip("networkx")
+
+from src.graph.network_index import MISSING, NetworkIndex
+from src.graph.unified_network import (
+    add_inference_rules,
+    build_network_index,
+    detect_communities,
+    validate_hvdc_ontology,
+)
+
+
+def synthetic_network(n_vessels=200, n_persons=150, n_ops=300, seed=0, mosb_share=0.5):
+    """HVDC-shaped graph: ports/hub/sites, vessels, persons, operations"""
+    rng = random.Random(seed)
+    G = nx.Graph()
+    for p in ["ZAYED_PORT", "KHALIFA_PORT", "JEBEL_ALI_PORT"]:
+        G.add_node(p, type="port", level=1, ontology_class="Location")
+    G.add_node("MOSB", type="hub", level=1, ontology_class="Location")
+    for s in ["MIR", "SHU", "DAS", "AGI"]:
+        G.add_node(s, type="site", level=2, ontology_class="Location")
+    G.add_edge("ZAYED_PORT", "MOSB", rel="feeds_into", weight=1.0)
+    G.add_edge("MOSB", "KHALIFA_PORT", rel="feeds_into", weight=1.0)
+    for s in ["MIR", "DAS", "AGI"]:
+        G.add_edge("MOSB", s, rel="dispatches", weight=1.0)
+    G.add_edge("DAS", "AGI", rel="connected_to", weight=0.5)
+
+    ports = [f"port:{i}" for i in range(max(3, n_vessels // 20))]
+    for p in ports:
+        G.add_node(p, type="port", level=3, ontology_class="Location")
+    vessels = [f"vessel:{i}" for i in range(n_vessels)]
+    for v in vessels:
+        G.add_node(v, type="vessel", level=3, ontology_class="Asset")
+        if rng.random() < mosb_share:
+            G.add_edge(v, "MOSB", rel="operates_from", weight=0.5)
+        if rng.random() < 0.3:
+            G.add_edge(v, rng.choice(ports), rel="calls_at", weight=0.5)
+        if rng.random() < 0.2 * mosb_share:
+            G.add_edge(v, rng.choice(["MIR", "SHU", "ZAYED_PORT"]), rel="delivers_to", weight=0.5)
+    for i in range(0, n_vessels - 1, 17):
+        G.add_edge(vessels[i], vessels[i + 1], rel="same_as", weight=0.9)
+
+    persons = [f"person:{i}" for i in range(n_persons)]
+    for p in persons:
+        G.add_node(p, type="person", level=3, ontology_class="Party")
+        for v in rng.sample(vessels, k=min(len(vessels), rng.randint(0, 3))):
+            G.add_edge(p, v, rel="operates", weight=0.5)
+    for i in range(n_ops):
+        op = f"op:{i}"
+        G.add_node(op, type="operation", level=3, ontology_class="Process")
+        for p in rng.sample(persons, k=min(len(persons), rng.randint(0, 2))):
+            G.add_edge(op, p, rel="performed", weight=0.5)
+    G.add_node("orphan")
+    return G
+
+
+def quiet(func, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args)
+
+
+class TestNetworkIndex:
+    def test_layout_follows_graph(self):
+        G = synthetic_network(40, 30, 50, seed=3)
+        G.add_edge("orphan", "orphan", weight=2.0)
+        index = NetworkIndex(G, edge_attrs=("rel",))
+
+        assert index.nodes == list(G.nodes)
+        assert index.nodes_of_type("vessel") == [n for n, d in G.nodes(data=True) if d.get("type") == "vessel"]
+        assert [index.nodes[i] for i in index.neighbor_ids(index.ids["MOSB"])] == list(G.adj["MOSB"])
+        assert [(index.nodes[u], index.nodes[v]) for u, v in zip(index.edge_u, index.edge_v)] == list(G.edges())
+        assert list(index.edge_attrs["rel"]) == [d.get("rel", MISSING) for _, _, d in G.edges(data=True)]
+        assert index.number_of_edges == G.number_of_edges()
+        degree = dict(G.degree(weight="weight"))
+        assert index.weighted_degree().tolist() == [degree[n] for n in G]
+
+    def test_has_edge(self):
+        G = synthetic_network(40, 30, 50, seed=3)
+        index = NetworkIndex(G)
+        nodes = list(G)
+        rng = random.Random(0)
+        pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(500)] + list(G.edges())
+
+        assert [index.has_edge(u, v) for u, v in pairs] == [G.has_edge(u, v) for u, v in pairs]
+        assert not index.has_edge("MOSB", "unknown")
+        assert NetworkIndex(nx.empty_graph(3)).has_edges([0, 1], [1, 2]).tolist() == [False, False]
+
+
+class TestCsrBackend:
+    @pytest.mark.parametrize("seed", range(4))
+    @pytest.mark.parametrize("sizes", [(200, 150, 300), (30, 20, 40), (0, 5, 5)])
+    def test_inference_matches_networkx(self, seed, sizes):
+        expected = synthetic_network(*sizes, seed=seed)
+        actual = copy.deepcopy(expected)
+
+        quiet(add_inference_rules, expected)
+        quiet(add_inference_rules, actual, "csr")
+
+        assert list(actual.nodes(data=True)) == list(expected.nodes(data=True))
+        assert list(actual.edges(data=True)) == list(expected.edges(data=True))
+        assert [list(actual.adj[n]) for n in actual] == [list(expected.adj[n]) for n in expected]
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_validation_matches_networkx(self, seed):
+        G = synthetic_network(seed=seed)
+        quiet(add_inference_rules, G)
+
+        assert quiet(validate_hvdc_ontology, G, build_network_index(G)) == quiet(validate_hvdc_ontology, G)
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            add_inference_rules(synthetic_network(5, 5, 5), backend="scipy")
+
+    def test_louvain_modularity(self):
+        G = nx.karate_club_graph()
+        communities = NetworkIndex(G).louvain_communities(seed=42)
+
+        assert set().union(*communities) == set(G)
+        assert nx.community.modularity(G, communities) == pytest.approx(
+            nx.community.modularity(G, nx.community.louvain_communities(G, seed=42)), abs=0.02
+        )
+
+    @pytest.mark.benchmark
+    def test_performance_csr_backend(self):
+        """Benchmark: networkx vs csr backend (inference + validation + Louvain)"""
+        base = synthetic_network(4000, 3000, 8000, seed=1, mosb_share=0.02)
+        timings = {}
+        partitions = {}
+        for backend in ("networkx", "csr"):
+            G = copy.deepcopy(base)
+            start = time.perf_counter()
+            quiet(add_inference_rules, G, backend)
+            index = build_network_index(G) if backend == "csr" else None
+            quiet(validate_hvdc_ontology, G, index)
+            partitions[backend] = (G, detect_communities(G, index, seed=42))
+            timings[backend] = time.perf_counter() - start
+
+        q = {b: nx.community.modularity(G, c) for b, (G, c) in partitions.items()}
+        assert q["csr"] == pytest.approx(q["networkx"], abs=0.02)
+        assert timings["csr"] < timings["networkx"], (
+            f"csr {timings['csr']:.2f}s vs networkx {timings['networkx']:.2f}s"
+        )
@@ -0,0 +1,116 @@
+"""
+Unit tests for the Case/Event Parquet store
+"""
+
+from datetime import date
+
+import pandas as pd
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, RDF, XSD
+
+from src.export.parquet_store import (
+    is_parquet_store,
+    load_case_tables,
+    load_overrides,
+    load_tables,
+    write_case_parquet,
+)
+from src.export.view_engine import compute_views, scan_case_events
+
+pytest.importorskip("pyarrow")
+
+HVDC = Namespace("http://samsung.com/project-logistics#")
+
+
+@pytest.fixture
+def case_graph():
+    g = Graph()
+    for idx, (flow, orig, reason, vendor) in enumerate(
+        [("1", 1, None, "HITACHI"), ("3", 2, "AGI/DAS forced", "SIEMENS"), ("2", 2, None, None)]
+    ):
+        case = HVDC[f"Case_{idx + 1:05d}"]
+        g.add((case, RDF.type, HVDC.Case))
+        g.add((case, HVDC.hasFlowCode, Literal(flow, datatype=XSD.string)))
+        g.add((case, HVDC.hasFlowCodeOriginal, Literal(orig, datatype=XSD.integer)))
+        if reason:
+            g.add((case, HVDC.hasFlowOverrideReason, Literal(reason)))
+        if vendor:
+            g.add((case, HVDC.hasVendor, Literal(vendor)))
+        event = BNode()
+        g.add((case, HVDC.hasInboundEvent, event))
+        g.add((event, HVDC.hasEventDate, Literal(date(2024, 1, idx + 1), datatype=XSD.date)))
+        g.add((event, HVDC.hasLocationAtEvent, Literal("DSV Indoor")))
+        g.add((event, HVDC.hasQuantity, Literal(1.0, datatype=XSD.decimal)))
+    return g
+
+
+class TestParquetStore:
+    def test_round_trip(self, case_graph, tmp_path):
+        tables = scan_case_events(case_graph)
+        paths = write_case_parquet(case_graph, tmp_path)
+
+        assert set(paths) == {"cases", "events", "overrides"}
+        assert is_parquet_store(tmp_path)
+        loaded = load_case_tables(tmp_path)
+        pd.testing.assert_frame_equal(loaded.cases, tables.cases)
+        pd.testing.assert_frame_equal(loaded.events, tables.events)
+
+    def test_string_columns_dictionary_encoded(self, case_graph, tmp_path):
+        import pyarrow.parquet as pq
+
+        write_case_parquet(case_graph, tmp_path)
+        schema = pq.read_schema(tmp_path / "cases.parquet")
+
+        for column in ("case_id", "flow_code", "vendor"):
+            assert str(schema.field(column).type).startswith("dictionary")
+
+    def test_overrides(self, case_graph, tmp_path):
+        write_case_parquet(case_graph, tmp_path)
+        overrides = load_overrides(tmp_path)
+
+        assert list(overrides["case_id"].astype(str)) == ["Case_00002"]
+        assert overrides.loc[0, "flow_code_original"] == 2
+
+    def test_load_tables_dispatch(self, case_graph, tmp_path):
+        ttl = tmp_path / "cases.ttl"
+        case_graph.serialize(ttl, format="turtle")
+        write_case_parquet(ttl, tmp_path / "store")
+
+        from_ttl = compute_views(load_tables(ttl))
+        from_store = compute_views(load_tables(tmp_path / "store"))
+        for name in from_ttl:
+            pd.testing.assert_frame_equal(from_ttl[name], from_store[name])
+        assert not is_parquet_store(ttl)
+
+
+class TestConverterParquetOutput:
+    """convert_data_wh_to_ttl_with_events(parquet_dir=...) matches the TTL"""
+
+    def test_parquet_matches_ttl(self, tmp_path):
+        from src.ingest.excel_to_ttl_with_events import convert_data_wh_to_ttl_with_events
+
+        excel = tmp_path / "data_wh.xlsx"
+        pd.DataFrame(
+            {
+                "HVDC CODE": ["HVDC-1", "HVDC-2", "HVDC-3", "HVDC-4"],
+                "VENDOR": ["HITACHI", "SIEMENS", None, "HITACHI"],
+                "FLOW_CODE": [1, 2, 3, 0],
+                "Pkg": [2, None, 1, 1],
+                "CBM": [1.5, 2.0, None, 0.5],
+                "DSV Indoor": [None, "2024-01-10", None, None],
+                "MOSB": [None, None, "2024-02-01", None],
+                "MIR": ["2024-01-05", "2024-01-20", "2024-02-11", None],
+            }
+        ).to_excel(excel, index=False)
+
+        ttl = tmp_path / "out.ttl"
+        stats = convert_data_wh_to_ttl_with_events(
+            str(excel), str(ttl), flow_version="3.4", parquet_dir=str(tmp_path / "store")
+        )
+
+        from_ttl = load_tables(ttl)
+        direct = load_case_tables(tmp_path / "store")
+        assert set(stats["parquet"]) == {"cases", "events", "overrides"}
+        assert len(direct.events) == stats["inbound_events"] + stats["outbound_events"]
+        pd.testing.assert_frame_equal(direct.cases, from_ttl.cases)
+        pd.testing.assert_frame_equal(direct.events, from_ttl.events)
@@ -0,0 +1,110 @@
+"""
+Unit tests for binary graph snapshots
+"""
+
+import time
+
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, RDF, XSD
+from rdflib.compare import isomorphic
+
+from src.rdfio.snapshot import (
+    file_digest,
+    load_graph,
+    load_snapshot,
+    read_meta,
+    save_snapshot,
+    snapshot_path_for,
+)
+
+EX = Namespace("http://example.org/hvdc/")
+
+
+@pytest.fixture
+def sample_graph():
+    g = Graph()
+    g.bind("ex", EX)
+    node = BNode("evt1")
+    g.add((EX.case1, RDF.type, EX.Case))
+    g.add((EX.case1, EX.hasVendor, Literal("HITACHI")))
+    g.add((EX.case1, EX.hasLabel, Literal("케이스", lang="ko")))
+    g.add((EX.case1, EX.hasCBM, Literal("1.5", datatype=XSD.decimal)))
+    g.add((EX.case1, EX.hasCount, Literal(3)))
+    g.add((EX.case1, EX.hasDate, Literal("2024-01-05", datatype=XSD.date)))
+    g.add((EX.case1, EX.hasInboundEvent, node))
+    g.add((node, EX.hasLocation, Literal("")))
+    return g
+
+
+@pytest.fixture
+def ttl_file(sample_graph, tmp_path):
+    path = tmp_path / "sample.ttl"
+    sample_graph.serialize(path, format="turtle")
+    return path
+
+
+class TestSnapshot:
+    def test_round_trip(self, sample_graph, tmp_path):
+        save_snapshot(sample_graph, tmp_path / "g.snapshot")
+        loaded = load_snapshot(tmp_path / "g.snapshot")
+
+        assert set(loaded) == set(sample_graph)
+        assert str(dict(loaded.namespaces())["ex"]) == str(EX)
+
+    def test_invalid_snapshot(self, tmp_path):
+        with pytest.raises(ValueError):
+            load_snapshot(tmp_path)
+
+    def test_load_graph_creates_and_reuses_snapshot(self, ttl_file):
+        first = load_graph(ttl_file)
+        snap = snapshot_path_for(ttl_file)
+        meta = read_meta(snap)
+
+        assert meta["source_sha256"] == file_digest(ttl_file)
+        assert meta["n_triples"] == len(first)
+        assert isomorphic(load_graph(ttl_file), first)
+
+    def test_stale_snapshot_is_rebuilt(self, ttl_file):
+        load_graph(ttl_file)
+        with open(ttl_file, "a", encoding="utf-8") as f:
+            f.write('\n<http://example.org/hvdc/case2> a <http://example.org/hvdc/Case> .\n')
+
+        graph = load_graph(ttl_file)
+
+        assert (EX.case2, RDF.type, EX.Case) in graph
+        assert read_meta(snapshot_path_for(ttl_file))["source_sha256"] == file_digest(ttl_file)
+
+    def test_snapshot_dir_keyed_by_hash(self, ttl_file, tmp_path):
+        cache = tmp_path / "cache"
+        load_graph(ttl_file, snapshot_dir=cache)
+
+        assert (cache / f"{file_digest(ttl_file)}.snapshot").is_dir()
+        assert not snapshot_path_for(ttl_file).exists()
+
+    @pytest.mark.benchmark
+    def test_performance_snapshot_reload(self, tmp_path):
+        """Benchmark: snapshot reload vs Turtle parse (50k triples)"""
+        g = Graph()
+        for i in range(10000):
+            case = EX[f"Case_{i:05d}"]
+            g.add((case, RDF.type, EX.Case))
+            g.add((case, EX.hasVendor, Literal(f"VENDOR_{i % 50}")))
+            g.add((case, EX.hasCBM, Literal(i * 0.5)))
+            g.add((case, EX.hasDate, Literal(f"2024-{i % 12 + 1:02d}-01", datatype=XSD.date)))
+            g.add((case, EX.hasInboundEvent, BNode()))
+        ttl = tmp_path / "bench.ttl"
+        g.serialize(ttl, format="turtle")
+        load_graph(ttl)
+
+        start = time.perf_counter()
+        Graph().parse(ttl, format="turtle")
+        parse_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded = load_graph(ttl)
+        snapshot_time = time.perf_counter() - start
+
+        assert len(loaded) == len(g)
+        assert snapshot_time < parse_time, (
+            f"snapshot reload {snapshot_time:.2f}s vs Turtle parse {parse_time:.2f}s"
+        )
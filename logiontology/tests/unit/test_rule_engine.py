@@ -0,0 +1,183 @@
+"""
+Unit tests for the forward-chaining rule engine and the HVDC rule set
+"""
+
+import copy
+import random
+import time
+
+import pytest
+
+nx = pytest.importorskip("networkx")
+
+from src.graph.rule_engine import Rule, RuleEngine
+from src.graph.unified_network import HVDC_RULES, add_inference_rules
+
+
+def hvdc_network(n_vessels=120, n_persons=80, n_ops=150, seed=0, mosb_share=0.4):
+    """Ports/hub/sites plus vessels, persons and operations wired at random"""
+    rng = random.Random(seed)
+    G = nx.Graph()
+    for node, node_type in [("ZAYED_PORT", "port"), ("KHALIFA_PORT", "port"), ("MOSB", "hub"),
+                            ("MIR", "site"), ("SHU", "site"), ("DAS", "site"), ("AGI", "site")]:
+        G.add_node(node, type=node_type)
+    G.add_edge("ZAYED_PORT", "MOSB", rel="feeds_into")
+    for site in ["MIR", "DAS", "AGI"]:
+        G.add_edge("MOSB", site, rel="dispatches")
+    ports = [f"port:{i}" for i in range(5)]
+    G.add_nodes_from(ports, type="port")
+    vessels = [f"vessel:{i}" for i in range(n_vessels)]
+    persons = [f"person:{i}" for i in range(n_persons)]
+    G.add_nodes_from(vessels, type="vessel")
+    G.add_nodes_from(persons, type="person")
+    for v in vessels:
+        if rng.random() < mosb_share:
+            G.add_edge(v, "MOSB", rel="operates_from")
+        if rng.random() < 0.3:
+            G.add_edge(v, rng.choice(ports), rel="calls_at")
+        if rng.random() < 0.1:
+            G.add_edge(v, rng.choice(["MIR", "SHU"]), rel="delivers_to")
+    for p in persons:
+        for v in rng.sample(vessels, k=rng.randint(0, 3)):
+            G.add_edge(p, v, rel="operates")
+    for i in range(n_ops):
+        G.add_node(f"op:{i}", type="operation")
+        for p in rng.sample(persons, k=rng.randint(0, 2)):
+            G.add_edge(f"op:{i}", p, rel="performed")
+    return G
+
+
+def canonical(G):
+    edges = {
+        frozenset((u, v)): (d.get("rel"), d.get("weight"), d.get("inferred"))
+        for u, v, d in G.edges(data=True)
+    }
+    return edges, dict(G.nodes(data=True))
+
+
+def assert_locations_shared(G):
+    for u, v, d in G.edges(data=True):
+        if d.get("rel") == "co_located_with":
+            assert G.has_edge(u, d["location"]) and G.has_edge(v, d["location"])
+
+
+class TestHvdcRules:
+    @pytest.mark.parametrize("seed", range(4))
+    def test_run_matches_add_inference_rules(self, seed):
+        expected = hvdc_network(seed=seed)
+        actual = copy.deepcopy(expected)
+        add_inference_rules(expected)
+
+        stats = RuleEngine(actual, HVDC_RULES).run()
+
+        assert canonical(actual) == canonical(expected)
+        assert_locations_shared(actual)
+        inferred = [d["rel"] for _, _, d in actual.edges(data=True) if d.get("inferred")]
+        for name in ("indirectly_serves", "flows_through", "co_located_with"):
+            assert stats[name].fired == inferred.count(name)
+        critical = [n for n, d in actual.nodes(data=True) if d.get("criticality") == "HIGH"]
+        assert stats["critical_path"].fired == len(critical)
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_incremental_matches_full_run(self, seed):
+        full = hvdc_network(seed=seed)
+        edges = list(full.edges(data=True))
+        random.Random(seed).shuffle(edges)
+        held_back = edges[: len(edges) // 4]
+        G = copy.deepcopy(full)
+        G.remove_edges_from([(u, v) for u, v, _ in held_back])
+        add_inference_rules(full)
+
+        engine = RuleEngine(G, HVDC_RULES)
+        engine.run()
+        for start in range(0, len(held_back), 5):
+            engine.add_edges(held_back[start:start + 5])
+
+        assert canonical(G) == canonical(full)
+        assert_locations_shared(G)
+
+    def test_add_edges_with_new_nodes(self):
+        G = hvdc_network(seed=1)
+        engine = RuleEngine(G, HVDC_RULES)
+        engine.run()
+
+        stats = engine.add_edges(
+            [("vessel:new", "MOSB", {"rel": "operates_from"})],
+            nodes=[("vessel:new", {"type": "vessel"})],
+        )
+
+        assert G.edges["vessel:new", "MIR"]["rel"] == "indirectly_serves"
+        assert G.edges["vessel:new", "ZAYED_PORT"]["rel"] == "flows_through"
+        assert stats["indirectly_serves"].fired == 3  # MIR, DAS, AGI
+        assert stats["flows_through"].fired == 1
+        assert stats["co_located_with"].fired > 0
+        assert engine.add_edges([("vessel:new", "MOSB")])["co_located_with"].matches == 0
+
+
+class TestRuleEngine:
+    def test_transitive_closure_to_fixpoint(self):
+        G = nx.path_graph(6)
+        rule = Rule(
+            name="two_hop",
+            bodies=((("edge", "?a", "?b"), ("edge", "?b", "?c"), ("lt", "?a", "?c")),),
+            head=("edge", "?a", "?c"),
+        )
+
+        engine = RuleEngine(G, [rule])
+        engine.run()
+
+        assert G.number_of_edges() == 15  # complete graph
+        assert engine.rounds == 4  # hops 2, 3-4, 5, then nothing new
+
+    def test_rel_constraint_and_threshold(self):
+        G = nx.Graph()
+        G.add_node("hub", type="hub")
+        for i in range(4):
+            G.add_node(f"v{i}", type="vessel")
+            G.add_edge(f"v{i}", "hub", rel="operates_from" if i < 3 else "visits")
+        rule = Rule(
+            name="busy_hub",
+            bodies=((("edge", "?h", "?v", "operates_from"),),),
+            head=("node", "?h"),
+            types={"?h": ("hub",)},
+            attrs={"busy": True},
+            threshold=3,
+            count_attr="vessels",
+        )
+        engine = RuleEngine(G, [rule])
+
+        assert engine.run()["busy_hub"].fired == 1
+        assert G.nodes["hub"] == {"type": "hub", "busy": True, "vessels": 3}
+
+    def test_invalid_rules(self):
+        unbound = Rule(name="bad", bodies=((("edge", "?a", "?b"), ("lt", "?a", "?c")),), head=("edge", "?a", "?b"))
+        with pytest.raises(ValueError):
+            RuleEngine(nx.Graph(), [unbound])
+        with pytest.raises(ValueError):
+            RuleEngine(nx.Graph(), list(HVDC_RULES) + [HVDC_RULES[0]])
+
+    @pytest.mark.benchmark
+    def test_performance_incremental_update(self):
+        """Benchmark: semi-naive add_edges vs re-running inference on the whole graph"""
+        G = hvdc_network(6000, 4000, 12000, seed=2, mosb_share=0.02)
+        engine = RuleEngine(G, HVDC_RULES)
+        engine.run()
+        rng = random.Random(0)
+        persons = [f"person:{i}" for i in range(4000)]
+        new_edges = [
+            (f"op:new{i}", rng.choice(persons), {"rel": "performed"}) for i in range(200)
+        ]
+        new_nodes = [(f"op:new{i}", {"type": "operation"}) for i in range(200)]
+
+        start = time.perf_counter()
+        engine.add_edges(new_edges, nodes=new_nodes)
+        incremental = time.perf_counter() - start
+
+        rerun = copy.deepcopy(G)
+        start = time.perf_counter()
+        add_inference_rules(rerun)
+        full = time.perf_counter() - start
+
+        assert incremental * 10 < full, (
+            f"incremental {incremental * 1000:.1f}ms vs full re-run {full * 1000:.1f}ms"
+        )
@@ -0,0 +1,164 @@
+"""
+Unit tests for the ontology schema index (OntologyLoader / reasoning engine lookups)
+"""
+
+import time
+from pathlib import Path
+
+import pytest
+from rdflib import Graph, Namespace, OWL, RDF, RDFS, URIRef
+from rdflib.namespace import XSD
+
+from src.ontology import schema_index
+from src.ontology.ontology_loader import OntologyLoader
+from src.ontology.schema_index import load_schema_index
+from src.reasoning.engine import DEFAULT_ONTOLOGY_FILES, Materializer, Schema, load_ontology
+
+HVDC = Namespace("https://hvdc-project.com/ontology#")
+EX = Namespace("http://example.org/o#")
+DATA = Namespace("http://example.org/data/")
+
+ONTOLOGY_FILE = Path(__file__).parent.parent.parent / "configs" / "ontology" / "hvdc_ontology.ttl"
+
+CHAIN_ONTOLOGY = """
+@prefix e: <http://example.org/o#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+e:A a owl:Class . e:B a owl:Class ; rdfs:subClassOf e:A . e:C a owl:Class ; rdfs:subClassOf e:B .
+e:D rdfs:subClassOf e:C , [ a owl:Restriction ] .
+e:partOf a owl:ObjectProperty , owl:TransitiveProperty ; owl:inverseOf e:hasPart ; rdfs:domain e:B .
+"""
+
+
+@pytest.fixture
+def chain_file(tmp_path):
+    path = tmp_path / "chain.ttl"
+    path.write_text(CHAIN_ONTOLOGY, encoding="utf-8")
+    return path
+
+
+@pytest.fixture(autouse=True)
+def fresh_memory():
+    schema_index._MEMORY.clear()
+    yield
+    schema_index._MEMORY.clear()
+
+
+class TestSchemaIndex:
+    def test_closures(self, chain_file, tmp_path):
+        index = load_schema_index(chain_file, cache_dir=tmp_path / "cache")
+
+        assert index.ancestors(EX.D) >= {EX.C, EX.B, EX.A}
+        assert index.descendants[EX.A] == {EX.B, EX.C, EX.D}
+        assert index.is_subclass(EX.D, EX.A) and index.is_subclass(EX.A, EX.A)
+        assert not index.is_subclass(EX.A, EX.D)
+        assert index.domains_of(EX.partOf) == [EX.B]
+        assert index.transitive == [EX.partOf]
+
+    def test_persisted_with_ontology_hash(self, chain_file, tmp_path, monkeypatch):
+        cache_dir = tmp_path / "cache"
+        built = load_schema_index(chain_file, cache_dir=cache_dir)
+        assert (cache_dir / f"{built.source_sha256}.json").exists()
+
+        schema_index._MEMORY.clear()
+        monkeypatch.setattr(Graph, "parse", lambda *a, **k: pytest.fail("ontology re-parsed"))
+        loaded = load_schema_index(chain_file, cache_dir=cache_dir)
+        monkeypatch.undo()
+
+        assert loaded is not built
+        assert loaded.to_dict() == built.to_dict()
+        assert loaded.superclasses == built.superclasses
+        assert any(not isinstance(d, URIRef) for d in loaded.subclass_of[EX.D])  # BNode kept
+
+        chain_file.write_text(CHAIN_ONTOLOGY + "e:E rdfs:subClassOf e:D .\n", encoding="utf-8")
+        changed = load_schema_index(chain_file, cache_dir=cache_dir)
+        assert changed.source_sha256 != built.source_sha256
+        assert changed.is_subclass(EX.E, EX.A)
+
+    def test_datatype_of(self, tmp_path):
+        index = load_schema_index(ONTOLOGY_FILE, cache_dir=tmp_path)
+
+        assert index.datatype_of(HVDC.weight) == XSD.decimal
+        assert index.datatype_of(HVDC.storedAt, "none") == "none"
+
+
+class TestOntologyLoader:
+    def test_matches_graph_scans(self, tmp_path):
+        loader = OntologyLoader(ONTOLOGY_FILE, cache_dir=tmp_path)
+        g = loader.load()
+
+        assert sorted(loader.extract_classes()) == sorted(str(c) for c in g.subjects(RDF.type, OWL.Class))
+        assert sorted(loader.extract_object_properties()) == sorted(
+            str(p) for p in g.subjects(RDF.type, OWL.ObjectProperty)
+        )
+        hierarchy = {}
+        for child, parent in g.subject_objects(RDFS.subClassOf):
+            hierarchy.setdefault(str(parent), []).append(str(child))
+        assert {k: sorted(v) for k, v in loader.get_class_hierarchy().items()} == {
+            k: sorted(v) for k, v in hierarchy.items()
+        }
+        for prop in g.subjects(RDF.type, OWL.DatatypeProperty):
+            assert loader.get_property_domains(str(prop)) == [str(d) for d in g.objects(prop, RDFS.domain)]
+            assert loader.get_property_ranges(str(prop)) == [str(r) for r in g.objects(prop, RDFS.range)]
+
+        info = loader.get_ontology_info()
+        assert info["triples"] == len(g)
+        assert info["classes"] == len(loader.extract_classes())
+        assert "version" in info
+
+    def test_schema_without_load(self):
+        loader = OntologyLoader(ONTOLOGY_FILE)
+        loader.graph.add((EX.B, RDFS.subClassOf, EX.A))
+
+        assert loader.get_class_hierarchy() == {str(EX.A): [str(EX.B)]}
+
+
+class TestReasoningSchema:
+    def test_index_and_graph_schemas_agree(self, tmp_path):
+        index = load_schema_index(DEFAULT_ONTOLOGY_FILES, cache_dir=tmp_path)
+        graph = load_ontology()
+
+        for profile in ("rdfs", "owlrl"):
+            a, b = Schema(index, profile), Schema(graph, profile)
+            assert a.superclasses == b.superclasses
+            assert a.superproperties == b.superproperties
+            assert (a.domains, a.ranges) == (b.domains, b.ranges)
+
+    def test_materializer_default_uses_index(self):
+        g = Graph()
+        g.add((DATA.cargo, HVDC.storedAt, DATA.wh))
+
+        Materializer(g, profile="rdfs").run()
+
+        assert (DATA.cargo, RDF.type, HVDC.Project) in g
+        assert (DATA.wh, RDF.type, HVDC.Warehouse) in g
+
+
+@pytest.mark.benchmark
+def test_performance_cached_schema_lookups(tmp_path):
+    """Benchmark: index lookups vs per-call graph scans (get_property_domains / hierarchy)"""
+    loader = OntologyLoader(ONTOLOGY_FILE, cache_dir=tmp_path)
+    g = loader.load()
+    props = [str(p) for p in g.subjects(RDF.type, OWL.ObjectProperty)]
+    props += [str(p) for p in g.subjects(RDF.type, OWL.DatatypeProperty)]
+
+    start = time.perf_counter()
+    for _ in range(200):
+        for prop in props:
+            [str(o) for o in g.objects(URIRef(prop), RDFS.domain)]
+            [str(o) for o in g.objects(URIRef(prop), RDFS.range)]
+        [str(s) for s in g.subjects(RDF.type, OWL.Class)]
+    scans = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(200):
+        for prop in props:
+            loader.get_property_domains(prop)
+            loader.get_property_ranges(prop)
+        loader.extract_classes()
+    lookups = time.perf_counter() - start
+
+    assert lookups * 5 < scans, (
+        f"index lookups {lookups * 1000:.1f}ms vs graph scans {scans * 1000:.1f}ms"
+    )
@@ -5,6 +5,8 @@ Unit tests for SchemaValidator class
 Tests document validation, confidence thresholds, and HVDC pattern matching
 """
 
+import numpy as np
+import pandas as pd
 import pytest
 from datetime import datetime
 from unittest.mock import patch
@@ -442,6 +444,90 @@ class TestSchemaValidator:
         assert results["valid"] == 100
 
 
+class TestParallelBatchValidation:
+    """Test precompiled patterns and process-pool batch validation"""
+
+    @staticmethod
+    def _synthetic_documents(n):
+        meta = {"source": "bench", "timestamp": "2024-01-01T00:00:00Z", "version": "1.0"}
+        blocks = [{"type": "text", "content": "x"}]
+        docs = []
+        for i in range(n):
+            kind = i % 4
+            if kind == 0:
+                doc = {
+                    "type": "BOE",
+                    "mbl_no": f"ABCD{i:010d}",
+                    "entry_no": f"ENT{i}",
+                    "containers": f"ABCD{i % 10**7:07d}",
+                    "gross_weight": 1000.0,
+                    "hs_code": "12345" if i % 40 == 0 else "1234567890",
+                }
+            elif kind == 1:
+                doc = {
+                    "type": "DO",
+                    "do_number": f"DO{i:08d}",
+                    "do_validity_date": "2024-12-31",
+                    "container_no": f"ABCD{i % 10**7:07d}",
+                }
+            elif kind == 2:
+                doc = {"type": "DN", "origin": "MOSB", "destination": "DAS", "delivery_date": ""}
+            else:
+                doc = {
+                    "type": "CarrierInvoice",
+                    "invoice_number": f"INV-{i}",
+                    "total_amount": {"value": 10.0, "confidence": 0.5 if i % 3 else 0.99},
+                    "currency": "USD",
+                }
+            doc.update(meta=meta, blocks=blocks)
+            docs.append(doc)
+        return docs
+
+    def test_patterns_compiled(self):
+        """Patterns are compiled once and follow edits to hvdc_patterns"""
+        validator = SchemaValidator()
+        assert set(validator._compiled_patterns) == set(validator.hvdc_patterns.values())
+
+        validator.hvdc_patterns["entry_no"] = r"^ENT\d{3}$"
+        errors = validator._validate_hvdc_patterns({"entry_no": "ENT1"}, "BOE")
+        assert len(errors) == 1
+
+    def test_parallel_matches_serial(self):
+        """Merged parallel summary equals serial summary"""
+        validator = SchemaValidator()
+        docs = self._synthetic_documents(2_000)
+
+        serial = validator.validate_batch(docs)
+        parallel = validator.validate_batch(docs, workers=2, chunk_size=300)
+
+        assert parallel == serial
+        assert serial["invalid"] > 0
+        assert set(serial["errors_by_type"]) == {"BOE", "DN", "CarrierInvoice"}
+
+    @pytest.mark.benchmark
+    def test_performance_100k_documents(self):
+        """Benchmark: 100k BOE/DO/DN/invoice documents, serial vs process pool"""
+        import time
+
+        validator = SchemaValidator()
+        docs = self._synthetic_documents(100_000)
+
+        start = time.perf_counter()
+        serial = validator.validate_batch(docs)
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel = validator.validate_batch(docs, workers=0)
+        parallel_time = time.perf_counter() - start
+
+        assert parallel == serial
+        assert serial["total"] == 100_000
+        assert parallel_time < serial_time * 2, (
+            f"100k documents: serial {100_000 / serial_time:,.0f} docs/s, "
+            f"parallel {100_000 / parallel_time:,.0f} docs/s"
+        )
+
+
 class TestPydanticValidationFunctions:
     """Test cases for Pydantic model validation functions"""
 
@@ -565,3 +651,118 @@ class TestPydanticValidationFunctions:
         is_valid, errors = validate_dead_stock([])
         assert is_valid == True
         assert len(errors) == 0
+
+
+class TestDataFrameValidationMode:
+    """Test column-wise DataFrame validation with Pydantic fallback"""
+
+    def _events(self):
+        return pd.DataFrame(
+            {
+                "event_id": ["EVT001", "EVT002", "EVT003", "EVT004"],
+                "shipment_id": ["SHIP001", "SHIP002", None, "SHIP004"],
+                "event_type": ["LOAD", "UNLOAD", "ARRIVE", "TELEPORT"],
+                "occurred_at": [
+                    "2024-01-01T00:00:00Z",
+                    "2024-01-02 08:30:00",
+                    "2024-01-03",
+                    "not-a-date",
+                ],
+                "location": ["Dubai Port", "Abu Dhabi Port", "MOSB", "DAS"],
+            }
+        )
+
+    def test_frame_matches_record_mode(self):
+        """DataFrame mode returns the same row-indexed errors as record mode"""
+        df = self._events()
+
+        frame_ok, frame_errors = validate_transport_events(df)
+        record_ok, record_errors = validate_transport_events(df.to_dict(orient="records"))
+
+        assert frame_ok is False
+        assert frame_errors == record_errors
+        assert [e.split(":")[0] for e in frame_errors] == ["row=2", "row=3"]
+
+    def test_frame_valid(self):
+        """Valid DataFrame passes without Pydantic fallback"""
+        df = self._events().iloc[:2]
+        is_valid, errors = validate_transport_events(df)
+
+        assert is_valid is True
+        assert errors == []
+
+    def test_frame_extra_column(self):
+        """Extra columns fail every row like extra='forbid'"""
+        df = self._events().iloc[:2].assign(unexpected=1)
+        is_valid, errors = validate_transport_events(df)
+
+        assert is_valid is False
+        assert len(errors) == 2
+
+    def test_non_negative_quantities(self):
+        """Negative quantities are reported when requested"""
+        df = pd.DataFrame(
+            {
+                "deadstock_id": ["DS001", "DS002", "DS003"],
+                "sku_id": ["SKU001", "SKU002", "SKU003"],
+                "location_id": ["LOC001", "LOC002", "LOC003"],
+                "quantity": [50, -5, 10],
+                "days_stagnant": [90, 120, -1],
+            }
+        )
+
+        assert validate_dead_stock(df) == (True, [])
+        is_valid, errors = validate_dead_stock(df, non_negative=True)
+        assert is_valid is False
+        assert errors == [
+            "row=1: field 'quantity' must be non-negative, got -5",
+            "row=2: field 'days_stagnant' must be non-negative, got -1",
+        ]
+        assert validate_dead_stock(df.to_dict(orient="records"), non_negative=True) == (
+            False,
+            errors,
+        )
+
+    def test_stock_snapshot_frame(self):
+        """Stock snapshots with datetime64 and integer columns"""
+        df = pd.DataFrame(
+            {
+                "snapshot_id": ["S1", "S2"],
+                "sku_id": ["SKU001", "SKU002"],
+                "location_id": ["LOC001", "LOC002"],
+                "on_hand": [100.0, 2.5],
+                "at": pd.to_datetime(["2024-01-01", "2024-01-02"]),
+            }
+        )
+        is_valid, errors = validate_stock_snapshots(df)
+
+        assert is_valid is False
+        assert len(errors) == 1 and errors[0].startswith("row=1:")
+
+    @pytest.mark.benchmark
+    def test_performance_frame_validation(self):
+        """Benchmark: 1M transport events validated column-wise"""
+        import time
+
+        n = 1_000_000
+        rng = np.random.default_rng(0)
+        ids = np.arange(n).astype(str)
+        days = pd.date_range("2024-01-01", periods=365, freq="D").strftime("%Y-%m-%dT%H:%M:%SZ")
+        df = pd.DataFrame(
+            {
+                "event_id": ids,
+                "shipment_id": ids,
+                "event_type": rng.choice(["LOAD", "UNLOAD", "DEPART", "ARRIVE"], n),
+                "occurred_at": days[rng.integers(0, 365, n)],
+                "location": rng.choice(["MOSB", "DAS", "AGI"], n),
+            }
+        )
+        df.loc[[10, 500_000], "event_type"] = "BOGUS"
+
+        start = time.perf_counter()
+        is_valid, errors = validate_transport_events(df)
+        elapsed = time.perf_counter() - start
+
+        assert is_valid is False
+        assert [e.split(":")[0] for e in errors] == ["row=10", "row=500000"]
+        assert elapsed < 15.0
@@ -0,0 +1,192 @@
+"""
+Unit tests for the cached-shapes SHACL validation service (delta validation)
+"""
+
+import random
+import time
+
+import pytest
+from rdflib import Graph, Literal, Namespace, RDF, RDFS
+
+pyshacl = pytest.importorskip("pyshacl")
+
+from src.ontology.validator import OntologyValidator
+from src.validation.shacl_runner import run_shacl
+from src.validation.shacl_service import ShaclValidationService, load_shapes
+
+FLOW = Namespace("https://hvdc.example.org/flow#")
+DATA = Namespace("http://example.org/data/")
+
+NESTED_SHAPES = """
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+@prefix e: <http://example.org/o#> .
+
+e:CargoShape a sh:NodeShape ;
+    sh:targetClass e:Cargo ;
+    sh:property [ sh:path e:storedAt ; sh:minCount 1 ; sh:class e:Warehouse ] ;
+    sh:property [ sh:path ( e:storedAt e:operatedBy ) ; sh:minCount 1 ] .
+"""
+EX = Namespace("http://example.org/o#")
+
+
+def flow_triples(i, rng, error_rate=0.1):
+    """Triples of one LogisticsFlow (FlowCode.shape.ttl), some inconsistent"""
+    flow = DATA[f"flow{i}"]
+    wh = rng.randrange(3)
+    offshore = rng.random() < 0.3
+    pre = rng.random() < 0.1
+    code = 0 if pre else min(1 + wh + int(offshore), 4)
+    if rng.random() < error_rate:
+        code = (code + 1) % 6
+    return [
+        (flow, RDF.type, FLOW.ContainerFlow if i % 2 else FLOW.BulkFlow),
+        (flow, FLOW.hasFlowCode, Literal(code)),
+        (flow, FLOW.hasWHHandling, Literal(wh)),
+        (flow, FLOW.hasOffshoreFlag, Literal(offshore)),
+        (flow, FLOW.isPreArrival, Literal(pre)),
+    ]
+
+
+def flow_graph(n, seed=0, error_rate=0.1):
+    rng = random.Random(seed)
+    g = Graph()
+    g.add((FLOW.ContainerFlow, RDFS.subClassOf, FLOW.LogisticsFlow))
+    g.add((FLOW.BulkFlow, RDFS.subClassOf, FLOW.LogisticsFlow))
+    for i in range(n):
+        for triple in flow_triples(i, rng, error_rate):
+            g.add(triple)
+    return g
+
+
+def reference_results(g, shapes):
+    """(focus node, message) pairs from plain pyshacl inference='rdfs'"""
+    conforms, report, _ = pyshacl.validate(g, shacl_graph=shapes.graph, inference="rdfs")
+    SH = Namespace("http://www.w3.org/ns/shacl#")
+    pairs = sorted((str(report.value(r, SH.focusNode)), str(report.value(r, SH.resultMessage)))
+                   for r in report.subjects(RDF.type, SH.ValidationResult))
+    return conforms, pairs
+
+
+def service_results(report):
+    return report.conforms, sorted((str(r.focus_node), r.message) for r in report.results)
+
+
+class TestValidate:
+    @pytest.mark.parametrize("seed", range(3))
+    def test_matches_pyshacl(self, seed):
+        shapes = load_shapes()
+        g = flow_graph(60, seed)
+
+        report = ShaclValidationService(g, shapes, allow_warnings=False).validate()
+
+        assert service_results(report) == reference_results(flow_graph(60, seed), shapes)
+        assert not report.conforms
+        assert report.validated > 0
+
+    def test_shapes_are_cached(self):
+        assert load_shapes() is load_shapes()
+        assert load_shapes(data=NESTED_SHAPES) is load_shapes(data=NESTED_SHAPES)
+
+    def test_per_shape_stats(self):
+        service = ShaclValidationService(flow_graph(30), load_shapes())
+        service.validate()
+
+        assert {str(s).rsplit("#", 1)[-1] for s in service.stats} >= {
+            "FlowCodeRangeShape", "FlowCodeConsistencyShape", "PreArrivalShape"
+        }
+        assert all(stats.seconds > 0 for stats in service.stats.values() if stats.focus_nodes)
+        assert sum(s.results for s in service.stats.values()) == len(service.report().results)
+
+    def test_parallel_partitions_match_serial(self):
+        shapes = load_shapes()
+        serial = ShaclValidationService(flow_graph(80, 1), shapes).validate()
+        parallel = ShaclValidationService(flow_graph(80, 1), shapes, workers=2).validate()
+
+        assert service_results(parallel) == service_results(serial)
+
+    def test_ontology_validator_and_runner(self):
+        g = flow_graph(20, 2, error_rate=0.0)
+        conforms, text = OntologyValidator().validate(g)
+        assert conforms and text.startswith("Validation Report\nConforms: True")
+
+        bad = flow_graph(20, 2, error_rate=1.0)
+        ttl = bad.serialize(format="turtle")
+        shapes_ttl = load_shapes().graph.serialize(format="turtle")
+        assert run_shacl(ttl, shapes_ttl)[0] is False
+
+
+class TestDeltaValidation:
+    @pytest.mark.parametrize("seed", range(3))
+    def test_incremental_matches_full_validation(self, seed):
+        shapes = load_shapes()
+        full = flow_graph(60, seed)
+        triples = [t for t in full if t[1] != RDFS.subClassOf]
+        random.Random(seed).shuffle(triples)
+
+        g = Graph()
+        for triple in full.triples((None, RDFS.subClassOf, None)):
+            g.add(triple)
+        for triple in triples[len(triples) // 3:]:
+            g.add(triple)
+        service = ShaclValidationService(g, shapes)
+        service.validate()
+        for start in range(0, len(triples) // 3, 7):
+            report = service.add_triples(triples[start:start + 7])
+
+        expected = ShaclValidationService(full, shapes).validate()
+        assert service_results(report) == service_results(expected)
+
+    def test_only_touched_focus_nodes_are_validated(self):
+        service = ShaclValidationService(flow_graph(100, error_rate=0.0), load_shapes())
+        assert service.validate().conforms
+
+        flow = DATA.flow5
+        report = service.add_triples([(flow, FLOW.hasFlowCode, Literal(9))])
+
+        assert not report.conforms
+        assert {r.focus_node for r in report.results} == {flow}
+        assert report.validated == 4  # LogisticsFlow shapes + ContainerFlowShape
+
+    def test_path_reach(self):
+        shapes = load_shapes(data=NESTED_SHAPES)
+        g = Graph()
+        for i in range(5):
+            g.add((DATA[f"c{i}"], RDF.type, EX.Cargo))
+            g.add((DATA[f"c{i}"], EX.storedAt, DATA.wh))
+        service = ShaclValidationService(g, shapes)
+        assert len(service.validate().results) == 10  # no operator, no Warehouse type
+
+        report = service.add_triples([
+            (DATA.wh, EX.operatedBy, DATA.op),
+            (DATA.wh, RDF.type, EX.Warehouse),
+        ])
+
+        assert shapes.reach[EX.CargoShape] == 1  # wh triples, one hop from the cargo
+        assert report.validated == 5
+        assert report.conforms
+
+
+@pytest.mark.benchmark
+def test_performance_delta_validation():
+    """Benchmark: delta validation of 10 new flows vs pyshacl rdfs over the whole graph"""
+    shapes = load_shapes()
+    g = flow_graph(400, seed=3, error_rate=0.01)
+    service = ShaclValidationService(g, shapes)
+    service.validate()
+    rng = random.Random(7)
+    new = [t for i in range(400, 410) for t in flow_triples(i, rng, 0.01)]
+
+    start = time.perf_counter()
+    report = service.add_triples(new)
+    delta = time.perf_counter() - start
+
+    reference = flow_graph(400, seed=3, error_rate=0.01)
+    for triple in new:
+        reference.add(triple)
+    start = time.perf_counter()
+    conforms, _, _ = pyshacl.validate(reference, shacl_graph=shapes.graph, inference="rdfs",
+                                      allow_warnings=True, allow_infos=True)
+    full = time.perf_counter() - start
+
+    assert report.conforms == conforms
+    assert delta * 20 < full, f"delta {delta * 1000:.1f}ms vs pyshacl full {full:.2f}s"
@@ -0,0 +1,198 @@
+"""
+Unit tests for SiteNormalizer (alias file, memo, fuzzy fallback, normalize_series)
+"""
+
+import random
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.integration.site_normalizer import SITE_CODES, SiteNormalizer, alias_key, edit_distance
+
+# spellings accepted by the hardcoded v1.0 tables
+LEGACY = {
+    "site": {
+        "AGI": "Al Ghallan Island", "AL GHALLAN": "Al Ghallan Island", "AL_GHALLAN": "Al Ghallan Island",
+        "ALGHALLAN": "Al Ghallan Island", "DAS": "Das Island", "DAS ISLAND": "Das Island",
+        "DAS_ISLAND": "Das Island", "DASISLAND": "Das Island", "MIR": "Mirfa Site", "MIRFA": "Mirfa Site",
+        "MIRFA SITE": "Mirfa Site", "MIRFA_SITE": "Mirfa Site", "SHU": "Shuweihat Site",
+        "SHUWEIHAT": "Shuweihat Site", "SHUWEIHAT SITE": "Shuweihat Site", "SHUWEIHAT_SITE": "Shuweihat Site",
+    },
+    "warehouse": {
+        "DSV": "DSV Indoor Warehouse", "DSV INDOOR": "DSV Indoor Warehouse",
+        "DSV_INDOOR": "DSV Indoor Warehouse", "DSVINDOOR": "DSV Indoor Warehouse",
+        "MOSB": "Mussafah Offshore Supply Base", "MUSSAFAH": "Mussafah Offshore Supply Base",
+        "MUSSAFAH OFFSHORE": "Mussafah Offshore Supply Base",
+        "MUSSAFAH_OFFSHORE": "Mussafah Offshore Supply Base",
+    },
+    "port": {
+        "ZAYED": "Zayed Port", "ZAYED PORT": "Zayed Port", "ZAYED_PORT": "Zayed Port",
+        "PORT ZAYED": "Zayed Port", "AEZYD": "Zayed Port", "KHALIFA": "Khalifa Port",
+        "KHALIFA PORT": "Khalifa Port", "KHALIFA_PORT": "Khalifa Port", "PORT KHALIFA": "Khalifa Port",
+        "AEKHL": "Khalifa Port", "JEBEL ALI": "Jebel Ali Port", "JEBEL_ALI": "Jebel Ali Port",
+        "JEBEL ALI PORT": "Jebel Ali Port", "JEBEL_ALI_PORT": "Jebel Ali Port",
+        "PORT JEBEL ALI": "Jebel Ali Port", "AEJEA": "Jebel Ali Port",
+    },
+}
+
+ALIAS_FILE = """
+sites:
+  - code: RUW
+    name: Ruwais Site
+    aliases: [RUWAIS]
+ports:
+  - code: MUSSAFAH_PORT
+    name: Mussafah Port
+    aliases: [PORT MUSSAFAH]
+"""
+
+
+def legacy_normalize(value, table):
+    """v1.0 lookup: upper / strip / '-' → '_' and exact dict match"""
+    if not value:
+        return None
+    return table.get(value.upper().strip().replace("-", "_"))
+
+
+@pytest.fixture
+def normalizer():
+    return SiteNormalizer()
+
+
+class TestAliases:
+    @pytest.mark.parametrize("kind", ["site", "warehouse", "port"])
+    def test_legacy_spellings(self, normalizer, kind):
+        for spelling, name in LEGACY[kind].items():
+            assert normalizer.normalize(spelling, kind) == name
+            assert normalizer.normalize(spelling.lower().replace("_", "-"), kind) == name
+
+    def test_separator_variants(self, normalizer):
+        assert alias_key("  dsv - indoor ") == "DSV_INDOOR"
+        assert normalizer.normalize_wh("Dsv  Indoor") == "DSV Indoor Warehouse"
+        assert normalizer.normalize_port("port_jebel-ali") == "Jebel Ali Port"
+
+    def test_codes_and_reverse(self, normalizer):
+        assert normalizer.normalize_code("Mirfa Site", "site") == "MIR"
+        assert normalizer.normalize_code("jebel ali") == "JEBEL_ALI_PORT"
+        assert normalizer.normalize_code("mussafah") == "MOSB"
+        assert normalizer.normalize_code("unknown") is None
+        assert normalizer.get_all_sites() == {
+            "Al Ghallan Island": "AGI", "Das Island": "DAS", "Mirfa Site": "MIR", "Shuweihat Site": "SHU",
+        }
+        assert normalizer.is_offshore_site("das island") and normalizer.is_onshore_site("SHU")
+
+    def test_non_strings(self, normalizer):
+        assert normalizer.normalize_site(None) is None
+        assert normalizer.normalize_site("") is None
+        assert normalizer.normalize_site(float("nan")) is None
+        assert normalizer.normalize_site(["AGI"]) is None
+
+    def test_alias_file(self, tmp_path):
+        path = tmp_path / "aliases.yaml"
+        path.write_text(ALIAS_FILE, encoding="utf-8")
+
+        custom = SiteNormalizer(alias_file=path)
+
+        assert custom.normalize_code("ruwais") == "RUW"
+        assert custom.normalize_port("Port Mussafah") == "Mussafah Port"
+        assert custom.normalize_site("AGI") is None
+        assert custom.normalize_wh("DSV") is None
+        assert "AL_GHALLAN" in SITE_CODES  # module tables keep the default file
+
+
+class TestMemo:
+    def test_cached_per_kind(self, normalizer):
+        normalizer.normalize("AGI", "site")
+        normalizer.normalize("AGI", "port")
+
+        assert normalizer._memo["site"] == {"AGI": "Al Ghallan Island"}
+        assert normalizer._memo["port"] == {"AGI": None}
+
+    def test_bounded(self):
+        small = SiteNormalizer(memo_size=3)
+        for value in ["AGI", "DAS", "MIR", "SHU", "XYZ"]:
+            small.normalize_site(value)
+
+        assert len(small._memo["site"]) <= 3
+        assert small.normalize_site("AGI") == "Al Ghallan Island"
+
+
+class TestFuzzy:
+    @pytest.mark.parametrize("value,kind,code", [
+        ("SHUWEIHT", "site", "SHU"),
+        ("Shuweihat Ste", "site", "SHU"),
+        ("Mussafa", "warehouse", "MOSB"),
+        ("DSV INDOR", "warehouse", "DSV"),
+        ("Khalifa Prt", "port", "KHALIFA_PORT"),
+        ("JEBEL ALLI", "port", "JEBEL_ALI_PORT"),
+    ])
+    def test_matches(self, value, kind, code):
+        assert SiteNormalizer().normalize_code(value, kind) is None
+        assert SiteNormalizer(fuzzy=True).normalize_code(value, kind) == code
+
+    @pytest.mark.parametrize("value,kind", [
+        ("DSV OUTDOOR", "warehouse"),
+        ("XYZ", "site"),
+        ("DUBAI PORT", "port"),
+        ("AG", "site"),
+    ])
+    def test_rejections(self, value, kind):
+        assert SiteNormalizer(fuzzy=True).normalize_code(value, kind) is None
+
+    def test_threshold(self):
+        assert SiteNormalizer(fuzzy=True, threshold=0.95).normalize_code("SHUWEIHT", "site") is None
+
+    def test_edit_distance(self):
+        assert edit_distance("KITTEN", "SITTING") == 3
+        assert edit_distance("", "ABC") == 3
+        assert edit_distance("DSV", "DSV") == 0
+
+
+class TestNormalizeSeries:
+    def test_matches_per_value(self, normalizer):
+        values = pd.Series(["agi", "DSV", None, "Das Island", "xyz", np.nan, "agi", 7],
+                           index=range(10, 18), name="SITE")
+
+        names = normalizer.normalize_series(values, "site")
+        codes = normalizer.normalize_series(values, "site", to="code")
+
+        assert names.index.equals(values.index) and names.name == "SITE"
+        assert names.tolist() == [normalizer.normalize_site(v) for v in values]
+        assert codes.tolist() == ["AGI", None, None, "DAS", None, None, "AGI", None]
+
+    def test_iterable_and_bad_target(self, normalizer):
+        assert normalizer.normalize_series(["mosb", "dsv"], "warehouse", to="code").tolist() == ["MOSB", "DSV"]
+        with pytest.raises(ValueError):
+            normalizer.normalize_series(["AGI"], "site", to="iri")
+
+    def test_unique_values_looked_up_once(self, normalizer, monkeypatch):
+        calls = []
+        lookup = normalizer._lookup
+        monkeypatch.setattr(normalizer, "_lookup", lambda code, kind: calls.append(code) or lookup(code, kind))
+
+        normalizer.normalize_series(["AGI", "DAS", "AGI", "AGI", "DAS"] * 100, "site")
+
+        assert sorted(calls) == ["AGI", "DAS"]
+
+
+@pytest.mark.benchmark
+def test_performance_normalize_series_1m():
+    """Benchmark: normalize_series vs v1.0 per-value lookups on 1M values"""
+    rng = random.Random(0)
+    spellings = list(LEGACY["warehouse"]) + ["dsv indoor", "Mosb ", "mussafah-offshore", "DSV OUTDOOR", "N/A"]
+    values = pd.Series([rng.choice(spellings) for _ in range(1_000_000)], dtype=object)
+
+    start = time.perf_counter()
+    reference = [legacy_normalize(v, LEGACY["warehouse"]) for v in values]
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = SiteNormalizer(fuzzy=True).normalize_series(values, "warehouse")
+    ours = time.perf_counter() - start
+
+    assert all(r == o for r, o in zip(reference, result) if r is not None)
+    assert ours * 2 < legacy, (
+        f"normalize_series (1M) {ours * 1000:.1f}ms vs per-value v1.0 lookups {legacy * 1000:.1f}ms"
+    )
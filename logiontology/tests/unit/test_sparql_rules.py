@@ -0,0 +1,177 @@
+"""
+Unit tests for the SPARQL rule runner (one-pass native rules + threaded SPARQL)
+"""
+
+import json
+import random
+import time
+from dataclasses import replace
+
+import pandas as pd
+import pytest
+from rdflib import Graph, Literal, Namespace, RDF
+from rdflib.namespace import XSD
+
+from src.validation.sparql_rules import (
+    CaseEventIndex,
+    load_rules,
+    native_rule,
+    run_rules,
+)
+
+HVDC = Namespace("http://samsung.com/project-logistics#")
+DATA = Namespace("http://samsung.com/project-logistics/data/")
+
+
+def event_graph(n, seed=0):
+    """Cases with flow codes, optional HVDC codes and dated / undated events"""
+    rng = random.Random(seed)
+    g = Graph()
+    for i in range(n):
+        case = DATA[f"Case_{i:05d}"]
+        g.add((case, RDF.type, HVDC.Case))
+        if rng.random() < 0.9:
+            g.add((case, HVDC.hasFlowCode, Literal(str(rng.randrange(5)))))
+        if rng.random() < 0.05:
+            g.add((case, HVDC.hasFlowCode, Literal(rng.randrange(5))))
+        if rng.random() < 0.8:
+            g.add((case, HVDC.hasHvdcCode, Literal(f"HVDC-ADOPT-{i:04d}")))
+        g.add((case, HVDC.hasVendor, Literal(rng.choice(["HE", "SIM", "SAS"]))))
+        for j in range(rng.randrange(3)):
+            link = rng.choice([HVDC.hasInboundEvent, HVDC.hasOutboundEvent])
+            event = DATA[f"Case_{i:05d}_E{j}"]
+            g.add((case, link, event))
+            g.add((event, HVDC.hasLocationAtEvent, Literal(rng.choice(["DSV Indoor", "MOSB", "AGI"]))))
+            g.add((event, HVDC.hasQuantity, Literal(rng.randrange(1, 5))))
+            if rng.random() < 0.85:
+                day = rng.randrange(1, 29)
+                g.add((event, HVDC.hasEventDate, Literal(f"2025-{rng.randrange(9, 11):02d}-{day:02d}",
+                                                         datatype=XSD.date)))
+    return g
+
+
+def rows(result):
+    return sorted(map(tuple, result.rows.map(str).to_numpy().tolist()))
+
+
+@pytest.fixture(scope="module")
+def rules():
+    return load_rules()
+
+
+class TestLoadRules:
+    def test_rule_file_sections(self, rules):
+        assert [r.rule_id for r in rules] == [f"Q{i}" for i in range(1, 11)]
+        assert {r.rule_id for r in rules if r.kind == "check"} == {"Q4", "Q5"}
+        assert rules[0].prefixes["hvdc"] == str(HVDC)
+        assert rules[3].text.startswith("PREFIX hvdc: <http://samsung.com/project-logistics#>")
+
+    def test_native_rules(self, rules):
+        assert {r.rule_id for r in rules if native_rule(r)} == {"Q3", "Q4", "Q5", "Q9"}
+
+    def test_edited_query_runs_as_sparql(self, rules):
+        q4 = rules[3]
+        assert native_rule(replace(q4, query=q4.query.replace('("2", "3")', '("2", "3", "4")'))) is None
+        assert native_rule(replace(q4, prefixes={"hvdc": "http://example.org/other#"})) is None
+
+
+class TestRunRules:
+    @pytest.mark.parametrize("seed", range(3))
+    def test_native_matches_sparql(self, rules, seed):
+        g = event_graph(150, seed)
+
+        native = run_rules(g, rules, workers=1)
+        sparql = run_rules(g, rules, workers=1, native=False)
+
+        for rule in rules:
+            assert list(native.results[rule.rule_id].rows.columns) == list(sparql.results[rule.rule_id].rows.columns)
+            assert rows(native.results[rule.rule_id]) == rows(sparql.results[rule.rule_id]), rule.rule_id
+        assert native.results["Q4"].engine == "native"
+        assert sparql.results["Q4"].engine == "sparql"
+
+    def test_xsd_string_flow_codes(self, rules):
+        # hvdc_status_v35.ttl types flow codes as xsd:string; FILTER IN ("2", "3") skips them
+        g = event_graph(150, 4)
+        for case, code in list(g.subject_objects(HVDC.hasFlowCode)):
+            if code.datatype is None and int(case[-1]) % 2:
+                g.remove((case, HVDC.hasFlowCode, code))
+                g.add((case, HVDC.hasFlowCode, Literal(str(code), datatype=XSD.string)))
+
+        native = run_rules(g, rules, workers=1)
+        sparql = run_rules(g, rules, workers=1, native=False)
+
+        for rule in rules:
+            assert rows(native.results[rule.rule_id]) == rows(sparql.results[rule.rule_id]), rule.rule_id
+        typed = {str(c) for c, v in g.subject_objects(HVDC.hasFlowCode) if v.datatype == XSD.string}
+        assert typed and not typed & {str(row[0]) for row in rows(native.results["Q4"])}
+
+    def test_thread_pool_matches_serial(self, rules):
+        g = event_graph(100, 3)
+
+        serial = run_rules(g, rules, workers=1)
+        threaded = run_rules(g, rules, workers=4)
+
+        assert list(threaded.results) == [r.rule_id for r in rules]
+        for rule_id, result in serial.results.items():
+            assert rows(threaded.results[rule_id]) == rows(result)
+
+    def test_coverage(self):
+        g = event_graph(200, 4)
+        index = CaseEventIndex(g)
+        coverage = index.coverage()
+
+        cases = set(g.subjects(RDF.type, HVDC.Case))
+        inbound = set(g.subjects(HVDC.hasInboundEvent, None))
+        outbound = set(g.subjects(HVDC.hasOutboundEvent, None))
+        assert coverage == {
+            "total_cases": len(cases),
+            "with_inbound": len(inbound),
+            "with_outbound": len(outbound),
+            "with_both": len(inbound & outbound),
+            "with_neither": len(cases - inbound - outbound),
+        }
+
+
+class TestReport:
+    def test_violations_and_timings(self, rules):
+        report = run_rules(event_graph(120, 5), rules)
+
+        violations = report.violations
+        assert set(violations["rule"]) == {"Q4", "Q5"}
+        assert len(violations) == report.results["Q4"].count + report.results["Q5"].count
+        assert set(report.timings) == {"index"} | {r.rule_id for r in rules}
+        assert all(t["seconds"] >= 0 for t in report.timings.values())
+
+    def test_write_json_and_parquet(self, rules, tmp_path):
+        report = run_rules(event_graph(80, 6), rules)
+
+        paths = report.write(tmp_path)
+
+        data = json.loads((tmp_path / "event_validation_report.json").read_text(encoding="utf-8"))
+        assert data["rules"]["Q4"]["engine"] == "native"
+        assert data["rules"]["Q4"]["count"] == len(data["rules"]["Q4"]["rows"])
+        assert data["timings"]["Q1"]["engine"] == "sparql"
+        pytest.importorskip("pyarrow")
+        frame = pd.read_parquet(paths["parquet"])
+        assert len(frame) == len(report.violations)
+
+
+@pytest.mark.benchmark
+def test_performance_one_pass_vs_sequential_sparql(rules):
+    """Benchmark: native one-pass rules vs sequential SPARQL of the same rules (3k cases)"""
+    g = event_graph(3000, seed=7)
+    compiled = [r for r in rules if native_rule(r)]
+
+    start = time.perf_counter()
+    report = run_rules(g, compiled)
+    ours = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for rule in compiled:
+        list(g.query(rule.text))
+    reference = time.perf_counter() - start
+
+    assert report.results["Q4"].count > 0
+    assert ours * 10 < reference, (
+        f"one pass {ours * 1000:.1f}ms vs sequential SPARQL {reference:.2f}s"
+    )
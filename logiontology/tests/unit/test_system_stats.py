@@ -0,0 +1,118 @@
+"""
+Unit tests for single-pass system statistics
+"""
+
+import json
+from collections import Counter
+
+import pytest
+from rdflib import Graph, Literal, Namespace, RDF
+
+from src.analytics.system_stats import collect_system_stats, compute_system_stats
+
+NS = Namespace("http://example.org/lightning/")
+NSI = Namespace("http://example.org/lightning/instance/")
+
+
+def build_graph(n_messages=60):
+    g = Graph()
+    for i in range(6):
+        vessel = NSI[f"vessel{i}"]
+        g.add((vessel, RDF.type, NS.Vessel))
+        g.add((vessel, NS.vesselName, Literal(f"Vessel {i}")))
+    for i in range(4):
+        loc = NSI[f"loc{i}"]
+        g.add((loc, RDF.type, NS.Location))
+        g.add((loc, NS.locationName, Literal(f"Location {i}")))
+    for i in range(5):
+        person = NSI[f"person{i}"]
+        g.add((person, RDF.type, NS.Person))
+        g.add((person, NS.personName, Literal(f"Person {i}")))
+        for v in range(i + 1):
+            g.add((person, NS.worksWithVessel, NSI[f"vessel{v}"]))
+    for i in range(12):
+        op = NSI[f"op{i}"]
+        g.add((op, RDF.type, NS.Operation))
+        g.add((op, NS.operationType, Literal(["LOADING", "BERTHING", "ANCHORAGE"][i % 3])))
+    for i in range(n_messages):
+        msg = NSI[f"msg{i}"]
+        g.add((msg, RDF.type, NS.Message))
+        g.add((msg, NS.mentionsVessel, NSI[f"vessel{i % 6}"]))
+        if i % 2:
+            g.add((msg, NS.mentionsLocation, NSI[f"loc{i % 4}"]))
+        if i % 10 == 0:
+            g.add((NSI[f"img{i}"], RDF.type, NS.Image))
+    return g
+
+
+def lookup_stats(graph, ns):
+    """Reference: per-entity lookups (previous analyze_system_stats logic)"""
+    stats = {"total_triples": len(graph)}
+    for key, cls in [("vessels", ns.Vessel), ("persons", ns.Person), ("locations", ns.Location),
+                     ("operations", ns.Operation), ("messages", ns.Message), ("images", ns.Image)]:
+        stats[key] = len(list(graph.subjects(RDF.type, cls)))
+    ops = Counter(str(graph.value(op, ns.operationType))
+                  for op in graph.subjects(RDF.type, ns.Operation))
+    stats["operation_types"] = dict(ops.most_common(10))
+    persons = Counter({str(graph.value(p, ns.personName)): len(list(graph.objects(p, ns.worksWithVessel)))
+                       for p in graph.subjects(RDF.type, ns.Person)})
+    stats["top_persons"] = dict(persons.most_common(10))
+    vessels = Counter({str(graph.value(v, ns.vesselName)): len(list(graph.subjects(ns.mentionsVessel, v)))
+                       for v in graph.subjects(RDF.type, ns.Vessel)})
+    stats["top_vessels"] = dict(vessels.most_common(10))
+    locations = Counter({str(graph.value(loc, ns.locationName)): len(list(graph.subjects(ns.mentionsLocation, loc)))
+                         for loc in graph.subjects(RDF.type, ns.Location)})
+    stats["top_locations"] = dict(locations.most_common(10))
+    return stats
+
+
+@pytest.fixture
+def ttl_files(tmp_path):
+    abu = tmp_path / "abu.ttl"
+    lightning = tmp_path / "lightning.ttl"
+    build_graph(20).serialize(abu, format="turtle")
+    build_graph(60).serialize(lightning, format="turtle")
+    return abu, lightning
+
+
+class TestCollectSystemStats:
+    def test_matches_per_entity_lookups(self):
+        g = build_graph()
+
+        assert collect_system_stats(g, NS) == lookup_stats(g, NS)
+
+    def test_other_namespace_is_ignored(self):
+        stats = collect_system_stats(build_graph(), Namespace("https://abu-dhabi.example.org/ns#"))
+
+        assert stats["messages"] == 0
+        assert stats["top_vessels"] == {}
+
+
+class TestComputeSystemStats:
+    def test_writes_precomputed_stats_json(self, ttl_files, tmp_path):
+        abu, lightning = ttl_files
+
+        paths = compute_system_stats(
+            {"ABU": (abu, NS), "Lightning": (lightning, NS)}, tmp_path / "stats"
+        )
+
+        data = json.loads(paths["Lightning"].read_text(encoding="utf-8"))
+        assert data["message_count"] == 60
+        assert data["vessel_count"] == 6
+        assert data["top_persons"]["Person 4"] == 5
+        assert json.loads(paths["ABU"].read_text(encoding="utf-8"))["message_count"] == 20
+
+    def test_cache_reused_until_ttl_changes(self, ttl_files, tmp_path):
+        abu, lightning = ttl_files
+        sources = {"ABU": (abu, NS), "Lightning": (lightning, NS)}
+        paths = compute_system_stats(sources, tmp_path / "stats", parallel=False)
+        first = paths["ABU"].read_text(encoding="utf-8")
+
+        compute_system_stats(sources, tmp_path / "stats", parallel=False)
+        assert paths["ABU"].read_text(encoding="utf-8") == first
+
+        with open(abu, "a", encoding="utf-8") as f:
+            f.write("\n<http://example.org/lightning/instance/msgX> a "
+                    "<http://example.org/lightning/Message> .\n")
+        compute_system_stats(sources, tmp_path / "stats", parallel=False)
+        assert json.loads(paths["ABU"].read_text(encoding="utf-8"))["message_count"] == 21
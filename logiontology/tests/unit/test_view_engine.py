@@ -0,0 +1,136 @@
+"""
+Unit tests for the single-scan precomputed view engine
+"""
+
+import json
+from datetime import date
+
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, RDF, XSD
+
+from src.export.view_engine import compute_views, generate_views, scan_case_events
+
+HVDC = Namespace("http://samsung.com/project-logistics#")
+
+
+def _add_event(g, case, predicate, day, location, qty):
+    event = BNode()
+    g.add((case, predicate, event))
+    g.add((event, RDF.type, HVDC.StockEvent))
+    g.add((event, HVDC.hasEventDate, Literal(day, datatype=XSD.date)))
+    g.add((event, HVDC.hasLocationAtEvent, Literal(location, datatype=XSD.string)))
+    g.add((event, HVDC.hasQuantity, Literal(float(qty), datatype=XSD.decimal)))
+
+
+@pytest.fixture
+def event_graph():
+    g = Graph()
+    specs = [
+        # (flow, vendor, override, inbound, outbound)
+        ("1", "HITACHI", None, (date(2024, 1, 5), "AGI", 2), None),
+        ("2", "HITACHI", None, (date(2024, 1, 10), "DSV Indoor", 3), (date(2024, 1, 20), "MIR", 3)),
+        ("2", "SIEMENS", None, (date(2024, 2, 1), "DSV Indoor", 1), (date(2024, 2, 4), "SHU", 1)),
+        ("3", "SIEMENS", "AGI/DAS forced", (date(2024, 2, 3), "MOSB", 5), (date(2024, 2, 13), "DAS", 5)),
+        ("0", None, None, None, None),
+        (None, "HITACHI", None, None, None),
+    ]
+    for idx, (flow, vendor, override, inbound, outbound) in enumerate(specs):
+        case = HVDC[f"Case_{idx + 1:05d}"]
+        g.add((case, RDF.type, HVDC.Case))
+        if flow is not None:
+            g.add((case, HVDC.hasFlowCode, Literal(flow, datatype=XSD.string)))
+        if vendor:
+            g.add((case, HVDC.hasVendor, Literal(vendor)))
+        if override:
+            g.add((case, HVDC.hasFlowOverrideReason, Literal(override)))
+        if inbound:
+            _add_event(g, case, HVDC.hasInboundEvent, *inbound)
+        if outbound:
+            _add_event(g, case, HVDC.hasOutboundEvent, *outbound)
+    return g
+
+
+class TestScanCaseEvents:
+    def test_tables(self, event_graph):
+        tables = scan_case_events(event_graph)
+
+        assert len(tables.cases) == 6
+        assert len(tables.events) == 7
+        assert list(tables.cases["case_id"])[:2] == ["Case_00001", "Case_00002"]
+        assert str(tables.cases["vendor"].dtype) == "category"
+        assert str(tables.events["event_date"].dtype).startswith("datetime64")
+        # events reference cases through shared integer codes
+        assert tables.case_codes.max() < len(tables.cases)
+
+
+class TestViews:
+    def test_monthly_warehouse_matches_sparql(self, event_graph):
+        rows = event_graph.query("""
+            PREFIX hvdc: <http://samsung.com/project-logistics#>
+            SELECT ?date ?location ?qty WHERE {
+                ?case hvdc:hasInboundEvent ?event .
+                ?event hvdc:hasEventDate ?date ;
+                       hvdc:hasLocationAtEvent ?location ;
+                       hvdc:hasQuantity ?qty .
+            }""")
+        expected = {}
+        for row in rows:
+            key = (str(row.date)[:7], str(row.location))
+            count, qty = expected.get(key, (0, 0.0))
+            expected[key] = (count + 1, qty + float(row.qty))
+
+        view = compute_views(scan_case_events(event_graph))["monthly_warehouse"]
+        actual = {
+            (r["month"], r["warehouse"]): (r["event_count"], r["total_quantity"])
+            for r in view.to_dict(orient="records")
+        }
+        assert actual == expected
+        assert list(zip(view["month"], view["warehouse"])) == sorted(expected)
+
+    def test_vendor_and_flow_views(self, event_graph):
+        views = compute_views(scan_case_events(event_graph))
+
+        vendor = views["vendor_summary"].to_dict(orient="records")
+        assert [(r["vendor"], r["month"], r["event_count"]) for r in vendor] == [
+            ("HITACHI", "2024-01", 2),
+            ("SIEMENS", "2024-02", 2),
+        ]
+
+        flow = {r["flow_code"]: r for r in views["flow_distribution"].to_dict(orient="records")}
+        assert flow["2"]["case_count"] == 2
+        assert flow["3"]["case_count"] == 1
+        assert flow["NO_FLOW"]["case_count"] == 1
+
+    def test_dwell_time(self, event_graph):
+        dwell = compute_views(scan_case_events(event_graph))["dwell_time"]
+        by_wh = dwell.set_index("warehouse")
+
+        assert by_wh.loc["DSV Indoor", "case_count"] == 2
+        assert by_wh.loc["DSV Indoor", "avg_dwell_days"] == 6.5
+        assert by_wh.loc["MOSB", "max_dwell_days"] == 10
+        assert "AGI" not in by_wh.index
+
+    def test_generate_views_writes_json(self, event_graph, tmp_path):
+        paths = generate_views(event_graph, tmp_path, parquet=False)
+
+        assert set(paths) == {"monthly_warehouse", "vendor_summary", "flow_distribution", "dwell_time"}
+        with open(paths["flow_distribution"], encoding="utf-8") as f:
+            records = json.load(f)
+        assert records[0] == {"flow_code": "0", "case_count": 1}
+
+    def test_flow_override_counts(self, event_graph, tmp_path):
+        # scripts/core/ttl_to_json.py keeps override_count in cases_by_flow.json
+        paths = generate_views(event_graph, tmp_path, parquet=False, override_counts=True)
+
+        with open(paths["flow_distribution"], encoding="utf-8") as f:
+            records = {r["flow_code"]: r for r in json.load(f)}
+        assert records["3"] == {"flow_code": "3", "case_count": 1, "override_count": 1}
+        assert records["2"]["override_count"] == 0
+
+    def test_generate_views_parquet(self, event_graph, tmp_path):
+        pd = pytest.importorskip("pandas")
+        pytest.importorskip("pyarrow")
+        generate_views(event_graph, tmp_path)
+
+        frame = pd.read_parquet(tmp_path / "monthly_warehouse_inbound.parquet")
+        assert len(frame) == 4
@@ -15,15 +15,18 @@ from collections import Counter, defaultdict
 from rdflib import Graph, Namespace, RDF, RDFS, XSD, Literal, URIRef
 from rdflib.namespace import NamespaceManager
 
+# 프로젝트 루트를 PYTHONPATH에 추가 (공유 그래프 캐시)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from logiontology.src.rdfio.graph_cache import load_cached_graph
+
 # Unicode 출력 지원
 sys.stdout.reconfigure(encoding="utf-8")
 
 
 def load_rdf_data(rdf_file: str) -> Graph:
     """RDF 파일 로드"""
-    g = Graph()
     if Path(rdf_file).exists():
-        g.parse(rdf_file, format="turtle")
+        g = load_cached_graph(rdf_file)
         print(f"[INFO] RDF 파일 로드: {rdf_file}")
     else:
         print(f"[ERROR] RDF 파일을 찾을 수 없습니다: {rdf_file}")
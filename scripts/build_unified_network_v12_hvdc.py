@@ -10,14 +10,27 @@ References:
 - ontology/core/1_CORE-02-hvdc-infra-nodes.md: 8거점 네트워크
 """
 
+import argparse
 import json
+import sys
 from pathlib import Path
-from collections import defaultdict
 from difflib import SequenceMatcher
 import pandas as pd
 import networkx as nx
 from pyvis.network import Network
-from networkx.algorithms.community import louvain_communities
+
+# 프로젝트 루트를 PYTHONPATH에 추가 (추론/검증/커뮤니티: networkx, CSR 또는 rule engine 백엔드)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from logiontology.src.graph.rule_engine import RuleEngine
+from logiontology.src.graph.unified_network import (
+    BACKENDS,
+    HVDC_RULES,
+    add_inference_rules,
+    build_network_index,
+    detect_communities,
+    print_rule_stats,
+    validate_hvdc_ontology,
+)
 
 # Import from existing builder
 from build_unified_network import (
@@ -110,16 +123,16 @@ def build_hvdc_infrastructure(G: nx.Graph) -> nx.Graph:
         "HVDC_Infrastructure": "#339af0",  # HVDC 노드 시스템
     }
 
-    for sys, color in systems.items():
+    for system, color in systems.items():
         G.add_node(
-            sys,
+            system,
             type="system",
             ontology_class="System",
-            label=sys.replace("_", " "),
+            label=system.replace("_", " "),
             level=1,
             color=color,
         )
-        G.add_edge("HVDC_Project", sys, rel="belongs_to", weight=2.0)
+        G.add_edge("HVDC_Project", system, rel="belongs_to", weight=2.0)
 
     # L2: HVDC Nodes (8개 노드)
     # Ports (3개)
@@ -419,189 +432,6 @@ def build_identity_graph_hvdc(G: nx.Graph) -> nx.Graph:
     return G
 
 
-def add_inference_rules(G: nx.Graph) -> nx.Graph:
-    """
-    Apply ontological inference rules (p.md 5.1)
-
-    Rules:
-    1. Transitive Property: Vessel operates_from MOSB AND MOSB dispatches Site → Vessel indirectly_serves Site
-    2. Cargo Flow Path: Vessel operates_from MOSB AND MOSB receives_from Port → Vessel flows_through Port
-    3. Critical Path Detection: Operation.performed_by Person AND Person.operates Vessel AND Vessel.operates_from MOSB → Operation.criticality = HIGH
-    4. Co-Location Clustering: Vessels operating_from same location → co_located_with
-    """
-
-    # Rule 1: Transitive Property (indirectly_serves)
-    for vessel in [n for n, d in G.nodes(data=True) if d.get("type") == "vessel"]:
-        if G.has_edge(vessel, "MOSB"):
-            for site in ["MIR", "SHU", "DAS", "AGI"]:
-                if G.has_edge("MOSB", site):
-                    # Check if edge already exists
-                    if not G.has_edge(vessel, site):
-                        G.add_edge(
-                            vessel,
-                            site,
-                            rel="indirectly_serves",
-                            weight=0.3,
-                            inferred=True,
-                        )
-
-    # Rule 2: Cargo Flow Path (flows_through)
-    for vessel in [n for n, d in G.nodes(data=True) if d.get("type") == "vessel"]:
-        if G.has_edge(vessel, "MOSB"):
-            for port in ["ZAYED_PORT", "KHALIFA_PORT", "JEBEL_ALI_PORT"]:
-                if G.has_edge(port, "MOSB") or G.has_edge("MOSB", port):
-                    # Check if edge already exists
-                    if not G.has_edge(vessel, port):
-                        G.add_edge(
-                            vessel,
-                            port,
-                            rel="flows_through",
-                            weight=0.4,
-                            inferred=True,
-                        )
-
-    # Rule 3: Critical Path Detection
-    for op in [n for n, d in G.nodes(data=True) if d.get("type") == "operation"]:
-        # Count dependency chain depth
-        depth = 0
-        for neighbor in G.neighbors(op):
-            if G.nodes[neighbor].get("type") == "person":
-                depth += 1
-                for vessel_neighbor in G.neighbors(neighbor):
-                    if G.nodes[vessel_neighbor].get("type") == "vessel":
-                        depth += 1
-                        if G.has_edge(vessel_neighbor, "MOSB"):
-                            depth += 1
-
-        # Mark as critical if depth >= 3
-        if depth >= 3:
-            G.nodes[op]["criticality"] = "HIGH"
-            G.nodes[op]["dependency_depth"] = depth
-            G.nodes[op]["inferred"] = True
-
-    # Rule 4: Co-Location Clustering
-    location_groups = defaultdict(list)
-    for vessel in [n for n, d in G.nodes(data=True) if d.get("type") == "vessel"]:
-        for neighbor in G.neighbors(vessel):
-            if G.nodes[neighbor].get("type") in ["hub", "port", "site"]:
-                location_groups[neighbor].append(vessel)
-
-    for location, vessels in location_groups.items():
-        if len(vessels) > 1:
-            for i, vessel_a in enumerate(vessels):
-                for vessel_b in vessels[i + 1 :]:
-                    # Check if edge already exists
-                    if not G.has_edge(vessel_a, vessel_b):
-                        G.add_edge(
-                            vessel_a,
-                            vessel_b,
-                            rel="co_located_with",
-                            weight=0.2,
-                            inferred=True,
-                            location=location,
-                        )
-
-    return G
-
-
-def validate_hvdc_ontology(G: nx.Graph) -> dict:
-    """Validate HVDC v3.0 ontology compliance"""
-
-    results = {}
-
-    # 1. HVDC 노드 존재 확인
-    hvdc_nodes_present = []
-    for node in [
-        "ZAYED_PORT",
-        "KHALIFA_PORT",
-        "JEBEL_ALI_PORT",
-        "MOSB",
-        "MIR",
-        "SHU",
-        "DAS",
-        "AGI",
-    ]:
-        if node in G.nodes:
-            hvdc_nodes_present.append(node)
-
-    results["hvdc_nodes_count"] = len(hvdc_nodes_present)
-    results["hvdc_nodes_list"] = hvdc_nodes_present
-
-    # 2. Cargo flow 검증 (Port → MOSB → Sites)
-    mosb_incoming = [u for u, v in G.edges() if v == "MOSB"]
-    mosb_outgoing = [v for u, v in G.edges() if u == "MOSB"]
-
-    results["mosb_incoming"] = len(mosb_incoming)
-    results["mosb_outgoing"] = len(mosb_outgoing)
-
-    # 3. 관계 타입 (목표: 12종+)
-    edge_types = set([d.get("rel") for u, v, d in G.edges(data=True)])
-    results["edge_types_count"] = len(edge_types)
-    results["edge_types_list"] = sorted(edge_types)
-
-    # 4. 온톨로지 클래스 커버리지
-    ontology_classes = set(
-        [
-            d.get("ontology_class")
-            for n, d in G.nodes(data=True)
-            if "ontology_class" in d
-        ]
-    )
-    results["ontology_classes"] = sorted(ontology_classes)
-
-    # 5. same_as 링크
-    same_as_edges = [
-        (u, v) for u, v, d in G.edges(data=True) if d.get("rel") == "same_as"
-    ]
-    results["same_as_links"] = len(same_as_edges)
-
-    # 6. 평균 차수
-    if G.number_of_nodes() > 0:
-        results["avg_degree"] = sum(dict(G.degree()).values()) / G.number_of_nodes()
-    else:
-        results["avg_degree"] = 0
-
-    # 7. 노드/엣지 통계
-    results["total_nodes"] = G.number_of_nodes()
-    results["total_edges"] = G.number_of_edges()
-
-    # 8. 추론된 관계 (inferred edges)
-    inferred_edges = [
-        (u, v, d.get("rel"))
-        for u, v, d in G.edges(data=True)
-        if d.get("inferred") == True
-    ]
-    results["inferred_edges_count"] = len(inferred_edges)
-    results["inferred_relation_types"] = sorted(
-        set([rel for u, v, rel in inferred_edges])
-    )
-
-    # 9. Critical path operations (criticality = HIGH)
-    critical_ops = [n for n, d in G.nodes(data=True) if d.get("criticality") == "HIGH"]
-    results["critical_operations"] = len(critical_ops)
-
-    print("\n" + "=" * 60)
-    print("[HVDC v3.0 ONTOLOGY VALIDATION]")
-    print("=" * 60)
-    print(f"[OK] HVDC Nodes: {results['hvdc_nodes_count']}/8")
-    print(f"     {results['hvdc_nodes_list']}")
-    print(
-        f"[OK] MOSB Hub: {results['mosb_incoming']} incoming, {results['mosb_outgoing']} outgoing"
-    )
-    print(f"[OK] Edge types: {results['edge_types_count']} (target: >=12)")
-    print(f"     {results['edge_types_list']}")
-    print(f"[OK] Ontology classes: {results['ontology_classes']}")
-    print(f"[OK] Same_as links: {results['same_as_links']}")
-    print(f"[OK] Avg degree: {results['avg_degree']:.2f} (target: >=3.2)")
-    print(f"[OK] Total: {results['total_nodes']} nodes, {results['total_edges']} edges")
-    print(f"[OK] Inferred edges: {results['inferred_edges_count']}")
-    print(f"     Types: {results['inferred_relation_types']}")
-    print(f"[OK] Critical operations: {results['critical_operations']}")
-    print("=" * 60)
-
-    return results
-
-
 def export_json(G: nx.Graph, output_path: str):
     """Export graph to JSON (node-link format)"""
     data = nx.node_link_data(G)
@@ -909,6 +739,16 @@ def patch_html_with_pro_ui(html_path: str) -> None:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HVDC v3.0 ontology-based network builder")
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="networkx",
+        help="csr: typed node index + CSR adjacency for inference/validation/Louvain (100k+ nodes); "
+        "rules: rule engine over HVDC_RULES with per-rule firing counts",
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Phase 1 v1.2 Stage 1 - HVDC v3.0 Ontology")
     print("=" * 60)
@@ -933,11 +773,15 @@ if __name__ == "__main__":
 
     # 5. Apply inference rules
     print("[5/6] Applying ontological inference rules...")
-    G = add_inference_rules(G)
+    if args.backend == "rules":
+        print_rule_stats(RuleEngine(G, HVDC_RULES).run())
+    else:
+        G = add_inference_rules(G, backend=args.backend)
 
-    # 6. Validate
+    # 6. Validate (CSR: 인덱스 한 번 생성 후 검증과 Louvain에서 공유)
     print("[6/8] Validating HVDC v3.0 ontology...")
-    validation = validate_hvdc_ontology(G)
+    index = build_network_index(G) if args.backend == "csr" else None
+    validation = validate_hvdc_ontology(G, index)
 
     # 7. Community detection for meta-graph
     print("[7/8] Generating meta-graph...")
@@ -945,7 +789,7 @@ if __name__ == "__main__":
         # Apply Louvain community detection
         try:
             node2comm = {}
-            communities = louvain_communities(G, seed=42)
+            communities = detect_communities(G, index, seed=42)
             for cid, comm in enumerate(communities):
                 for node in comm:
                     node2comm[node] = cid
@@ -7,12 +7,17 @@ ABU-Lightning 시스템 비교 분석 스크립트
 
 import sys
 import json
+import argparse
 import csv
 from pathlib import Path
-from collections import defaultdict, Counter
+from collections import defaultdict
 from datetime import datetime
-import rdflib
-from rdflib import Namespace, RDF, RDFS, XSD
+from rdflib import Namespace, RDFS, XSD
+
+# 프로젝트 루트를 PYTHONPATH에 추가 (공유 그래프 캐시)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from logiontology.src.rdfio.graph_cache import load_cached_graph
+from logiontology.src.analytics.system_stats import collect_system_stats, compute_system_stats
 
 # UTF-8 출력 설정
 sys.stdout.reconfigure(encoding="utf-8")
@@ -26,8 +31,7 @@ LIGHTNINGI = Namespace("http://example.org/lightning/instance/")
 
 def load_rdf_graph(file_path):
     """RDF 그래프 로드"""
-    g = rdflib.Graph()
-    g.parse(file_path, format="turtle")
+    g = load_cached_graph(file_path)
     print(f"Loaded {len(g)} triples from {file_path}")
     return g
 
@@ -51,55 +55,8 @@ def load_csv_entities(csv_path):
 
 
 def analyze_system_stats(graph, ns, nsi, system_name):
-    """시스템 통계 분석"""
-    stats = {}
-
-    # 기본 카운트
-    stats["total_triples"] = len(graph)
-    stats["vessels"] = len(list(graph.subjects(RDF.type, ns.Vessel)))
-    stats["persons"] = len(list(graph.subjects(RDF.type, ns.Person)))
-    stats["locations"] = len(list(graph.subjects(RDF.type, ns.Location)))
-    stats["operations"] = len(list(graph.subjects(RDF.type, ns.Operation)))
-    stats["messages"] = len(list(graph.subjects(RDF.type, ns.Message)))
-    stats["images"] = len(list(graph.subjects(RDF.type, ns.Image)))
-
-    # 작업 타입 분포
-    operation_types = Counter()
-    for op in graph.subjects(RDF.type, ns.Operation):
-        op_type = graph.value(op, ns.operationType)
-        if op_type:
-            operation_types[str(op_type)] += 1
-    stats["operation_types"] = dict(operation_types.most_common(10))
-
-    # 담당자별 활동
-    person_activity = Counter()
-    for person in graph.subjects(RDF.type, ns.Person):
-        person_name = graph.value(person, ns.personName)
-        if person_name:
-            # 담당 선박 수
-            vessels = list(graph.objects(person, ns.worksWithVessel))
-            person_activity[str(person_name)] = len(vessels)
-    stats["top_persons"] = dict(person_activity.most_common(10))
-
-    # 선박별 활동
-    vessel_activity = Counter()
-    for vessel in graph.subjects(RDF.type, ns.Vessel):
-        vessel_name = graph.value(vessel, ns.vesselName)
-        if vessel_name:
-            # 관련 작업 수
-            ops = len(list(graph.subjects(ns.mentionsVessel, vessel)))
-            vessel_activity[str(vessel_name)] = ops
-    stats["top_vessels"] = dict(vessel_activity.most_common(10))
-
-    # 위치별 활동
-    location_activity = Counter()
-    for loc in graph.subjects(RDF.type, ns.Location):
-        loc_name = graph.value(loc, ns.locationName)
-        if loc_name:
-            # 관련 메시지 수
-            mentions = len(list(graph.subjects(ns.mentionsLocation, loc)))
-            location_activity[str(loc_name)] = mentions
-    stats["top_locations"] = dict(location_activity.most_common(10))
+    """시스템 통계 분석 (관련 트리플 단일 패스)"""
+    stats = collect_system_stats(graph, ns)
 
     print(f"\n{system_name} 시스템 통계:")
     print(f"  - Total triples: {stats['total_triples']:,}")
@@ -726,7 +683,23 @@ def load_precomputed_stats(json_path, system_name):
     return data
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ABU-Lightning 시스템 비교 분석")
+    parser.add_argument("--abu-ttl", help="ABU TTL (지정 시 RDF에서 통계 직접 계산)")
+    parser.add_argument("--lightning-ttl", help="Lightning TTL (지정 시 RDF에서 통계 직접 계산)")
+    parser.add_argument(
+        "--stats-cache",
+        help="RDF 통계 JSON 캐시 디렉토리 (기본: reports/data/system_stats)",
+    )
+    parser.add_argument("--force", action="store_true", help="캐시된 통계 무시하고 재계산")
+    parser.add_argument("--serial", action="store_true", help="시스템별 병렬 프로세스 사용 안 함")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """비교 보고서 생성 (입력 통계가 없으면 종료 코드 1 반환)"""
+    args = parse_args(argv)
+
     print("=" * 80)
     print("ABU-Lightning 시스템 비교 분석")
     print("=" * 80)
@@ -737,17 +710,37 @@ def main():
     lightning_stats_file = (
         base_dir / "reports" / "lightning" / "lightning_integrated_stats.json"
     )
+
+    # TTL 지정 시: 단일 패스 통계를 시스템별 병렬 계산 후 사전 계산 통계 JSON으로 캐시
+    if args.abu_ttl and args.lightning_ttl:
+        cache_dir = (
+            Path(args.stats_cache)
+            if args.stats_cache
+            else base_dir / "reports" / "data" / "system_stats"
+        )
+        print(f"\n📊 RDF 통계 계산 중 (캐시: {cache_dir})...")
+        stats_files = compute_system_stats(
+            {"ABU": (args.abu_ttl, ABU), "Lightning": (args.lightning_ttl, LIGHTNING)},
+            cache_dir,
+            parallel=not args.serial,
+            force=args.force,
+        )
+        abu_stats_file = stats_files["ABU"]
+        lightning_stats_file = stats_files["Lightning"]
+    elif args.abu_ttl or args.lightning_ttl:
+        print("❌ --abu-ttl 과 --lightning-ttl 은 함께 지정해야 합니다")
+        return 1
     csv_file = base_dir / "HVDC Project Lightning" / "Logistics_Entities__Summary_.csv"
     output_report = base_dir / "reports" / "final" / "ABU_LIGHTNING_COMPARISON.md"
 
     # 파일 존재 확인
     if not abu_stats_file.exists():
         print(f"❌ ABU 통계 파일을 찾을 수 없습니다: {abu_stats_file}")
-        return
+        return 1
 
     if not lightning_stats_file.exists():
         print(f"❌ Lightning 통계 파일을 찾을 수 없습니다: {lightning_stats_file}")
-        return
+        return 1
 
     if not csv_file.exists():
         print(f"⚠️  Lightning CSV 파일을 찾을 수 없습니다: {csv_file}")
@@ -827,4 +820,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
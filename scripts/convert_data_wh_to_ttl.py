@@ -38,6 +38,11 @@ Examples:
       --output-ttl "rdf_output/data_wh_events.ttl" \\
       --schema "logiontology/configs/ontology/hvdc_event_schema.ttl"
 
+  # TTL + Parquet 저장소 (KPI/뷰 생성용 컬럼 데이터)
+  python scripts/convert_data_wh_to_ttl.py \\
+      --input "DATA WH.xlsx" \\
+      --parquet "rdf_output/parquet/"
+
   # TTL만 생성 (JSON 건너뛰기)
   python scripts/convert_data_wh_to_ttl.py \\
       --input "DATA WH.xlsx" \\
@@ -54,6 +59,8 @@ Examples:
                         help="온톨로지 스키마 TTL 경로 (선택)")
     parser.add_argument("--report", "-r",
                         help="변환 통계 JSON 리포트 경로 (선택)")
+    parser.add_argument("--parquet", "-p",
+                        help="Case/Event Parquet 저장소 디렉토리 (선택, TTL과 같은 Case ID)")
     parser.add_argument("--skip-json", action="store_true",
                         help="JSON 변환 건너뛰기 (아직 구현 안 됨)")
 
@@ -77,7 +84,8 @@ Examples:
         ttl_stats = convert_data_wh_to_ttl_with_events(
             excel_path=args.input,
             output_path=args.output_ttl,
-            schema_path=args.schema
+            schema_path=args.schema,
+            parquet_dir=args.parquet
         )
 
         print(f"\nSUCCESS: TTL created")
@@ -85,6 +93,8 @@ Examples:
         print(f"   - Inbound Events: {ttl_stats.get('inbound_events', 0)}")
         print(f"   - Outbound Events: {ttl_stats.get('outbound_events', 0)}")
         print(f"   - Output: {args.output_ttl}")
+        if args.parquet:
+            print(f"   - Parquet: {args.parquet}")
 
     except Exception as e:
         print(f"\nERROR: TTL conversion failed: {e}")
@@ -5,6 +5,7 @@ TTL 파일을 Neo4j 그래프 데이터베이스에 로드
 
 Usage:
     python scripts/core/neo4j_loader.py --ttl data.ttl --uri bolt://localhost:7687 --user neo4j --password password
+    python scripts/core/neo4j_loader.py --ttl output/parquet/ --password password   # Parquet 저장소
 """
 
 from __future__ import annotations
@@ -18,7 +19,9 @@ import os
 ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(ROOT))
 
-from rdflib import Graph, Namespace
+from rdflib import Namespace
+
+from logiontology.src.export.parquet_store import load_tables
 
 # 로깅 설정
 logging.basicConfig(
@@ -31,12 +34,22 @@ logger = logging.getLogger(__name__)
 HVDC = Namespace("http://samsung.com/project-logistics#")
 
 
+def neo4j_case_id(case_id: str) -> str:
+    """
+    Case 테이블 ID → Neo4j Case 노드 ID
+
+    기존 로더와 같은 형식(Case IRI의 마지막 '/' 구간, e.g. project-logistics#Case_00001)을
+    유지하여 기존 DB의 Case 노드에 MERGE 되도록 합니다.
+    """
+    return str(HVDC[case_id]).split("/")[-1]
+
+
 def load_ttl_to_neo4j(ttl_path: str, uri: str, user: str, password: str, database: str = "neo4j") -> dict:
     """
-    TTL 파일을 Neo4j에 로드
+    TTL 파일(또는 Parquet 저장소)을 Neo4j에 로드
 
     Args:
-        ttl_path: TTL 파일 경로
+        ttl_path: TTL 파일 경로 또는 write_case_parquet 출력 디렉토리
         uri: Neo4j URI (e.g., bolt://localhost:7687)
         user: Neo4j 사용자
         password: Neo4j 비밀번호
@@ -47,11 +60,10 @@ def load_ttl_to_neo4j(ttl_path: str, uri: str, user: str, password: str, databas
     """
     logger.info(f"Loading TTL: {ttl_path}")
 
-    # TTL 로드
+    # TTL 또는 Parquet 저장소 로드
     try:
-        g = Graph()
-        g.parse(ttl_path, format='turtle')
-        logger.info(f"TTL loaded: {len(g)} triples")
+        cases = load_tables(ttl_path).cases
+        logger.info(f"Case table loaded: {len(cases)} cases")
     except Exception as e:
         logger.error(f"Failed to load TTL: {e}")
         return {"error": str(e)}
@@ -68,21 +80,6 @@ def load_ttl_to_neo4j(ttl_path: str, uri: str, user: str, password: str, databas
     # Case 노드 생성
     logger.info("Creating Case nodes in Neo4j...")
 
-    query = """
-    PREFIX hvdc: <http://samsung.com/project-logistics#>
-
-    SELECT ?case ?hvdcCode ?flowCode ?vendor ?grossWeight
-    WHERE {
-        ?case a hvdc:Case .
-        OPTIONAL { ?case hvdc:hasHvdcCode ?hvdcCode }
-        OPTIONAL { ?case hvdc:hasFlowCode ?flowCode }
-        OPTIONAL { ?case hvdc:hasVendor ?vendor }
-        OPTIONAL { ?case hvdc:hasGrossWeight ?grossWeight }
-    }
-    """
-
-    results = g.query(query)
-
     stats = {"cases_created": 0, "events_created": 0}
 
     with driver.session(database=database) as session:
@@ -90,9 +87,9 @@ def load_ttl_to_neo4j(ttl_path: str, uri: str, user: str, password: str, databas
         # session.run("MATCH (n) DETACH DELETE n")
 
         # Case 노드 생성
-        for row in results:
-            case_id = str(row.case).split("/")[-1]
-
+        columns = ["case_id", "hvdc_code", "flow_code", "vendor", "gross_weight"]
+        rows = cases[columns].astype(object).where(cases[columns].notna(), None)
+        for case_id, hvdc_code, flow_code, vendor, gross_weight in rows.itertuples(index=False):
             cypher = """
             MERGE (c:Case {id: $case_id})
             SET c.hvdc_code = $hvdc_code,
@@ -102,11 +99,11 @@ def load_ttl_to_neo4j(ttl_path: str, uri: str, user: str, password: str, databas
             """
 
             session.run(cypher, {
-                "case_id": case_id,
-                "hvdc_code": str(row.hvdcCode) if row.hvdcCode else None,
-                "flow_code": str(row.flowCode) if row.flowCode else None,
-                "vendor": str(row.vendor) if row.vendor else None,
-                "gross_weight": float(row.grossWeight) if row.grossWeight else None
+                "case_id": neo4j_case_id(case_id),
+                "hvdc_code": hvdc_code,
+                "flow_code": flow_code,
+                "vendor": vendor,
+                "gross_weight": gross_weight
             })
 
             stats["cases_created"] += 1
@@ -156,7 +153,7 @@ Examples:
     parser.add_argument(
         '--ttl', '-t',
         required=True,
-        help='TTL file path to load'
+        help='TTL file path (or Parquet store directory) to load'
     )
     parser.add_argument(
         '--uri',
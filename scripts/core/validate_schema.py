@@ -23,11 +23,14 @@ from rdflib import Graph, Namespace
 
 # pyshacl은 선택적 의존성
 try:
-    from pyshacl import validate
+    import pyshacl  # noqa: F401
     HAS_PYSHACL = True
 except ImportError:
     HAS_PYSHACL = False
 
+if HAS_PYSHACL:
+    from logiontology.src.validation.shacl_service import ShaclValidationService, load_shapes
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -39,13 +42,14 @@ logger = logging.getLogger(__name__)
 HVDC = Namespace("http://samsung.com/project-logistics#")
 
 
-def validate_ttl(ttl_path: str, schema_path: str = None) -> dict:
+def validate_ttl(ttl_path: str, schema_path: str = None, workers: int = None) -> dict:
     """
     TTL 파일을 SHACL 스키마로 검증
 
     Args:
         ttl_path: TTL 파일 경로
         schema_path: SHACL 스키마 경로 (optional)
+        workers: focus node 분할 검증 프로세스 수 (None/1 = 직렬, 0 = CPU 수)
 
     Returns:
         dict: 검증 결과 {
@@ -65,13 +69,17 @@ def validate_ttl(ttl_path: str, schema_path: str = None) -> dict:
         logger.error(f"Failed to load TTL: {e}")
         return {"conforms": False, "error": str(e)}
 
-    # SHACL 스키마 로드 (optional)
+    # SHACL 스키마 로드 (optional, 파일 내용 기준 캐시)
     shacl_graph = None
     if schema_path:
         logger.info(f"Loading SHACL schema: {schema_path}")
         try:
-            shacl_graph = Graph()
-            shacl_graph.parse(schema_path, format='turtle')
+            if HAS_PYSHACL:
+                shapes = load_shapes(schema_path)
+                shacl_graph = shapes.graph
+            else:
+                shacl_graph = Graph()
+                shacl_graph.parse(schema_path, format='turtle')
             logger.info(f"SHACL schema loaded: {len(shacl_graph)} triples")
         except Exception as e:
             logger.warning(f"Failed to load SHACL schema: {e}")
@@ -86,19 +94,16 @@ def validate_ttl(ttl_path: str, schema_path: str = None) -> dict:
 
         logger.info("Running SHACL validation...")
         try:
-            conforms, results_graph, results_text = validate(
-                data_graph,
-                shacl_graph=shacl_graph,
-                inference='rdfs',
-                abort_on_first=False
+            service = ShaclValidationService(
+                data_graph, shapes, workers=workers, allow_warnings=False, allow_infos=False
             )
-
-            violations = len(list(results_graph.subjects()))
+            report = service.validate()
 
             return {
-                "conforms": conforms,
-                "violations": violations,
-                "validation_report": results_text
+                "conforms": report.conforms,
+                "violations": len(report.results),
+                "validation_report": report.text,
+                "shape_seconds": {str(shape): round(stats.seconds, 4) for shape, stats in service.stats.items()},
             }
         except Exception as e:
             logger.error(f"SHACL validation failed: {e}")
@@ -203,6 +208,12 @@ Examples:
         '--output', '-o',
         help='Output JSON file path (optional)'
     )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=None,
+        help='Worker processes for SHACL focus-node partitions (0 = CPU count)'
+    )
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -232,7 +243,7 @@ Examples:
 
     # 검증 실행
     try:
-        result = validate_ttl(str(ttl_path), str(schema_path) if schema_path else None)
+        result = validate_ttl(str(ttl_path), str(schema_path) if schema_path else None, args.workers)
     except Exception as e:
         logger.error(f"Validation failed: {e}")
         import traceback
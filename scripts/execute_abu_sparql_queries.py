@@ -7,9 +7,13 @@ import sys
 import json
 from datetime import datetime
 from pathlib import Path
-from rdflib import Graph, Namespace, Literal, URIRef
+from rdflib import Namespace, Literal, URIRef
 from rdflib.namespace import RDF, RDFS, XSD
 
+# 프로젝트 루트를 PYTHONPATH에 추가 (공유 그래프 캐시)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from logiontology.src.rdfio.graph_cache import load_cached_graph
+
 # UTF-8 인코딩 설정
 sys.stdout.reconfigure(encoding="utf-8")
 
@@ -36,8 +40,7 @@ def load_integrated_rdf():
         print("❌ 통합 RDF 파일을 찾을 수 없습니다.")
         return None
 
-    g = Graph()
-    g.parse(rdf_file, format="turtle")
+    g = load_cached_graph(rdf_file)
     print(f"✅ 통합 RDF 그래프 로드: {len(g)}개 트리플")
     return g
 
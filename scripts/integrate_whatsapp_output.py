@@ -14,9 +14,12 @@ import json
 from pathlib import Path
 from collections import defaultdict, Counter
 from datetime import datetime
-import rdflib
 from rdflib import Namespace, RDF, RDFS, XSD, Literal
 
+# 프로젝트 루트를 PYTHONPATH에 추가 (공유 그래프 캐시)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from logiontology.src.rdfio.graph_cache import load_cached_graph
+
 # UTF-8 출력 설정
 sys.stdout.reconfigure(encoding="utf-8")
 
@@ -58,8 +61,7 @@ def load_whatsapp_data(whatsapp_dir):
 def load_existing_rdf(rdf_path):
     """기존 Lightning RDF 로드"""
     print(f"\n📖 기존 Lightning RDF 로드 중: {rdf_path}")
-    g = rdflib.Graph()
-    g.parse(rdf_path, format="turtle")
+    g = load_cached_graph(rdf_path, mutable=True)
 
     # 네임스페이스 바인딩
     g.bind("lightning", LIGHTNING)
@@ -14,11 +14,16 @@ import yaml
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List
-import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 # RDF 관련 import
-from rdflib import Graph, Namespace, Literal, URIRef, RDF, XSD
-from rdflib.namespace import RDF, RDFS, XSD
+from rdflib import Graph, Namespace
+from rdflib.namespace import RDFS
+
+# 프로젝트 루트를 PYTHONPATH에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from logiontology.src.ingest.invoice_rdf import invoice_rows_to_graph
 
 
 def load_mapping_rules(config_path: str) -> Dict[str, Any]:
@@ -35,47 +40,6 @@ def setup_namespaces(rules: Dict[str, Any]) -> Dict[str, Namespace]:
     return ns_dict
 
 
-def normalize_value(value: Any, field_name: str, rules: Dict[str, Any]) -> Any:
-    """값 정규화"""
-    if pd.isna(value) or value == "":
-        return None
-
-    # 문자열 정리
-    if isinstance(value, str):
-        value = str(value).strip()
-
-    # 타입 변환
-    type_conversion = rules.get("business_rules", {}).get("type_conversion", {})
-    target_type = type_conversion.get(field_name)
-
-    if target_type == "decimal":
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return None
-    elif target_type == "date":
-        try:
-            if isinstance(value, str):
-                # 숫자만 있는 경우 (예: "0", "150")는 날짜가 아님
-                if value.isdigit():
-                    return None
-
-                # 다양한 날짜 형식 처리
-                for fmt in ["%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%Y-%m-%d %H:%M:%S"]:
-                    try:
-                        return pd.to_datetime(value, format=fmt).strftime("%Y-%m-%d")
-                    except:
-                        continue
-                return None
-            elif isinstance(value, datetime):
-                return value.strftime("%Y-%m-%d")
-            return None
-        except:
-            return None
-
-    return value
-
-
 def apply_business_filters(df: pd.DataFrame, rules: Dict[str, Any]) -> pd.DataFrame:
     """비즈니스 필터 적용"""
     print(f"[INFO] Original rows: {len(df)}")
@@ -94,24 +58,6 @@ def apply_business_filters(df: pd.DataFrame, rules: Dict[str, Any]) -> pd.DataFr
     return df
 
 
-def create_invoice_uri(shipment_ref: str, ns_dict: Dict[str, Namespace]) -> URIRef:
-    """Invoice URI 생성"""
-    # HVDC 코드에서 UUID 생성용 부분 추출
-    hvdc_code = shipment_ref.replace("HVDC-ADOPT-", "") if shipment_ref else "UNKNOWN"
-    # URI에 사용할 수 없는 문자들을 안전한 문자로 변환
-    safe_code = re.sub(r"[^\w\-]", "_", hvdc_code)
-    uri_id = f"Invoice/{safe_code}_{datetime.now().strftime('%Y%m%d')}"
-    return URIRef(f"{ns_dict['hvdci']}{uri_id}")
-
-
-def create_shipment_uri(shipment_ref: str, ns_dict: Dict[str, Namespace]) -> URIRef:
-    """Shipment URI 생성"""
-    hvdc_code = shipment_ref.replace("HVDC-ADOPT-", "") if shipment_ref else "UNKNOWN"
-    # URI에 사용할 수 없는 문자들을 안전한 문자로 변환
-    safe_code = re.sub(r"[^\w\-]", "_", hvdc_code)
-    return URIRef(f"{ns_dict['hvdci']}Shipment/{safe_code}")
-
-
 def process_invoice_sheet(
     df: pd.DataFrame,
     sheet_name: str,
@@ -127,11 +73,11 @@ def process_invoice_sheet(
         print(f"[WARNING] No column mapping found for sheet: {sheet_name}")
         return Graph()
 
-    # 컬럼명 변경
+    # 컬럼명 변경 (header=None 이므로 컬럼 라벨 = 원본 컬럼 인덱스, usecols로 일부만 읽어도 동일)
     df_mapped = df.copy()
     for col_idx, field_name in column_mapping.items():
-        if int(col_idx) < len(df.columns):
-            df_mapped[field_name] = df.iloc[:, int(col_idx)]
+        if int(col_idx) in df.columns:
+            df_mapped[field_name] = df[int(col_idx)]
 
     # 비즈니스 필터 적용
     df_filtered = apply_business_filters(df_mapped, rules)
@@ -140,86 +86,89 @@ def process_invoice_sheet(
         print(f"[WARNING] No valid data in sheet: {sheet_name}")
         return Graph()
 
-    # RDF 그래프 생성
-    g = Graph()
-
-    # 네임스페이스 바인딩
-    for prefix, ns in ns_dict.items():
-        g.bind(prefix, ns)
-
-    # 각 행 처리
-    for idx, row in df_filtered.iterrows():
-        try:
-            # Invoice 엔티티 생성
-            shipment_ref = row.get("shipment_reference", "")
-            if not shipment_ref:
-                continue
-
-            invoice_uri = create_invoice_uri(shipment_ref, ns_dict)
-            g.add((invoice_uri, RDF.type, ns_dict["hvdc"]["Invoice"]))
-
-            # Invoice 속성 추가
-            entity_mapping = rules.get("entity_mapping", {}).get("invoice", {})
-            properties = entity_mapping.get("properties", [])
-
-            for prop in properties:
-                field_name = prop["field"]
-                property_uri = ns_dict["hvdc"][prop["property"].split(":")[1]]
-                datatype = prop.get("datatype", "xsd:string")
-
-                value = row.get(field_name)
-                if value is not None:
-                    normalized_value = normalize_value(value, field_name, rules)
-                    if normalized_value is not None:
-                        # 날짜 타입의 경우 추가 검증
-                        if datatype == "xsd:date":
-                            # 날짜 형식이 올바른지 확인 (YYYY-MM-DD)
-                            if (
-                                isinstance(normalized_value, str)
-                                and len(normalized_value) == 10
-                                and normalized_value.count("-") == 2
-                            ):
-                                g.add(
-                                    (
-                                        invoice_uri,
-                                        property_uri,
-                                        Literal(normalized_value, datatype=XSD.date),
-                                    )
-                                )
-                        elif datatype == "xsd:decimal":
-                            g.add(
-                                (
-                                    invoice_uri,
-                                    property_uri,
-                                    Literal(normalized_value, datatype=XSD.decimal),
-                                )
-                            )
-                        else:
-                            g.add(
-                                (
-                                    invoice_uri,
-                                    property_uri,
-                                    Literal(str(normalized_value)),
-                                )
-                            )
-
-            # Shipment 연결
-            shipment_uri = create_shipment_uri(shipment_ref, ns_dict)
-            g.add((invoice_uri, ns_dict["hvdc"]["relatedShipment"], shipment_uri))
-
-        except Exception as e:
-            print(f"[ERROR] Error processing row {idx}: {e}")
-            continue
+    # RDF 변환 (컬럼 단위 정규화 + 일괄 트리플 추가)
+    g = invoice_rows_to_graph(df_filtered, rules, ns_dict)
 
     print(f"[INFO] Generated {len(g)} triples for sheet: {sheet_name}")
     return g
 
 
+def read_invoice_sheet(
+    excel_path: str, sheet_name: str, column_mapping: Dict[Any, str]
+) -> pd.DataFrame:
+    """시트 하나에서 매핑된 컬럼만 읽기 (컬럼 라벨은 원본 인덱스 유지)"""
+    wanted = {int(col_idx) for col_idx in column_mapping}
+    return pd.read_excel(
+        excel_path, sheet_name=sheet_name, header=None, usecols=lambda col: col in wanted
+    )
+
+
+def process_sheet_to_ttl(
+    excel_path: str,
+    sheet_name: str,
+    rules: Dict[str, Any],
+    ns_dict: Dict[str, Namespace],
+    output_dir: str,
+) -> Dict[str, Any]:
+    """
+    시트 하나를 읽고 RDF 변환 후 TTL 저장 (워커 프로세스에서도 실행)
+
+    Returns:
+        dict: sheet, triples, output_file (None = 저장 없음), error
+    """
+    result = {"sheet": sheet_name, "triples": 0, "output_file": None, "error": None}
+    try:
+        column_mapping = rules.get("column_mapping", {}).get(sheet_name, {})
+        if not column_mapping:
+            print(f"[WARNING] No column mapping found for sheet: {sheet_name}")
+            return result
+
+        # 시트 읽기 (매핑된 컬럼만)
+        df = read_invoice_sheet(excel_path, sheet_name, column_mapping)
+
+        if df.empty:
+            print(f"[WARNING] Empty sheet: {sheet_name}")
+            return result
+
+        # RDF 변환
+        graph = process_invoice_sheet(df, sheet_name, rules, ns_dict)
+
+        if len(graph) > 0:
+            # TTL 파일 저장
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_file = Path(output_dir) / f"invoice_{sheet_name}_{timestamp}.ttl"
+
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(graph.serialize(format="turtle"))
+
+            result["triples"] = len(graph)
+            result["output_file"] = str(output_file)
+            print(f"[SUCCESS] Saved: {output_file} ({len(graph)} triples)")
+        else:
+            print(f"[WARNING] No triples generated for sheet: {sheet_name}")
+
+    except Exception as e:
+        result["error"] = f"Error processing sheet {sheet_name}: {e}"
+        print(f"[ERROR] {result['error']}")
+
+    return result
+
+
 def process_invoice_file(
-    excel_path: str, config_path: str, output_dir: str = "output"
+    excel_path: str, config_path: str, output_dir: str = "output", workers: int = 1
 ) -> Dict[str, Any]:
-    """Invoice 파일 전체 처리"""
+    """
+    Invoice 파일 전체 처리
+
+    Args:
+        excel_path: Invoice Excel 경로
+        config_path: 매핑 규칙 YAML 경로
+        output_dir: 시트별 TTL 출력 디렉토리
+        workers: 동시에 처리할 시트 수 (1 = 순차, 0 = CPU 수)
+    """
     print(f"[INFO] Starting Invoice processing: {excel_path}")
+    if workers <= 0:
+        workers = os.cpu_count() or 1
 
     # 매핑 규칙 로드
     rules = load_mapping_rules(config_path)
@@ -245,54 +194,59 @@ def process_invoice_file(
         "errors": [],
     }
 
-    # 각 시트 처리
-    for sheet_name in sheet_names:
-        try:
-            # 시트 읽기
-            df = pd.read_excel(excel_path, sheet_name=sheet_name, header=None)
-
-            if df.empty:
-                print(f"[WARNING] Empty sheet: {sheet_name}")
-                continue
-
-            # RDF 변환
-            graph = process_invoice_sheet(df, sheet_name, rules, ns_dict)
-
-            if len(graph) > 0:
-                # TTL 파일 저장
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                output_file = Path(output_dir) / f"invoice_{sheet_name}_{timestamp}.ttl"
-
-                with open(output_file, "w", encoding="utf-8") as f:
-                    f.write(graph.serialize(format="turtle"))
-
-                results["processed_sheets"].append(sheet_name)
-                results["total_triples"] += len(graph)
-                results["output_files"].append(str(output_file))
-
-                print(f"[SUCCESS] Saved: {output_file} ({len(graph)} triples)")
-            else:
-                print(f"[WARNING] No triples generated for sheet: {sheet_name}")
-
-        except Exception as e:
-            error_msg = f"Error processing sheet {sheet_name}: {e}"
-            print(f"[ERROR] {error_msg}")
-            results["errors"].append(error_msg)
+    # 각 시트 처리 (workers > 1: 시트별 프로세스, 결과는 시트 순서대로 병합)
+    if workers > 1 and len(sheet_names) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(sheet_names))) as executor:
+            sheet_results = list(
+                executor.map(
+                    process_sheet_to_ttl,
+                    repeat(excel_path),
+                    sheet_names,
+                    repeat(rules),
+                    repeat(ns_dict),
+                    repeat(output_dir),
+                )
+            )
+    else:
+        sheet_results = [
+            process_sheet_to_ttl(excel_path, sheet_name, rules, ns_dict, output_dir)
+            for sheet_name in sheet_names
+        ]
+
+    for sheet_result in sheet_results:
+        if sheet_result["error"]:
+            results["errors"].append(sheet_result["error"])
+        elif sheet_result["output_file"]:
+            results["processed_sheets"].append(sheet_result["sheet"])
+            results["total_triples"] += sheet_result["triples"]
+            results["output_files"].append(sheet_result["output_file"])
 
     return results
 
 
 def main():
     """메인 함수"""
-    if len(sys.argv) < 3:
+    args = sys.argv[1:]
+    workers = 1
+    if "--workers" in args:
+        pos = args.index("--workers")
+        try:
+            workers = int(args[pos + 1])
+        except (IndexError, ValueError):
+            print("[ERROR] --workers requires an integer (0 = one per CPU)")
+            sys.exit(1)
+        del args[pos : pos + 2]
+
+    if len(args) < 2:
         print(
             "Usage: python process_invoice_excel.py <excel_file> <config_file> [output_dir]"
+            " [--workers N]"
         )
         sys.exit(1)
 
-    excel_path = sys.argv[1]
-    config_path = sys.argv[2]
-    output_dir = sys.argv[3] if len(sys.argv) > 3 else "output"
+    excel_path = args[0]
+    config_path = args[1]
+    output_dir = args[2] if len(args) > 2 else "output"
 
     if not Path(excel_path).exists():
         print(f"[ERROR] Excel file not found: {excel_path}")
@@ -303,7 +257,7 @@ def main():
         sys.exit(1)
 
     # 처리 실행
-    results = process_invoice_file(excel_path, config_path, output_dir)
+    results = process_invoice_file(excel_path, config_path, output_dir, workers=workers)
 
     # 결과 요약
     print(f"\n[SUMMARY]")
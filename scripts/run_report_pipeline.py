@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Report Pipeline Runner
+여러 분석/시각화 스크립트를 하나의 프로세스에서 실행하여 각 TTL을 최대 한 번만 파싱
+
+Usage:
+    python scripts/run_report_pipeline.py                  # 전체 파이프라인
+    python scripts/run_report_pipeline.py --pipeline abu
+    python scripts/run_report_pipeline.py --steps analyze_responsible_persons visualize_abu_integrated
+"""
+
+from __future__ import annotations
+import argparse
+import importlib
+import os
+import sys
+import time
+import traceback
+from pathlib import Path
+
+# 프로젝트 루트 / scripts 디렉토리를 PYTHONPATH에 추가
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from logiontology.src.rdfio.graph_cache import get_graph_cache
+
+# 파이프라인 이름 → 순서대로 실행할 스크립트 모듈 (각 모듈의 main() 호출)
+PIPELINES = {
+    "abu": [
+        "analyze_responsible_persons",
+        "execute_abu_sparql_queries",
+        "visualize_abu_integrated",
+    ],
+    "lightning": [
+        "integrate_whatsapp_output",
+    ],
+    "compare": [
+        "compare_abu_lightning",
+    ],
+}
+PIPELINES["all"] = PIPELINES["abu"] + PIPELINES["lightning"] + PIPELINES["compare"]
+
+
+def run_steps(steps, fail_fast: bool = False) -> dict:
+    """
+    스크립트 main()을 순서대로 실행
+
+    main()이 0 이외의 정수 종료 코드를 반환하거나 SystemExit(code != 0)로 종료하면 실패로 기록
+    (예: compare_abu_lightning 입력 통계 파일 누락)
+
+    Args:
+        steps: 스크립트 모듈 이름 리스트
+        fail_fast: 첫 실패에서 중단
+
+    Returns:
+        dict: {step: {"status": "ok"|"failed", "seconds": float}}
+    """
+    results = {}
+    for step in steps:
+        print("\n" + "=" * 80)
+        print(f"[PIPELINE] {step}")
+        print("=" * 80)
+        start = time.perf_counter()
+        status = "ok"
+        # 각 스크립트는 자체 인자 없이 실행 (러너 인자를 argparse가 읽지 않도록)
+        saved_argv = sys.argv
+        sys.argv = [step]
+        try:
+            code = importlib.import_module(step).main()
+            if isinstance(code, int) and code != 0:
+                status = "failed"
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                status = "failed"
+        except Exception:
+            traceback.print_exc()
+            status = "failed"
+        finally:
+            sys.argv = saved_argv
+        results[step] = {"status": status, "seconds": round(time.perf_counter() - start, 2)}
+        if status == "failed" and fail_fast:
+            break
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run report scripts in one process with a shared graph cache")
+    parser.add_argument("--pipeline", choices=sorted(PIPELINES), default="all",
+                        help="Named pipeline (default: all)")
+    parser.add_argument("--steps", nargs="+", help="Explicit script modules to run (overrides --pipeline)")
+    parser.add_argument("--fail-fast", action="store_true", help="Stop at the first failing step")
+    args = parser.parse_args()
+
+    # 스크립트들은 저장소 루트 기준 상대 경로(output/, reports/)를 사용
+    os.chdir(ROOT)
+
+    results = run_steps(args.steps or PIPELINES[args.pipeline], fail_fast=args.fail_fast)
+
+    stats = get_graph_cache().stats
+    print("\n" + "=" * 80)
+    print("Pipeline Summary")
+    print("=" * 80)
+    for step, result in results.items():
+        print(f"  {step:<32} {result['status']:<8} {result['seconds']:>7.2f}s")
+    print(f"  Graph cache: {stats.parses} parsed, {stats.disk_hits} from snapshot, "
+          f"{stats.memory_hits} shared in-process")
+
+    if any(result["status"] == "failed" for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,22 +7,32 @@ SPARQL Event Validation Script
 from __future__ import annotations
 import sys
 import json
+from collections import defaultdict
 from pathlib import Path
 from datetime import datetime
 from rdflib import Graph
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from logiontology.src.validation.sparql_rules import load_rules, run_rules
+
 # Windows console encoding fix
 import io
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
 
 
-def run_sparql_validation(ttl_path: str, output_dir: str) -> dict:
+def run_sparql_validation(ttl_path: str, output_dir: str, rules_path: str | None = None,
+                          workers: int = 4) -> dict:
     """
-    SPARQL 쿼리로 이벤트 데이터 검증
+    SPARQL 규칙 세트로 이벤트 데이터 검증
+
+    공통 규칙(FLOW 2/3 Inbound 누락, 날짜 누락, FLOW 분포/패턴)은 Case/이벤트
+    트리플 1회 인덱스 패스로 처리하고, 나머지 SPARQL 규칙은 스레드 풀에서 동시 실행
 
     Args:
         ttl_path: TTL 파일 경로
         output_dir: 검증 결과 출력 디렉토리
+        rules_path: 규칙 파일 (None = queries/event_validation.sparql)
+        workers: SPARQL 규칙 실행 스레드 수 (1 = 순차)
 
     Returns:
         dict: 검증 통계
@@ -39,43 +49,28 @@ def run_sparql_validation(ttl_path: str, output_dir: str) -> dict:
     output_dir_obj = Path(output_dir)
     output_dir_obj.mkdir(parents=True, exist_ok=True)
 
-    results = {}
+    rules = load_rules(rules_path) if rules_path else load_rules()
+    report = run_rules(g, rules, workers=workers)
+    rule_results = report.results
 
-    # Query 4: FLOW 2/3 without Inbound (Human-gate)
     print("\n" + "=" * 80)
-    print("Query 4: FLOW 2/3 Cases without Inbound Events (Human-gate)")
+    print(f"Rules: {len(rules)} ({report.seconds:.2f}s)")
     print("=" * 80)
+    for rule_id, timing in report.timings.items():
+        print(f"  {rule_id:>5} [{timing['engine']}] {timing['count']:>6} rows  {timing['seconds'] * 1000:.1f}ms")
 
-    query_4 = """
-    PREFIX hvdc: <http://samsung.com/project-logistics#>
-
-    SELECT ?case ?flowCode ?hvdcCode
-    WHERE {
-        ?case a hvdc:Case ;
-              hvdc:hasFlowCode ?flowCode .
-
-        OPTIONAL { ?case hvdc:hasHvdcCode ?hvdcCode }
-
-        FILTER(?flowCode IN ("2", "3"))
-
-        FILTER NOT EXISTS {
-            ?case hvdc:hasInboundEvent ?inEvent .
-        }
-    }
-    ORDER BY ?flowCode ?case
-    """
+    results = {}
 
-    q4_results = g.query(query_4)
+    # Query 4: FLOW 2/3 without Inbound (Human-gate)
     q4_data = [
         {
-            "case_id": str(row.case).split("/")[-1],
-            "flow_code": str(row.flowCode),
-            "hvdc_code": str(row.hvdcCode) if row.hvdcCode else None
+            "case_id": str(row["case"]).split("/")[-1],
+            "flow_code": str(row["flowCode"]),
+            "hvdc_code": str(row["hvdcCode"]) if row["hvdcCode"] is not None else None
         }
-        for row in q4_results
-    ]
-
-    print(f"FOUND: {len(q4_data)} cases requiring manual verification")
+        for row in rule_results["Q4"].rows.to_dict(orient="records")
+    ] if "Q4" in rule_results else []
+    print(f"\nFLOW 2/3 without inbound: {len(q4_data)} cases requiring manual verification")
 
     q4_file = output_dir_obj / "human_gate_flow23_no_inbound.json"
     with open(q4_file, 'w', encoding='utf-8') as f:
@@ -87,47 +82,15 @@ def run_sparql_validation(ttl_path: str, output_dir: str) -> dict:
     }
 
     # Query 5: Missing Event Dates (Human-gate)
-    print("\n" + "=" * 80)
-    print("Query 5: Events with Missing Dates (Human-gate)")
-    print("=" * 80)
-
-    query_5 = """
-    PREFIX hvdc: <http://samsung.com/project-logistics#>
-
-    SELECT ?case ?event ?eventType
-    WHERE {
-        ?case a hvdc:Case .
-
-        {
-            ?case hvdc:hasInboundEvent ?event .
-            BIND("inbound" AS ?eventType)
-            FILTER NOT EXISTS {
-                ?event hvdc:hasEventDate ?date .
-            }
-        }
-        UNION
-        {
-            ?case hvdc:hasOutboundEvent ?event .
-            BIND("outbound" AS ?eventType)
-            FILTER NOT EXISTS {
-                ?event hvdc:hasEventDate ?date .
-            }
-        }
-    }
-    ORDER BY ?case ?eventType
-    """
-
-    q5_results = g.query(query_5)
     q5_data = [
         {
-            "case_id": str(row.case).split("/")[-1],
-            "event_type": str(row.eventType),
-            "event_uri": str(row.event)
+            "case_id": str(row["case"]).split("/")[-1],
+            "event_type": str(row["eventType"]),
+            "event_uri": str(row["event"])
         }
-        for row in q5_results
-    ]
-
-    print(f"FOUND: {len(q5_data)} events with missing dates")
+        for row in rule_results["Q5"].rows.to_dict(orient="records")
+    ] if "Q5" in rule_results else []
+    print(f"Missing event dates: {len(q5_data)} events")
 
     q5_file = output_dir_obj / "human_gate_missing_dates.json"
     with open(q5_file, 'w', encoding='utf-8') as f:
@@ -138,46 +101,21 @@ def run_sparql_validation(ttl_path: str, output_dir: str) -> dict:
         "file": str(q5_file)
     }
 
-    # Query 6: Event Coverage Statistics
-    print("\n" + "=" * 80)
-    print("Query 6: Event Coverage Statistics")
-    print("=" * 80)
-
-    query_6 = """
-    PREFIX hvdc: <http://samsung.com/project-logistics#>
-
-    SELECT ?case ?hasInbound ?hasOutbound
-    WHERE {
-        ?case a hvdc:Case .
-
-        BIND(EXISTS { ?case hvdc:hasInboundEvent ?in } AS ?hasInbound)
-        BIND(EXISTS { ?case hvdc:hasOutboundEvent ?out } AS ?hasOutbound)
-    }
-    """
-
-    q6_results = list(g.query(query_6))
-
-    total_cases = len(q6_results)
-    with_inbound = sum(1 for r in q6_results if r.hasInbound)
-    with_outbound = sum(1 for r in q6_results if r.hasOutbound)
-    with_both = sum(1 for r in q6_results if r.hasInbound and r.hasOutbound)
-    with_neither = sum(1 for r in q6_results if not r.hasInbound and not r.hasOutbound)
-
-    coverage_stats = {
-        "total_cases": total_cases,
-        "with_inbound": with_inbound,
-        "with_outbound": with_outbound,
-        "with_both": with_both,
-        "with_neither": with_neither,
-        "inbound_coverage_pct": round(with_inbound / total_cases * 100, 2) if total_cases > 0 else 0,
-        "outbound_coverage_pct": round(with_outbound / total_cases * 100, 2) if total_cases > 0 else 0
-    }
-
-    print(f"Total cases: {total_cases}")
-    print(f"With inbound: {with_inbound} ({coverage_stats['inbound_coverage_pct']}%)")
-    print(f"With outbound: {with_outbound} ({coverage_stats['outbound_coverage_pct']}%)")
-    print(f"With both: {with_both}")
-    print(f"With neither: {with_neither}")
+    # Event Coverage Statistics (Case/이벤트 인덱스)
+    coverage_stats = report.index.coverage()
+    total_cases = coverage_stats["total_cases"]
+    coverage_stats["inbound_coverage_pct"] = (
+        round(coverage_stats["with_inbound"] / total_cases * 100, 2) if total_cases > 0 else 0
+    )
+    coverage_stats["outbound_coverage_pct"] = (
+        round(coverage_stats["with_outbound"] / total_cases * 100, 2) if total_cases > 0 else 0
+    )
+
+    print(f"\nTotal cases: {total_cases}")
+    print(f"With inbound: {coverage_stats['with_inbound']} ({coverage_stats['inbound_coverage_pct']}%)")
+    print(f"With outbound: {coverage_stats['with_outbound']} ({coverage_stats['outbound_coverage_pct']}%)")
+    print(f"With both: {coverage_stats['with_both']}")
+    print(f"With neither: {coverage_stats['with_neither']}")
 
     coverage_file = output_dir_obj / "event_coverage_stats.json"
     with open(coverage_file, 'w', encoding='utf-8') as f:
@@ -185,36 +123,14 @@ def run_sparql_validation(ttl_path: str, output_dir: str) -> dict:
 
     results["coverage_stats"] = coverage_stats
 
-    # Query 9: FLOW-wise Event Pattern Validation
-    print("\n" + "=" * 80)
-    print("Query 9: FLOW-wise Event Pattern Validation")
-    print("=" * 80)
-
-    query_9 = """
-    PREFIX hvdc: <http://samsung.com/project-logistics#>
-
-    SELECT ?flowCode ?case ?hasInbound ?hasOutbound
-    WHERE {
-        ?case a hvdc:Case ;
-              hvdc:hasFlowCode ?flowCode .
-
-        BIND(EXISTS { ?case hvdc:hasInboundEvent ?in } AS ?hasInbound)
-        BIND(EXISTS { ?case hvdc:hasOutboundEvent ?out } AS ?hasOutbound)
-    }
-    """
-
-    q9_results = list(g.query(query_9))
-
-    from collections import defaultdict
+    # Query 9: FLOW-wise Event Pattern Validation (FLOW 코드 문자열 기준 합산)
     flow_stats = defaultdict(lambda: {"total": 0, "with_inbound": 0, "with_outbound": 0})
-
-    for row in q9_results:
-        flow = str(row.flowCode)
-        flow_stats[flow]["total"] += 1
-        if row.hasInbound:
-            flow_stats[flow]["with_inbound"] += 1
-        if row.hasOutbound:
-            flow_stats[flow]["with_outbound"] += 1
+    if "Q9" in rule_results:
+        for row in rule_results["Q9"].rows.to_dict(orient="records"):
+            data = flow_stats[str(row["flowCode"])]
+            data["total"] += row["totalCases"]
+            data["with_inbound"] += row["withInbound"]
+            data["with_outbound"] += row["withOutbound"]
 
     flow_validation = [
         {
@@ -228,6 +144,7 @@ def run_sparql_validation(ttl_path: str, output_dir: str) -> dict:
         for flow, data in sorted(flow_stats.items())
     ]
 
+    print()
     for item in flow_validation:
         print(f"FLOW {item['flow_code']}: {item['total_cases']} cases, "
               f"inbound={item['inbound_pct']}%, outbound={item['outbound_pct']}%")
@@ -238,6 +155,14 @@ def run_sparql_validation(ttl_path: str, output_dir: str) -> dict:
 
     results["flow_patterns"] = flow_validation
 
+    # Combined violation report (JSON + Parquet, 규칙별 시간 포함)
+    report_paths = report.write(output_dir_obj)
+    results["rule_report"] = {
+        "violations": len(report.violations),
+        "files": report_paths,
+        "timings": report.timings,
+    }
+
     # Summary Report
     print("\n" + "=" * 80)
     print("Validation Summary")
@@ -256,6 +181,7 @@ def run_sparql_validation(ttl_path: str, output_dir: str) -> dict:
 
     print(f"\nValidation complete. Results saved to: {output_dir}")
     print(f"Summary: {summary_file}")
+    print(f"Rule report: {report_paths['json']}")
 
     return results
 
@@ -266,10 +192,12 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="SPARQL Event Validation")
     parser.add_argument("--ttl", required=True, help="Path to TTL file")
     parser.add_argument("--output", default="validation_results", help="Output directory")
+    parser.add_argument("--rules", default=None, help="SPARQL rule file (default: queries/event_validation.sparql)")
+    parser.add_argument("--workers", "-w", type=int, default=4, help="Threads for SPARQL rules (1 = sequential)")
 
     args = parser.parse_args()
 
-    results = run_sparql_validation(args.ttl, args.output)
+    results = run_sparql_validation(args.ttl, args.output, rules_path=args.rules, workers=args.workers)
 
     print("\n" + "=" * 80)
     print("Next Steps:")